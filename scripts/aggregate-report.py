@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Group-by dashboard metrics over a local synthetic dataset or report cache (requires numpy).
+
+Computes successful/unsuccessful, defensores, verified, linked house/homes,
+offline and rejection-reason counts for any combination of dimensions in
+one pass, or whole ``Dashboard003Response``/``MetricsData`` payloads.
+With ``--cache`` the records are the real ones of a ``report-cache.py``
+cache (key: ``--startDate``/``--endDate``), without calling the API.
+
+Usage:
+    python3 scripts/aggregate-report.py --records 10000000 --by department gender
+    python3 scripts/aggregate-report.py --data /tmp/soci-50m --by supervisor day --jobs 4 -o por-dia.json
+    python3 scripts/aggregate-report.py --data /tmp/soci-50m --shape dashboard003 --rol supervisor \\
+        --startDate 2026-02-01 --endDate 2026-02-28 --city Cali
+    python3 scripts/aggregate-report.py --cache --startDate 2026-02-01 --endDate 2026-02-28 --by city day
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    sys.exit('aggregate-report.py requiere numpy: pip install numpy')
+
+from reportkit.aggregate import Aggregator, CachedRecords
+from reportkit.cache import DEFAULT_ROOT, ReportCache
+from reportkit.mock_backend import QueryError, ReportStore
+from reportkit.params import add_filter_arguments, filters_from_args
+from reportkit.synthetic import ROLES, Dataset, generate
+from reportkit.trace import add_trace_arguments, span, tracing
+
+SHAPES = ('records', 'dashboard003', 'metrics')
+DEFAULT_API = 'http://localhost:3000/api/v1'
+
+
+def load_dataset(args):
+    if args.data and os.path.exists(os.path.join(args.data, 'meta.json')):
+        return Dataset.load(args.data)
+    dataset = generate(args.records, seed=args.seed)
+    if args.data:
+        dataset.save(args.data)
+    return dataset
+
+
+def cache_records(args, filters):
+    if not args.startDate or not args.endDate:
+        raise ValueError('--cache requiere --startDate y --endDate (la clave de la caché)')
+    cache = ReportCache.open(args.api, {'startDate': args.startDate, 'endDate': args.endDate}, args.cache_dir)
+    if cache.watermark is None:
+        raise ValueError('la caché está vacía: ejecute primero report-cache.py sync')
+    return CachedRecords(cache, filters)
+
+
+def run(args):
+    filters = filters_from_args(args)
+    started = time.perf_counter()
+    try:
+        with span('dataset'):
+            dataset = cache_records(args, filters) if args.cache else load_dataset(args)
+    except ValueError as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 2
+    print(f'{len(dataset):,} registros listos en {time.perf_counter() - started:.1f}s', file=sys.stderr)
+
+    try:
+        started = time.perf_counter()
+        if args.cache:
+            # Los filtros ya se aplicaron al leer la caché
+            aggregator = Aggregator(dataset)
+            rows = slice(0, len(dataset))
+        else:
+            store = ReportStore(dataset)
+            aggregator = store.aggregator
+            rows = store.rows(filters)
+        if args.shape == 'dashboard003':
+            periodo = {'inicio': filters.get('startDate') or dataset.meta['start'],
+                       'fin': filters.get('endDate') or dataset.meta['end']}
+            result = aggregator.dashboard003(rows, periodo, filters.get('city'), args.rol, args.jobs)
+        elif args.shape == 'metrics':
+            result = aggregator.metrics_data(rows, args.jobs)
+        else:
+            result = aggregator.group_by(rows, args.by, args.jobs).records()
+        elapsed = time.perf_counter() - started
+    except (QueryError, ValueError) as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 2
+    print(f'{aggregator.selection_size(rows):,} registros agregados en {elapsed:.3f}s', file=sys.stderr)
+
+    with span('serialize'):
+        data = json.dumps(result, ensure_ascii=False, indent=2) + '\n'
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+    else:
+        sys.stdout.write(data)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--by', nargs='*', default=[], choices=Aggregator.DIMENSIONS, metavar='DIM',
+                        help=f'dimensions to group by: {", ".join(Aggregator.DIMENSIONS)}')
+    parser.add_argument('--shape', choices=SHAPES, default='records',
+                        help='records (one row per group), dashboard003 or metrics (MetricsData)')
+    parser.add_argument('--rol', choices=ROLES, default='socializer', help='grouping of --shape dashboard003')
+    parser.add_argument('--jobs', type=int, default=1, help='processes to split the records across (default: 1)')
+    parser.add_argument('-o', '--output', help='write JSON here (default: stdout)')
+    source = parser.add_argument_group('source')
+    source.add_argument('--cache', action='store_true', help='aggregate the records of the report-cache.py cache')
+    source.add_argument('--api', default=os.environ.get('API_BASE_URL', DEFAULT_API), help='API base URL of the cache')
+    source.add_argument('--cache-dir', default=DEFAULT_ROOT, help=f'cache root (default: {DEFAULT_ROOT})')
+    source.add_argument('--records', type=int, default=1_000_000, help='synthetic records (default: 1000000)')
+    source.add_argument('--seed', type=int, default=1, help='synthetic dataset seed (default: 1)')
+    source.add_argument('--data', help='synthetic dataset directory: loaded if present, else generated and saved')
+    add_filter_arguments(parser)
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+    with tracing(args, 'aggregate-report'):
+        return run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
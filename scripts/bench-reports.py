@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark report generation, paged fetches, full exports and aggregation.
+
+Fetch and export suites run against a local ``mock-backend.py``; the aggregate
+suite runs in process (both require numpy). Results are written as JSON; with ``--baseline`` the run fails
+(exit 1) if any metric is worse than the baseline by more than ``--threshold``.
+
+Usage:
+    python3 scripts/bench-reports.py -o bench.json
+    python3 scripts/bench-reports.py --baseline bench.json --threshold 0.15
+    python3 scripts/bench-reports.py --suites generator --zones
+    python3 scripts/bench-reports.py --suites aggregate --aggregate-records 10000000
+"""
+
+import argparse
+import json
+import sys
+
+from reportkit.bench import (
+    Metrics, bench_aggregate, bench_export, bench_fetch, bench_generator, compare, mock_backend,
+)
+from reportkit.reports_generate import PAGES
+from reportkit.trace import add_trace_arguments, span, tracing
+
+SUITES = ('generator', 'fetch', 'export', 'aggregate')
+
+
+def _sizes(value):
+    return tuple(int(v) for v in value.split(','))
+
+
+def run(args):
+    metrics = Metrics()
+    if 'generator' in args.suites:
+        pages = list(PAGES)
+        if args.zones:
+            from reportkit.zones import load_zones, zone_page
+            pages += [zone_page(page, zone) for page in PAGES for zone in load_zones()]
+        print('generador...', file=sys.stderr)
+        with span('generator'):
+            bench_generator(metrics, pages, args.repeat)
+    if 'fetch' in args.suites or 'export' in args.suites:
+        print(f'backend simulado con {args.records:,} registros...', file=sys.stderr)
+        with mock_backend(args.records, args.seed) as base_url:
+            if 'fetch' in args.suites:
+                print('latencia de páginas...', file=sys.stderr)
+                with span('fetch'):
+                    bench_fetch(metrics, base_url, args.perPage, args.samples, args.seed)
+            if 'export' in args.suites:
+                print('exportación completa...', file=sys.stderr)
+                with span('export'):
+                    bench_export(metrics, base_url, args.export_per_page, args.concurrency)
+    if 'aggregate' in args.suites:
+        print(f'agregación sobre {args.aggregate_records:,} registros...', file=sys.stderr)
+        with span('aggregate'):
+            bench_aggregate(metrics, args.aggregate_records, args.seed, jobs=args.jobs)
+
+    # Opciones que no cambian lo medido
+    skipped = ('output', 'baseline', 'threshold', 'trace', 'profile', 'tracemalloc')
+    config = {k: v for k, v in vars(args).items() if k not in skipped}
+    results = metrics.as_dict(config)
+    for name, metric in results['metrics'].items():
+        print(f'{name:<52} {metric["value"]:>12,.3f} {metric["unit"]}', file=sys.stderr)
+
+    data = json.dumps(results, indent=2, ensure_ascii=False) + '\n'
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+    else:
+        sys.stdout.write(data)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, base, value, change in regressions:
+            print(f'REGRESIÓN {name}: {base} -> {value} ({change:+.1%})', file=sys.stderr)
+        if regressions:
+            return 1
+        print(f'Sin regresiones (umbral {args.threshold:.0%}) frente a {args.baseline}', file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--suites', nargs='+', choices=SUITES, default=list(SUITES), help='suites to run (default: all)')
+    parser.add_argument('--zones', action='store_true', help='also benchmark one page per .env.production.* build')
+    parser.add_argument('--repeat', type=int, default=20, help='renders per page (default: 20)')
+    parser.add_argument('--records', type=int, default=200_000, help='mock backend records (default: 200000)')
+    parser.add_argument('--perPage', type=_sizes, default=(50, 500, 10000), help='fetch page sizes (default: 50,500,10000)')
+    parser.add_argument('--samples', type=int, default=30, help='requests per page size (default: 30)')
+    parser.add_argument('--export-perPage', dest='export_per_page', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=4, help='export requests in flight (default: 4)')
+    parser.add_argument('--aggregate-records', dest='aggregate_records', type=int, default=10_000_000,
+                        help='records of the aggregate suite (default: 10000000)')
+    parser.add_argument('--jobs', type=int, default=1, help='aggregation processes (default: 1)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('-o', '--output', help='write results JSON here (default: stdout)')
+    parser.add_argument('--baseline', help='results JSON of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed relative regression (default: 0.10)')
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+    with tracing(args, 'bench-reports'):
+        return run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Attribute the Vite build output to routes and roles and check size budgets.
+
+Reads ``dist`` (manifest and, if built with ``--sourcemap``, the source maps)
+together with ``src/routes/index.tsx`` and the role rules of
+``ProtectedRoute``, and reports what a cold load of each route downloads,
+how much of the startup bundle each role never uses, and which pages are
+the best ``React.lazy`` candidates. Budgets are gzip KB; any budget over its
+limit makes the command exit with status 1.
+
+Usage:
+    npx vite build --sourcemap
+    python3 scripts/bundle-report.py
+    python3 scripts/bundle-report.py --budget startup=180 --budget role:socializer=120 \\
+        --budget /survey/:surveyId/participant=150
+    python3 scripts/bundle-report.py --json -o bundle-report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from reportkit.bundle import analyze, kb
+from reportkit.trace import add_trace_arguments, tracing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_budget(text):
+    key, sep, value = text.rpartition('=')
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f'presupuesto inválido: {text} (use CLAVE=KB)')
+    try:
+        return key, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'presupuesto inválido: {text} (KB no numérico)')
+
+
+def print_text(report, top):
+    startup = report['startup']
+    print(f'Arranque (index.html): {kb(startup["bytes"])} KB · {kb(startup["gzip"])} KB gzip · '
+          f'{len(startup["files"])} archivos')
+    if not report['sourcemaps']:
+        print('  (sin source maps: compile con `vite build --sourcemap` para atribuir por módulo y rol)')
+
+    print('\nRutas (carga en frío, gzip):')
+    for row in report['routes']:
+        lazy = 'lazy' if row['lazy'] else 'estática'
+        print(f'  {row["path"]:<34} {kb(row["gzip"]):>8} KB  {lazy:<8} {row["guard"]}')
+
+    if report['sourcemaps']:
+        print('\nRoles (arranque sin usar = módulos de páginas a las que el rol no accede):')
+        for role, row in sorted(report['roles'].items(), key=lambda item: -item[1]['unusedStartupBytes']):
+            print(f'  {role:<18} {len(row["routes"]):>2} rutas · sin usar {kb(row["unusedStartupBytes"]):>8} KB '
+                  f'({row["unusedStartupPct"]}%) · {kb(row["unusedStartupGzip"])} KB gzip')
+        print('\nCandidatas a React.lazy (bytes del arranque exclusivos de la página):')
+        for row in report['splitting'][:top]:
+            where = 'en el arranque' if row['inStartup'] else 'ya diferida'
+            packages = f' · paquetes: {", ".join(row["packages"])}' if row['packages'] else ''
+            print(f'  {row["page"]:<40} {kb(row["exclusiveBytes"]):>8} KB ({where}; '
+                  f'roles: {", ".join(row["roles"]) or "—"}){packages}')
+
+    print('\nArchivos más grandes:')
+    for chunk in report['chunks'][:top]:
+        print(f'  {chunk["file"]:<48} {kb(chunk["bytes"]):>8} KB · {kb(chunk["gzip"]):>7} KB gzip')
+
+    if report['budgets']:
+        print('\nPresupuestos (gzip):')
+        for row in report['budgets']:
+            actual = '—' if row['actualKb'] is None else f'{row["actualKb"]} KB'
+            print(f'  {"✓" if row["ok"] else "✗"} {row["budget"]:<34} {actual:>10} / {row["limitKb"]} KB')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dist', default=os.path.join(ROOT, 'dist'), help='build directory (default: dist)')
+    parser.add_argument('--budget', action='append', type=parse_budget, default=[],
+                        help='KEY=KB gzip limit; KEY is startup, a route path or role:<role> (repeatable)')
+    parser.add_argument('--top', type=int, default=10, help='rows in the ranked sections (default: 10)')
+    parser.add_argument('--json', action='store_true', help='print the full report as JSON')
+    parser.add_argument('-o', '--output', help='write the JSON report here')
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        with tracing(args, 'bundle-report'):
+            report = analyze(ROOT, args.dist, dict(args.budget), args.top)
+    except (ValueError, OSError) as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 2
+
+    data = json.dumps(report, ensure_ascii=False, indent=2) + '\n'
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+    if args.json:
+        sys.stdout.write(data)
+    else:
+        print_text(report, args.top)
+    return 1 if any(not row['ok'] for row in report['budgets']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Find duplicate respondents across zones with blocking indexes.
+
+Reads the respondents of the ``delta-export.py`` stores (every zone by
+default), groups them by normalized ID, phone and phonetic name keys within
+the neighborhood, scores only the pairs inside each block (in parallel) and
+writes one JSON line per duplicate cluster, most confident first.
+
+Usage:
+    python3 scripts/delta-export.py --zones                       # refresh the stores first
+    python3 scripts/dedup-respondents.py -o duplicados.jsonl
+    python3 scripts/dedup-respondents.py --zone zona1 --zone zona3 --min-score 0.8 -o alta.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from reportkit.dedup import MAX_BLOCK, MIN_SCORE, find_duplicates
+from reportkit.delta import DEFAULT_ROOT, DeltaStore
+from reportkit.trace import add_trace_arguments, tracing
+
+
+def load_docs(store_root, zones):
+    for zone in zones:
+        for doc in DeltaStore.open(zone, store_root).records().values():
+            yield zone, doc
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-o', '--output', help='JSON-lines file with the clusters (default: stdout)')
+    parser.add_argument('--store', default=DEFAULT_ROOT, help=f'delta-export.py store root (default: {DEFAULT_ROOT})')
+    parser.add_argument('--zone', action='append', help='only this zone (repeatable; default: every zone in the store)')
+    parser.add_argument('--min-score', dest='min_score', type=float, default=MIN_SCORE,
+                        help=f'lowest pair score linked into a cluster (default: {MIN_SCORE})')
+    parser.add_argument('--max-block', dest='max_block', type=int, default=MAX_BLOCK,
+                        help=f'skip blocks with more records than this (default: {MAX_BLOCK})')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='processes scoring blocks (default: CPU count)')
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+
+    zones = DeltaStore.zones(args.store)
+    if args.zone:
+        unknown = sorted(set(args.zone) - set(zones))
+        if unknown:
+            print(f'Error: zonas sin almacén en {args.store}: {", ".join(unknown)}', file=sys.stderr)
+            return 2
+        zones = [z for z in zones if z in args.zone]
+    if not zones:
+        print(f'Error: no hay almacenes en {args.store}; ejecute delta-export.py primero', file=sys.stderr)
+        return 2
+    if not 0 < args.min_score <= 1:
+        parser.error('--min-score debe estar entre 0 y 1')
+
+    with tracing(args, 'dedup-respondents'):
+        clusters, stats = find_duplicates(
+            load_docs(args.store, zones), min_score=args.min_score, max_block=args.max_block, jobs=args.jobs,
+        )
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for c in clusters:
+            out.write(json.dumps(c, ensure_ascii=False) + '\n')
+    finally:
+        if args.output:
+            out.close()
+    print(json.dumps({'zones': zones, **stats.as_dict()}, indent=2, ensure_ascii=False), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Export respondents changed since the last run, one watermark per zone.
+
+Each run appends a gzipped JSON-lines change file (upserts of new or
+modified records, deletions found by reconciling ID sets) to the zone's
+store instead of re-exporting the whole date range. The first run of a zone
+downloads everything from ``--startDate``; later runs only fetch records
+whose ``updatedAt`` is past the zone watermark.
+
+Usage:
+    python3 scripts/delta-export.py --startDate 2026-01-01          # first run, $API_BASE_URL
+    python3 scripts/delta-export.py                                 # nightly run
+    python3 scripts/delta-export.py --zones --startDate 2026-01-01  # every .env.production.* build
+    python3 scripts/delta-export.py --zones --zone zona1 --zone zona3 --no-deletions
+
+The API URL defaults to ``$API_BASE_URL`` and the token to ``$SOCI_TOKEN``;
+with ``--zones`` each zone uses ``$SOCI_TOKEN_<ZONE>`` (e.g.
+``SOCI_TOKEN_ZONA1``) when set.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from reportkit.client import ApiClient, ApiError
+from reportkit.codegen import ROOT_DIR
+from reportkit.delta import DEFAULT_ROOT, DeltaStore
+from reportkit.trace import add_trace_arguments, tracing
+
+DEFAULT_API = 'http://localhost:3000/api/v1'
+DEFAULT_ZONE = 'default'
+
+
+def zone_targets(args):
+    """``[(zone name, API URL, token)]`` to export."""
+    if not args.zones:
+        return [(args.zone[0] if args.zone else DEFAULT_ZONE, args.api, args.token)]
+    from reportkit.zones import load_zones
+
+    zones = load_zones(args.root)
+    if args.zone:
+        unknown = sorted(set(args.zone) - {z.name for z in zones})
+        if unknown:
+            raise ValueError(f'zonas desconocidas: {", ".join(unknown)}')
+        zones = [z for z in zones if z.name in args.zone]
+    return [
+        (z.name, z.api_base_url, os.environ.get(f'SOCI_TOKEN_{z.name.upper()}', args.token))
+        for z in zones
+    ]
+
+
+async def export_zone(args, zone, api_url, token):
+    store = DeltaStore.open(zone, args.store)
+    async with ApiClient(api_url, token, max_connections=args.concurrency) as api:
+        stats = await store.run(
+            api, zone, start_date=args.startDate, per_page=args.perPage,
+            concurrency=args.concurrency, deletions=not args.no_deletions,
+        )
+    print(f'{zone}: +{stats.upserts} -{stats.deletes} ({stats.elapsed:.1f}s)', file=sys.stderr)
+    return stats.as_dict()
+
+
+async def run(args, targets):
+    async def guarded(target):
+        try:
+            return await export_zone(args, *target)
+        except ApiError as err:
+            print(f'{target[0]}: error de API: {err.message}', file=sys.stderr)
+            return {'zone': target[0], 'error': err.message}
+
+    # Cada zona tiene su API: se exportan en paralelo
+    return await asyncio.gather(*(guarded(t) for t in targets))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--api', default=os.environ.get('API_BASE_URL', DEFAULT_API), help='API base URL')
+    parser.add_argument('--token', default=os.environ.get('SOCI_TOKEN'), help='x-access-token value')
+    parser.add_argument('--store', default=DEFAULT_ROOT, help=f'change store root (default: {DEFAULT_ROOT})')
+    parser.add_argument('--startDate', help='first day tracked; required on the first run of a zone')
+    parser.add_argument('--zones', action='store_true', help='export every .env.production.* zone with its API')
+    parser.add_argument('--zone', action='append',
+                        help='only this zone (repeatable); without --zones, the store name for --api')
+    parser.add_argument('--root', default=ROOT_DIR, help='project root with the .env.production.* files')
+    parser.add_argument('--perPage', type=int, default=1000, help='rows per request (default: 1000)')
+    parser.add_argument('--concurrency', type=int, default=4, help='requests in flight per zone (default: 4)')
+    parser.add_argument('--no-deletions', dest='no_deletions', action='store_true',
+                        help='skip the ID reconciliation that detects deleted records')
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        with tracing(args, 'delta-export'):
+            results = asyncio.run(run(args, zone_targets(args)))
+    except KeyboardInterrupt:
+        print('\nInterrumpido; la próxima corrida retoma desde la última marca de agua.', file=sys.stderr)
+        return 130
+    except ValueError as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 2
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 1 if any('error' in r for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Export a full dashboard002 report (every page) to CSV, XLSX or Parquet.
+
+Takes the same filters as ``ReportFilters``/``Dashboard002Params``, fetches
+pages concurrently and streams rows to disk in order. The format follows
+the extension of ``-o`` unless ``--format`` says otherwise. An interrupted
+CSV export resumes from its checkpoint when rerun with the same arguments.
+
+Usage:
+    python3 scripts/export-report.py --startDate 2026-01-01 --endDate 2026-01-31 \\
+        --surveyStatus successful -o reporte.csv
+    python3 scripts/export-report.py --startDate 2026-01-01 --endDate 2026-01-31 -o reporte.xlsx
+    python3 scripts/export-report.py --startDate 2026-01-01 --endDate 2026-01-31 -o reporte.parquet  # pyarrow
+
+The API URL defaults to ``$API_BASE_URL`` (as in ``.env.local``) and the
+token to ``$SOCI_TOKEN`` (the ``soci_token`` the web app stores).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from reportkit.client import ApiClient, ApiError
+from reportkit.export import export_report
+from reportkit.params import add_filter_arguments, filters_from_args
+from reportkit.trace import add_trace_arguments, tracing
+from reportkit.writers import FORMATS, format_for
+
+DEFAULT_API = 'http://localhost:3000/api/v1'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-o', '--output', required=True, help='file to write (.csv, .xlsx or .parquet)')
+    parser.add_argument('--format', choices=FORMATS, help='output format (default: from the extension of --output)')
+    parser.add_argument('--bom', action='store_true', help='start the CSV with a UTF-8 BOM, as the browser export (Excel)')
+    parser.add_argument('--api', default=os.environ.get('API_BASE_URL', DEFAULT_API), help='API base URL')
+    parser.add_argument('--token', default=os.environ.get('SOCI_TOKEN'), help='x-access-token value')
+    parser.add_argument('--perPage', type=int, default=1000, help='rows per request (default: 1000)')
+    parser.add_argument('--concurrency', type=int, default=4, help='requests in flight (default: 4)')
+    parser.add_argument('--restart', action='store_true', help='ignore an existing checkpoint')
+    add_filter_arguments(parser)
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        fmt = format_for(args.output, args.format)
+    except ValueError as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 2
+
+    query = filters_from_args(args)
+    # Orden estable: los registros nuevos quedan al final y no desplazan páginas ya exportadas
+    query.setdefault('sortBy', 'createdAt')
+    query.setdefault('sortOrder', 'asc')
+
+    def progress(page, stats):
+        print(f'\rpágina {page}/{stats.total_pages} · {stats.rows} filas', end='', file=sys.stderr, flush=True)
+
+    async def run():
+        async with ApiClient(args.api, args.token, max_connections=args.concurrency) as api:
+            return await export_report(
+                api, query, args.output, per_page=args.perPage, concurrency=args.concurrency,
+                resume=not args.restart, progress=progress, fmt=fmt, bom=args.bom,
+            )
+
+    try:
+        with tracing(args, 'export-report'):
+            stats = asyncio.run(run())
+    except KeyboardInterrupt:
+        print('\nInterrumpido; vuelva a ejecutar el mismo comando para continuar.', file=sys.stderr)
+        return 130
+    except ApiError as err:
+        print(f'\nError de API: {err.message}', file=sys.stderr)
+        return 1
+    except ValueError as err:
+        print(f'\nError: {err}', file=sys.stderr)
+        return 2
+    print(file=sys.stderr)
+    print(json.dumps(stats.as_dict(), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
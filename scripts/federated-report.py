@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Run one dashboard002 report query over every zone API and merge the results.
+
+Sends the same ``Dashboard002Params`` to each zone backend concurrently and
+merges the zone results in ``sortBy``/``sortOrder`` order, reading only the
+rows the requested global page needs. Prints that page as a
+``/dashboard002`` response (each row tagged with its ``zone``), or writes
+the whole merged report with ``-o``.
+
+Usage:
+    python3 scripts/federated-report.py --zones --startDate 2026-01-01 --sortBy city --page 3 --perPage 50
+    python3 scripts/federated-report.py --api zona1=http://localhost:3001/api/v1 \\
+        --api zona3=http://localhost:3003/api/v1 --surveyStatus successful
+    python3 scripts/federated-report.py --zones --startDate 2026-01-01 --endDate 2026-01-31 -o nacional.csv
+    python3 scripts/federated-report.py --local 3 --records 20000 --sortBy fullName --page 40 --verify  # numpy
+
+With ``--zones`` each zone of the ``.env.production.*`` files uses
+``$SOCI_TOKEN_<ZONE>`` (e.g. ``SOCI_TOKEN_ZONA1``) when set, else ``$SOCI_TOKEN``.
+``--local N`` starts N stand-in zone servers (``mock-backend.py`` datasets
+with seeds ``--seed``, ``--seed``+1...) on free ports.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import AsyncExitStack
+
+from reportkit.client import ApiClient, ApiError
+from reportkit.codegen import ROOT_DIR
+from reportkit.columns import export_columns
+from reportkit.federated import DEFAULT_PER_PAGE, MAX_BATCH, FederatedQuery, FederatedStats
+from reportkit.params import add_filter_arguments, filters_from_args
+from reportkit.trace import add_trace_arguments, tracing
+from reportkit.writers import CHUNK, open_writer
+
+
+def zone_targets(args):
+    """``[(zone name, API URL, token)]`` to query."""
+    targets = []
+    for value in args.api or ():
+        name, sep, url = value.partition('=')
+        if not sep or not name or not url:
+            raise ValueError(f'--api espera ZONA=URL: {value}')
+        targets.append((name, url, args.token))
+    if args.zones:
+        from reportkit.zones import load_zones
+
+        zones = load_zones(args.root)
+        if args.zone:
+            unknown = sorted(set(args.zone) - {z.name for z in zones})
+            if unknown:
+                raise ValueError(f'zonas desconocidas: {", ".join(unknown)}')
+            zones = [z for z in zones if z.name in args.zone]
+        targets.extend(
+            (z.name, z.api_base_url, os.environ.get(f'SOCI_TOKEN_{z.name.upper()}', args.token))
+            for z in zones
+        )
+    if args.local:
+        targets.extend(local_zones(args))
+    names = [name for name, _, _ in targets]
+    if len(set(names)) != len(names):
+        raise ValueError(f'zonas repetidas: {", ".join(sorted({n for n in names if names.count(n) > 1}))}')
+    if not targets:
+        raise ValueError('indique las zonas: --zones, --api ZONA=URL o --local N')
+    return targets
+
+
+def local_zones(args):
+    """Stand-in zone servers in background threads, one synthetic dataset each."""
+    try:
+        from reportkit.mock_backend import ReportStore, serve
+        from reportkit.synthetic import generate
+    except ImportError:
+        raise ValueError('--local requiere numpy: pip install numpy') from None
+
+    targets = []
+    for n in range(args.local):
+        started = time.perf_counter()
+        store = ReportStore(generate(args.records, seed=args.seed + n))
+        server = serve(store, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_address[1]}/api/v1'
+        print(f'zona local {n + 1}: {args.records:,} registros en {url} '
+              f'({time.perf_counter() - started:.1f}s)', file=sys.stderr)
+        targets.append((f'local{n + 1}', url, None))
+    return targets
+
+
+async def run(args, targets, query):
+    async with AsyncExitStack() as stack:
+        # Un pool de conexiones por zona
+        zones = [
+            (name, await stack.enter_async_context(ApiClient(url, token, max_connections=args.concurrency)))
+            for name, url, token in targets
+        ]
+        federated = FederatedQuery(zones, query, batch=args.batch)
+        if args.output:
+            stats = FederatedStats()
+            with open_writer(args.output) as writer:
+                chunk = []
+                async for _, item in federated.rows(stats=stats):
+                    chunk.append(item)
+                    if len(chunk) == CHUNK:
+                        writer.write(export_columns(chunk, stats.rows - len(chunk)))
+                        chunk = []
+                if chunk:
+                    writer.write(export_columns(chunk, stats.rows - len(chunk)))
+            return None, stats
+        data, stats = await federated.page(args.page, args.perPage)
+        if args.verify:
+            expected = await federated.reference_page(args.page, args.perPage)
+            if data['surveys'] != expected:
+                raise ValueError(f'la página {args.page} no coincide con la mezcla completa de las zonas')
+            print(f'página {args.page} verificada contra la mezcla completa', file=sys.stderr)
+        return {'message': 'Reporte generado correctamente', 'data': data}, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    zones = parser.add_argument_group('zones')
+    zones.add_argument('--zones', action='store_true', help='query every .env.production.* zone with its API')
+    zones.add_argument('--zone', action='append', help='with --zones, only this zone (repeatable)')
+    zones.add_argument('--api', action='append', metavar='ZONE=URL', help='a zone API (repeatable)')
+    zones.add_argument('--local', type=int, default=0, metavar='N', help='start N local stand-in zones (numpy)')
+    zones.add_argument('--records', type=int, default=20000, help='records per local zone (default: 20000)')
+    zones.add_argument('--seed', type=int, default=1, help='seed of the first local zone (default: 1)')
+    zones.add_argument('--root', default=ROOT_DIR, help='project root with the .env.production.* files')
+    parser.add_argument('--token', default=os.environ.get('SOCI_TOKEN'), help='x-access-token value')
+    parser.add_argument('--page', type=int, default=1, help='global page (default: 1)')
+    parser.add_argument('--perPage', type=int, default=DEFAULT_PER_PAGE,
+                        help=f'rows per global page (default: {DEFAULT_PER_PAGE})')
+    parser.add_argument('--batch', type=int, default=MAX_BATCH,
+                        help=f'most rows per zone request (default: {MAX_BATCH})')
+    parser.add_argument('--concurrency', type=int, default=4, help='connections per zone (default: 4)')
+    parser.add_argument('-o', '--output', help='write the whole merged report (.csv, .xlsx or .parquet)')
+    parser.add_argument('--verify', action='store_true',
+                        help='check the page against every zone result sorted in memory (small data only)')
+    add_filter_arguments(parser)
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        with tracing(args, 'federated-report'):
+            response, stats = asyncio.run(run(args, zone_targets(args), filters_from_args(args)))
+    except KeyboardInterrupt:
+        return 130
+    except ApiError as err:
+        print(f'Error de API: {err.message}', file=sys.stderr)
+        return 1
+    except (ValueError, OSError) as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 2
+    if response is not None:
+        print(json.dumps(response, indent=2, ensure_ascii=False))
+    print(json.dumps(stats.as_dict(), ensure_ascii=False), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
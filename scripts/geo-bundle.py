@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Compile departments, municipalities and zones into the app's offline geography bundle.
+
+``fetch`` downloads ``/departments`` and the municipalities of each one into a
+snapshot; ``build`` turns the snapshot plus the zones of BUILD_ZONES.md into
+``src/constants/colombiaGeo.ts`` (records, zone lists and an accent- and
+case-insensitive prefix index); ``search`` runs the app's lookup on the
+snapshot to check it.
+
+Usage:
+    python3 scripts/geo-bundle.py fetch --api https://zona3-api.contactodirectocol.com/api/v1
+    python3 scripts/geo-bundle.py build
+    python3 scripts/geo-bundle.py build --check                # exit 1 if colombiaGeo.ts is stale
+    python3 scripts/geo-bundle.py search "bogo" --zone 1
+    python3 scripts/geo-bundle.py build --empty                # back to the API-only module
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+
+from reportkit.cache import DEFAULT_ROOT
+from reportkit.client import ApiClient, ApiError
+from reportkit.codegen import ROOT_DIR, write_if_changed
+from reportkit.geo import TARGET, compile_bundle, fetch_geography, render_module, search
+from reportkit.trace import add_trace_arguments, span, tracing
+
+DEFAULT_API = 'http://localhost:3000/api/v1'
+DEFAULT_SNAPSHOT = os.path.join(DEFAULT_ROOT, 'geography.json')
+
+
+def load_snapshot(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f'no hay snapshot en {path}: ejecute primero geo-bundle.py fetch') from None
+
+
+def cmd_fetch(args):
+    async def run():
+        async with ApiClient(args.api, args.token, max_connections=args.concurrency) as api:
+            return await fetch_geography(api, args.concurrency)
+
+    with span('fetch'):
+        departments = asyncio.run(run())
+    if not departments:
+        raise ValueError(f'{args.api}/departments no devolvió departamentos')
+    snapshot = {'source': args.api.rstrip('/'), 'departments': departments}
+    write_if_changed(args.snapshot, (json.dumps(snapshot, indent=1, ensure_ascii=False) + '\n').encode('utf-8'))
+    municipalities = sum(len(d['municipalities']) for d in departments)
+    print(f'{len(departments)} departamentos, {municipalities} municipios -> {args.snapshot}', file=sys.stderr)
+    return 0
+
+
+def cmd_build(args):
+    with span('compile', empty=args.empty):
+        bundle = None if args.empty else compile_bundle(load_snapshot(args.snapshot))
+    with span('render'):
+        data = render_module(bundle).encode('utf-8')
+    target = os.path.join(args.root, TARGET)
+    if args.check:
+        try:
+            with open(target, 'rb') as f:
+                stale = f.read() != data
+        except FileNotFoundError:
+            stale = True
+        print(f'{"stale" if stale else "unchanged"} {TARGET}', file=sys.stderr)
+        return 1 if stale else 0
+    changed = write_if_changed(target, data)
+    info = {'target': TARGET, 'written': changed, 'bytes': len(data), 'gzipBytes': len(gzip.compress(data, 9))}
+    if bundle:
+        info.update({
+            'version': bundle['version'],
+            'source': bundle['source'],
+            'departments': len(bundle['departments']['_id']),
+            'municipalities': len(bundle['municipalities']['_id']),
+            'zones': {zone: len(positions) for zone, positions in bundle['zones'].items()},
+            'indexKeys': len(bundle['index']['names']['keys']) + len(bundle['index']['words']['keys']),
+        })
+    print(json.dumps(info, indent=2, ensure_ascii=False))
+    return 0
+
+
+def cmd_search(args):
+    with span('compile'):
+        bundle = compile_bundle(load_snapshot(args.snapshot))
+    with span('search', query=args.query):
+        result = search(bundle, args.query, zone=args.zone, limit=args.limit)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--snapshot', default=DEFAULT_SNAPSHOT, help=f'snapshot file (default: {DEFAULT_SNAPSHOT})')
+    add_trace_arguments(common)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    f = sub.add_parser('fetch', parents=[common], help='download departments and municipalities from the API')
+    f.add_argument('--api', default=os.environ.get('API_BASE_URL', DEFAULT_API), help='API base URL (the zone the build is for)')
+    f.add_argument('--token', default=os.environ.get('SOCI_TOKEN'), help='x-access-token value')
+    f.add_argument('--concurrency', type=int, default=4, help='requests in flight (default: 4)')
+    f.set_defaults(func=cmd_fetch)
+
+    b = sub.add_parser('build', parents=[common], help=f'write {TARGET} from the snapshot')
+    b.add_argument('--root', default=ROOT_DIR, help='repository root (default: this checkout)')
+    b.add_argument('--check', action='store_true', help='do not write; exit 1 if the target is stale')
+    b.add_argument('--empty', action='store_true', help='write the module without data (the app uses the API)')
+    b.set_defaults(func=cmd_build)
+
+    s = sub.add_parser('search', parents=[common], help='prefix search over the snapshot, as the app does')
+    s.add_argument('query')
+    s.add_argument('--zone', type=int, help='only places of this zone number')
+    s.add_argument('--limit', type=int, default=20, help='results (default: 20)')
+    s.set_defaults(func=cmd_search)
+
+    args = parser.parse_args(argv)
+    try:
+        with tracing(args, f'geo-bundle {args.command}'):
+            return args.func(args)
+    except ApiError as err:
+        print(f'Error de API: {err.message}', file=sys.stderr)
+        return 1
+    except (ValueError, OSError) as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
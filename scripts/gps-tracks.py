@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Keep full socializer GPS tracks and compute their routes per day (requires numpy).
+
+``collect`` polls ``/socializers/with-locations`` (the same feed as
+``ReportsRealtime``) and appends every new fix to a compact, delta-encoded
+store; ``import`` loads a dump of the backend ``locations`` collection.
+``stats`` filters inaccurate fixes and GPS spikes, simplifies the routes
+with Douglas-Peucker and reports distance travelled and time on the ground
+per socializer and day; ``export`` writes the simplified routes as GeoJSON.
+
+Usage:
+    python3 scripts/gps-tracks.py collect --interval 30                 # $API_BASE_URL, $SOCI_TOKEN
+    python3 scripts/gps-tracks.py import locations.jsonl               # mongoexport --collection locations
+    python3 scripts/gps-tracks.py compact
+    python3 scripts/gps-tracks.py stats --startDate 2026-03-01 --endDate 2026-03-07 -o recorridos.json
+    python3 scripts/gps-tracks.py export --day 2026-03-05 --socializer 65f0c2... -o ruta.geojson
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    sys.exit('gps-tracks.py requiere numpy: pip install numpy')
+
+from reportkit.client import ApiClient, ApiError
+from reportkit.tracks import (
+    DEFAULT_ROOT, GAP, MAX_ACCURACY, MAX_SPEED, TOLERANCE, Fixes, TrackStore, fixes_from_items, geojson, poll, routes,
+)
+from reportkit.trace import add_trace_arguments, count, span, tracing
+
+DEFAULT_API = 'http://localhost:3000/api/v1'
+
+
+def write_output(payload, output):
+    text = json.dumps(payload, indent=2, ensure_ascii=False)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+async def collect(args, store):
+    pending, last_seen = [], {}
+    flushed = time.monotonic()
+    deadline = time.monotonic() + args.duration if args.duration else None
+
+    def flush():
+        fixes = Fixes.concat(pending)
+        pending.clear()
+        if len(fixes):
+            with span('append', fixes=len(fixes)):
+                days = store.append(fixes)
+            print(f'{len(fixes)} posiciones -> {", ".join(days)}', file=sys.stderr)
+
+    async with ApiClient(args.api, args.token, max_connections=1) as api:
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                try:
+                    with span('poll'):
+                        fixes, names = await poll(api)
+                except ApiError as err:
+                    print(f'Error de API: {err.message}', file=sys.stderr)
+                else:
+                    store.save_names(names)
+                    # Solo las posiciones que no se habían visto en la consulta anterior
+                    ids = fixes.users[fixes.user]
+                    new = [i for i, (user, t) in enumerate(zip(ids, fixes.t)) if last_seen.get(user) != t]
+                    last_seen.update(zip(ids, fixes.t))
+                    count('fixes', len(new))
+                    if new:
+                        pending.append(fixes.take(new))
+                if time.monotonic() - flushed >= args.flush:
+                    flush()
+                    flushed = time.monotonic()
+                await asyncio.sleep(args.interval)
+        finally:
+            flush()
+
+
+def cmd_collect(args, store):
+    try:
+        asyncio.run(collect(args, store))
+    except KeyboardInterrupt:
+        print('\nInterrumpido; las posiciones pendientes se guardaron.', file=sys.stderr)
+
+
+def cmd_import(args, store):
+    with span('parse', file=args.file):
+        with open(args.file, encoding='utf-8') as f:
+            text = f.read()
+        stripped = text.lstrip()
+        if stripped.startswith('['):
+            items = json.loads(text)
+        else:
+            items = [json.loads(line) for line in text.splitlines() if line.strip()]
+        fixes = fixes_from_items(items)
+    with span('append', fixes=len(fixes)):
+        days = store.append(fixes)
+    print(f'{len(fixes)} posiciones de {len(items)} documentos en {len(days)} día(s)', file=sys.stderr)
+
+
+def cmd_compact(args, store):
+    for day in args.day or store.days():
+        with span('compact', day=day):
+            merged, fixes = store.compact(day)
+        if merged:
+            print(f'{day}: {merged} archivo(s) -> track.npz ({fixes} posiciones)', file=sys.stderr)
+
+
+def day_routes(args, store, day):
+    with span('load', day=day):
+        fixes = store.load(day)
+        if args.socializer:
+            fixes = fixes.select(args.socializer)
+    with span('routes', day=day, fixes=len(fixes)):
+        return routes(fixes, max_accuracy=args.max_accuracy, max_speed=args.max_speed,
+                      tolerance=args.tolerance, gap=args.gap)
+
+
+def cmd_stats(args, store):
+    names, rows = store.names(), []
+    started = time.perf_counter()
+    for day in store.day_range(args.startDate, args.endDate):
+        stats, _, _ = day_routes(args, store, day)
+        rows.extend({'socializer': user, 'name': names.get(user, ''), 'day': day, **values}
+                    for user, values in stats.items())
+    write_output(rows, args.output)
+    print(f'{len(rows)} recorridos ({(time.perf_counter() - started) * 1000:.0f} ms)', file=sys.stderr)
+
+
+def cmd_export(args, store):
+    if args.day not in store.days():
+        raise ValueError(f'no hay posiciones del {args.day}')
+    names = store.names()
+    stats, route, route_segment = day_routes(args, store, args.day)
+    properties = {user: {'name': names.get(user, ''), 'day': args.day, **values} for user, values in stats.items()}
+    write_output(geojson(route, route_segment, properties), args.output)
+
+
+def cmd_info(args, store):
+    info = []
+    for day in store.days():
+        files = store.files(day)
+        fixes = store.load(day)
+        size = sum(os.path.getsize(path) for path in files)
+        info.append({
+            'day': day,
+            'files': len(files),
+            'socializers': len(set(fixes.user.tolist())),
+            'fixes': len(fixes),
+            'bytes': size,
+            'bytesPerFix': round(size / len(fixes), 2) if len(fixes) else None,
+        })
+    write_output(info, None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--store', default=DEFAULT_ROOT, help=f'track store root (default: {DEFAULT_ROOT})')
+    add_trace_arguments(common)
+    analysis = argparse.ArgumentParser(add_help=False)
+    analysis.add_argument('--socializer', action='append', help='only this user id (repeatable)')
+    analysis.add_argument('--max-accuracy', dest='max_accuracy', type=float, default=MAX_ACCURACY,
+                          help=f'drop fixes less accurate than this, in metres (default: {MAX_ACCURACY:g})')
+    analysis.add_argument('--max-speed', dest='max_speed', type=float, default=MAX_SPEED,
+                          help=f'fixes reached and left faster than this (m/s) are GPS spikes (default: {MAX_SPEED:g})')
+    analysis.add_argument('--tolerance', type=float, default=TOLERANCE,
+                          help=f'Douglas-Peucker tolerance in metres (default: {TOLERANCE:g})')
+    analysis.add_argument('--gap', type=int, default=GAP,
+                          help=f'seconds without fixes that split a route (default: {GAP})')
+    analysis.add_argument('-o', '--output', help='write to this file instead of stdout')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    c = sub.add_parser('collect', parents=[common], help='poll the latest fixes into the store')
+    c.add_argument('--api', default=os.environ.get('API_BASE_URL', DEFAULT_API), help='API base URL')
+    c.add_argument('--token', default=os.environ.get('SOCI_TOKEN'), help='x-access-token value')
+    c.add_argument('--interval', type=float, default=30, help='seconds between polls (default: 30, as the app posts)')
+    c.add_argument('--flush', type=float, default=300, help='seconds between writes to the store (default: 300)')
+    c.add_argument('--duration', type=float, help='stop after this many seconds (default: run until interrupted)')
+    c.set_defaults(func=cmd_collect)
+
+    i = sub.add_parser('import', parents=[common], help='load a JSON or JSON-lines dump of location documents')
+    i.add_argument('file')
+    i.set_defaults(func=cmd_import)
+
+    k = sub.add_parser('compact', parents=[common], help='merge the chunks of each day into one file')
+    k.add_argument('--day', action='append', help='only this day (repeatable)')
+    k.set_defaults(func=cmd_compact)
+
+    s = sub.add_parser('stats', parents=[common, analysis], help='distance and time on the ground per socializer and day')
+    s.add_argument('--startDate', required=True)
+    s.add_argument('--endDate', required=True)
+    s.set_defaults(func=cmd_stats)
+
+    e = sub.add_parser('export', parents=[common, analysis], help='simplified routes of a day as GeoJSON')
+    e.add_argument('--day', required=True, help='YYYY-MM-DD')
+    e.set_defaults(func=cmd_export)
+
+    n = sub.add_parser('info', parents=[common], help='fixes and bytes per stored day')
+    n.set_defaults(func=cmd_info)
+
+    args = parser.parse_args(argv)
+    try:
+        with tracing(args, f'gps-tracks {args.command}'):
+            args.func(args, TrackStore(args.store))
+    except (ValueError, OSError) as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Build and query the hierarchy index (requires numpy).
+
+``build`` reads the whole hierarchy once (``/users/hierarchy``, a
+``hierarchy-dry-run.json`` spec or a synthetic dataset) and saves the index;
+``query`` answers "who is under / above this person" from it in constant
+time, instead of one ``/users/hierarchy/:id?role=`` request per level.
+
+Usage:
+    python3 scripts/hierarchy-index.py build --api http://localhost:3000/api/v1
+    python3 scripts/hierarchy-index.py build --spec hierarchy-dry-run.json -o /tmp/hierarchy
+    python3 scripts/hierarchy-index.py query zone-coord-1 --role socializer -i /tmp/hierarchy
+    python3 scripts/hierarchy-index.py query 6955b900040000000000002a --ancestors
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    sys.exit('hierarchy-index.py requiere numpy: pip install numpy')
+
+from reportkit.cache import DEFAULT_ROOT
+from reportkit.client import ApiClient, ApiError
+from reportkit.hierarchy import LEVELS, HierarchyIndex, fetch_users
+from reportkit.trace import add_trace_arguments, span, tracing
+
+DEFAULT_API = 'http://localhost:3000/api/v1'
+DEFAULT_INDEX = os.path.join(DEFAULT_ROOT, 'hierarchy')
+
+
+def cmd_build(args):
+    started = time.perf_counter()
+    if args.spec:
+        with span('build', source='spec'):
+            index = HierarchyIndex.from_spec(args.spec)
+    elif args.data:
+        from reportkit.synthetic import Dataset
+
+        with span('build', source='dataset'):
+            index = HierarchyIndex.from_dataset(Dataset.load(args.data))
+    else:
+        async def run():
+            async with ApiClient(args.api, args.token, max_connections=args.concurrency) as api:
+                return await fetch_users(api, args.fetch_per_page, args.concurrency)
+
+        with span('fetch'):
+            items = asyncio.run(run())
+        with span('build', source='api', users=len(items)):
+            index = HierarchyIndex.from_users(items, {'api': args.api})
+    with span('save', nodes=len(index)):
+        index.save(args.index)
+    roots = int((index.parent == -1).sum())
+    print(json.dumps({
+        'index': args.index,
+        'nodes': len(index),
+        'roots': roots,
+        'byRole': {role: int((index.level == level).sum()) for level, role in enumerate(LEVELS)},
+        'elapsedSeconds': round(time.perf_counter() - started, 3),
+    }, indent=2))
+    if roots > 1 and not args.spec:
+        print(f'Aviso: {roots} personas sin superior en el índice', file=sys.stderr)
+
+
+def cmd_query(args):
+    with span('load'):
+        index = HierarchyIndex.load(args.index)
+    try:
+        node = index.node(args.id)
+    except KeyError:
+        raise ValueError(f'{args.id} no está en el índice {args.index}') from None
+    result = index.describe(node)
+    if args.ancestors:
+        result['ancestors'] = [index.describe(a) for a in index.path(node)[:-1]]
+    else:
+        with span('descendants', role=args.role or ''):
+            nodes = index.descendants(node, args.role)
+        result['matches'] = len(nodes)
+        result['ids'] = [str(i) for i in index.ids[nodes]]
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('-i', '-o', '--index', default=DEFAULT_INDEX, help=f'index directory (default: {DEFAULT_INDEX})')
+    add_trace_arguments(common)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', parents=[common], help='build the index and save it')
+    build.add_argument('--api', default=os.environ.get('API_BASE_URL', DEFAULT_API), help='API base URL')
+    build.add_argument('--token', default=os.environ.get('SOCI_TOKEN'), help='x-access-token value')
+    build.add_argument('--concurrency', type=int, default=4, help='requests in flight (default: 4)')
+    build.add_argument('--fetch-perPage', dest='fetch_per_page', type=int, default=1000,
+                       help='people per /users/hierarchy request (default: 1000)')
+    source = build.add_mutually_exclusive_group()
+    source.add_argument('--spec', help='hierarchy-dry-run.json instead of the API')
+    source.add_argument('--data', help='synthetic dataset directory instead of the API')
+    build.set_defaults(func=cmd_build)
+
+    query = sub.add_parser('query', parents=[common], help='people under or above someone')
+    query.add_argument('id', help='profile _id (or spec id) of the person')
+    query.add_argument('--role', choices=LEVELS, help='only descendants with this role')
+    query.add_argument('--ancestors', action='store_true', help='list the people above instead')
+    query.set_defaults(func=cmd_query)
+
+    args = parser.parse_args(argv)
+    try:
+        with tracing(args, f'hierarchy-index {args.command}'):
+            args.func(args)
+    except ApiError as err:
+        print(f'Error de API: {err.message}', file=sys.stderr)
+        return 1
+    except (OSError, ValueError) as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Build pre-clustered map tiles for ReportsMap (requires numpy).
+
+Clusters respondent locations per zoom level and writes them as static
+``<z>/<x>/<y>.json`` tiles plus ``index.json``. Points come from the local
+report cache (``report-cache.py``) or from a synthetic dataset.
+
+Usage:
+    python3 scripts/map-tiles.py --cache --startDate 2026-02-01 --endDate 2026-02-28 \\
+        --city Cali -o public/map-tiles/cali
+    python3 scripts/map-tiles.py --records 1000000 --max-zoom 15 --jobs 4 -o /tmp/tiles
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    sys.exit('map-tiles.py requiere numpy: pip install numpy')
+
+from reportkit.cache import DEFAULT_ROOT, ReportCache
+from reportkit.params import add_filter_arguments, filters_from_args
+from reportkit.tiles import build_tiles, points_from_dataset, points_from_items
+from reportkit.trace import add_trace_arguments, span, tracing
+
+DEFAULT_API = 'http://localhost:3000/api/v1'
+DEFAULT_OUTPUT = 'public/map-tiles'
+
+
+def cache_points(args, filters):
+    if not (args.startDate and args.endDate):
+        raise ValueError('--cache requiere --startDate y --endDate (la clave de la caché)')
+    cache = ReportCache.open(args.api, {'startDate': args.startDate, 'endDate': args.endDate}, args.cache_dir)
+    if cache.watermark is None:
+        raise ValueError('la caché está vacía: ejecute primero report-cache.py sync')
+    seg_ids, rows = cache.query(filters)
+    items = (doc for start in range(0, len(rows), 10000)
+             for doc in cache.docs(seg_ids[start:start + 10000], rows[start:start + 10000]))
+    return points_from_items(items)
+
+
+def synthetic_points(args, filters):
+    from reportkit.mock_backend import ReportStore
+    from reportkit.synthetic import Dataset, generate
+
+    if args.data and os.path.exists(os.path.join(args.data, 'meta.json')):
+        dataset = Dataset.load(args.data)
+    else:
+        dataset = generate(args.records, seed=args.seed)
+        if args.data:
+            dataset.save(args.data)
+    return points_from_dataset(dataset, ReportStore(dataset).rows(filters))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT, help=f'tile directory (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--min-zoom', dest='min_zoom', type=int, default=4, help='lowest zoom (default: 4)')
+    parser.add_argument('--max-zoom', dest='max_zoom', type=int, default=16,
+                        help='zoom at which every point is shown individually (default: 16)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='processes writing levels')
+    source = parser.add_argument_group('source')
+    source.add_argument('--cache', action='store_true', help='read points from the report-cache.py cache')
+    source.add_argument('--api', default=os.environ.get('API_BASE_URL', DEFAULT_API), help='API base URL of the cache')
+    source.add_argument('--cache-dir', default=DEFAULT_ROOT, help=f'cache root (default: {DEFAULT_ROOT})')
+    source.add_argument('--records', type=int, default=1_000_000, help='synthetic records (default: 1000000)')
+    source.add_argument('--seed', type=int, default=1, help='synthetic dataset seed (default: 1)')
+    source.add_argument('--data', help='synthetic dataset directory: loaded if present, else generated and saved')
+    add_filter_arguments(parser)
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+
+    filters = filters_from_args(args)
+    started = time.perf_counter()
+    try:
+        with tracing(args, 'map-tiles'):
+            with span('points', source='cache' if args.cache else 'synthetic'):
+                points = cache_points(args, filters) if args.cache else synthetic_points(args, filters)
+            print(f'{len(points):,} puntos en {time.perf_counter() - started:.1f}s', file=sys.stderr)
+            started = time.perf_counter()
+            meta = {'source': 'cache' if args.cache else 'synthetic', 'filters': filters}
+            with span('tiles', points=len(points), levels=args.max_zoom - args.min_zoom + 1):
+                index = build_tiles(points, args.output, args.min_zoom, args.max_zoom, meta, args.jobs)
+    except ValueError as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 2
+    print(json.dumps({
+        'output': args.output,
+        'points': index['total'],
+        'tiles': index['tiles'],
+        'changed': index['changed'],
+        'removed': index['removed'],
+        'elapsedSeconds': round(time.perf_counter() - started, 3),
+    }, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Serve the report endpoints locally from a seeded synthetic dataset.
+
+Implements ``/dashboard002``, ``/dashboard003``, ``/respondents/reports/complete``
+and ``/respondents/reports/by-socializer-date`` under ``/api/v1``, so the web
+app (``VITE_API_BASE_URL=http://localhost:3000/api/v1``) and the Python
+tooling can run against it offline. Requires numpy.
+
+Usage:
+    python3 scripts/mock-backend.py --records 1000000
+    python3 scripts/mock-backend.py --records 50000000 --data /tmp/soci-50m   # generate once, then reuse
+    python3 scripts/mock-backend.py --records 1000000 --trace mock.json   # spans per request, saved on Ctrl+C
+"""
+
+import argparse
+import os
+import sys
+import time
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    sys.exit('mock-backend.py requiere numpy: pip install numpy')
+
+from reportkit.mock_backend import ReportStore, serve
+from reportkit.synthetic import Dataset, generate
+from reportkit.trace import add_trace_arguments, span, tracing
+
+
+def load_dataset(args):
+    if args.data and os.path.exists(os.path.join(args.data, 'meta.json')):
+        with span('load', path=args.data):
+            dataset = Dataset.load(args.data)
+        print(f'Dataset cargado de {args.data}: {len(dataset):,} registros', file=sys.stderr)
+        return dataset
+    started = time.perf_counter()
+    with span('generate', records=args.records):
+        dataset = generate(args.records, seed=args.seed, start=args.start, days=args.days, socializers=args.socializers)
+    print(f'Generados {len(dataset):,} registros en {time.perf_counter() - started:.1f}s', file=sys.stderr)
+    if args.data:
+        with span('save', path=args.data):
+            dataset.save(args.data)
+        print(f'Dataset guardado en {args.data}', file=sys.stderr)
+    return dataset
+
+
+def run(args):
+    dataset = load_dataset(args)
+    with span('store'):
+        store = ReportStore(dataset)
+    server = serve(store, args.host, args.port, args.prefix, args.token, args.verbose)
+    meta = dataset.meta
+    print(
+        f'Escuchando en http://{args.host}:{server.server_address[1]}{args.prefix} '
+        f'(datos del {meta["start"]} al {meta["end"]})',
+        file=sys.stderr,
+    )
+    try:
+        with span('serve'):
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=1_000_000, help='records to generate (default: 1000000)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    parser.add_argument('--start', default='2026-01-01', help='first day of data, YYYY-MM-DD')
+    parser.add_argument('--days', type=int, default=90, help='days of data (default: 90)')
+    parser.add_argument('--socializers', type=int, help='number of socializers (default: records / 2000)')
+    parser.add_argument('--data', help='dataset directory: loaded if present, else generated and saved there')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--prefix', default='/api/v1', help='API path prefix (default: /api/v1)')
+    parser.add_argument('--token', help='require this x-access-token')
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with tracing(args, 'mock-backend'):
+        run(args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Shrink uploaded survey recordings in batches (requires numpy).
+
+Downmixes to mono, resamples to a speech rate and trims silence, streaming
+each file in chunks across a process pool. Prints the size reduction and
+throughput of every batch. Files whose output is already newer are skipped,
+so re-running over the same directory only processes new recordings.
+
+Usage:
+    python3 scripts/process-audio.py grabaciones/ -o grabaciones-16k/
+    python3 scripts/process-audio.py grabaciones/ -o comprimidas/ --format opus --bitrate 24k --jobs 8
+    python3 scripts/process-audio.py a.wav b.wav -o /tmp/out --rate 8000 --silence-db -40
+"""
+
+import argparse
+import json
+import os
+import sys
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    sys.exit('process-audio.py requiere numpy: pip install numpy')
+
+from reportkit.audio import FORMATS, Settings, find_recordings, has_ffmpeg, process_batches
+from reportkit.trace import add_trace_arguments, span, tracing
+
+
+def run(args):
+    with span('find', inputs=len(args.inputs)):
+        files = find_recordings(args.inputs)
+    if not files:
+        print('Error: no se encontraron grabaciones', file=sys.stderr)
+        return 2
+    settings = Settings(args.rate, args.silence_db, args.pad, args.max_pause, args.format, args.bitrate)
+    print(f'{len(files)} grabaciones → {args.output} ({args.format}, {args.rate} Hz)', file=sys.stderr)
+
+    def report(number, stats):
+        print(json.dumps({'batch': number, **stats.as_dict()}), file=sys.stderr)
+
+    try:
+        total = process_batches(files, args.output, settings, args.batch_size, args.jobs, args.force, report)
+    except KeyboardInterrupt:
+        print('\nInterrumpido; vuelva a ejecutar para continuar.', file=sys.stderr)
+        return 130
+    for source, message in total.failed[:20]:
+        print(f'  ✗ {source}: {message}', file=sys.stderr)
+    print(json.dumps(total.as_dict(), indent=2))
+    return 1 if total.failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='+', help='recordings or directories with recordings')
+    parser.add_argument('-o', '--output', required=True, help='output directory (mirrors the input tree)')
+    parser.add_argument('--rate', type=int, default=16000, help='output sample rate, Hz (default: 16000)')
+    parser.add_argument('--silence-db', dest='silence_db', type=float, default=-45.0,
+                        help='frames quieter than this (dBFS) are silence (default: -45)')
+    parser.add_argument('--pad', type=float, default=0.25, help='silence kept before/after speech, s (default: 0.25)')
+    parser.add_argument('--max-pause', dest='max_pause', type=float, default=0.8,
+                        help='longer pauses are shortened to this, s (default: 0.8)')
+    parser.add_argument('--format', choices=FORMATS, default='mp3' if has_ffmpeg() else 'wav',
+                        help='output format; mp3 and opus need ffmpeg (default: mp3 if ffmpeg is installed, else wav)')
+    parser.add_argument('--bitrate', default='32k', help='mp3/opus bitrate (default: 32k)')
+    parser.add_argument('--batch-size', dest='batch_size', type=int, default=200, help='files per batch (default: 200)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='worker processes')
+    parser.add_argument('--force', action='store_true', help='reprocess files whose output is up to date')
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+    with tracing(args, 'process-audio'):
+        return run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Local columnar cache for report queries (requires numpy).
+
+``sync`` downloads the records of a date range once and then only what
+changed (``updatedAt`` newer than the stored watermark). ``query`` answers
+any other ``Dashboard002Params`` filter from the cache, without calling the
+API; the ``q`` search goes through each segment's inverted index.
+
+Usage:
+    python3 scripts/report-cache.py sync --startDate 2026-02-01 --endDate 2026-02-28
+    python3 scripts/report-cache.py query --startDate 2026-02-01 --endDate 2026-02-28 \\
+        --surveyStatus successful --city Cali --page 1 --perPage 50
+    python3 scripts/report-cache.py query --startDate 2026-02-01 --endDate 2026-02-28 \\
+        --isPatriaDefender true --sync -o defensores.csv     # o .xlsx / .parquet
+    python3 scripts/report-cache.py query --startDate 2026-02-01 --endDate 2026-02-28 --q "maria gom 3104"
+    python3 scripts/report-cache.py query --startDate 2026-02-01 --endDate 2026-02-28 --q "ndez 4567" --q-rules server
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    sys.exit('report-cache.py requiere numpy: pip install numpy')
+
+from reportkit.cache import DEFAULT_ROOT, ReportCache
+from reportkit.client import ApiClient, ApiError
+from reportkit.columns import export_columns
+from reportkit.params import add_filter_arguments, filters_from_args
+from reportkit.textindex import RULES
+from reportkit.trace import add_trace_arguments, tracing
+from reportkit.writers import open_writer
+
+DEFAULT_API = 'http://localhost:3000/api/v1'
+KEY_FILTERS = ('startDate', 'endDate')
+
+
+def open_cache(args):
+    key = {name: getattr(args, name) for name in KEY_FILTERS if getattr(args, name)}
+    return ReportCache.open(args.api, key, args.cache_dir)
+
+
+def run_sync(cache, args):
+    def progress(page, total, stats):
+        print(f'\r{stats.mode}: página {page}/{total} · {stats.fetched} registros', end='', file=sys.stderr, flush=True)
+
+    async def run():
+        async with ApiClient(args.api, args.token, max_connections=args.concurrency) as api:
+            return await cache.sync(api, per_page=args.fetch_per_page, concurrency=args.concurrency, progress=progress)
+
+    stats = asyncio.run(run())
+    print(file=sys.stderr)
+    return stats
+
+
+def cmd_sync(args):
+    cache = open_cache(args)
+    stats = run_sync(cache, args)
+    print(json.dumps({**stats.as_dict(), 'rows': len(cache), 'segments': len(cache.segments)}, indent=2))
+
+
+def cmd_query(args):
+    cache = open_cache(args)
+    if args.sync or cache.watermark is None:
+        run_sync(cache, args)
+    filters = filters_from_args(args)
+    started = time.perf_counter()
+    if args.output:
+        seg_ids, rows = cache.query(filters, filters.get('sortBy'), filters.get('sortOrder'), args.q_rules)
+        with open_writer(args.output) as writer:
+            for start in range(0, len(rows), 10000):
+                docs = cache.docs(seg_ids[start:start + 10000], rows[start:start + 10000])
+                writer.write(export_columns(docs, start))
+        print(f'{len(rows)} filas en {args.output} ({time.perf_counter() - started:.3f}s)', file=sys.stderr)
+    else:
+        response = cache.page(filters, args.page, args.perPage, args.q_rules)
+        print(json.dumps(response, ensure_ascii=False, indent=2))
+        print(f'{response["data"]["totalItems"]} coincidencias ({time.perf_counter() - started:.3f}s)', file=sys.stderr)
+
+
+def cmd_info(args):
+    cache = open_cache(args)
+    print(json.dumps({
+        'path': cache.path,
+        'keyFilters': cache.key_filters,
+        'watermark': cache.watermark,
+        'rows': len(cache),
+        'segments': len(cache.segments),
+        'textIndex': {
+            'terms': sum(s.text.terms for s in cache.segments),
+            'postingBytes': sum(s.text.meta['postingBytes'] for s in cache.segments),
+        },
+    }, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--api', default=os.environ.get('API_BASE_URL', DEFAULT_API), help='API base URL')
+    common.add_argument('--token', default=os.environ.get('SOCI_TOKEN'), help='x-access-token value')
+    common.add_argument('--cache-dir', default=DEFAULT_ROOT, help=f'cache root (default: {DEFAULT_ROOT})')
+    common.add_argument('--concurrency', type=int, default=4, help='requests in flight on a full sync (default: 4)')
+    common.add_argument('--fetch-perPage', dest='fetch_per_page', type=int, default=1000, help='rows per sync request (default: 1000)')
+    add_trace_arguments(common)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sync = sub.add_parser('sync', parents=[common], help='download new and changed records')
+    sync.add_argument('--startDate', required=True)
+    sync.add_argument('--endDate', required=True)
+    sync.set_defaults(func=cmd_sync)
+
+    query = sub.add_parser('query', parents=[common], help='answer a report query from the cache')
+    add_filter_arguments(query)
+    query.add_argument('--page', type=int, default=1)
+    query.add_argument('--perPage', type=int, default=50)
+    query.add_argument('-o', '--output', help='write every match to this .csv, .xlsx or .parquet file instead of one JSON page')
+    query.add_argument('--sync', action='store_true', help='refresh the cache first')
+    query.add_argument('--q-rules', dest='q_rules', choices=RULES, default='local',
+                       help='local: prefixes over every indexed field; server: as the API, '
+                            'infix over fullName and identification only (default: local)')
+    query.set_defaults(func=cmd_query)
+
+    info = sub.add_parser('info', parents=[common], help='show what the cache holds')
+    info.add_argument('--startDate', required=True)
+    info.add_argument('--endDate', required=True)
+    info.set_defaults(func=cmd_info)
+
+    args = parser.parse_args(argv)
+    if args.command == 'query' and not (args.startDate and args.endDate):
+        parser.error('query requiere --startDate y --endDate (la clave de la caché)')
+    try:
+        with tracing(args, f'report-cache {args.command}'):
+            args.func(args)
+    except KeyboardInterrupt:
+        print('\nInterrumpido.', file=sys.stderr)
+        return 130
+    except ApiError as err:
+        print(f'\nError de API: {err.message}', file=sys.stderr)
+        return 1
+    except ValueError as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""Python tooling for the report pages and report endpoints.
+
+Submodules are imported on demand so that the page generator keeps working
+with nothing but the standard library.
+"""
@@ -0,0 +1,553 @@
+"""Group-by counts of the dashboard metrics over a synthetic ``Dataset`` or a ``ReportCache``.
+
+Every breakdown the dashboards show (successful/unsuccessful, defensores,
+verified, linked house/homes, offline and the ``noExitosaDetalle`` rejection
+reasons) comes out of a single pass over the selected records, for any
+combination of dimensions (place, demographics, staff at any level, status,
+rejection reason and local-time date buckets).
+
+Each record gets a group code (mixed radix over the dimension codes) and a
+state code (the metric bits of ``flags`` times the rejection reason, 384
+states). One ``bincount`` of ``group * 384 + state`` yields a (groups,
+states) count matrix; multiplying it by the state/metric indicator matrix
+gives every metric at once. When groups x states would not fit in
+``MAX_CELLS``, flags and reasons are counted in two smaller bincounts instead.
+Records are counted in chunks so temporaries stay bounded, and ``jobs > 1``
+splits the selection across forked processes that share the dataset arrays
+copy-on-write.
+
+Selections are what ``ReportStore.rows`` returns: a ``slice`` of the
+``createdAt``-sorted records or an array of record indices.
+
+``CachedRecords`` presents the rows of a ``ReportCache`` (real API records)
+in the shape of a ``Dataset``, so the same ``Aggregator`` counts them. Those
+records carry their own department and city but no staff above the
+socializer, so the supervisor and coordinator dimensions are not available.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .cache import FLAG_BITS as CACHE_FLAG_BITS
+from .params import BOGOTA
+from .trace import span
+from .synthetic import (
+    LINKED_HOMES, LINKED_HOUSE, OFFLINE, PATRIA_DEFENDER, RECORDING_AUTHORIZATION, REJECTION_REASONS, ROLES,
+    SUCCESSFUL, VERIFIED, WILLING,
+)
+
+# Bits de ``flags`` que cuentan como métrica, en el orden de los bits del estado
+_STATE_BITS = (SUCCESSFUL, PATRIA_DEFENDER, VERIFIED, LINKED_HOUSE, LINKED_HOMES, OFFLINE)
+_BITS = 1 << len(_STATE_BITS)
+_REASONS = len(REJECTION_REASONS)
+STATES = _BITS * _REASONS
+
+# (métrica, bit de flags; None = todas, 0 = sin SUCCESSFUL), nombres de MetricsData
+FLAG_METRICS = (
+    ('total', None),
+    ('successful', SUCCESSFUL),
+    ('unsuccessful', 0),
+    ('defensores', PATRIA_DEFENDER),
+    ('isVerified', VERIFIED),
+    ('isLinkedHouse', LINKED_HOUSE),
+    ('linkedHomes', LINKED_HOMES),
+    ('isOffline', OFFLINE),
+)
+REASON_METRICS = tuple(key for _, _, key in REJECTION_REASONS[1:])
+METRICS = tuple(name for name, _ in FLAG_METRICS) + REASON_METRICS
+
+CHUNK = 1 << 21
+# Celdas (grupos x estados) hasta las que se cuenta con un solo bincount
+MAX_CELLS = 1 << 23
+MAX_GROUPS = 1 << 20
+
+_WEEKDAYS = ('lunes', 'martes', 'miércoles', 'jueves', 'viernes', 'sábado', 'domingo')
+_OFFSET = int(BOGOTA.utcoffset(None).total_seconds())
+_DAY = 86400
+# 1970-01-01 fue jueves: (días + 3) // 7 cuenta semanas de lunes a domingo
+_EPOCH_WEEKDAY = 3
+
+
+def _bits_table():
+    """Metric bits of each ``flags`` byte, packed into ``0.._BITS - 1``."""
+    table = np.zeros(256, dtype=np.int16)
+    for flags in range(256):
+        table[flags] = sum(1 << i for i, bit in enumerate(_STATE_BITS) if flags & bit)
+    return table
+
+
+def _indicator():
+    """(STATES, METRICS) matrix: 1 where a state counts towards a metric."""
+    matrix = np.zeros((STATES, len(METRICS)), dtype=np.float64)
+    for state in range(STATES):
+        bits, reason = divmod(state, _REASONS)
+        flags = sum(bit for i, bit in enumerate(_STATE_BITS) if bits & (1 << i))
+        for m, (_, bit) in enumerate(FLAG_METRICS):
+            if bit is None:
+                matrix[state, m] = 1
+            elif bit == 0:
+                matrix[state, m] = not flags & SUCCESSFUL
+            else:
+                matrix[state, m] = bool(flags & bit)
+        if reason:
+            matrix[state, len(FLAG_METRICS) + reason - 1] = 1
+    return matrix
+
+
+_BITS_OF_FLAGS = _bits_table()
+_INDICATOR = _indicator()
+# Filas de _INDICATOR con razón 0: las métricas de flags por combinación de bits
+_BITS_INDICATOR = _INDICATOR[::_REASONS, :len(FLAG_METRICS)]
+
+
+# Dimensiones de vocabulario de CachedRecords (mismo nombre que la columna de la caché)
+_CACHE_VOCABULARIES = ('gender', 'ageRange', 'idType', 'neighborhood')
+
+# Bit de ``flags`` de la caché -> bit de ``flags`` del Dataset
+_CACHE_FLAGS = {
+    'willingToRespond': WILLING,
+    'isPatriaDefender': PATRIA_DEFENDER,
+    'isVerified': VERIFIED,
+    'isLinkedHouse': LINKED_HOUSE,
+    'linkedHomes': LINKED_HOMES,
+    'isOffline': OFFLINE,
+    'recordingAuthorization': RECORDING_AUTHORIZATION,
+}
+
+
+def _cache_flags_table():
+    """Dataset ``flags`` of each ``ReportCache`` ``flags`` byte."""
+    table = np.zeros(256, dtype=np.uint8)
+    for flags in range(256):
+        table[flags] = (flags & SUCCESSFUL) | sum(
+            bit for field, bit in _CACHE_FLAGS.items() if flags & CACHE_FLAG_BITS[field]
+        )
+    return table
+
+
+def _iso_day(day):
+    return datetime.fromtimestamp(int(day) * _DAY, timezone.utc).date().isoformat()
+
+
+class Dimension:
+    """A group-by key: ``size`` codes, computed per chunk by ``codes``."""
+
+    def __init__(self, name, size, codes, label, origin=0):
+        self.name = name
+        self.size = size
+        self._codes = codes
+        self._label = label
+        self.origin = origin
+
+    def codes(self, chunk):
+        return self._codes(chunk) - self.origin if self.origin else self._codes(chunk)
+
+    def label(self, code):
+        return self._label(code + self.origin)
+
+
+class _Chunk:
+    """Columns of one block of the selection, gathered on first use."""
+
+    def __init__(self, ds, municipality_of, rows):
+        self.ds = ds
+        self.rows = rows
+        self._municipality_of = municipality_of
+        self._cache = {}
+
+    def column(self, name):
+        if name not in self._cache:
+            self._cache[name] = np.asarray(self.ds.columns[name][self.rows])
+        return self._cache[name]
+
+    @property
+    def socializer(self):
+        return self.column('socializer')
+
+    @property
+    def municipality(self):
+        if 'municipality' not in self._cache:
+            if self._municipality_of is None:
+                # Lugar propio de cada registro (CachedRecords)
+                return self.column('municipality')
+            self._cache['municipality'] = self._municipality_of[self.socializer]
+        return self._cache['municipality']
+
+    @property
+    def local_days(self):
+        if 'local_days' not in self._cache:
+            self._cache['local_days'] = (self.column('created') + _OFFSET) // _DAY
+        return self._cache['local_days']
+
+
+class GroupCounts:
+    """Dense ``(groups, METRICS)`` counts over the product of ``dims``."""
+
+    def __init__(self, dims, counts):
+        self.dims = tuple(dims)
+        self.counts = counts
+
+    @property
+    def shape(self):
+        return tuple(d.size for d in self.dims)
+
+    def metric(self, name):
+        return self.counts[:, METRICS.index(name)]
+
+    def totals(self):
+        """``{metric: count}`` over every group."""
+        return dict(zip(METRICS, self.counts.sum(axis=0).tolist()))
+
+    def nonempty(self):
+        return np.flatnonzero(self.metric('total'))
+
+    def rollup(self, dim, mapping, size, name, label):
+        """Counts with ``dim`` replaced by ``mapping[code]`` (e.g. socializer -> supervisor)."""
+        axis = [d.name for d in self.dims].index(dim)
+        shape = self.shape
+        cube = self.counts.reshape(shape + (len(METRICS),))
+        out_shape = shape[:axis] + (size,) + shape[axis + 1:] + (len(METRICS),)
+        out = np.zeros(out_shape, dtype=np.int64)
+        index = [slice(None)] * len(out_shape)
+        index[axis] = mapping[:shape[axis]]
+        np.add.at(out, tuple(index), cube)
+        dims = list(self.dims)
+        dims[axis] = Dimension(name, size, None, label)
+        return GroupCounts(dims, out.reshape(-1, len(METRICS)))
+
+    def records(self):
+        """One dict per non-empty group: dimension labels plus every metric."""
+        groups = self.nonempty()
+        keys = np.unravel_index(groups, self.shape) if self.dims else ()
+        out = []
+        for i, g in enumerate(groups.tolist()):
+            record = {d.name: d.label(int(keys[k][i])) for k, d in enumerate(self.dims)}
+            record.update(zip(METRICS, self.counts[g].tolist()))
+            out.append(record)
+        return out
+
+
+# Pool de procesos: la selección queda en el proceso hijo al hacer fork, sin serializarla
+_worker = None
+
+
+def _init_worker(aggregator, rows, dims):
+    global _worker
+    _worker = (aggregator, rows, dims)
+
+
+def _count_task(bounds):
+    aggregator, rows, dims = _worker
+    with span('count.chunk', rows=bounds[1] - bounds[0]):
+        return aggregator._count(rows, dims, *bounds)
+
+
+class Aggregator:
+    """Dashboard metrics of a ``Dataset``, grouped by any set of dimensions."""
+
+    DIMENSIONS = (
+        'zone', 'department', 'city', 'gender', 'ageRange', 'stratum', 'idType', 'neighborhood',
+        'surveyStatus', 'rejectionReason', 'hour', 'day', 'week', 'month', 'weekday',
+    ) + ROLES
+
+    def __init__(self, dataset):
+        self.ds = dataset
+        self._municipality_of = None if 'municipality' in dataset.columns else \
+            np.asarray(dataset.socializer_municipality).astype(np.int32)
+        names = [name for name, _ in dataset.municipalities]
+        self._muni_names = names
+        departments = [dataset.department_of(m) for m in range(len(names))]
+        self._departments = sorted(set(departments))
+        self._muni_department = np.array([self._departments.index(d) for d in departments], dtype=np.int32)
+        self._muni_zone = np.array([z for _, z in dataset.municipalities], dtype=np.int32)
+        self._staff_cache = {}
+
+    def _staff(self, role):
+        """Index of the ``role`` person above each socializer."""
+        if role not in self._staff_cache:
+            self._staff_cache[role] = np.asarray(self.ds.staff_of(role)).astype(np.int32)
+        return self._staff_cache[role]
+
+    # ---- Selección ----
+
+    def _bounds(self, rows):
+        """``(first, last)`` ``createdAt`` of a non-empty selection."""
+        created = self.ds.created
+        if isinstance(rows, slice):
+            return int(created[rows.start]), int(created[rows.stop - 1])
+        return int(created[rows.min()]), int(created[rows.max()])
+
+    @staticmethod
+    def selection_size(rows):
+        """Number of records in a selection."""
+        return rows.stop - rows.start if isinstance(rows, slice) else len(rows)
+
+    @staticmethod
+    def _part(rows, lo, hi):
+        if isinstance(rows, slice):
+            return slice(rows.start + lo, rows.start + hi)
+        return rows[lo:hi]
+
+    # ---- Dimensiones ----
+
+    def dimension(self, name, rows):
+        """The ``Dimension`` called ``name``, sized for the selection ``rows``."""
+        ds = self.ds
+        if name in ROLES:
+            staff = self._staff(name)
+            return Dimension(name, ds.count(name), lambda c: staff[c.socializer], lambda g: ds.staff_label(name, g))
+        if name == 'zone':
+            return Dimension(name, len(ds.zones), lambda c: self._muni_zone[c.municipality], lambda g: ds.zones[g])
+        if name == 'department':
+            return Dimension(
+                name, len(self._departments), lambda c: self._muni_department[c.municipality],
+                lambda g: self._departments[g],
+            )
+        if name == 'city':
+            return Dimension(name, len(self._muni_names), lambda c: c.municipality, lambda g: self._muni_names[g])
+        if name in ds.vocabularies:
+            column, vocab = ds.vocabularies[name]
+            return Dimension(name, len(vocab), lambda c: c.column(column), lambda g: vocab[g])
+        if name == 'stratum':
+            return Dimension(name, 7, lambda c: c.column('stratum'), lambda g: g or None)
+        if name == 'surveyStatus':
+            return Dimension(
+                name, 2, lambda c: c.column('flags') & SUCCESSFUL,
+                lambda g: 'successful' if g else 'unsuccessful',
+            )
+        if name == 'rejectionReason':
+            return Dimension(name, _REASONS, lambda c: c.column('reason'), lambda g: REJECTION_REASONS[g][0])
+        if name == 'hour':
+            return Dimension(name, 24, lambda c: (c.column('created') + _OFFSET) % _DAY // 3600, lambda g: g)
+        if name == 'weekday':
+            return Dimension(name, 7, lambda c: (c.local_days + _EPOCH_WEEKDAY) % 7, lambda g: _WEEKDAYS[g])
+        if name not in ('day', 'week', 'month'):
+            raise ValueError(f'dimensión desconocida: {name} (disponibles: {", ".join(self.DIMENSIONS)})')
+
+        first, last = self._bounds(rows) if self.selection_size(rows) else (0, 0)
+        first_day, last_day = (first + _OFFSET) // _DAY, (last + _OFFSET) // _DAY
+        if name == 'day':
+            return Dimension(name, last_day - first_day + 1, lambda c: c.local_days, _iso_day, origin=first_day)
+        if name == 'week':
+            def week(days):
+                return (days + _EPOCH_WEEKDAY) // 7
+            return Dimension(
+                name, week(last_day) - week(first_day) + 1, lambda c: week(c.local_days),
+                lambda g: _iso_day(g * 7 - _EPOCH_WEEKDAY), origin=week(first_day),
+            )
+
+        # Mes de cada día del rango, por tabla: más barato que convertir datetime64 fila a fila
+        months = np.arange(first_day, last_day + 1).astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+        table = (months - months[0]).astype(np.int32)
+        return Dimension(
+            name, int(table[-1]) + 1, lambda c: table[c.local_days - first_day],
+            lambda g: str(np.datetime64(int(months[0]) + g, 'M')),
+        )
+
+    # ---- Conteo ----
+
+    def _count(self, rows, dims, lo, hi):
+        """``(groups, METRICS)`` counts of ``rows[lo:hi]``."""
+        groups = int(np.prod([d.size for d in dims], dtype=np.int64))
+        joint = groups * STATES <= MAX_CELLS
+        cells = np.zeros(groups * STATES if joint else groups * _BITS, dtype=np.int64)
+        reasons = np.zeros(0 if joint else groups * _REASONS, dtype=np.int64)
+        for start in range(lo, hi, CHUNK):
+            chunk = _Chunk(self.ds, self._municipality_of, self._part(rows, start, min(start + CHUNK, hi)))
+            group = np.zeros(len(chunk.column('flags')), dtype=np.int64)
+            for d in dims:
+                group *= d.size
+                group += d.codes(chunk)
+            bits = _BITS_OF_FLAGS[chunk.column('flags')]
+            if joint:
+                group *= STATES
+                group += bits * _REASONS + chunk.column('reason')
+                cells += np.bincount(group, minlength=len(cells))
+            else:
+                # Demasiadas celdas: bits de flags y razón por separado
+                reasons += np.bincount(group * _REASONS + chunk.column('reason'), minlength=len(reasons))
+                group *= _BITS
+                group += bits
+                cells += np.bincount(group, minlength=len(cells))
+        if joint:
+            return np.rint(cells.reshape(groups, STATES).astype(np.float64) @ _INDICATOR).astype(np.int64)
+        flag_counts = np.rint(cells.reshape(groups, _BITS).astype(np.float64) @ _BITS_INDICATOR).astype(np.int64)
+        return np.hstack([flag_counts, reasons.reshape(groups, _REASONS)[:, 1:]])
+
+    def group_by(self, rows, by=(), jobs=1):
+        """``GroupCounts`` of the selection ``rows`` grouped by the dimensions ``by``."""
+        dims = [self.dimension(name, rows) for name in by]
+        groups = int(np.prod([d.size for d in dims], dtype=np.int64))
+        if groups > MAX_GROUPS:
+            raise ValueError(f'demasiados grupos ({groups:,}) para {", ".join(by)}')
+        n = self.selection_size(rows)
+        jobs = max(1, min(jobs, -(-n // CHUNK)))
+        if jobs == 1 or 'fork' not in multiprocessing.get_all_start_methods():
+            with span('count', rows=n, by=','.join(by)):
+                return GroupCounts(dims, self._count(rows, dims, 0, n))
+        bounds = [(n * i // jobs, n * (i + 1) // jobs) for i in range(jobs)]
+        with ProcessPoolExecutor(
+            max_workers=jobs, mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_worker, initargs=(self, rows, dims),
+        ) as pool:
+            counts = sum(pool.map(_count_task, bounds))
+        return GroupCounts(dims, counts)
+
+    # ---- Respuestas del API ----
+
+    def resumen(self, rows, jobs=1, by_socializer=None):
+        """``resumen`` of ``Dashboard003Response`` (and of by-socializer-date)."""
+        by_socializer = by_socializer or self.group_by(rows, ('socializer',), jobs)
+        t = by_socializer.totals()
+        return {
+            'totalEncuestas': t['total'],
+            'totalIntervenciones': t['total'],
+            'totalExitosas': t['successful'],
+            'totalNoExitosas': t['unsuccessful'],
+            'totalIsPatriaDefender': t['defensores'],
+            'totalDefensores': t['defensores'],
+            'totalIsLinkedHouse': t['isLinkedHouse'],
+            'totalLinkedHomes': t['linkedHomes'],
+            'totalIsVerified': t['isVerified'],
+            'totalVerificados': t['isVerified'],
+            'totalIsOffline': t['isOffline'],
+            'totalSocializers': len(by_socializer.nonempty()),
+            'noExitosaDetalle': {key: t[key] for key in REASON_METRICS},
+            'linkedHomes': t['linkedHomes'],
+        }
+
+    def socializadores(self, rows, role='socializer', jobs=1, by_socializer=None):
+        """``socializadores`` of ``Dashboard003Response``, grouped by ``role``."""
+        by_socializer = by_socializer or self.group_by(rows, ('socializer',), jobs)
+        grouped = by_socializer
+        if role != 'socializer':
+            grouped = by_socializer.rollup(
+                'socializer', self._staff(role), self.ds.count(role), role, lambda g: self.ds.staff_label(role, g)
+            )
+        out = []
+        for g in grouped.nonempty().tolist():
+            c = dict(zip(METRICS, grouped.counts[g].tolist()))
+            out.append({
+                'socializadorId': self.ds.staff_label(role, g),
+                'socializador': self.ds.staff_name(role, g),
+                'intervenciones': c['total'],
+                'exitosas': c['successful'],
+                'noExitosas': c['unsuccessful'],
+                'defensoresDeLaPatria': c['defensores'],
+                'isLinkedHouse': c['isLinkedHouse'],
+                'linkedHomes': c['linkedHomes'],
+                'verificados': c['isVerified'],
+                'isOffline': c['isOffline'],
+                'noExitosaDetalle': {key: c[key] for key in REASON_METRICS},
+            })
+        out.sort(key=lambda s: -s['intervenciones'])
+        return out
+
+    def dashboard003(self, rows, periodo, municipio=None, role='socializer', jobs=1):
+        """A ``Dashboard003Response`` for the selection, from one pass over it."""
+        by_socializer = self.group_by(rows, ('socializer',), jobs)
+        socializadores = self.socializadores(rows, role, by_socializer=by_socializer)
+        return {
+            'periodo': periodo,
+            'filtros': {'municipio': municipio or None},
+            'totalSocializadores': len(socializadores),
+            'resumen': self.resumen(rows, by_socializer=by_socializer),
+            'socializadores': socializadores,
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+        }
+
+    def metrics_data(self, rows, jobs=1):
+        """``MetricsData`` of ``MetricsCard`` (totals, ``dailyStats``, ``rejectionStats``)."""
+        daily = self.group_by(rows, ('day',), jobs)
+        totals = daily.totals()
+        daily_stats = [
+            {'date': r['day'], **{name: r[name] for name, _ in FLAG_METRICS}} for r in daily.records()
+        ]
+        rejection_stats = [
+            {'label': label, 'count': totals[key], 'value': value}
+            for value, label, key in REJECTION_REASONS[1:] if totals[key]
+        ]
+        rejection_stats.sort(key=lambda r: -r['count'])
+        return {
+            **{name: totals[name] for name, _ in FLAG_METRICS},
+            'dailyStats': daily_stats,
+            'rejectionStats': rejection_stats,
+            'loadedAt': datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+        }
+
+
+class CachedRecords:
+    """The rows of a ``ReportCache`` matching ``filters``, shaped like a ``Dataset``.
+
+    Rows are gathered once, in ``createdAt`` order, so every selection is a
+    ``slice``. Dictionary columns keep the cache codes; each distinct
+    department/city pair becomes a municipality of the single zone ``zone``.
+    Rejection reasons outside ``REJECTION_REASONS`` count as "other".
+    """
+
+    def __init__(self, report_cache, filters=None, zone=''):
+        seg_ids, rows = report_cache.query(filters or {}, 'createdAt', 'asc')
+        n = len(rows)
+        names = ('created', 'flags', 'stratum', 'department', 'city', 'socializer', 'rejectionReason')
+        gathered = {name: np.zeros(n, dtype=np.int64) for name in names + _CACHE_VOCABULARIES}
+        for i, segment in enumerate(report_cache.segments):
+            pos = np.flatnonzero(seg_ids == i)
+            for name, out in gathered.items():
+                out[pos] = getattr(segment, name)[rows[pos]]
+
+        reasons = {value: code for code, (value, _, _) in enumerate(REJECTION_REASONS)}
+        other = reasons['other']
+        reason_of = np.array(
+            [reasons.get(value, other if value else 0) for value in report_cache.dicts['rejectionReason']],
+            dtype=np.uint8,
+        )
+        places, municipality = np.unique(
+            gathered['department'] * len(report_cache.dicts['city']) + gathered['city'], return_inverse=True
+        )
+        socializers, first, socializer = np.unique(gathered['socializer'], return_index=True, return_inverse=True)
+
+        self.columns = {
+            'created': gathered['created'] // 1000,
+            'flags': _cache_flags_table()[gathered['flags']],
+            'reason': reason_of[gathered['rejectionReason']],
+            'stratum': gathered['stratum'].astype(np.uint8),
+            'municipality': municipality.astype(np.int32),
+            'socializer': socializer.astype(np.int32),
+        }
+        for column in _CACHE_VOCABULARIES:
+            self.columns[column] = gathered[column].astype(np.int32)
+        self.created = self.columns['created']
+        self.vocabularies = {column: (column, tuple(report_cache.dicts[column])) for column in _CACHE_VOCABULARIES}
+        self.zones = (zone,)
+        cities = report_cache.dicts['city']
+        self.municipalities = tuple((cities[int(p) % len(cities)], 0) for p in places)
+        self._departments = [report_cache.dicts['department'][int(p) // len(cities)] for p in places]
+        self._socializer_ids = [report_cache.dicts['socializer'][code] for code in socializers.tolist()]
+        # Nombre del socializador: del primer registro de cada uno
+        docs = report_cache.docs(seg_ids[first], rows[first]) if len(first) else []
+        self._socializer_names = [(doc.get('socializer') or {}).get('fullName') or '' for doc in docs]
+        bounds = report_cache.key_filters
+        self.meta = {'start': bounds.get('startDate'), 'end': bounds.get('endDate')}
+
+    def __len__(self):
+        return len(self.created)
+
+    def count(self, role):
+        if role != 'socializer':
+            raise ValueError(f'los registros de la caché no traen la jerarquía: no se puede agrupar por {role}')
+        return len(self._socializer_ids)
+
+    def staff_of(self, role):
+        return np.arange(self.count(role), dtype=np.int32)
+
+    def staff_label(self, role, index):
+        return self._socializer_ids[index]
+
+    def staff_name(self, role, index):
+        return self._socializer_names[index]
+
+    def department_of(self, municipality):
+        return self._departments[municipality]
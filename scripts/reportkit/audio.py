@@ -0,0 +1,417 @@
+"""Streaming post-processing of survey recordings (downmix, resample, trim).
+
+Each file is read in chunks of ``CHUNK`` frames and pushed through three
+stateful stages, so memory stays the same for a 10 s or a 2 h recording:
+
+- ``downmix``: channel average (what ``audioConverter.ts`` does in the browser);
+- ``Resampler``: windowed-sinc low-pass followed by interpolation at the
+  output instants, carrying the filter history across chunks;
+- ``SilenceTrimmer``: 20 ms frames under ``silence_db`` are silence; leading
+  and trailing silence is cut to ``pad`` seconds and pauses longer than
+  ``max_pause`` are shortened to it.
+
+WAV files are read and written with the standard library. MP3/WebM/M4A
+(what ``useAudioRecorder`` uploads) are decoded, and compressed outputs
+encoded, by an ``ffmpeg`` subprocess streaming raw PCM through pipes.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .trace import span
+
+CHUNK = 1 << 16                 # frames leídos por iteración
+FRAME_SECONDS = 0.02
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.webm', '.m4a', '.mp4', '.ogg', '.opus')
+# formato de salida -> (extensión, argumentos de ffmpeg; None = sin ffmpeg)
+FORMATS = {
+    'wav': ('.wav', None),
+    'mp3': ('.mp3', ['-c:a', 'libmp3lame']),
+    'opus': ('.ogg', ['-c:a', 'libopus', '-application', 'voip']),
+}
+
+
+class AudioError(Exception):
+    """A recording that cannot be read or written."""
+
+
+def has_ffmpeg():
+    return shutil.which('ffmpeg') is not None
+
+
+@dataclass
+class Settings:
+    rate: int = 16000           # frecuencia máxima de salida (no se sobremuestrea)
+    silence_db: float = -45.0
+    pad: float = 0.25
+    max_pause: float = 0.8
+    format: str = 'wav'
+    bitrate: str = '32k'
+
+
+# ---- Lectura ----
+
+def _wav_chunks(path):
+    with wave.open(path, 'rb') as w:
+        width, channels, rate = w.getsampwidth(), w.getnchannels(), w.getframerate()
+        if w.getcomptype() != 'NONE' or width not in (1, 2, 3, 4):
+            raise AudioError(f'{path}: WAV no PCM')
+
+        def chunks():
+            with wave.open(path, 'rb') as r:
+                while True:
+                    data = r.readframes(CHUNK)
+                    if not data:
+                        return
+                    yield _pcm_to_float(data, width).reshape(-1, channels)
+
+        return rate, channels, chunks()
+
+
+def _pcm_to_float(data, width):
+    if width == 1:
+        return (np.frombuffer(data, np.uint8).astype(np.float32) - 128) / 128
+    if width == 2:
+        return np.frombuffer(data, '<i2').astype(np.float32) / 32768
+    if width == 3:
+        raw = np.frombuffer(data, np.uint8).reshape(-1, 3)
+        value = (raw[:, 0].astype(np.int32) | (raw[:, 1].astype(np.int32) << 8) | (raw[:, 2].astype(np.int32) << 16))
+        value = np.where(value & 0x800000, value - 0x1000000, value)
+        return value.astype(np.float32) / 8388608
+    return np.frombuffer(data, '<i4').astype(np.float32) / 2147483648
+
+
+def _ffmpeg_chunks(path):
+    if not has_ffmpeg():
+        raise AudioError(f'{path}: leer {os.path.splitext(path)[1]} requiere ffmpeg')
+    probe = subprocess.run(
+        ['ffprobe', '-v', 'error', '-select_streams', 'a:0', '-show_entries', 'stream=sample_rate,channels',
+         '-of', 'json', path], capture_output=True, text=True)
+    try:
+        stream = json.loads(probe.stdout)['streams'][0]
+        rate, channels = int(stream['sample_rate']), int(stream['channels'])
+    except (ValueError, KeyError, IndexError):
+        raise AudioError(f'{path}: sin pista de audio legible ({probe.stderr.strip()[:200]})') from None
+
+    def chunks():
+        proc = subprocess.Popen(['ffmpeg', '-v', 'error', '-i', path, '-f', 'f32le', '-'],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        size = CHUNK * channels * 4
+        try:
+            while True:
+                data = proc.stdout.read(size)
+                if not data:
+                    break
+                usable = len(data) - len(data) % (channels * 4)
+                yield np.frombuffer(data[:usable], '<f4').reshape(-1, channels)
+        finally:
+            proc.stdout.close()
+            if proc.wait() != 0:
+                raise AudioError(f'{path}: ffmpeg: {proc.stderr.read().decode(errors="replace").strip()[:200]}')
+
+    return rate, channels, chunks()
+
+
+def open_audio(path):
+    """``(rate, channels, chunks)``; chunks are ``(frames, channels)`` float32 in [-1, 1]."""
+    if path.lower().endswith('.wav'):
+        try:
+            return _wav_chunks(path)
+        except (wave.Error, EOFError) as err:
+            raise AudioError(f'{path}: {err}') from None
+    return _ffmpeg_chunks(path)
+
+
+# ---- Etapas ----
+
+def downmix(chunk):
+    return chunk[:, 0] if chunk.shape[1] == 1 else chunk.mean(axis=1)
+
+
+def lowpass(cutoff, taps):
+    """Blackman-windowed sinc; ``cutoff`` in cycles per sample."""
+    n = np.arange(taps) - (taps - 1) / 2
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.blackman(taps)
+    return (h / h.sum()).astype(np.float32)
+
+
+class Resampler:
+    """Streaming ``in_rate`` -> ``out_rate`` conversion (downsampling only)."""
+
+    def __init__(self, in_rate, out_rate):
+        self.in_rate, self.out_rate = in_rate, out_rate
+        ratio = in_rate / out_rate
+        taps = int(16 * ratio) | 1
+        self.h = lowpass(0.45 / ratio, taps)
+        self.delay = (taps - 1) // 2
+        self.history = np.zeros(taps - 1, dtype=np.float32)
+        self.filtered = np.zeros(0, dtype=np.float32)
+        self.start = -self.delay    # índice de entrada del primer elemento de ``filtered``
+        self.consumed = 0           # muestras de entrada recibidas
+        self.emitted = 0            # muestras de salida producidas
+
+    def process(self, samples, final=False):
+        if self.in_rate == self.out_rate:
+            return samples
+        self.consumed += len(samples)
+        if final:
+            samples = np.concatenate([samples, np.zeros(self.delay, dtype=np.float32)])
+        buf = np.concatenate([self.history, samples])
+        self.history = buf[len(buf) - len(self.history):]
+        self.filtered = np.concatenate([self.filtered, np.convolve(buf, self.h, 'valid')])
+        # La salida k cae en la entrada k * in / out e interpola entre i y i + 1;
+        # al final, hasta cubrir todas las muestras de entrada
+        end = self.consumed if final else self.start + len(self.filtered) - 1
+        limit = -(-end * self.out_rate // self.in_rate)
+        k = np.arange(self.emitted, max(self.emitted, limit), dtype=np.int64)
+        position = k * self.in_rate
+        local = position // self.out_rate - self.start
+        frac = (position % self.out_rate).astype(np.float32) / self.out_rate
+        padded = np.append(self.filtered, np.float32(0))
+        out = padded[local] * (1 - frac) + padded[local + 1] * frac
+        self.emitted += len(k)
+        drop = min((self.emitted * self.in_rate) // self.out_rate - self.start, len(self.filtered))
+        if drop > 0:
+            self.filtered = self.filtered[drop:]
+            self.start += drop
+        return out.astype(np.float32)
+
+
+class SilenceTrimmer:
+    """Drops leading/trailing silence and shortens long pauses, frame by frame."""
+
+    def __init__(self, rate, silence_db=-45.0, pad=0.25, max_pause=0.8):
+        self.frame = max(1, int(rate * FRAME_SECONDS))
+        self.threshold = 10 ** (silence_db / 20)
+        self.pad = int(pad / FRAME_SECONDS)
+        self.keep = max(self.pad, int(max_pause / FRAME_SECONDS) // 2)
+        self.started = False
+        self.rest = np.zeros(0, dtype=np.float32)
+        self.head = []              # primeras tramas de la pausa en curso
+        self.tail = []              # últimas tramas de la pausa en curso
+
+    def _pause(self, before_speech):
+        if not self.started:
+            frames = self.tail[len(self.tail) - self.pad:] if self.pad else []
+        elif before_speech:
+            frames = self.head + self.tail    # como mucho ``max_pause``
+        else:
+            frames = self.head[:self.pad]
+        self.head, self.tail = [], []
+        return frames
+
+    def process(self, samples, final=False):
+        samples = np.concatenate([self.rest, samples])
+        whole = len(samples) - len(samples) % self.frame
+        frames = list(samples[:whole].reshape(-1, self.frame))
+        self.rest = samples[whole:]
+        if final and len(self.rest):
+            frames.append(self.rest)
+            self.rest = np.zeros(0, dtype=np.float32)
+        # Sin tramas nuevas no se retorna antes: con ``final`` aún falta el margen de la pausa final
+        loud = np.sqrt(np.mean(np.square(samples[:whole].reshape(-1, self.frame)), axis=1)) >= self.threshold
+        if len(frames) > len(loud):
+            loud = np.append(loud, np.sqrt(np.mean(np.square(frames[-1]))) >= self.threshold)
+        out = []
+        for frame, speech in zip(frames, loud.tolist()):
+            if speech:
+                out.extend(self._pause(before_speech=True))
+                out.append(frame)
+                self.started = True
+            elif self.started and len(self.head) < self.keep:
+                self.head.append(frame)
+            else:
+                self.tail.append(frame)
+                if len(self.tail) > self.keep:
+                    del self.tail[0]
+        if final and self.started:
+            out.extend(self._pause(before_speech=False))
+        return np.concatenate(out) if out else np.zeros(0, dtype=np.float32)
+
+
+# ---- Escritura ----
+
+def _to_pcm16(samples):
+    return (np.clip(samples, -1, 1) * 32767).astype('<i2').tobytes()
+
+
+class _WavSink:
+    def __init__(self, path, rate, settings):
+        self.w = wave.open(path, 'wb')
+        self.w.setnchannels(1)
+        self.w.setsampwidth(2)
+        self.w.setframerate(rate)
+
+    def write(self, samples):
+        self.w.writeframes(_to_pcm16(samples))
+
+    def close(self):
+        self.w.close()
+
+
+class _FfmpegSink:
+    def __init__(self, path, rate, settings):
+        if not has_ffmpeg():
+            raise AudioError(f'el formato {settings.format} requiere ffmpeg')
+        _, codec = FORMATS[settings.format]
+        self.proc = subprocess.Popen(
+            ['ffmpeg', '-v', 'error', '-y', '-f', 's16le', '-ar', str(rate), '-ac', '1', '-i', '-',
+             *codec, '-b:a', settings.bitrate, path],
+            stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    def write(self, samples):
+        self.proc.stdin.write(_to_pcm16(samples))
+
+    def close(self):
+        self.proc.stdin.close()
+        if self.proc.wait() != 0:
+            raise AudioError(f'ffmpeg: {self.proc.stderr.read().decode(errors="replace").strip()[:200]}')
+
+
+# ---- Archivos y lotes ----
+
+@dataclass
+class FileResult:
+    source: str
+    output: str = ''
+    bytes_in: int = 0
+    bytes_out: int = 0
+    seconds_in: float = 0.0
+    seconds_out: float = 0.0
+    elapsed: float = 0.0
+    skipped: bool = False
+    error: str = ''
+
+
+def process_file(source, output, settings):
+    """Stream ``source`` through the three stages into ``output``."""
+    started = time.perf_counter()
+    result = FileResult(source, output, bytes_in=os.path.getsize(source))
+    rate, _, chunks = open_audio(source)
+    out_rate = min(settings.rate, rate)
+    resampler = Resampler(rate, out_rate)
+    trimmer = SilenceTrimmer(out_rate, settings.silence_db, settings.pad, settings.max_pause)
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    partial = output + '.part' + FORMATS[settings.format][0]
+    sink = (_WavSink if settings.format == 'wav' else _FfmpegSink)(partial, out_rate, settings)
+    frames_in = frames_out = 0
+    try:
+        for chunk in chunks:
+            frames_in += len(chunk)
+            kept = trimmer.process(resampler.process(downmix(chunk)))
+            frames_out += len(kept)
+            sink.write(kept)
+        kept = trimmer.process(resampler.process(np.zeros(0, dtype=np.float32), final=True), final=True)
+        frames_out += len(kept)
+        sink.write(kept)
+    finally:
+        sink.close()
+    os.replace(partial, output)
+    result.bytes_out = os.path.getsize(output)
+    result.seconds_in = frames_in / rate
+    result.seconds_out = frames_out / out_rate
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _process_task(task):
+    source, output, settings, force = task
+    if not force and os.path.exists(output) and os.path.getmtime(output) >= os.path.getmtime(source):
+        return FileResult(source, output, os.path.getsize(source), os.path.getsize(output), skipped=True)
+    try:
+        with span('file', source=os.path.basename(source)):
+            return process_file(source, output, settings)
+    except (AudioError, OSError) as err:
+        return FileResult(source, output, error=str(err))
+
+
+def find_recordings(paths):
+    """Audio files under ``paths`` (files or directories), with their base directory."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                found.extend((os.path.join(root, n), path) for n in sorted(names)
+                             if n.lower().endswith(AUDIO_EXTENSIONS))
+        else:
+            found.append((path, os.path.dirname(path)))
+    return found
+
+
+def output_path(source, base, out_dir, settings):
+    stem = os.path.splitext(os.path.relpath(source, base))[0]
+    return os.path.join(out_dir, stem + FORMATS[settings.format][0])
+
+
+@dataclass
+class BatchStats:
+    files: int = 0
+    skipped: int = 0
+    failed: list = field(default_factory=list)   # (archivo, mensaje)
+    bytes_in: int = 0
+    bytes_out: int = 0
+    seconds_in: float = 0.0
+    seconds_out: float = 0.0
+    elapsed: float = 0.0
+
+    def add(self, result):
+        if result.error:
+            self.failed.append((result.source, result.error))
+            return
+        if result.skipped:
+            self.skipped += 1
+            return
+        self.files += 1
+        self.bytes_in += result.bytes_in
+        self.bytes_out += result.bytes_out
+        self.seconds_in += result.seconds_in
+        self.seconds_out += result.seconds_out
+
+    def as_dict(self):
+        return {
+            'files': self.files,
+            'skipped': self.skipped,
+            'failed': len(self.failed),
+            'mbIn': round(self.bytes_in / 1e6, 2),
+            'mbOut': round(self.bytes_out / 1e6, 2),
+            'sizeReductionPct': round(100 * (1 - self.bytes_out / self.bytes_in), 1) if self.bytes_in else 0.0,
+            'audioMinutesIn': round(self.seconds_in / 60, 2),
+            'audioMinutesOut': round(self.seconds_out / 60, 2),
+            'silenceRemovedPct': round(100 * (1 - self.seconds_out / self.seconds_in), 1) if self.seconds_in else 0.0,
+            'elapsedSeconds': round(self.elapsed, 3),
+            'mbPerSecond': round(self.bytes_in / 1e6 / self.elapsed, 2) if self.elapsed else 0.0,
+            'realtimeFactor': round(self.seconds_in / self.elapsed, 1) if self.elapsed else 0.0,
+        }
+
+
+def process_batches(files, out_dir, settings, batch_size=200, jobs=1, force=False, report=None):
+    """Process ``(source, base)`` pairs in batches; ``report(n, BatchStats)`` after each one."""
+    tasks = [(source, output_path(source, base, out_dir, settings), settings, force) for source, base in files]
+    total = BatchStats()
+    pool = ProcessPoolExecutor(jobs) if jobs > 1 else None
+    try:
+        for number, start in enumerate(range(0, len(tasks), batch_size), 1):
+            started = time.perf_counter()
+            batch = tasks[start:start + batch_size]
+            stats = BatchStats()
+            with span('batch', number=number, files=len(batch)):
+                results = pool.map(_process_task, batch) if pool else map(_process_task, batch)
+                for result in results:
+                    stats.add(result)
+                    total.add(result)
+            stats.elapsed = time.perf_counter() - started
+            total.elapsed += stats.elapsed
+            if report:
+                report(number, stats)
+    finally:
+        if pool:
+            pool.shutdown()
+    return total
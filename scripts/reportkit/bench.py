@@ -0,0 +1,210 @@
+"""Benchmarks for page generation, paged report fetches, full exports and aggregation.
+
+Results are a flat ``{name: {value, unit, better}}`` map so two runs (e.g.
+two commits) can be compared metric by metric with ``compare``.
+
+Fetch and export benchmarks run against ``mock-backend.py`` started in a
+subprocess, so the dataset does not count towards the client's memory and
+the numbers do not depend on a remote API. The export is also run as a
+subprocess (``export-report.py``), which makes its peak RSS its own.
+"""
+
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from .client import ApiClient
+from .codegen import ROOT_DIR, SCRIPTS_DIR, generate, load_template, render_page
+from .export import DASHBOARD_002
+
+COMPLETE_REPORT = '/respondents/reports/complete'
+
+
+class Metrics:
+    """Collected measurements, keyed by dotted metric name."""
+
+    def __init__(self):
+        self.values = {}
+
+    def add(self, name, value, unit, better='lower'):
+        self.values[name] = {'value': round(value, 3), 'unit': unit, 'better': better}
+
+    def as_dict(self, config):
+        return {
+            'version': 1,
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': f'{platform.system()} {platform.machine()}, {os.cpu_count()} CPU',
+            'config': config,
+            'metrics': self.values,
+        }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(values, p):
+    """``p``-th percentile (0-100) with linear interpolation."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+# ---- Generador ----
+
+def bench_generator(metrics, pages, repeat=20):
+    """Render time per page spec, plus full and no-op runs of ``generate``."""
+    for spec in pages:
+        template = load_template(spec.template)
+        times = _timed(lambda: render_page(spec, template), repeat)
+        metrics.add(f'generator.render.{spec.name}.ms', statistics.median(times), 'ms')
+
+    with tempfile.TemporaryDirectory() as root:
+        manifest = os.path.join(root, 'manifest.json')
+        started = time.perf_counter()
+        generate(pages, root=root, manifest_path=manifest, force=True, jobs=os.cpu_count() or 1)
+        metrics.add('generator.full.ms', (time.perf_counter() - started) * 1000, 'ms')
+        times = _timed(lambda: generate(pages, root=root, manifest_path=manifest), max(3, repeat // 4))
+        metrics.add('generator.noop.ms', statistics.median(times), 'ms')
+
+
+# ---- Backend simulado ----
+
+@contextmanager
+def mock_backend(records, seed=1):
+    """Run ``mock-backend.py`` on a free port; yields its API base URL."""
+    cmd = [
+        sys.executable, os.path.join(SCRIPTS_DIR, 'mock-backend.py'),
+        '--records', str(records), '--seed', str(seed), '--port', '0',
+    ]
+    proc = subprocess.Popen(cmd, stderr=subprocess.PIPE, text=True)
+    try:
+        base_url = None
+        for line in proc.stderr:
+            match = re.search(r'Escuchando en (\S+)', line)
+            if match:
+                base_url = match.group(1)
+                break
+        if base_url is None:
+            raise RuntimeError(f'mock-backend.py terminó sin arrancar (código {proc.wait()})')
+        yield base_url
+    finally:
+        proc.terminate()
+        proc.wait()
+        proc.stderr.close()
+
+
+# ---- Latencia de páginas ----
+
+async def _latencies(base_url, endpoint, per_page, samples, rng):
+    async with ApiClient(base_url, max_connections=1) as api:
+        first = await api.get(endpoint, [('page', 1), ('perPage', per_page)])
+        total_pages = max(1, first['data']['totalPages'])
+        times = []
+        for _ in range(samples):
+            page = rng.randint(1, total_pages)
+            started = time.perf_counter()
+            await api.get(endpoint, [('page', page), ('perPage', per_page)])
+            times.append((time.perf_counter() - started) * 1000)
+        return times
+
+
+def bench_fetch(metrics, base_url, sizes=(50, 500, 10000), samples=30, seed=1):
+    """p50/p95/p99 latency of random pages of ``/dashboard002`` and the complete report."""
+    rng = random.Random(seed)
+    for endpoint, label in ((DASHBOARD_002, 'dashboard002'), (COMPLETE_REPORT, 'complete')):
+        for size in sizes:
+            times = asyncio.run(_latencies(base_url, endpoint, size, samples, rng))
+            for p in (50, 95, 99):
+                metrics.add(f'fetch.{label}.perPage{size}.p{p}_ms', percentile(times, p), 'ms')
+
+
+# ---- Exportación ----
+
+def bench_export(metrics, base_url, per_page=1000, concurrency=4):
+    """Run ``export-report.py`` end to end; records rows/s and peak RSS."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cmd = [
+            sys.executable, os.path.join(SCRIPTS_DIR, 'export-report.py'), '--api', base_url,
+            '-o', os.path.join(tmp, 'export.csv'), '--perPage', str(per_page),
+            '--concurrency', str(concurrency), '--restart',
+        ]
+        out = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    stats = json.loads(out.stdout)
+    metrics.add('export.rows', stats['rows'], 'rows', better='none')
+    metrics.add('export.rows_per_second', stats['rowsPerSecond'], 'rows/s', better='higher')
+    metrics.add('export.elapsed_s', stats['elapsedSeconds'], 's')
+    metrics.add('export.peak_rss_mb', stats['peakRssMb'], 'MB')
+
+
+# ---- Agregación ----
+
+AGGREGATIONS = (
+    (),
+    ('socializer',),
+    ('department', 'gender'),
+    ('day',),
+    ('city', 'ageRange', 'stratum'),
+    ('supervisor', 'day'),
+)
+
+
+def bench_aggregate(metrics, records, seed=1, repeat=3, jobs=1):
+    """Median time of ``Aggregator.group_by`` over the whole synthetic dataset."""
+    from .aggregate import Aggregator
+    from .synthetic import generate
+
+    dataset = generate(records, seed=seed)
+    aggregator = Aggregator(dataset)
+    rows = slice(0, len(dataset))
+    for by in AGGREGATIONS:
+        times = _timed(lambda: aggregator.group_by(rows, by, jobs), repeat)
+        metrics.add(f'aggregate.{"_".join(by) or "total"}.ms', statistics.median(times), 'ms')
+    metrics.add('aggregate.rows', records, 'rows', better='none')
+
+
+# ---- Comparación ----
+
+def compare(current, baseline, threshold=0.1):
+    """``(name, base, value, change)`` for each metric that regressed past ``threshold``."""
+    regressions = []
+    for name, metric in current['metrics'].items():
+        base = baseline.get('metrics', {}).get(name)
+        if not base or not base['value'] or metric['better'] not in ('lower', 'higher'):
+            continue
+        change = metric['value'] / base['value'] - 1
+        worse = change > threshold if metric['better'] == 'lower' else change < -threshold
+        if worse:
+            regressions.append((name, base['value'], metric['value'], change))
+    return regressions
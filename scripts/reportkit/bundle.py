@@ -0,0 +1,480 @@
+"""Route- and role-level attribution of the Vite build output.
+
+Three inputs are combined:
+
+- the routes of ``src/routes/index.tsx``: path, page component and the
+  ``ProtectedRoute`` guard, turned into the roles that can open the route with
+  the same rules as ``ProtectedRoute``/``authService`` (admin roles,
+  socializer, ``allowedRoles`` and the superadmin allow-list);
+- the build manifest (``dist/.vite/manifest.json``, ``build.manifest``): which
+  chunks and CSS a route needs before it can render, i.e. the static import
+  closure of ``index.html`` plus that of the page when it is lazy-loaded;
+- the source maps, if the build has them (``vite build --sourcemap``): how
+  many bytes of each chunk come from each source module or npm package.
+
+With the source maps, every module in the startup chunks is also assigned
+to the pages that import it (following static imports under ``src/``), which
+tells how much of the startup download a role never uses and which pages
+are worth turning into ``React.lazy`` boundaries.
+
+Compressed sizes are gzip level 9 per file; per-module compressed sizes are
+the module's share of its chunk.
+"""
+
+import gzip
+import json
+import os
+import re
+from dataclasses import dataclass, field
+
+from .trace import span
+
+SOURCE_EXTENSIONS = ('.tsx', '.ts', '.jsx', '.js')
+MANIFEST_PATHS = ('.vite/manifest.json', 'manifest.json')
+HTML_ENTRY = 'index.html'
+
+_IMPORT = re.compile(r'''^\s*(import|export)\s+(type\s+)?(?:([^'";]*?)\s*\bfrom\s*)?['"]([^'"]+)['"]''', re.M | re.S)
+_DYNAMIC_IMPORT = re.compile(r'''\bimport\(\s*['"]([^'"]+)['"]\s*\)''')
+_ROUTE = re.compile(r'\{\s*path:\s*([^,\n]+),\s*element:\s*(.*?)\n  \},', re.S)
+_STRING_LIST = re.compile(r"'([^']*)'")
+_B64 = {c: i for i, c in enumerate('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/')}
+
+
+def gzip_size(data):
+    return len(gzip.compress(data, 9))
+
+
+def kb(n):
+    return round(n / 1024, 1)
+
+
+# ---- Código fuente ----
+
+def _resolve(root, importer, spec):
+    """Repo-relative module id of ``spec`` imported from ``importer``."""
+    if not spec.startswith('.'):
+        parts = spec.split('/')
+        return 'node_modules/' + '/'.join(parts[:2] if spec.startswith('@') else parts[:1])
+    base = os.path.normpath(os.path.join(os.path.dirname(importer), spec))
+    for candidate in [base] + [base + ext for ext in SOURCE_EXTENSIONS] + \
+            [os.path.join(base, 'index' + ext) for ext in SOURCE_EXTENSIONS]:
+        if os.path.isfile(os.path.join(root, candidate)):
+            return candidate.replace(os.sep, '/')
+    return base.replace(os.sep, '/')
+
+
+def _names(clause):
+    """Imported (or re-exported) names of an import clause; ``None`` means all of them."""
+    if clause is None or clause.startswith('*'):
+        return None
+    names = []
+    braces = re.search(r'\{(.*)\}', clause, re.S)
+    if braces:
+        for item in braces.group(1).split(','):
+            item = item.strip()
+            if item and not item.startswith('type '):
+                names.append(item.split()[0])
+        clause = clause[:braces.start()]
+    if clause.strip().rstrip(',').strip():
+        names.append('default')
+    return names
+
+
+def import_graph(root, src='src'):
+    """``{module: (static imports, dynamic imports)}`` for every source file under ``src``.
+
+    Named imports from a module that re-exports them (``export { X } from``,
+    such as the ``components`` barrel) point at the module that defines them,
+    as Rollup's tree-shaking does; the rest of the barrel is not followed.
+    """
+    parsed = {}
+    for directory, _, names in os.walk(os.path.join(root, src)):
+        for name in names:
+            if not name.endswith(SOURCE_EXTENSIONS) or name.endswith('.d.ts'):
+                continue
+            path = os.path.relpath(os.path.join(directory, name), root).replace(os.sep, '/')
+            with open(os.path.join(root, path), encoding='utf-8') as f:
+                text = f.read()
+            imports, reexports = [], {}
+            for kind, type_only, clause, spec in _IMPORT.findall(text):
+                if type_only:
+                    continue
+                target = _resolve(root, path, spec)
+                if kind == 'export':
+                    # export { a as b } from: el nombre exportado es el último
+                    if _names(clause) is None:
+                        reexports.setdefault('*', []).append((target, None))
+                    else:
+                        braces = re.search(r'\{(.*)\}', clause, re.S)
+                        for item in braces.group(1).split(',') if braces else []:
+                            item = item.strip()
+                            if item and not item.startswith('type '):
+                                words = item.split()
+                                reexports[words[-1]] = [(target, words[0])]
+                else:
+                    imports.append((target, _names(clause) if clause else []))
+            dynamic = {_resolve(root, path, spec) for spec in _DYNAMIC_IMPORT.findall(text)}
+            parsed[path] = (imports, reexports, dynamic)
+
+    def providers(module, names, seen=()):
+        reexports = parsed[module][1] if module in parsed else {}
+        if not reexports or module in seen:
+            return {module}
+        seen = set(seen) | {module}
+        if names is None:
+            found = set()
+            for targets in reexports.values():
+                for target, original in targets:
+                    found |= providers(target, None if original is None else [original], seen)
+            return found | {module}
+        found = set()
+        for name in names:
+            if name in reexports and name != '*':
+                target, original = reexports[name][0]
+                found |= providers(target, [original], seen)
+            elif '*' in reexports:
+                for target, _ in reexports['*']:
+                    found |= providers(target, [name], seen)
+            else:
+                found.add(module)
+        return found
+
+    graph = {}
+    for path, (imports, _, dynamic) in parsed.items():
+        static = set()
+        for target, names in imports:
+            static |= providers(target, names) if names else {target}
+        graph[path] = (static, dynamic)
+    return graph
+
+
+def reachable(graph, start, stop=()):
+    """Modules reached from ``start`` through static imports, not entering ``stop``."""
+    seen, stack = set(), [start]
+    while stack:
+        module = stack.pop()
+        if module in seen:
+            continue
+        seen.add(module)
+        for child in graph.get(module, ((), ()))[0]:
+            if child not in seen and child not in stop:
+                stack.append(child)
+    return seen
+
+
+# ---- Rutas y roles ----
+
+@dataclass
+class Route:
+    path: str
+    page: str                    # módulo de la página, p. ej. src/pages/ReportsMap.tsx
+    component: str
+    roles: list = field(default_factory=list)
+    guard: str = 'public'
+
+
+def _constants(root):
+    """``ROUTES.X`` values and the superadmin allow-list from ``src/constants/routes.ts``."""
+    with open(os.path.join(root, 'src/constants/routes.ts'), encoding='utf-8') as f:
+        text = f.read()
+    routes = dict(re.findall(r"^\s*(\w+):\s*'([^']*)'", text, re.M))
+    allowed = re.search(r'SUPERADMIN_ALLOWED_ADMIN_ROUTES\s*=\s*\[(.*?)\]', text, re.S)
+    superadmin = [routes.get(name) for name in re.findall(r'ROUTES\.(\w+)', allowed.group(1))] if allowed else []
+    return routes, [r for r in superadmin if r]
+
+
+def _role_sets(root):
+    """All role names (``roleHelpers``) and those passing ``isAdminOrRoot``/``isSocializer``."""
+    with open(os.path.join(root, 'src/utils/roleHelpers.ts'), encoding='utf-8') as f:
+        helpers = f.read()
+    translations = re.search(r'ROLE_TRANSLATIONS[^{]*\{(.*?)\}', helpers, re.S)
+    roles = set(_STRING_LIST.findall(translations.group(1))[::2]) if translations else set()
+    with open(os.path.join(root, 'src/services/auth.service.ts'), encoding='utf-8') as f:
+        auth = f.read()
+    admin = re.search(r'isAdminOrRoot[\s\S]*?adminRoles\s*=\s*\[(.*?)\]', auth)
+    admin_roles = set(_STRING_LIST.findall(admin.group(1))) if admin else {'admin', 'root'}
+    socializer = re.search(r"isSocializer[\s\S]*?roleType\s*===\s*'([^']+)'", auth)
+    socializer_roles = {socializer.group(1)} if socializer else {'socializer'}
+    return sorted(roles | admin_roles | socializer_roles), admin_roles, socializer_roles
+
+
+def parse_routes(root, routes_file='src/routes/index.tsx'):
+    """``Route`` list of the router, with the roles allowed by each guard."""
+    with open(os.path.join(root, routes_file), encoding='utf-8') as f:
+        text = f.read()
+    imports = {}
+    for names, spec in re.findall(r'''^import\s+(.+?)\s+from\s+['"]([^'"]+)['"]''', text, re.M):
+        for name in re.findall(r'\w+', names):
+            imports[name] = _resolve(root, routes_file, spec)
+    constants, superadmin_routes = _constants(root)
+    all_roles, admin_roles, socializer_roles = _role_sets(root)
+
+    routes = []
+    for path_expr, element in _ROUTE.findall(text):
+        path_expr = path_expr.strip()
+        constant = re.match(r'ROUTES\.(\w+)', path_expr)
+        path = constants.get(constant.group(1), path_expr) if constant else path_expr.strip('\'"')
+        components = [c for c in re.findall(r'<(\w+)', element) if c not in ('ProtectedRoute', 'Navigate')]
+        component = components[0] if components else ''
+        allowed = set(all_roles)
+        guard = 'public'
+        if 'requireAdminRole' in element:
+            allowed &= admin_roles
+            guard = 'requireAdminRole'
+        if 'requireSocializerRole' in element:
+            allowed &= socializer_roles
+            guard = 'requireSocializerRole'
+        listed = re.search(r'allowedRoles=\{\[(.*?)\]\}', element, re.S)
+        if listed:
+            allowed &= set(_STRING_LIST.findall(listed.group(1)))
+            guard = 'allowedRoles'
+        if guard != 'public' and path.startswith('/admin') and not any(path.startswith(r) for r in superadmin_routes):
+            allowed.discard('superadmin')
+        routes.append(Route(path, imports.get(component, ''), component, sorted(allowed), guard))
+    return routes
+
+
+# ---- Build ----
+
+def load_manifest(dist):
+    for name in MANIFEST_PATHS:
+        path = os.path.join(dist, name)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+    raise FileNotFoundError(
+        f'{dist}: falta el manifest de Vite (build.manifest en vite.config.ts o vite build --manifest)')
+
+
+def closure(manifest, key):
+    """Manifest keys loaded before ``key`` can run (its static imports, recursively)."""
+    seen, stack = [], [key]
+    while stack:
+        current = stack.pop()
+        if current in seen or current not in manifest:
+            continue
+        seen.append(current)
+        stack.extend(manifest[current].get('imports', []))
+    return seen
+
+
+def chunk_files(manifest, keys):
+    files = []
+    for key in keys:
+        entry = manifest[key]
+        for name in [entry['file']] + entry.get('css', []):
+            if name not in files:
+                files.append(name)
+    return files
+
+
+def _vlq(segment):
+    values, value, shift = [], 0, 0
+    for char in segment:
+        digit = _B64[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+            continue
+        values.append(-(value >> 1) if value & 1 else value >> 1)
+        value, shift = 0, 0
+    return values
+
+
+def _module_id(source):
+    source = source.replace('\\', '/')
+    marker = source.rfind('node_modules/')
+    if marker >= 0:
+        parts = source[marker + len('node_modules/'):].split('/')
+        return 'node_modules/' + '/'.join(parts[:2] if parts[0].startswith('@') else parts[:1])
+    marker = source.find('src/')
+    return source[marker:] if marker >= 0 else source.lstrip('./')
+
+
+def attribute(js_path):
+    """``{module: bytes}`` of a chunk from its ``.map`` (``None`` without one)."""
+    map_path = js_path + '.map'
+    if not os.path.exists(map_path):
+        return None
+    with open(map_path, encoding='utf-8') as f:
+        source_map = json.load(f)
+    with open(js_path, 'rb') as f:
+        lines = f.read().split(b'\n')
+    sources = [_module_id(s) for s in source_map.get('sources', [])]
+    sizes = {}
+    source = 0
+    for number, line in enumerate(source_map.get('mappings', '').split(';')):
+        if number >= len(lines):
+            break
+        length = len(lines[number])
+        segments = []
+        column = 0
+        for raw in filter(None, line.split(',')):
+            values = _vlq(raw)
+            column += values[0]
+            if len(values) >= 4:
+                source += values[1]
+                segments.append((column, source))
+            else:
+                segments.append((column, None))
+        if not segments:
+            sizes['(sin mapa)'] = sizes.get('(sin mapa)', 0) + length
+            continue
+        segments.append((length, None))
+        first = segments[0][0]
+        if first:
+            sizes['(sin mapa)'] = sizes.get('(sin mapa)', 0) + first
+        for (start, src), (end, _) in zip(segments, segments[1:]):
+            key = sources[src] if src is not None and src < len(sources) else '(sin mapa)'
+            sizes[key] = sizes.get(key, 0) + max(0, end - start)
+    return sizes
+
+
+class Build:
+    """Sizes and module attribution of every file in a ``dist`` directory."""
+
+    def __init__(self, dist):
+        self.dist = dist
+        self.manifest = load_manifest(dist)
+        self.files = {}
+        for entry in self.manifest.values():
+            for name in [entry['file']] + entry.get('css', []):
+                if name in self.files:
+                    continue
+                path = os.path.join(dist, name)
+                with open(path, 'rb') as f:
+                    data = f.read()
+                self.files[name] = {
+                    'bytes': len(data),
+                    'gzip': gzip_size(data),
+                    'modules': attribute(path) if name.endswith('.js') else None,
+                }
+
+    @property
+    def has_sourcemaps(self):
+        return any(f['modules'] is not None for f in self.files.values())
+
+    def size(self, files):
+        return sum(self.files[f]['bytes'] for f in files), sum(self.files[f]['gzip'] for f in files)
+
+    def entry_key(self):
+        for key, entry in self.manifest.items():
+            if entry.get('isEntry') and (key.endswith('.html') or entry.get('src', '').endswith('.html')):
+                return key
+        return next(key for key, entry in self.manifest.items() if entry.get('isEntry'))
+
+    def route_files(self, page):
+        """Files a cold load of a route with ``page`` downloads before rendering."""
+        keys = closure(self.manifest, self.entry_key())
+        if page in self.manifest:
+            keys += [k for k in closure(self.manifest, page) if k not in keys]
+        return chunk_files(self.manifest, keys)
+
+    def module_bytes(self, files):
+        """``{module: (bytes, gzip estimate)}`` over ``files``."""
+        totals = {}
+        for name in files:
+            info = self.files[name]
+            if not info['modules']:
+                continue
+            ratio = info['gzip'] / info['bytes'] if info['bytes'] else 0
+            for module, size in info['modules'].items():
+                raw, packed = totals.get(module, (0, 0.0))
+                totals[module] = (raw + size, packed + size * ratio)
+        return totals
+
+
+# ---- Informe ----
+
+def analyze(root, dist, budgets=None, top=10):
+    """Report dict: chunks, routes, roles, code-splitting candidates and budgets."""
+    with span('build'):
+        build = Build(dist)
+    with span('routes'):
+        routes = parse_routes(root)
+    with span('graph'):
+        graph = import_graph(root)
+    pages = {r.page for r in routes if r.page}
+    shell = reachable(graph, 'src/main.tsx', stop=pages)
+    owners = {}
+    for page in pages:
+        for module in reachable(graph, page, stop=pages - {page}):
+            if module not in shell:
+                owners.setdefault(module, set()).add(page)
+
+    startup = build.route_files(None)
+    startup_bytes, startup_gzip = build.size(startup)
+    startup_modules = build.module_bytes(startup)
+
+    route_rows = []
+    for route in routes:
+        files = build.route_files(route.page)
+        raw, packed = build.size(files)
+        route_rows.append({
+            'path': route.path, 'page': route.page, 'guard': route.guard, 'roles': route.roles,
+            'lazy': route.page in build.manifest, 'files': files, 'bytes': raw, 'gzip': packed,
+        })
+
+    all_roles = sorted({role for route in routes for role in route.roles})
+    role_rows = {}
+    for role in all_roles:
+        usable = {r.page for r in routes if role in r.roles}
+        unused = {m: v for m, v in startup_modules.items()
+                  if m in owners and not owners[m] & usable}
+        files = []
+        for row in route_rows:
+            if role in row['roles']:
+                files += [f for f in row['files'] if f not in files]
+        role_rows[role] = {
+            'routes': [r.path for r in routes if role in r.roles],
+            'startupGzip': startup_gzip,
+            'allRoutesGzip': build.size(files)[1],
+            'unusedStartupBytes': sum(v[0] for v in unused.values()),
+            'unusedStartupGzip': round(sum(v[1] for v in unused.values())),
+            'unusedStartupPct': round(100 * sum(v[0] for v in unused.values()) / startup_bytes, 1)
+            if startup_bytes else 0.0,
+            'topUnused': [{'module': m, 'bytes': v[0]} for m, v in
+                          sorted(unused.items(), key=lambda item: -item[1][0])[:top]],
+        }
+
+    splitting = []
+    for page in sorted(pages):
+        exclusive = {m: v for m, v in startup_modules.items() if owners.get(m) == {page}}
+        shared = {m: v for m, v in startup_modules.items() if m in owners and page in owners[m] and len(owners[m]) > 1}
+        if not exclusive and not shared:
+            continue
+        roles = sorted({role for r in routes if r.page == page for role in r.roles})
+        splitting.append({
+            'page': page,
+            'roles': roles,
+            'inStartup': page not in build.manifest,
+            'exclusiveBytes': sum(v[0] for v in exclusive.values()),
+            'exclusiveGzip': round(sum(v[1] for v in exclusive.values())),
+            'sharedWithOtherPagesBytes': sum(v[0] for v in shared.values()),
+            'packages': sorted({m[len('node_modules/'):] for m in exclusive if m.startswith('node_modules/')}),
+        })
+    splitting.sort(key=lambda row: -row['exclusiveBytes'])
+
+    results = []
+    for key, limit_kb in (budgets or {}).items():
+        if key == 'startup':
+            actual = startup_gzip
+        elif key.startswith('role:'):
+            role = role_rows.get(key[5:])
+            actual = role['startupGzip'] - role['unusedStartupGzip'] if role else None
+        else:
+            actual = next((row['gzip'] for row in route_rows if row['path'] == key), None)
+        results.append({'budget': key, 'limitKb': limit_kb, 'actualKb': kb(actual) if actual is not None else None,
+                        'ok': actual is not None and actual <= limit_kb * 1024})
+
+    return {
+        'dist': dist,
+        'sourcemaps': build.has_sourcemaps,
+        'startup': {'files': startup, 'bytes': startup_bytes, 'gzip': startup_gzip},
+        'chunks': [{'file': name, 'bytes': info['bytes'], 'gzip': info['gzip']}
+                   for name, info in sorted(build.files.items(), key=lambda item: -item[1]['bytes'])],
+        'routes': route_rows,
+        'roles': role_rows,
+        'splitting': splitting,
+        'budgets': results,
+    }
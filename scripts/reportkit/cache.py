@@ -0,0 +1,575 @@
+"""Local columnar cache of ``/dashboard002`` records, one per key filter set.
+
+A cache is keyed by the API URL and the filters sent to the server (the date
+range); every other ``Dashboard002Params`` filter is then answered locally by
+scanning memory-mapped numpy columns. Layout::
+
+    <root>/<key>/
+        manifest.json       key filters, watermark, segment list
+        dicts.json          values of the dictionary-encoded columns
+        seg-000001/         one .npy per column, docs.bin + docs_offsets.npy
+            text/           inverted index of the ``q`` search (``textindex``)
+
+Segments are append-only. A record that comes back with a newer
+``updatedAt`` is written to a new segment and its previous row is marked in
+that segment's ``dead.npy``; ``compact`` rewrites the live rows into one
+segment once there are more than ``MAX_SEGMENTS``. Each segment carries the
+index of its own rows, so a sync only indexes what it wrote and compaction
+merges the indexes.
+
+Refreshes are incremental: the API is asked for the key date range sorted by
+``updatedAt`` descending, and paging stops at the first record older than the
+watermark. The watermark never moves past the start of the previous sync
+(minus ``WATERMARK_MARGIN``), so records edited while a sync was running are
+picked up by the next one; records re-read in that margin whose ``updatedAt``
+is not newer than the cached row are skipped, so a sync with no changes
+writes no segment. Deleted records are not detected.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from . import textindex
+from .columns import parse_date, place_name
+from .export import fetch_page, iter_pages
+from .params import date_bound, fold, parse_bool
+from .textindex import TextIndex, item_tokens, server_match
+from .trace import count, span
+
+SEGMENT_ROWS = 100_000
+MAX_SEGMENTS = 8
+WATERMARK_MARGIN = 300  # segundos
+NAME_WIDTH = 64
+IDENT_WIDTH = 16
+
+SUCCESSFUL = 1
+# Booleanos de ReportItem empaquetados en ``flags`` (bit 0: surveyStatus === 'successful')
+FLAG_BITS = {
+    'willingToRespond': 2,
+    'isPatriaDefender': 4,
+    'isVerified': 8,
+    'isLinkedHouse': 16,
+    'linkedHomes': 32,
+    'isOffline': 64,
+    'recordingAuthorization': 128,
+}
+
+def _reason(item):
+    """``value`` of the no-response reason (``noResponseReason`` or ``rejectionReason``, object or string)."""
+    reason = item.get('noResponseReason') or item.get('rejectionReason') or ''
+    return (reason.get('value') or '') if isinstance(reason, dict) else str(reason)
+
+
+# Columnas codificadas con diccionario y cómo se obtiene su valor
+DICT_COLUMNS = {
+    'department': lambda item: place_name(item.get('department')),
+    'city': lambda item: place_name(item.get('city')),
+    'region': lambda item: item.get('region') or '',
+    'neighborhood': lambda item: item.get('neighborhood') or '',
+    'gender': lambda item: item.get('gender') or '',
+    'ageRange': lambda item: item.get('ageRange') or '',
+    'idType': lambda item: item.get('idType') or '',
+    'socializer': lambda item: (item.get('socializer') or {}).get('_id') or '',
+    'rejectionReason': _reason,
+}
+# Filtros de texto libre: coincidencia por subcadena, sin tildes ni mayúsculas
+SUBSTRING_FILTERS = ('department', 'city', 'neighborhood')
+
+SORT_FIELDS = ('createdAt', 'updatedAt', 'fullName', 'identification', 'surveyStatus', 'stratum') + tuple(DICT_COLUMNS)
+
+DEFAULT_ROOT = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'soci-reports')
+
+
+def _millis(value):
+    date = parse_date(value)
+    return int(date.timestamp() * 1000) if date else 0
+
+
+def _millis_array(values):
+    """Epoch ms of ISO dates; numpy parses the API's UTC ``...Z`` form in C."""
+    if all(not v or v.endswith('Z') for v in values):
+        dates = np.array([v[:-1] if v else 'NaT' for v in values], dtype='datetime64[ms]')
+        return np.where(np.isnat(dates), 0, dates.astype(np.int64))
+    # Fechas con desplazamiento explícito: una por una
+    return np.array([_millis(v) for v in values], dtype=np.int64)
+
+
+@lru_cache(maxsize=1 << 16)
+def _folded(name):
+    return fold(name).encode('utf-8')
+
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+def cache_key(api_url, key_filters):
+    payload = json.dumps({'api': api_url.rstrip('/'), 'filters': key_filters}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _write_json(path, data):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+class Segment:
+    """One immutable batch of rows (only ``dead`` is updated in place)."""
+
+    COLUMNS = ('id', 'created', 'updated', 'flags', 'stratum', 'full_name', 'ident', 'docs_offsets') + tuple(DICT_COLUMNS)
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        for column in self.COLUMNS:
+            file = os.path.join(path, f'{column}.npy')
+            # None: columna agregada después de escribir el segmento (ReportCache._upgrade)
+            setattr(self, column, np.load(file, mmap_mode='r') if os.path.exists(file) else None)
+        self.id_order = np.load(os.path.join(path, 'id_order.npy'), mmap_mode='r')
+        self.dead = np.load(os.path.join(path, 'dead.npy'), mmap_mode='r+')
+        self.docs = np.memmap(os.path.join(path, 'docs.bin'), dtype=np.uint8, mode='r') \
+            if os.path.getsize(os.path.join(path, 'docs.bin')) else np.zeros(0, dtype=np.uint8)
+        self._text = None
+
+    def __len__(self):
+        return len(self.id)
+
+    def doc(self, row):
+        start, end = self.docs_offsets[row], self.docs_offsets[row + 1]
+        return json.loads(self.docs[start:end].tobytes())
+
+    @property
+    def text(self):
+        """``TextIndex`` of the segment; rebuilt from the stored records when missing or outdated."""
+        if self._text is None:
+            path = os.path.join(self.path, textindex.DIR)
+            if not TextIndex.exists(path):
+                with span('text.build', rows=len(self)):
+                    textindex.build(path, [item_tokens(self.doc(row)) for row in range(len(self))])
+            self._text = TextIndex(path)
+        return self._text
+
+    def kill(self, ids):
+        """Mark the rows with these ids (sorted ``S24`` array) as superseded."""
+        if not len(self):
+            return 0
+        sorted_ids = self.id[self.id_order]
+        pos = np.searchsorted(sorted_ids, ids)
+        pos = pos[pos < len(sorted_ids)]
+        hits = pos[np.isin(sorted_ids[pos], ids)]
+        rows = np.asarray(self.id_order[hits])
+        fresh = rows[~self.dead[rows]]
+        self.dead[fresh] = True
+        self.dead.flush()
+        return len(fresh)
+
+    def updated_of(self, ids):
+        """``updatedAt`` (epoch ms) of the live rows with these ids (``S24`` array), ``-1`` if absent."""
+        out = np.full(len(ids), -1, dtype=np.int64)
+        if not len(self) or not len(ids):
+            return out
+        sorted_ids = self.id[self.id_order]
+        pos = np.minimum(np.searchsorted(sorted_ids, ids), len(sorted_ids) - 1)
+        rows = np.asarray(self.id_order[pos])
+        found = (sorted_ids[pos] == ids) & ~self.dead[rows]
+        out[found] = self.updated[rows[found]]
+        return out
+
+    @staticmethod
+    def write(path, columns, docs):
+        # Restos de una escritura interrumpida antes de actualizar el manifiesto
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+        for name, array in columns.items():
+            np.save(os.path.join(path, f'{name}.npy'), array)
+        np.save(os.path.join(path, 'id_order.npy'), np.argsort(columns['id'], kind='stable'))
+        np.save(os.path.join(path, 'dead.npy'), np.zeros(len(columns['id']), dtype=bool))
+        with open(os.path.join(path, 'docs.bin'), 'wb') as f:
+            f.write(docs)
+
+
+@dataclass
+class SyncStats:
+    mode: str = 'full'
+    fetched: int = 0
+    written: int = 0
+    superseded: int = 0
+    unchanged: int = 0
+    pages: int = 0
+    elapsed: float = 0.0
+
+    def as_dict(self):
+        return {
+            'mode': self.mode,
+            'fetched': self.fetched,
+            'written': self.written,
+            'superseded': self.superseded,
+            'unchanged': self.unchanged,
+            'pages': self.pages,
+            'elapsedSeconds': round(self.elapsed, 3),
+        }
+
+
+class ReportCache:
+    """Columnar cache of the records matching ``key_filters`` on one API."""
+
+    def __init__(self, path, key_filters=None):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        manifest_path = os.path.join(path, 'manifest.json')
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+            with open(os.path.join(path, 'dicts.json'), encoding='utf-8') as f:
+                self.dicts = json.load(f)
+        else:
+            self.manifest = {'keyFilters': key_filters or {}, 'watermark': None, 'segments': [], 'next': 1}
+            self.dicts = {}
+        for name in DICT_COLUMNS:
+            self.dicts.setdefault(name, [''])
+        self._codes = {name: {v: i for i, v in enumerate(values)} for name, values in self.dicts.items()}
+        self.segments = [self._upgrade(Segment(os.path.join(path, name))) for name in self.manifest['segments']]
+
+    @classmethod
+    def open(cls, api_url, key_filters, root=DEFAULT_ROOT):
+        return cls(os.path.join(root, cache_key(api_url, key_filters)), key_filters)
+
+    @property
+    def key_filters(self):
+        return self.manifest['keyFilters']
+
+    @property
+    def watermark(self):
+        """``updatedAt`` (epoch ms) below which every change is already cached."""
+        return self.manifest['watermark']
+
+    def __len__(self):
+        return sum(len(s) - int(np.count_nonzero(s.dead)) for s in self.segments)
+
+    def _save(self):
+        _write_json(os.path.join(self.path, 'dicts.json'), self.dicts)
+        _write_json(os.path.join(self.path, 'manifest.json'), self.manifest)
+
+    # ---- Escritura ----
+
+    def _upgrade(self, segment):
+        """Add the dictionary columns a segment written by an older version lacks."""
+        missing = [column for column in DICT_COLUMNS if getattr(segment, column) is None]
+        if not missing:
+            return segment
+        docs = [segment.doc(row) for row in range(len(segment))]
+        for column in missing:
+            value = DICT_COLUMNS[column]
+            codes = np.array([self._code(column, value(doc)) for doc in docs], dtype=np.int32)
+            np.save(os.path.join(segment.path, f'{column}.npy'), codes)
+        self._save()
+        return Segment(segment.path)
+
+    def _code(self, column, value):
+        codes = self._codes[column]
+        if value not in codes:
+            codes[value] = len(self.dicts[column])
+            self.dicts[column].append(value)
+        return codes[value]
+
+    def _columns(self, items):
+        n = len(items)
+        ids, created, updated, strata, names, idents, flags = [], [], [], [], [], [], []
+        coded = {column: [] for column in DICT_COLUMNS}
+        docs, tokens = [], []
+        for item in items:
+            ids.append(item['_id'])
+            created.append(item.get('createdAt') or '')
+            updated.append(item.get('updatedAt') or '')
+            strata.append(int(item.get('stratum') or 0))
+            names.append(_folded(item.get('fullName') or '')[:NAME_WIDTH])
+            idents.append(str(item.get('identification') or '').encode('utf-8')[:IDENT_WIDTH])
+            bits = SUCCESSFUL if item.get('surveyStatus') == 'successful' else 0
+            for field, bit in FLAG_BITS.items():
+                if item.get(field):
+                    bits |= bit
+            flags.append(bits)
+            for column, value in DICT_COLUMNS.items():
+                coded[column].append(self._code(column, value(item)))
+            docs.append(_encode(item).encode('utf-8'))
+            tokens.append(item_tokens(item))
+        cols = {
+            'id': np.array(ids, dtype='S24'),
+            'created': _millis_array(created),
+            'updated': _millis_array(updated),
+            'flags': np.array(flags, dtype=np.uint8),
+            'stratum': np.array(strata, dtype=np.uint8),
+            'full_name': np.array(names, dtype=f'S{NAME_WIDTH}'),
+            'ident': np.array(idents, dtype=f'S{IDENT_WIDTH}'),
+        }
+        for column, codes in coded.items():
+            cols[column] = np.array(codes, dtype=np.int32)
+        offsets = np.zeros(n + 1, dtype=np.uint64)
+        np.cumsum([len(d) for d in docs], out=offsets[1:])
+        cols['docs_offsets'] = offsets
+        return cols, b''.join(docs), tokens
+
+    def _new_segment(self, columns, docs):
+        name = f'seg-{self.manifest["next"]:06d}'
+        self.manifest['next'] += 1
+        Segment.write(os.path.join(self.path, name), columns, docs)
+        return Segment(os.path.join(self.path, name))
+
+    def changed(self, items):
+        """The ``items`` newer than the cached version of the same record (or not cached)."""
+        if not items:
+            return items
+        ids = np.array([item['_id'] for item in items], dtype='S24')
+        stored = np.full(len(items), -1, dtype=np.int64)
+        for segment in self.segments:
+            np.maximum(stored, segment.updated_of(ids), out=stored)
+        updated = _millis_array([item.get('updatedAt') or '' for item in items])
+        return [item for item, newer in zip(items, (updated > stored).tolist()) if newer]
+
+    def append(self, items):
+        """Upsert ``items`` (ReportItem dicts); returns how many rows were superseded."""
+        latest = {}
+        for item in items:
+            seen = latest.get(item['_id'])
+            if seen is None or _millis(item.get('updatedAt')) >= _millis(seen.get('updatedAt')):
+                latest[item['_id']] = item
+        items = list(latest.values())
+        superseded = 0
+        for start in range(0, len(items), SEGMENT_ROWS):
+            chunk = items[start:start + SEGMENT_ROWS]
+            with span('columns', rows=len(chunk)):
+                columns, docs, tokens = self._columns(chunk)
+            ids = np.sort(columns['id'])
+            superseded += sum(segment.kill(ids) for segment in self.segments)
+            with span('segment.write', rows=len(chunk)):
+                segment = self._new_segment(columns, docs)
+            with span('text.build', rows=len(chunk)):
+                textindex.build(os.path.join(segment.path, textindex.DIR), tokens)
+            self.segments.append(segment)
+            self.manifest['segments'].append(self.segments[-1].name)
+            self._save()
+        return superseded
+
+    def compact(self):
+        """Rewrite the live rows of every segment into a single one."""
+        if len(self.segments) <= 1 and not any(np.any(s.dead) for s in self.segments):
+            return
+        parts, blobs, base = {c: [] for c in Segment.COLUMNS if c != 'docs_offsets'}, [], 0
+        offsets = [np.zeros(1, dtype=np.uint64)]
+        texts, rows = [], 0
+        for segment in self.segments:
+            live = np.flatnonzero(~np.asarray(segment.dead))
+            # Fila de cada registro vivo en el segmento compactado (-1: se descarta)
+            new_rows = np.full(len(segment), -1, dtype=np.int64)
+            new_rows[live] = rows + np.arange(len(live))
+            texts.append((segment.text, new_rows))
+            rows += len(live)
+            for column in parts:
+                parts[column].append(np.asarray(getattr(segment, column)[live]))
+            starts = np.asarray(segment.docs_offsets[live])
+            ends = np.asarray(segment.docs_offsets[live + 1])
+            for s, e in zip(starts.tolist(), ends.tolist()):
+                blobs.append(segment.docs[s:e].tobytes())
+            offsets.append(base + np.cumsum(ends - starts))
+            base += int((ends - starts).sum())
+        columns = {column: np.concatenate(arrays) for column, arrays in parts.items()}
+        columns['docs_offsets'] = np.concatenate(offsets).astype(np.uint64)
+        old = self.segments
+        segment = self._new_segment(columns, b''.join(blobs))
+        with span('text.merge', rows=rows):
+            textindex.merge(os.path.join(segment.path, textindex.DIR), texts, rows)
+        self.segments = [segment]
+        self.manifest['segments'] = [self.segments[0].name]
+        self._save()
+        for segment in old:
+            shutil.rmtree(segment.path)
+
+    # ---- Sincronización ----
+
+    async def sync(self, api, per_page=1000, concurrency=4, progress=None):
+        """Fetch what changed since the watermark (everything on the first run)."""
+        started = time.time()
+        stats = SyncStats(mode='full' if self.watermark is None else 'incremental')
+        newest = self.watermark or 0
+        buffer = []
+
+        async def flush():
+            nonlocal buffer
+            if not buffer:
+                return
+            # En un hilo: las páginas ya pedidas siguen llegando mientras tanto
+            stats.superseded += await asyncio.to_thread(self.append, buffer)
+            stats.written += len(buffer)
+            buffer = []
+
+        if self.watermark is None:
+            query = {**self.key_filters, 'sortBy': 'createdAt', 'sortOrder': 'asc'}
+            async for page, data in iter_pages(api, query, per_page, 1, concurrency):
+                surveys = data.get('surveys') or []
+                count('records', len(surveys))
+                buffer.extend(surveys)
+                stats.fetched += len(surveys)
+                stats.pages += 1
+                newest = max([newest] + [_millis(s.get('updatedAt')) for s in surveys])
+                if len(buffer) >= SEGMENT_ROWS:
+                    await flush()
+                if progress:
+                    progress(page, data.get('totalPages') or 0, stats)
+        else:
+            query = {**self.key_filters, 'sortBy': 'updatedAt', 'sortOrder': 'desc'}
+            page = 1
+            while True:
+                data = await fetch_page(api, query, page, per_page)
+                surveys = data.get('surveys') or []
+                count('records', len(surveys))
+                fresh = [s for s in surveys if _millis(s.get('updatedAt')) >= self.watermark]
+                # Relectura del margen: lo que ya está en caché con la misma versión no se reescribe
+                changed = self.changed(fresh)
+                stats.unchanged += len(fresh) - len(changed)
+                buffer.extend(changed)
+                stats.fetched += len(surveys)
+                stats.pages += 1
+                newest = max([newest] + [_millis(s.get('updatedAt')) for s in fresh])
+                if progress:
+                    progress(page, data.get('totalPages') or 0, stats)
+                if len(fresh) < len(surveys) or page >= (data.get('totalPages') or 0):
+                    break
+                page += 1
+        await flush()
+
+        watermark = min(newest, int((started - WATERMARK_MARGIN) * 1000))
+        self.manifest['watermark'] = max(watermark, self.watermark or 0)
+        self.manifest['syncedAt'] = int(started * 1000)
+        if len(self.segments) > MAX_SEGMENTS:
+            with span('compact', segments=len(self.segments)):
+                self.compact()
+        self._save()
+        stats.elapsed = time.time() - started
+        return stats
+
+    # ---- Consultas ----
+
+    def _tables(self, filters):
+        """Boolean tables over dictionary codes for the dictionary filters."""
+        tables = {}
+        for column in DICT_COLUMNS:
+            value = filters.get(column)
+            if not value:
+                continue
+            needle = fold(value)
+            if column in SUBSTRING_FILTERS:
+                tables[column] = np.array([bool(v) and needle in fold(v) for v in self.dicts[column]])
+            else:
+                tables[column] = np.array([fold(v) == needle for v in self.dicts[column]])
+        return tables
+
+    def _mask(self, segment, filters, tables, q, q_rules='local'):
+        """Rows of ``segment`` matching ``filters``; with ``q`` only its index hits are checked."""
+        rows = segment.text.search(q, q_rules) if q else None
+        if rows is not None and not len(rows):
+            return rows
+
+        def column(name):
+            values = getattr(segment, name)
+            return np.asarray(values) if rows is None else values[rows]
+
+        mask = ~column('dead')
+        created = column('created')
+        if filters.get('startDate'):
+            mask &= created >= date_bound(filters['startDate']) * 1000
+        if filters.get('endDate'):
+            mask &= created < date_bound(filters['endDate'], end=True) * 1000
+        flags = column('flags')
+        if filters.get('surveyStatus'):
+            mask &= ((flags & SUCCESSFUL) != 0) == (filters['surveyStatus'] == 'successful')
+        for field, bit in FLAG_BITS.items():
+            wanted = parse_bool(filters.get(field))
+            if wanted is not None:
+                mask &= ((flags & bit) != 0) == wanted
+        if filters.get('stratum'):
+            mask &= column('stratum') == int(filters['stratum'])
+        for name, table in tables.items():
+            mask &= table[column(name)]
+        matched = np.flatnonzero(mask)
+        if rows is None:
+            return matched
+        matched = rows[matched]
+        if q_rules == 'server':
+            # El índice cubre más campos que la API: se confirma sobre nombre e identificación
+            names = [v.decode('utf-8', 'replace') for v in segment.full_name[matched].tolist()]
+            idents = [v.decode('utf-8', 'replace') for v in segment.ident[matched].tolist()]
+            matched = matched[server_match(q, names, idents)]
+        return matched
+
+    def _sort_key(self, segment, rows, field):
+        if field == 'createdAt':
+            return np.asarray(segment.created[rows])
+        if field == 'updatedAt':
+            return np.asarray(segment.updated[rows])
+        if field == 'fullName':
+            return np.asarray(segment.full_name[rows])
+        if field == 'identification':
+            return np.asarray(segment.ident[rows])
+        if field == 'surveyStatus':
+            return 1 - (np.asarray(segment.flags[rows]) & SUCCESSFUL)
+        if field == 'stratum':
+            return np.asarray(segment.stratum[rows])
+        rank = np.argsort(np.argsort([fold(v) for v in self.dicts[field]], kind='stable'))
+        return rank[np.asarray(getattr(segment, field)[rows])]
+
+    def query(self, filters, sort_by=None, sort_order=None, q_rules='local'):
+        """``(segment indices, rows)`` of the live rows matching ``filters``, sorted.
+
+        ``filters`` are ``Dashboard002Params``; the default order is
+        ``createdAt`` descending, as the API. ``q_rules`` picks how ``q``
+        matches (``textindex.RULES``).
+        """
+        sort_by = sort_by or 'createdAt'
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f'sortBy no soportado localmente: {sort_by}')
+        tables = self._tables(filters)
+        seg_ids, rows, keys, created = [], [], [], []
+        for i, segment in enumerate(self.segments):
+            matched = self._mask(segment, filters, tables, filters.get('q'), q_rules)
+            seg_ids.append(np.full(len(matched), i, dtype=np.int32))
+            rows.append(matched)
+            keys.append(self._sort_key(segment, matched, sort_by))
+            created.append(np.asarray(segment.created[matched]))
+        if not rows:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int64)
+        seg_ids, rows = np.concatenate(seg_ids), np.concatenate(rows)
+        # A igual clave, por createdAt en la misma dirección
+        order = np.lexsort((np.concatenate(created), np.concatenate(keys)))
+        if sort_order != 'asc':
+            order = order[::-1]
+        return seg_ids[order], rows[order]
+
+    def docs(self, seg_ids, rows):
+        """ReportItem dicts for ``(segment, row)`` pairs."""
+        return [self.segments[s].doc(r) for s, r in zip(seg_ids.tolist(), rows.tolist())]
+
+    def page(self, filters, page=1, per_page=50, q_rules='local'):
+        """A ``Dashboard002Response`` answered from the cache."""
+        seg_ids, rows = self.query(filters, filters.get('sortBy'), filters.get('sortOrder'), q_rules)
+        start = (page - 1) * per_page
+        total = len(rows)
+        return {
+            'message': 'Reporte generado desde caché local',
+            'data': {
+                'currentPage': page,
+                'itemsPerPage': per_page,
+                'totalItems': total,
+                'totalPages': -(-total // per_page),
+                'filters': {k: v for k, v in filters.items() if v not in (None, '')},
+                'surveys': self.docs(seg_ids[start:start + per_page], rows[start:start + per_page]),
+            },
+        }
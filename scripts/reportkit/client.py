@@ -0,0 +1,218 @@
+"""Minimal asyncio HTTP/1.1 client for the SOCI API.
+
+Keeps a bounded pool of keep-alive connections per client, sends the
+``x-access-token`` header like ``ApiService.request`` and raises
+``ApiError`` (message, code, details) on non-2xx responses. Only the
+standard library is used so the tooling runs anywhere Python does.
+"""
+
+import asyncio
+import gzip
+import json
+import random
+import ssl
+import time
+import zlib
+from urllib.parse import urlencode, urlsplit
+
+from .trace import count, span
+
+USER_AGENT = 'soci-reportkit/1'
+
+
+class ApiError(Exception):
+    """Error returned by the API, shaped like the front-end ``ApiError``."""
+
+    def __init__(self, message, code=None, details=None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.details = details
+
+
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
+    def close(self):
+        self.writer.close()
+
+
+class ApiClient:
+    """Pooled client bound to one API base URL (e.g. ``http://localhost:3000/api/v1``).
+
+    ``max_connections`` bounds both open sockets and in-flight requests.
+    Idempotent requests are retried on connection errors and 5xx responses.
+    Idle sockets are dropped after ``idle_timeout`` seconds, below Node's
+    default 5 s ``keepAliveTimeout``, so a reused socket is rarely stale.
+    """
+
+    def __init__(self, base_url, token=None, max_connections=8, timeout=60.0, retries=3, idle_timeout=4.0):
+        parts = urlsplit(base_url.rstrip('/'))
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f'Unsupported URL scheme: {base_url}')
+        self.base_url = base_url.rstrip('/')
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self.prefix = parts.path
+        self.token = token
+        self.timeout = timeout
+        self.retries = retries
+        self.idle_timeout = idle_timeout
+        self._idle = []
+        self._slots = asyncio.Semaphore(max_connections)
+        self.requests = 0
+        self.bytes_received = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+    # ---- Connection pool ----
+
+    async def _acquire(self):
+        now = time.monotonic()
+        while self._idle:
+            conn = self._idle.pop()
+            if now - conn.last_used < self.idle_timeout and not conn.reader.at_eof():
+                return conn
+            conn.close()
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl, limit=2 ** 20
+        )
+        return _Connection(reader, writer)
+
+    def _release(self, conn, reusable):
+        if reusable:
+            conn.last_used = time.monotonic()
+            self._idle.append(conn)
+        else:
+            conn.close()
+
+    # ---- HTTP ----
+
+    def url(self, endpoint, params=None):
+        path = self.prefix + endpoint
+        if params:
+            path += ('&' if '?' in path else '?') + urlencode(params)
+        return path
+
+    async def _send(self, method, path, body, content_type):
+        headers = {
+            'Host': self.host if self.port in (80, 443) else f'{self.host}:{self.port}',
+            'User-Agent': USER_AGENT,
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        }
+        if self.token:
+            headers['x-access-token'] = self.token
+        if body is not None:
+            headers['Content-Type'] = content_type
+            headers['Content-Length'] = str(len(body))
+        head = f'{method} {path} HTTP/1.1\r\n' + ''.join(f'{k}: {v}\r\n' for k, v in headers.items())
+
+        conn = await self._acquire()
+        reusable = False
+        try:
+            conn.writer.write(head.encode('latin-1') + b'\r\n' + (body or b''))
+            await conn.writer.drain()
+            status, reason, resp_headers, data, reusable = await asyncio.wait_for(
+                self._read_response(conn.reader, method), self.timeout
+            )
+        finally:
+            self._release(conn, reusable)
+        self.requests += 1
+        self.bytes_received += len(data)
+        count('http.requests')
+        count('http.bytesReceived', len(data))
+        encoding = resp_headers.get('content-encoding', '')
+        if encoding == 'gzip':
+            data = gzip.decompress(data)
+        elif encoding == 'deflate':
+            data = zlib.decompress(data)
+        return status, reason, resp_headers, data
+
+    @staticmethod
+    async def _read_response(reader, method):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by server')
+        _, status, *reason = status_line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+        status = int(status)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+
+        keep_alive = headers.get('connection', '').lower() != 'close'
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            return status, ' '.join(reason), headers, b'', keep_alive
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            data = b''.join(chunks)
+        elif 'content-length' in headers:
+            data = await reader.readexactly(int(headers['content-length']))
+        else:
+            data = await reader.read()
+            keep_alive = False
+        return status, ' '.join(reason), headers, data, keep_alive
+
+    async def request(self, method, endpoint, params=None, body=None, content_type='application/json'):
+        """Send a request and return the decoded JSON body (``None`` if empty)."""
+        path = self.url(endpoint, params)
+        attempts = self.retries + 1 if method in ('GET', 'HEAD', 'PUT', 'DELETE') else 1
+        for attempt in range(attempts):
+            async with self._slots:
+                try:
+                    with span('http', method=method, endpoint=endpoint, attempt=attempt + 1):
+                        status, reason, _, data = await self._send(method, path, body, content_type)
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as exc:
+                    if attempt + 1 == attempts:
+                        raise ApiError(f'{method} {path}: {exc!r}', code='NETWORK_ERROR') from exc
+                    status = None
+            if status is None or (status >= 500 and attempt + 1 < attempts):
+                await asyncio.sleep(min(0.25 * 2 ** attempt, 5) * (0.5 + random.random()))
+                continue
+            break
+
+        payload = None
+        if data:
+            try:
+                with span('parse', endpoint=endpoint, bytes=len(data)):
+                    payload = json.loads(data)
+            except ValueError:
+                payload = data.decode('utf-8', 'replace')
+        if not 200 <= status < 300:
+            message = f'HTTP {status}: {reason}'
+            if isinstance(payload, dict):
+                message = payload.get('error') or payload.get('message') or message
+            raise ApiError(message, code=str(status), details=payload)
+        return payload
+
+    async def get(self, endpoint, params=None):
+        return await self.request('GET', endpoint, params)
+
+    async def post(self, endpoint, payload=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        return await self.request('POST', endpoint, body=body)
@@ -0,0 +1,232 @@
+"""Template engine and incremental writer for generated pages.
+
+Templates are plain TSX files with slot markers: ``/*@ name @*/`` alone on a
+line is a block slot (the rendered block is indented to the marker column;
+an empty block drops the line), anywhere else it is an inline slot. Parsed templates are cached by path,
+mtime and size.
+
+Targets are only rewritten when their bytes change, and a JSON manifest
+records, per spec, the inputs digest and the output hash. When the inputs
+digest and the target's size/mtime match the manifest, rendering is skipped
+altogether.
+
+Several pages can be generated across a process pool: templates are parsed
+once in the parent and handed to every worker, so no worker re-reads or
+re-parses them.
+"""
+
+import dataclasses
+import functools
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from .render import indent, slots_for
+from .trace import count, span
+
+# Bump when renderers change output for an unchanged spec
+GENERATOR_VERSION = 3
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT_DIR = os.path.dirname(SCRIPTS_DIR)
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+DEFAULT_MANIFEST = os.path.join(SCRIPTS_DIR, '.write-reports-manifest.json')
+
+_SLOT = re.compile(r'^([ \t]*)/\*@ (\w+) @\*/\n|/\*@ (\w+) @\*/', re.M)
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass(frozen=True)
+class Template:
+    """Parsed template: literal chunks and ``(slot, indent)`` pairs."""
+
+    name: str
+    digest: str
+    parts: tuple
+
+    @property
+    def slots(self):
+        return {part[0] for part in self.parts if isinstance(part, tuple)}
+
+    def render(self, values):
+        missing = self.slots - values.keys()
+        if missing:
+            raise KeyError(f'{self.name}: no value for slots {sorted(missing)}')
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            slot, prefix = part
+            if prefix is None:
+                out.append(values[slot])
+            elif values[slot]:
+                out.append(indent(values[slot], prefix) + '\n')
+        return ''.join(out)
+
+
+def parse_template(name, text):
+    parts = []
+    pos = 0
+    for match in _SLOT.finditer(text):
+        parts.append(text[pos:match.start()])
+        if match.group(2):
+            parts.append((match.group(2), match.group(1)))
+        else:
+            parts.append((match.group(3), None))
+        pos = match.end()
+    parts.append(text[pos:])
+    return Template(name, sha256(text.encode('utf-8')), tuple(p for p in parts if p != ''))
+
+
+@functools.lru_cache(maxsize=None)
+def _load(path, mtime_ns, size):
+    with span('template.parse', template=os.path.basename(path)), open(path, encoding='utf-8') as f:
+        return parse_template(os.path.basename(path), f.read())
+
+
+def load_template(name, templates_dir=TEMPLATES_DIR):
+    path = os.path.join(templates_dir, name)
+    st = os.stat(path)
+    return _load(path, st.st_mtime_ns, st.st_size)
+
+
+def spec_digest(spec):
+    payload = json.dumps(dataclasses.asdict(spec), sort_keys=True, ensure_ascii=False)
+    return sha256(payload.encode('utf-8'))
+
+
+def write_if_changed(path, data):
+    """Write ``data`` atomically unless the file already holds those bytes."""
+    try:
+        with open(path, 'rb') as f:
+            if sha256(f.read()) == sha256(data):
+                return False
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f'{path}.tmp{os.getpid()}'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+def load_manifest(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'version': GENERATOR_VERSION, 'pages': {}}
+
+
+def save_manifest(path, manifest):
+    data = json.dumps(manifest, indent=2, sort_keys=True, ensure_ascii=False) + '\n'
+    write_if_changed(path, data.encode('utf-8'))
+
+
+@dataclass
+class Result:
+    name: str
+    target: str
+    status: str  # written | unchanged | skipped | stale
+    sha256: str
+    size: int
+
+
+def render_page(spec, template=None):
+    """Render ``spec``; returns ``(bytes, slot values)``."""
+    template = template or load_template(spec.template)
+    with span('slots', page=spec.name):
+        slots = slots_for(spec)
+    with span('render', page=spec.name):
+        return template.render(slots).encode('utf-8'), slots
+
+
+def generate_page(spec, root=ROOT_DIR, entry=None, force=False, check=False, template=None):
+    """Render one page if needed; returns ``(Result, manifest entry)``."""
+    template = template or load_template(spec.template)
+    target = os.path.join(root, spec.target)
+    inputs = sha256(f'{GENERATOR_VERSION}:{template.digest}:{spec_digest(spec)}'.encode('utf-8'))
+
+    if entry and not force and entry.get('inputs') == inputs:
+        try:
+            st = os.stat(target)
+        except FileNotFoundError:
+            st = None
+        if st and st.st_size == entry['size'] and st.st_mtime_ns == entry['mtime_ns']:
+            count('pages.skipped')
+            return Result(spec.name, spec.target, 'skipped', entry['sha256'], entry['size']), entry
+
+    data, slots = render_page(spec, template)
+    digest = sha256(data)
+    if check:
+        try:
+            with open(target, 'rb') as f:
+                current = sha256(f.read())
+        except FileNotFoundError:
+            current = None
+        status = 'unchanged' if current == digest else 'stale'
+        count(f'pages.{status}')
+        return Result(spec.name, spec.target, status, digest, len(data)), entry
+
+    with span('write', page=spec.name, bytes=len(data)):
+        status = 'written' if write_if_changed(target, data) else 'unchanged'
+    count(f'pages.{status}')
+    st = os.stat(target)
+    entry = {
+        'target': spec.target,
+        'template': spec.template,
+        'inputs': inputs,
+        'sha256': digest,
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'slots': {name: sha256(value.encode('utf-8'))[:12] for name, value in sorted(slots.items())},
+    }
+    return Result(spec.name, spec.target, status, digest, len(data)), entry
+
+
+# Plantillas ya parseadas, compartidas con los workers del pool
+_worker_templates = {}
+
+
+def _init_worker(templates):
+    _worker_templates.update(templates)
+
+
+def _generate_task(task):
+    spec, root, entry, force, check = task
+    return generate_page(spec, root, entry, force, check, _worker_templates[spec.template])
+
+
+def generate(pages, root=ROOT_DIR, manifest_path=DEFAULT_MANIFEST, force=False, check=False, jobs=1):
+    """Generate ``pages``; with ``jobs > 1`` pages are rendered in a process pool."""
+    manifest = load_manifest(manifest_path)
+    if manifest.get('version') != GENERATOR_VERSION:
+        manifest = {'version': GENERATOR_VERSION, 'pages': {}}
+    templates = {name: load_template(name) for name in {spec.template for spec in pages}}
+    tasks = [(spec, root, manifest['pages'].get(spec.name), force, check) for spec in pages]
+
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(tasks)), initializer=_init_worker, initargs=(templates,)
+        ) as pool:
+            outcomes = list(pool.map(_generate_task, tasks))
+    else:
+        _init_worker(templates)
+        outcomes = [_generate_task(task) for task in tasks]
+
+    results = []
+    for spec, (result, entry) in zip(pages, outcomes):
+        if entry is not None:
+            manifest['pages'][spec.name] = entry
+        results.append(result)
+    if not check:
+        with span('manifest.save'):
+            save_manifest(manifest_path, manifest)
+    return results
@@ -0,0 +1,109 @@
+"""Export columns of a report row, matching the generated ``exportToCSV``.
+
+Headers and order come from ``CSV_COLUMNS`` in ``reports_generate.py``;
+``_COLUMNS`` holds the Python counterpart of each TS value expression,
+computed a column at a time over a chunk of items (``export_columns``),
+which is what the streaming writers consume.
+"""
+
+from datetime import datetime
+
+from .params import BOGOTA
+from .reports_generate import CSV_COLUMNS
+
+
+def parse_date(value):
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _format_es_co(value):
+    date = parse_date(value)
+    if date is None:
+        return ''
+    date = date.astimezone(BOGOTA)
+    hour = date.hour % 12 or 12
+    period = 'a.\xa0m.' if date.hour < 12 else 'p.\xa0m.'
+    return f'{date.day:02d}/{date.month:02d}/{date.year}, {hour:02d}:{date.minute:02d} {period}'
+
+
+_HOURS = {}         # 'YYYY-MM-DDTHH' UTC -> ('dd/mm/yyyy, hh:', ' a.\xa0m.')
+_MAX_HOURS = 100_000
+
+
+def format_es_co(value):
+    """``toLocaleString('es-CO', {year, month, day, hour, minute})`` in Bogotá time.
+
+    E.g. ``'2026-03-05T19:07:00Z'`` -> ``'05/03/2026, 02:07 p.\\xa0m.'``.
+    UTC strings (what the API sends) reuse the formatted hour: Bogotá is a
+    whole number of hours from UTC, so only the minute changes within it.
+    """
+    if not value or value[-1] != 'Z' or len(value) < 17 or value[10] != 'T' or value[13] != ':':
+        return _format_es_co(value)
+    hour = _HOURS.get(value[:13])
+    if hour is None:
+        if len(_HOURS) >= _MAX_HOURS:
+            _HOURS.clear()
+        text = _format_es_co(value[:13] + ':00:00Z')
+        hour = _HOURS[value[:13]] = (text[:15], text[17:])
+    return hour[0] + value[14:16] + hour[1]
+
+
+def place_name(value):
+    # city/department pueden llegar como objetos poblados ({ name })
+    if isinstance(value, dict):
+        return value.get('name') or ''
+    return value or ''
+
+
+# Cada columna recibe los items de un bloque y la posición (0-based) del primero
+def _text(key):
+    return lambda items, start: [item.get(key) or '' for item in items]
+
+
+def _place(key):
+    return lambda items, start: [place_name(item.get(key)) for item in items]
+
+
+def _yes_no(key):
+    return lambda items, start: ['Sí' if item.get(key) else 'No' for item in items]
+
+
+_COLUMNS = {
+    'N°': lambda items, start: [str(n) for n in range(start + 1, start + len(items) + 1)],
+    'Nombre Completo': _text('fullName'),
+    'Identificación': _text('identification'),
+    'Email': _text('email'),
+    'Teléfono': _text('phone'),
+    'Género': _text('gender'),
+    'Edad': _text('ageRange'),
+    'Estrato': lambda items, start: [str(item['stratum']) if item.get('stratum') else '' for item in items],
+    'Departamento': _place('department'),
+    'Ciudad': _place('city'),
+    'Región': _text('region'),
+    'Barrio': _text('neighborhood'),
+    'Defensor Patria': _yes_no('isPatriaDefender'),
+    'Estado Encuesta': lambda items, start: [
+        'Exitosa' if item.get('surveyStatus') == 'successful' else 'No Exitosa' for item in items
+    ],
+    'Dispuesto Responder': _yes_no('willingToRespond'),
+    'Socializer': lambda items, start: [(item.get('socializer') or {}).get('fullName') or '' for item in items],
+    'Fecha Creación': lambda items, start: [format_es_co(item.get('createdAt')) for item in items],
+}
+
+HEADERS = tuple(c.header for c in CSV_COLUMNS)
+EXPORT_COLUMNS = tuple((header, _COLUMNS[header]) for header in HEADERS)
+
+
+def export_columns(items, start=0):
+    """One list of values per ``HEADERS`` column for the ``items`` list.
+
+    ``start`` is the 0-based position of ``items[0]`` in the export (``N°``).
+    """
+    return [values(items, start) for _, values in EXPORT_COLUMNS]
+
+
+def export_row(item, idx):
+    """Values of one ``ReportItem`` (``idx`` is its 0-based position in the export)."""
+    return [column[0] for column in export_columns([item], idx)]
@@ -0,0 +1,374 @@
+"""Duplicate-respondent detection with blocking indexes.
+
+Comparing every pair of respondents is quadratic, so records are first put
+into blocks that share a cheap key and only pairs inside a block are scored:
+
+- ``id:``    normalized ``identification`` (digits and letters only, without
+  leading zeros), whatever the ``idType``;
+- ``phone:`` the 10-digit Colombian number, without ``+57`` or separators;
+- ``name:``  the neighborhood (the city when it is empty) plus two phonetic
+  name tokens, one key per token pair, so a typo or a missing second surname
+  still shares a block with the original.
+
+Blocks larger than ``max_block`` (placeholder IDs, an office phone typed on
+every survey, very common names in a big neighborhood) are skipped and
+reported instead of compared. Blocks are scored in a process pool.
+
+A pair's score combines its evidence as a noisy-OR (same ID, same phone,
+name similarity within the neighborhood) and is cut down when both records
+carry different IDs. A near-identical name that sounds the same (``'Jose
+Gomez'`` / ``'Jose Gomes'`` in Suba) is enough on its own; one that differs in
+sound (``'Maria Lopez'`` / ``'Marta Lopez'``) needs more evidence. Pairs at or above ``min_score`` are linked into clusters
+with union-find, strongest first; the cluster confidence is its weakest link.
+"""
+
+import itertools
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+from .columns import place_name
+from .params import fold
+from .trace import count, span
+
+MAX_BLOCK = 500
+MIN_SCORE = 0.5
+PAIRS_PER_TASK = 20_000
+
+# Partículas que no distinguen nombres
+NAME_STOPWORDS = frozenset(('de', 'del', 'la', 'las', 'los', 'y', 'da', 'do', 'dos', 'san'))
+NAME_KEY_TOKENS = 4
+
+# Evidencia de cada coincidencia (se combinan como noisy-OR)
+SAME_ID = 0.97
+SAME_ID_OTHER_TYPE = 0.85
+SAME_PHONE = 0.5
+SAME_PHONE_OTHER_NAME = 0.15
+SAME_NAME = 0.6
+NAME_THRESHOLD = 0.8
+# Dos documentos distintos: casi seguro son personas distintas (p. ej. familia con un solo teléfono)
+DIFFERENT_IDS = 0.25
+
+_NON_ALNUM = re.compile(r'[^0-9A-Z]')
+_NON_DIGIT = re.compile(r'\D')
+_REPEATED = re.compile(r'(.)\1+')
+
+# Reglas fonéticas del español, en orden; el resultado usa mayúsculas como códigos
+_PHONETIC_RULES = (
+    (re.compile(r'[^a-z]'), ''),
+    (re.compile(r'ch'), 'X'),
+    (re.compile(r'll|y(?=[aeiou])'), 'Y'),
+    (re.compile(r'qu(?=[ei])|k|c(?![ei])'), 'K'),
+    # g y j en un solo código: 'Rodriguez'/'Rodriges', 'Jiménez'/'Giménez'
+    (re.compile(r'gu(?=[ei])|g|j'), 'J'),
+    (re.compile(r'c(?=[ei])|z|s'), 'S'),
+    (re.compile(r'x'), 'KS'),
+    (re.compile(r'[vw]|b'), 'B'),
+    (re.compile(r'h'), ''),
+    (re.compile(r'y'), 'i'),
+)
+
+
+def normalize_id(value):
+    """``'1.023.456-7'`` -> ``'10234567'``; ``None`` for placeholders."""
+    text = _NON_ALNUM.sub('', str(value or '').upper()).lstrip('0')
+    if len(text) < 5 or len(set(text)) == 1:
+        return None
+    return text
+
+
+def normalize_phone(value):
+    """Last 10 digits of a Colombian number (``+57 300 123 4567`` -> ``3001234567``)."""
+    digits = _NON_DIGIT.sub('', str(value or ''))
+    if len(digits) > 10 and digits.startswith('57'):
+        digits = digits[2:]
+    digits = digits[-10:]
+    if len(digits) < 7 or len(set(digits)) == 1:
+        return None
+    return digits
+
+
+@lru_cache(maxsize=1 << 16)
+def phonetic(word):
+    """Phonetic code of a Spanish word: ``'Rodríguez'`` and ``'Rodriges'`` -> ``'RDRJS'``."""
+    text = fold(word)
+    for pattern, code in _PHONETIC_RULES:
+        text = pattern.sub(code, text)
+    if not text:
+        return ''
+    # Primera letra (vocal incluida) y luego solo consonantes, sin repetidas
+    head, tail = text[0].upper(), re.sub(r'[aeiou]', '', text[1:])
+    return _REPEATED.sub(r'\1', head + tail.upper())
+
+
+def name_tokens(name):
+    return [t for t in re.findall(r'[a-z]+', fold(name)) if len(t) > 1 and t not in NAME_STOPWORDS]
+
+
+@dataclass(frozen=True)
+class Respondent:
+    """Fields of a record used for blocking and scoring."""
+
+    key: tuple  # (zona, _id)
+    ident: str
+    id_type: str
+    phone: str
+    name: str  # tokens plegados y ordenados
+    sound: str  # códigos fonéticos de los tokens, ordenados
+    place: str
+
+    @classmethod
+    def from_doc(cls, zone, doc):
+        tokens = name_tokens(doc.get('fullName'))
+        place = fold(doc.get('neighborhood') or place_name(doc.get('city'))).strip()
+        return cls(
+            key=(zone, doc['_id']),
+            ident=normalize_id(doc.get('identification')),
+            id_type=(doc.get('idType') or '').upper(),
+            phone=normalize_phone(doc.get('phone')),
+            name=' '.join(sorted(tokens)),
+            sound=' '.join(sorted(phonetic(t) for t in tokens)),
+            place=place,
+        )
+
+    def blocking_keys(self):
+        keys = []
+        if self.ident:
+            keys.append(f'id:{self.ident}')
+        if self.phone:
+            keys.append(f'phone:{self.phone}')
+        if self.place:
+            codes = sorted({phonetic(t) for t in self.name.split()[:NAME_KEY_TOKENS]} - {''})
+            keys.extend(f'name:{self.place}|{a}|{b}' for a, b in itertools.combinations(codes, 2))
+        return keys
+
+
+def name_similarity(a, b, floor=0.0):
+    """Similarity ratio of two folded names, ``0.0`` when it cannot reach ``floor``."""
+    if not a or not b:
+        return 0.0
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    # Cotas superiores baratas antes del ratio exacto
+    if matcher.real_quick_ratio() < floor or matcher.quick_ratio() < floor:
+        return 0.0
+    return matcher.ratio()
+
+
+def score_pair(a, b):
+    """``(score, reasons)`` of two respondents.
+
+    In the same neighborhood and with nothing else in common, ``'Jose Gomez'`` and
+    ``'Jose Gomes'`` score ``0.6`` (same sound, linked at the default ``MIN_SCORE``)
+    while ``'Maria Lopez'`` and ``'Marta Lopez'`` score ``0.327``.
+    """
+    evidence, reasons = [], []
+    same_phone = a.phone and a.phone == b.phone
+    same_place = a.place and a.place == b.place
+    # La similitud solo importa desde 0.6 con el mismo teléfono o desde NAME_THRESHOLD en el mismo barrio
+    floor = 0.6 if same_phone else NAME_THRESHOLD
+    similarity = name_similarity(a.name, b.name, floor) if same_phone or same_place else 0.0
+    if a.ident and a.ident == b.ident:
+        same_type = not a.id_type or not b.id_type or a.id_type == b.id_type
+        evidence.append(SAME_ID if same_type else SAME_ID_OTHER_TYPE)
+        reasons.append('id' if same_type else 'id-other-type')
+    if same_phone:
+        evidence.append(SAME_PHONE if similarity >= 0.6 else SAME_PHONE_OTHER_NAME)
+        reasons.append('phone')
+    if same_place and similarity >= NAME_THRESHOLD:
+        # Misma pronunciación: es el mismo nombre mal escrito ('Gomez'/'Gomes'), peso completo
+        ramp = 1.0 if a.sound == b.sound else (similarity - NAME_THRESHOLD) / (1 - NAME_THRESHOLD)
+        evidence.append(SAME_NAME * ramp)
+        reasons.append(f'name:{similarity:.2f}')
+    miss = 1.0
+    for e in evidence:
+        miss *= 1 - e
+    score = 1 - miss
+    if a.ident and b.ident and a.ident != b.ident:
+        score *= DIFFERENT_IDS
+        reasons.append('different-ids')
+    return round(score, 3), reasons
+
+
+def _score_blocks(task):
+    """Matched pairs ``(i, j, score, reasons)`` of a batch of ``(block number, members)``.
+
+    Members are ``(index, Respondent, numbers of its blocks)``; a pair is scored
+    (and counted) only in the first block both belong to, whatever task holds it.
+    """
+    blocks, min_score = task
+    matches, compared = [], 0
+    with span('score.task', blocks=len(blocks)):
+        for number, block in blocks:
+            for (i, a, in_a), (j, b, in_b) in itertools.combinations(block, 2):
+                if min(in_a & in_b) != number:
+                    continue
+                pair = (i, j) if i < j else (j, i)
+                compared += 1
+                score, reasons = score_pair(a, b)
+                if score >= min_score:
+                    matches.append((*pair, score, reasons))
+    count('pairs', compared)
+    return matches, compared
+
+
+def build_blocks(respondents, max_block=MAX_BLOCK):
+    """``(blocks, oversized)``: ``{record indices: key}`` of the blocks to compare and the skipped ``(key, size)``."""
+    index = {}
+    for i, respondent in enumerate(respondents):
+        for key in respondent.blocking_keys():
+            index.setdefault(key, []).append(i)
+    blocks, oversized = {}, []
+    for key, members in index.items():
+        if len(members) < 2:
+            continue
+        if len(members) > max_block:
+            oversized.append((key, len(members)))
+            continue
+        # Bloques con los mismos miembros (p. ej. mismo ID y mismo teléfono) se comparan una vez
+        blocks.setdefault(tuple(members), key)
+    oversized.sort(key=lambda item: -item[1])
+    return blocks, oversized
+
+
+def _tasks(respondents, blocks, min_score):
+    """Blocks grouped into tasks of about ``PAIRS_PER_TASK`` comparisons, largest first."""
+    ordered = sorted(blocks, key=len, reverse=True)
+    # Bloques de cada registro, numerados en ese orden: cada par es del primero que comparten
+    memberships = {}
+    for number, members in enumerate(ordered):
+        for i in members:
+            memberships.setdefault(i, set()).add(number)
+    memberships = {i: frozenset(numbers) for i, numbers in memberships.items()}
+    batch, pairs = [], 0
+    for number, members in enumerate(ordered):
+        batch.append((number, [(i, respondents[i], memberships[i]) for i in members]))
+        pairs += len(members) * (len(members) - 1) // 2
+        if pairs >= PAIRS_PER_TASK:
+            yield batch, min_score
+            batch, pairs = [], 0
+    if batch:
+        yield batch, min_score
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        root = self.parent.setdefault(x, x)
+        while root != self.parent[root]:
+            root = self.parent[root]
+        while x != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        self.parent[max(ra, rb)] = min(ra, rb)
+        return True
+
+
+def cluster(matches):
+    """Clusters ``[(members, links)]`` from matched pairs; ``links`` are the spanning-tree edges."""
+    uf = _UnionFind()
+    links = []
+    # Kruskal: las aristas más fuertes primero, así la más débil del árbol es la confianza
+    for i, j, score, reasons in sorted(matches, key=lambda m: (-m[2], m[0], m[1])):
+        if uf.union(i, j):
+            links.append((i, j, score, reasons))
+    groups = {}
+    for i, j, score, reasons in links:
+        groups.setdefault(uf.find(i), []).append((i, j, score, reasons))
+    clusters = []
+    for edges in groups.values():
+        members = sorted({i for i, _, _, _ in edges} | {j for _, j, _, _ in edges})
+        clusters.append((members, edges))
+    return clusters
+
+
+@dataclass
+class DedupStats:
+    records: int = 0
+    blocks: dict = field(default_factory=dict)
+    oversized: list = field(default_factory=list)
+    compared: int = 0
+    matched: int = 0
+    clusters: int = 0
+    duplicates: int = 0
+    elapsed: float = 0.0
+
+    def as_dict(self):
+        return {
+            'records': self.records,
+            'blocks': self.blocks,
+            'oversizedBlocks': [{'key': key, 'size': size} for key, size in self.oversized[:20]],
+            'pairsCompared': self.compared,
+            'pairsMatched': self.matched,
+            'clusters': self.clusters,
+            'duplicateRecords': self.duplicates,
+            'elapsedSeconds': round(self.elapsed, 3),
+        }
+
+
+MEMBER_FIELDS = ('_id', 'fullName', 'idType', 'identification', 'phone', 'neighborhood', 'createdAt')
+
+
+def find_duplicates(docs, min_score=MIN_SCORE, max_block=MAX_BLOCK, jobs=1):
+    """Duplicate clusters among ``docs`` (``(zone, doc)`` pairs), most confident first.
+
+    Returns ``(clusters, DedupStats)``; each cluster is a JSON-ready dict with
+    its confidence, the member records and the links that joined them.
+    """
+    started = time.perf_counter()
+    with span('load'):
+        docs = list(docs)
+        respondents = [Respondent.from_doc(zone, doc) for zone, doc in docs]
+    with span('blocks', records=len(respondents)):
+        blocks, oversized = build_blocks(respondents, max_block)
+    stats = DedupStats(records=len(respondents), oversized=oversized)
+    for key in blocks.values():
+        kind = key.split(':', 1)[0]
+        stats.blocks[kind] = stats.blocks.get(kind, 0) + 1
+    tasks = list(_tasks(respondents, blocks, min_score))
+
+    with span('score', tasks=len(tasks)):
+        if jobs > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+                outcomes = list(pool.map(_score_blocks, tasks))
+        else:
+            outcomes = [_score_blocks(task) for task in tasks]
+
+    matches = {}
+    for found, compared in outcomes:
+        stats.compared += compared
+        for i, j, score, reasons in found:
+            matches[(i, j)] = (i, j, score, reasons)
+    stats.matched = len(matches)
+
+    result = []
+    with span('cluster', pairs=len(matches)):
+        clusters = cluster(matches.values())
+    for members, links in clusters:
+        def member(i):
+            zone, doc = docs[i]
+            return {'zone': zone, **{name: doc.get(name) for name in MEMBER_FIELDS}}
+
+        result.append({
+            'confidence': min(score for _, _, score, _ in links),
+            'size': len(members),
+            'members': [member(i) for i in members],
+            'links': [
+                {'a': list(respondents[i].key), 'b': list(respondents[j].key), 'score': score, 'reasons': reasons}
+                for i, j, score, reasons in links
+            ],
+        })
+    result.sort(key=lambda c: (-c['confidence'], -c['size'], c['members'][0]['_id']))
+    stats.clusters = len(result)
+    stats.duplicates = sum(c['size'] - 1 for c in result)
+    stats.elapsed = time.perf_counter() - started
+    return result, stats
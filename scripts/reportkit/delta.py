@@ -0,0 +1,316 @@
+"""Watermark-based delta export of ``/dashboard002`` respondents, one store per zone.
+
+Layout::
+
+    <root>/<zone>/
+        state.json              tracked range, watermark, index file, run log
+        index-000042.tsv.gz     ``_id``, createdAt and updatedAt (epoch ms) of every known record
+        changes/000042.jsonl.gz one file per run with changes: upserts and deletions
+
+The first run downloads the tracked range (``startDate`` to today) sorted by
+``createdAt``. Later runs ask for it sorted by ``updatedAt`` descending and
+stop paging at the first record older than the watermark, like
+``ReportCache.sync``; records whose ``updatedAt`` is not newer than the
+index (the margin re-reads) are not written again.
+
+Deletions are found by reconciling ID sets without downloading them all: the
+number of indexed records created in a range of days is compared with the
+``totalItems`` the API reports for it (one ``perPage=1`` request). Ranges
+that agree are skipped and the others are halved down to single days, whose
+IDs are then fetched and diffed against the index. New records are already
+indexed at that point, so a surplus can only come from deletions; a record
+created and another deleted on the same day while the run was going cancel
+out and are caught by the next run.
+
+``state.json`` is the commit point: the change file and the new index are
+written first, so an interrupted run leaves the previous state intact and
+the next one rewrites the same sequence number.
+"""
+
+import asyncio
+import bisect
+import gzip
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from .columns import parse_date
+from .export import fetch_page, iter_pages
+from .params import BOGOTA, date_bound
+from .trace import count, span
+
+WATERMARK_MARGIN = 300  # segundos
+DEFAULT_ROOT = os.path.join(os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share'), 'soci-delta')
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+def _millis(value):
+    moment = parse_date(value)
+    return int(moment.timestamp() * 1000) if moment else 0
+
+
+def _write_json(path, data):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _write_gzip_lines(path, lines):
+    tmp = f'{path}.tmp'
+    # mtime=0: el mismo contenido produce los mismos bytes
+    with open(tmp, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+        for line in lines:
+            f.write(line.encode('utf-8') + b'\n')
+    os.replace(tmp, path)
+
+
+def today():
+    return datetime.now(BOGOTA).date().isoformat()
+
+
+def days_between(start, end):
+    """``YYYY-MM-DD`` days from ``start`` to ``end``, both included."""
+    first, last = date.fromisoformat(start), date.fromisoformat(end)
+    return [(first + timedelta(days=n)).isoformat() for n in range((last - first).days + 1)]
+
+
+@dataclass
+class DeltaStats:
+    zone: str
+    mode: str = 'full'
+    fetched: int = 0
+    pages: int = 0
+    upserts: int = 0
+    unchanged: int = 0
+    deletes: int = 0
+    count_requests: int = 0
+    reconciled_days: list = field(default_factory=list)
+    records: int = 0
+    change_file: str = None
+    elapsed: float = 0.0
+
+    def as_dict(self):
+        return {
+            'zone': self.zone,
+            'mode': self.mode,
+            'fetched': self.fetched,
+            'pages': self.pages,
+            'upserts': self.upserts,
+            'unchanged': self.unchanged,
+            'deletes': self.deletes,
+            'countRequests': self.count_requests,
+            'reconciledDays': self.reconciled_days,
+            'records': self.records,
+            'changeFile': self.change_file,
+            'elapsedSeconds': round(self.elapsed, 3),
+        }
+
+
+class DeltaStore:
+    """Change files and ID index of one zone."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.join(path, 'changes'), exist_ok=True)
+        try:
+            with open(os.path.join(path, 'state.json'), encoding='utf-8') as f:
+                self.state = json.load(f)
+        except FileNotFoundError:
+            self.state = {'startDate': None, 'watermark': None, 'index': None, 'next': 1, 'runs': []}
+        self.index = self._load_index()
+
+    @classmethod
+    def open(cls, zone, root=DEFAULT_ROOT):
+        return cls(os.path.join(root, zone))
+
+    @staticmethod
+    def zones(root=DEFAULT_ROOT):
+        """Names of the zones with a store under ``root``."""
+        if not os.path.isdir(root):
+            return []
+        return sorted(name for name in os.listdir(root) if os.path.exists(os.path.join(root, name, 'state.json')))
+
+    @property
+    def watermark(self):
+        """``updatedAt`` (epoch ms) below which every change is already exported."""
+        return self.state['watermark']
+
+    def _load_index(self):
+        """``{_id: (createdAt ms, updatedAt ms)}`` as of the last committed run."""
+        index = {}
+        if not self.state['index']:
+            return index
+        with gzip.open(os.path.join(self.path, self.state['index']), 'rt', encoding='utf-8') as f:
+            for line in f:
+                record_id, created, updated = line.rstrip('\n').split('\t')
+                index[record_id] = (int(created), int(updated))
+        return index
+
+    def change_files(self):
+        """Paths of the change files, oldest first."""
+        return [os.path.join(self.path, 'changes', run['file']) for run in self.state['runs']]
+
+    def records(self):
+        """Current ``{_id: doc}`` of the zone, replaying the change files in order."""
+        docs = {}
+        for path in self.change_files():
+            for change in read_changes(path):
+                if change['op'] == 'upsert':
+                    docs[change['doc']['_id']] = change['doc']
+                else:
+                    docs.pop(change['id'], None)
+        return docs
+
+    def _commit(self, index, changes, watermark, stats, started):
+        seq = self.state['next']
+        state = dict(self.state, watermark=watermark, syncedAt=int(started * 1000))
+        if changes:
+            name = f'{seq:06d}.jsonl.gz'
+            _write_gzip_lines(os.path.join(self.path, 'changes', name), changes)
+            index_name = f'index-{seq:06d}.tsv.gz'
+            _write_gzip_lines(
+                os.path.join(self.path, index_name),
+                (f'{record_id}\t{created}\t{updated}' for record_id, (created, updated) in index.items()),
+            )
+            state.update(index=index_name, next=seq + 1, runs=self.state['runs'] + [{
+                'seq': seq,
+                'file': name,
+                'upserts': stats.upserts,
+                'deletes': stats.deletes,
+                'watermark': watermark,
+                'at': int(started * 1000),
+            }])
+            stats.change_file = os.path.join(self.path, 'changes', name)
+        _write_json(os.path.join(self.path, 'state.json'), state)
+        if self.state['index'] and self.state['index'] != state['index']:
+            os.remove(os.path.join(self.path, self.state['index']))
+        self.state, self.index = state, index
+
+    # ---- Cambios desde la marca de agua ----
+
+    async def _fetch_changes(self, api, query, per_page, concurrency, stats):
+        """Records created or updated since the watermark (everything on the first run)."""
+        if self.watermark is None:
+            async for _, data in iter_pages(api, {**query, 'sortBy': 'createdAt', 'sortOrder': 'asc'}, per_page, 1, concurrency):
+                surveys = data.get('surveys') or []
+                stats.fetched += len(surveys)
+                stats.pages += 1
+                yield surveys
+            return
+        query = {**query, 'sortBy': 'updatedAt', 'sortOrder': 'desc'}
+        page = 1
+        while True:
+            data = await fetch_page(api, query, page, per_page)
+            surveys = data.get('surveys') or []
+            fresh = [s for s in surveys if _millis(s.get('updatedAt')) >= self.watermark]
+            stats.fetched += len(surveys)
+            stats.pages += 1
+            yield fresh
+            if len(fresh) < len(surveys) or page >= (data.get('totalPages') or 0):
+                return
+            page += 1
+
+    # ---- Reconciliación de IDs ----
+
+    async def _remote_total(self, api, start, end, stats):
+        data = await fetch_page(api, {'startDate': start, 'endDate': end}, 1, 1)
+        stats.count_requests += 1
+        return data.get('totalItems') or 0
+
+    async def _remote_ids(self, api, day, per_page, concurrency, stats):
+        query = {'startDate': day, 'endDate': day, 'sortBy': 'createdAt', 'sortOrder': 'asc'}
+        ids = set()
+        async for _, data in iter_pages(api, query, per_page, 1, concurrency):
+            ids.update(s['_id'] for s in data.get('surveys') or [])
+            stats.pages += 1
+        return ids
+
+    async def _deleted(self, api, index, days, per_page, concurrency, stats):
+        """IDs in ``index`` that the API no longer returns, found by bisecting ``days``."""
+        by_created = sorted((created, record_id) for record_id, (created, _) in index.items())
+        created = [c for c, _ in by_created]
+
+        def local(start, end):
+            lo = bisect.bisect_left(created, date_bound(start) * 1000)
+            hi = bisect.bisect_left(created, date_bound(end, end=True) * 1000)
+            return lo, hi
+
+        deleted = []
+
+        async def check(lo_day, hi_day):
+            start, end = days[lo_day], days[hi_day - 1]
+            lo, hi = local(start, end)
+            if hi - lo <= await self._remote_total(api, start, end, stats):
+                return
+            if hi_day - lo_day > 1:
+                mid = (lo_day + hi_day) // 2
+                await asyncio.gather(check(lo_day, mid), check(mid, hi_day))
+                return
+            remote = await self._remote_ids(api, start, per_page, concurrency, stats)
+            deleted.extend(record_id for _, record_id in by_created[lo:hi] if record_id not in remote)
+            stats.reconciled_days.append(start)
+
+        if days:
+            await check(0, len(days))
+        stats.reconciled_days.sort()
+        return deleted
+
+    # ---- Corrida ----
+
+    async def run(self, api, zone, start_date=None, per_page=1000, concurrency=4, deletions=True, progress=None):
+        """Export what changed since the last run into a new change file."""
+        started = time.time()
+        stats = DeltaStats(zone=zone, mode='full' if self.watermark is None else 'incremental')
+        tracked = self.state['startDate'] or start_date
+        if not tracked:
+            raise ValueError(f'{zone}: la primera corrida requiere --startDate')
+        if start_date and start_date != tracked:
+            raise ValueError(f'{zone}: el almacén sigue desde {tracked}, no desde {start_date}')
+        self.state['startDate'] = tracked
+        end_date = max(today(), tracked)
+        query = {'startDate': tracked, 'endDate': end_date}
+
+        index = dict(self.index)
+        changes = []
+        newest = self.watermark or 0
+        async for surveys in self._fetch_changes(api, query, per_page, concurrency, stats):
+            count('records', len(surveys))
+            for item in surveys:
+                created, updated = _millis(item.get('createdAt')), _millis(item.get('updatedAt'))
+                newest = max(newest, updated)
+                # Ya exportado (relectura del margen) o versión más vieja que la indexada
+                if updated <= index.get(item['_id'], (0, -1))[1]:
+                    stats.unchanged += 1
+                    continue
+                index[item['_id']] = (created, updated)
+                changes.append(_encode({'op': 'upsert', 'doc': item}))
+                stats.upserts += 1
+            if progress:
+                progress(stats)
+
+        if deletions and self.watermark is not None:
+            days = days_between(tracked, end_date)
+            with span('deletions', zone=zone, days=len(days)):
+                deleted = await self._deleted(api, index, days, per_page, concurrency, stats)
+            for record_id in sorted(deleted, key=lambda i: index[i][0]):
+                created, _ = index.pop(record_id)
+                changes.append(_encode({'op': 'delete', 'id': record_id, 'createdAt': created}))
+                stats.deletes += 1
+
+        watermark = min(newest, int((started - WATERMARK_MARGIN) * 1000))
+        with span('commit', zone=zone, changes=len(changes)):
+            self._commit(index, changes, max(watermark, self.watermark or 0), stats, started)
+        stats.records = len(self.index)
+        stats.elapsed = time.time() - started
+        return stats
+
+
+def read_changes(path):
+    """Yield the ``{'op': 'upsert', 'doc': ...}``/``{'op': 'delete', 'id': ...}`` entries of a change file."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
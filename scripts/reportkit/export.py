@@ -0,0 +1,213 @@
+"""Full-report export through ``/dashboard002``, page by page.
+
+Pages are fetched with bounded concurrency but written strictly in order,
+so at most ``concurrency`` pages are held in memory whatever the report
+size. After every page the output is flushed and a checkpoint (next page,
+rows and byte offset) is saved next to it; rerunning the same export
+truncates the file to the checkpoint and continues from there.
+
+XLSX and Parquet outputs go through the ``writers`` of those formats. They
+are streamed the same way but only valid once closed, so they cannot be
+resumed and always start from the first page.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import resource
+import sys
+import time
+from dataclasses import dataclass
+
+from .client import ApiError
+from .columns import HEADERS, export_columns
+from .params import dashboard002_query
+from .trace import count, span
+from .writers import csv_text, open_writer
+
+DASHBOARD_002 = '/dashboard002'
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process, in MiB."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss: KiB en Linux, bytes en macOS
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+@dataclass
+class ExportStats:
+    rows: int = 0
+    pages: int = 0
+    total_items: int = 0
+    total_pages: int = 0
+    resumed_from: int = 1
+    elapsed: float = 0.0
+    requests: int = 0
+    bytes_received: int = 0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'pages': self.pages,
+            'totalItems': self.total_items,
+            'totalPages': self.total_pages,
+            'resumedFromPage': self.resumed_from,
+            'elapsedSeconds': round(self.elapsed, 3),
+            'rowsPerSecond': round(self.rows_per_second, 1),
+            'requests': self.requests,
+            'bytesReceived': self.bytes_received,
+            'peakRssMb': round(peak_rss_mb(), 1),
+        }
+
+
+class Checkpoint:
+    """Progress of one export, stored as JSON next to the output file."""
+
+    def __init__(self, path, signature):
+        self.path = path
+        self.signature = signature
+        self.next_page = 1
+        self.rows = 0
+        self.offset = 0
+
+    def load(self):
+        """Restore progress if the checkpoint belongs to the same export."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return False
+        if data.get('signature') != self.signature:
+            return False
+        self.next_page, self.rows, self.offset = data['nextPage'], data['rows'], data['offset']
+        return True
+
+    def save(self, total_pages):
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'signature': self.signature,
+                'nextPage': self.next_page,
+                'rows': self.rows,
+                'offset': self.offset,
+                'totalPages': total_pages,
+            }, f)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def export_signature(query, per_page, out_path, bom=False):
+    payload = json.dumps({'query': query, 'perPage': per_page, 'out': os.path.abspath(out_path), 'bom': bom})
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+async def fetch_page(api, query, page, per_page):
+    params = dashboard002_query({**query, 'page': page, 'perPage': per_page})
+    with span('fetch', page=page):
+        response = await api.get(DASHBOARD_002, params)
+    data = (response or {}).get('data')
+    if not isinstance(data, dict):
+        raise ApiError(f'Unexpected /dashboard002 response for page {page}', details=response)
+    return data
+
+
+async def iter_pages(api, query, per_page, start=1, concurrency=4):
+    """Yield ``(page, data)`` in page order with up to ``concurrency`` requests in flight."""
+    first = await fetch_page(api, query, start, per_page)
+    total_pages = first.get('totalPages') or 0
+    yield start, first
+    pending = {}
+    scheduled = start + 1
+    try:
+        for page in range(start + 1, total_pages + 1):
+            while scheduled <= total_pages and len(pending) < concurrency:
+                pending[scheduled] = asyncio.create_task(fetch_page(api, query, scheduled, per_page))
+                scheduled += 1
+            yield page, await pending.pop(page)
+    finally:
+        for task in pending.values():
+            task.cancel()
+
+
+async def export_report(api, query, out_path, per_page=1000, concurrency=4, resume=True, progress=None,
+                        fmt='csv', bom=False):
+    """Export every row matching ``query`` (Dashboard002Params) to ``out_path``.
+
+    ``fmt`` is ``csv`` (resumable), ``xlsx`` or ``parquet``; ``bom`` prefixes
+    the CSV with the UTF-8 BOM.
+    """
+    if fmt != 'csv':
+        return await _export_writer(api, query, out_path, fmt, per_page, concurrency, progress)
+    checkpoint = Checkpoint(f'{out_path}.checkpoint.json', export_signature(query, per_page, out_path, bom))
+    resumed = resume and checkpoint.load() and os.path.exists(out_path)
+    if not resumed:
+        checkpoint = Checkpoint(checkpoint.path, checkpoint.signature)
+
+    stats = ExportStats(resumed_from=checkpoint.next_page)
+    started = time.perf_counter()
+    with open(out_path, 'r+b' if resumed else 'wb') as out:
+        if resumed:
+            out.truncate(checkpoint.offset)
+            out.seek(checkpoint.offset)
+        else:
+            out.write((('\ufeff' if bom else '') + csv_text([[h] for h in HEADERS])).encode('utf-8'))
+            checkpoint.offset = out.tell()
+
+        async for page, data in iter_pages(api, query, per_page, checkpoint.next_page, concurrency):
+            surveys = data.get('surveys') or []
+            stats.total_items = data.get('totalItems', stats.total_items)
+            stats.total_pages = data.get('totalPages', stats.total_pages)
+            with span('serialize', page=page, rows=len(surveys)):
+                chunk = csv_text(export_columns(surveys, checkpoint.rows)).encode('utf-8') if surveys else b''
+            with span('flush', page=page, bytes=len(chunk)):
+                out.write(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+            checkpoint.rows += len(surveys)
+            checkpoint.offset = out.tell()
+            checkpoint.next_page = page + 1
+            with span('checkpoint', page=page):
+                checkpoint.save(stats.total_pages)
+            count('rows', len(surveys))
+            stats.rows += len(surveys)
+            stats.pages += 1
+            if progress:
+                progress(page, stats)
+
+    checkpoint.clear()
+    stats.elapsed = time.perf_counter() - started
+    stats.requests = api.requests
+    stats.bytes_received = api.bytes_received
+    return stats
+
+
+async def _export_writer(api, query, out_path, fmt, per_page, concurrency, progress):
+    stats = ExportStats()
+    started = time.perf_counter()
+    with open_writer(out_path, fmt) as writer:
+        async for page, data in iter_pages(api, query, per_page, 1, concurrency):
+            surveys = data.get('surveys') or []
+            stats.total_items = data.get('totalItems', stats.total_items)
+            stats.total_pages = data.get('totalPages', stats.total_pages)
+            with span('serialize', page=page, rows=len(surveys)):
+                columns = export_columns(surveys, writer.rows)
+            writer.write(columns)
+            stats.rows += len(surveys)
+            stats.pages += 1
+            if progress:
+                progress(page, stats)
+    stats.elapsed = time.perf_counter() - started
+    stats.requests = api.requests
+    stats.bytes_received = api.bytes_received
+    return stats
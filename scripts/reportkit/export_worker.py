@@ -0,0 +1,40 @@
+"""CSV export Web Workers of the generated report pages.
+
+A page with ``export_worker`` set exports from a worker instead of the main
+thread: the worker pages through the whole ``getDashboard002Report`` result
+(``export_page_size`` rows per request, the next page downloading while the
+current one is formatted), escapes every cell, appends each page to the
+output as its own Blob and reports progress after each page. The worker is
+generated from the page spec (``ReportItem`` and CSV columns) with the
+page template's ``.export.worker.ts.tpl`` sibling.
+"""
+
+import dataclasses
+
+
+def worker_template(page):
+    return page.template.split('.', 1)[0] + '.export.worker.ts.tpl'
+
+
+def worker_page(page):
+    """Spec rendering the export worker of ``page``."""
+    return dataclasses.replace(
+        page,
+        name=f'{page.name}.export-worker',
+        template=worker_template(page),
+        target=page.export_worker,
+    )
+
+
+def with_export_workers(pages):
+    """``pages`` plus one worker spec per distinct ``export_worker`` target.
+
+    Zone pages share the worker of their base page: the worker only depends
+    on the item and CSV columns, and the zone API URL travels with each
+    export request.
+    """
+    workers = {}
+    for page in pages:
+        if page.export_worker and page.export_worker not in workers:
+            workers[page.export_worker] = worker_page(page)
+    return list(pages) + list(workers.values())
@@ -0,0 +1,273 @@
+"""One ``/dashboard002`` query over every zone API, merged into a national report.
+
+Each zone build talks to its own backend (``zona[N]-api...``, BUILD_ZONES.md),
+so a national view is the union of the zone reports. ``FederatedQuery`` sends
+the same ``Dashboard002Params`` to all zones at once, one ``ApiClient`` (one
+connection pool) per zone, and merges the zone results with a heap. Every
+zone already returns its rows ordered by ``sortBy``/``sortOrder``, so the
+merge yields the order a single backend would give the union.
+
+Global page ``p`` of ``perPage`` rows needs at most the first ``p * perPage``
+rows of each zone. Zones are read in batches of that size (capped at
+``batch``), with the next batch of a zone requested while the current one is
+merged, and the merge stops at the last row of the page: memory holds about
+two batches per zone whatever the size of the zones.
+
+Layout (``data`` of ``page``, a ``Dashboard002Response`` plus the zone totals)::
+
+    {"currentPage": 3, "itemsPerPage": 50, "totalItems": 181234, "totalPages": 3625,
+     "filters": {"startDate": "2026-01-01", "sortBy": "city"},
+     "zones": {"zona1": 40211, "zona3": 98001, ...},
+     "surveys": [{..., "zone": "zona3"}, ...]}
+
+The merge key of each ``sortBy`` mirrors the backend order (text without
+accents or case, ``identification`` and ``stratum`` as numbers); ties go in
+``createdAt`` order and then in zone order.
+"""
+
+import asyncio
+import heapq
+import time
+from dataclasses import dataclass, field
+
+from .client import ApiError
+from .export import fetch_page, iter_pages
+from .params import fold
+from .trace import count, span
+
+DEFAULT_PER_PAGE = 10
+MAX_BATCH = 1000
+
+
+def _number(value, missing):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return missing
+
+
+# sortBy -> clave de un Dashboard002Survey en el orden del backend (sin encuesta: -1/0/'')
+SORT_KEYS = {
+    'createdAt': lambda item: item.get('createdAt') or '',
+    'updatedAt': lambda item: item.get('updatedAt') or '',
+    'fullName': lambda item: fold(item.get('fullName')),
+    'identification': lambda item: _number(item.get('identification'), -1),
+    'surveyStatus': lambda item: item.get('surveyStatus') or '',
+    'department': lambda item: fold(item.get('department')),
+    'city': lambda item: fold(item.get('city')),
+    'stratum': lambda item: _number(item.get('stratum'), 0),
+    'ageRange': lambda item: item.get('ageRange') or '',
+    'gender': lambda item: fold(item.get('gender')),
+}
+
+
+class _Descending:
+    """Wraps a key so that the heap pops the largest first."""
+
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+def sort_key(sort_by=None, sort_order=None):
+    """Merge key for rows ordered by ``sortBy``/``sortOrder`` (default ``createdAt`` descending)."""
+    sort_by = sort_by or 'createdAt'
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f'sortBy no soportado: {sort_by} (use {", ".join(SORT_KEYS)})')
+    if sort_order not in (None, '', 'asc', 'desc'):
+        raise ValueError('sortOrder debe ser asc o desc')
+    primary, created = SORT_KEYS[sort_by], SORT_KEYS['createdAt']
+    key = primary if sort_by == 'createdAt' else (lambda item: (primary(item), created(item)))
+    if sort_order == 'asc':
+        return key
+    return lambda item: _Descending(key(item))
+
+
+async def merge(streams, key):
+    """Yield ``(stream index, item)`` from ordered async iterators in ``key`` order.
+
+    Like ``heapq.merge``: equal keys come out in stream order.
+    """
+    iterators = [aiter(stream) for stream in streams]
+    heap = []
+    try:
+        for index, iterator in enumerate(iterators):
+            try:
+                item = await anext(iterator)
+            except StopAsyncIteration:
+                continue
+            heap.append((key(item), index, item, iterator))
+        heapq.heapify(heap)
+        while heap:
+            _, index, item, iterator = heap[0]
+            yield index, item
+            try:
+                item = await anext(iterator)
+            except StopAsyncIteration:
+                heapq.heappop(heap)
+                continue
+            heapq.heapreplace(heap, (key(item), index, item, iterator))
+    finally:
+        # Cancela las tandas pedidas por adelantado de los flujos sin agotar
+        for iterator in iterators:
+            if hasattr(iterator, 'aclose'):
+                await iterator.aclose()
+
+
+@dataclass
+class ZoneStats:
+    total_items: int = 0
+    rows_fetched: int = 0
+    requests: int = 0
+
+    def as_dict(self):
+        return {'totalItems': self.total_items, 'rowsFetched': self.rows_fetched, 'requests': self.requests}
+
+
+@dataclass
+class FederatedStats:
+    rows: int = 0
+    elapsed: float = 0.0
+    zones: dict = field(default_factory=dict)
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'totalItems': sum(z.total_items for z in self.zones.values()),
+            'rowsFetched': sum(z.rows_fetched for z in self.zones.values()),
+            'requests': sum(z.requests for z in self.zones.values()),
+            'elapsedSeconds': round(self.elapsed, 3),
+            'zones': {name: z.as_dict() for name, z in self.zones.items()},
+        }
+
+
+class ZoneCursor:
+    """Rows of one zone in backend order, ``batch`` per request, one batch ahead."""
+
+    def __init__(self, name, api, query, batch, limit=None):
+        self.name = name
+        self.api = api
+        self.query = query
+        self.batch = batch
+        self.limit = limit
+        self.stats = ZoneStats()
+        self._first = None
+
+    async def _fetch(self, page):
+        try:
+            data = await fetch_page(self.api, self.query, page, self.batch)
+        except ApiError as err:
+            raise ApiError(f'{self.name}: {err.message}', err.code, err.details) from None
+        except OSError as err:
+            raise ApiError(f'{self.name}: sin conexión con {self.api.base_url} ({err})') from None
+        surveys = data.get('surveys') or []
+        self.stats.requests += 1
+        self.stats.rows_fetched += len(surveys)
+        count(f'federated.{self.name}.rows', len(surveys))
+        return data
+
+    async def open(self):
+        """Fetch the first batch; sets ``stats.total_items``."""
+        self._first = await self._fetch(1)
+        self.stats.total_items = self._first.get('totalItems') or 0
+
+    async def __aiter__(self):
+        wanted = self.stats.total_items if self.limit is None else min(self.limit, self.stats.total_items)
+        last_page = -(-wanted // self.batch)
+        page, items, left = 1, self._first.get('surveys') or [], wanted
+        self._first = None
+        ahead = None
+        try:
+            while items and left > 0:
+                # La siguiente tanda se pide mientras se mezcla esta
+                if page < last_page:
+                    ahead = asyncio.create_task(self._fetch(page + 1))
+                for item in items[:left]:
+                    yield item
+                left -= len(items)
+                if ahead is None:
+                    break
+                data, ahead = await ahead, None
+                items = data.get('surveys') or []
+                page += 1
+        finally:
+            if ahead is not None:
+                ahead.cancel()
+
+
+class FederatedQuery:
+    """One ``Dashboard002Params`` query over several zones.
+
+    ``zones`` is a list of ``(name, ApiClient)``; the clients stay open for
+    the caller to close. Raises ``ValueError`` on an unsupported order.
+    """
+
+    def __init__(self, zones, query, batch=MAX_BATCH):
+        self.zones = zones
+        self.query = query
+        self.batch = batch
+        self.key = sort_key(query.get('sortBy'), query.get('sortOrder'))
+
+    async def _open(self, limit):
+        batch = min(self.batch, limit) if limit else self.batch
+        cursors = [ZoneCursor(name, api, self.query, batch, limit) for name, api in self.zones]
+        with span('federated.open', zones=len(cursors), batch=batch):
+            await asyncio.gather(*(cursor.open() for cursor in cursors))
+        return cursors
+
+    async def rows(self, limit=None, stats=None):
+        """Yield ``(zone, item)`` of the merged report, the first ``limit`` rows or all of them."""
+        stats = FederatedStats() if stats is None else stats
+        started = time.perf_counter()
+        cursors = await self._open(limit)
+        stats.zones = {cursor.name: cursor.stats for cursor in cursors}
+        merged = merge(cursors, self.key)
+        try:
+            async for index, item in merged:
+                stats.rows += 1
+                yield cursors[index].name, item
+                if stats.rows == limit:
+                    break
+        finally:
+            await merged.aclose()
+            stats.elapsed = time.perf_counter() - started
+
+    async def page(self, page=1, per_page=DEFAULT_PER_PAGE):
+        """``(data, stats)``: global page ``page`` as in ``/dashboard002``, each item tagged with its ``zone``."""
+        if page < 1 or per_page < 1:
+            raise ValueError('page y perPage deben ser mayores que 0')
+        stats = FederatedStats()
+        offset = (page - 1) * per_page
+        surveys = []
+        with span('federated.page', page=page, perPage=per_page):
+            async for zone, item in self.rows(offset + per_page, stats):
+                if stats.rows > offset:
+                    surveys.append({**item, 'zone': zone})
+        total = sum(z.total_items for z in stats.zones.values())
+        stats.rows = len(surveys)
+        data = {
+            'currentPage': page,
+            'itemsPerPage': per_page,
+            'totalItems': total,
+            'totalPages': -(-total // per_page),
+            'filters': {k: v for k, v in self.query.items() if v not in (None, '')},
+            'zones': {name: z.total_items for name, z in stats.zones.items()},
+            'surveys': surveys,
+        }
+        return data, stats
+
+    async def reference_page(self, page=1, per_page=DEFAULT_PER_PAGE):
+        """The surveys of ``page`` from every zone's whole result sorted in memory, to check ``page``."""
+        everything = []
+        for name, api in self.zones:
+            async for _, data in iter_pages(api, self.query, self.batch):
+                everything.extend({**item, 'zone': name} for item in data.get('surveys') or [])
+        everything.sort(key=self.key)
+        return everything[(page - 1) * per_page:page * per_page]
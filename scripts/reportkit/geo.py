@@ -0,0 +1,226 @@
+"""Precompiled Colombia geography bundle for the survey and report forms.
+
+``SurveyForm``, ``ReportFilterPanel`` and ``ReportsSocializers`` load the
+departments and municipalities of a zone from ``/zones/:n/departments`` on
+every start. The bundle carries the same records, taken once from
+``/departments`` and ``/departments/:id/municipalities`` (the records, ``_id``
+included, that the forms store), together with the municipalities of each
+zone in BUILD_ZONES.md. It is rendered into ``src/constants/colombiaGeo.ts``,
+so it ships inside the hashed build and works offline from the first paint.
+
+Layout (columns, so each record costs a handful of strings)::
+
+    {"format": 1, "version": "3f9c0a51d2e4", "source": "https://zona3-api.../api/v1",
+     "departments": {"_id": [...], "departmentId": [...], "name": [...], "code": [...], "mpio": [...]},
+     "municipalities": {"_id": [...], "departmentId": [...], "name": [...], "code": [...], "mpio": [...],
+                        "department": [0, 0, 1, ...]},
+     "zones": {"3": [12, 13, ...]},
+     "index": {"names": {"keys": [...], "ids": [...]}, "words": {"keys": [...], "ids": [...]}}}
+
+``department`` is the position of each municipality's department and a
+zone lists positions of municipalities. The index holds ``search_key``s
+(lowercase, no accents or punctuation) in sorted order: ``names`` the whole
+names and ``words`` the same names from their second, third... word, so a
+prefix of any word finds the place with one binary search. An id ``i >= 0``
+is municipality ``i`` and ``-(j + 1)`` department ``j``. ``version`` hashes
+the rest, so it only changes when the content does.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import json
+import re
+
+from .codegen import load_template
+from .params import fold
+from .zones import zone_municipalities
+
+FORMAT = 1
+DEPARTMENTS = '/departments'
+TEMPLATE = 'colombiaGeo.ts.tpl'
+TARGET = 'src/constants/colombiaGeo.ts'
+DEPARTMENT_FIELDS = ('_id', 'departmentId', 'name', 'code', 'mpio')
+MUNICIPALITY_FIELDS = ('_id', 'departmentId', 'name', 'code', 'mpio')
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def search_key(text):
+    """``'Bogotá, D.C.'`` -> ``'bogota d c'``: what the index stores and queries match."""
+    return _NON_ALNUM.sub(' ', fold(text)).strip()
+
+
+async def fetch_geography(api, concurrency=4):
+    """Departments from the API, each with its ``municipalities``."""
+    response = await api.get(DEPARTMENTS)
+    departments = (response or {}).get('data') or []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def municipalities(department):
+        async with gate:
+            response = await api.get(f'{DEPARTMENTS}/{department["_id"]}/municipalities')
+            return (response or {}).get('data') or []
+
+    lists = await asyncio.gather(*(municipalities(d) for d in departments))
+    return [{**department, 'municipalities': items} for department, items in zip(departments, lists)]
+
+
+def _text(record, field):
+    value = record.get(field)
+    return '' if value is None else str(value)
+
+
+def _find(keys, name):
+    """Position of ``name`` among ``keys``: same key, same letters or a unique word prefix."""
+    key = search_key(name)
+    for candidates in (
+        [i for i, k in enumerate(keys) if k == key],
+        [i for i, k in enumerate(keys) if k.replace(' ', '') == key.replace(' ', '')],
+        [i for i, k in enumerate(keys) if k.startswith(key + ' ')],
+    ):
+        if len(candidates) == 1:
+            return candidates[0]
+        if candidates:
+            return None
+    return None
+
+
+def zone_number(zone):
+    """``'zona3'`` -> ``3``; ``None`` for builds without a number (``zonaf``)."""
+    suffix = zone[len('zona'):] if zone.startswith('zona') else ''
+    return int(suffix) if suffix.isdigit() else None
+
+
+def _index(entries):
+    entries.sort()
+    return {'keys': [key for key, _ in entries], 'ids': [target for _, target in entries]}
+
+
+def compile_bundle(snapshot, zones=None):
+    """Bundle dict of a ``fetch`` snapshot; raises ``ValueError`` on zone places it lacks.
+
+    ``zones`` maps zone names to ``(municipality, department)`` pairs, by
+    default those of BUILD_ZONES.md.
+    """
+    departments = sorted(snapshot['departments'], key=lambda d: (search_key(_text(d, 'name')), _text(d, '_id')))
+    dept_keys = [search_key(_text(d, 'name')) for d in departments]
+    dept_columns = {field: [_text(d, field) for d in departments] for field in DEPARTMENT_FIELDS}
+
+    munis = []
+    for j, department in enumerate(departments):
+        items = department.get('municipalities') or []
+        munis.extend((j, search_key(_text(m, 'name')), _text(m, '_id'), m) for m in items)
+    munis.sort(key=lambda m: m[:3])
+    muni_columns = {field: [_text(m, field) for *_, m in munis] for field in MUNICIPALITY_FIELDS}
+    muni_columns['department'] = [j for j, *_ in munis]
+
+    zone_map, missing = {}, []
+    for zone, places in sorted((zone_municipalities() if zones is None else zones).items()):
+        number = zone_number(zone)
+        if number is None or not places:
+            continue
+        positions = []
+        for name, department in places:
+            j = _find(dept_keys, department)
+            in_department = [i for i, m in enumerate(munis) if m[0] == j] if j is not None else []
+            i = _find([munis[i][1] for i in in_department], name) if in_department else None
+            if i is None:
+                missing.append(f'{zone}: {name} ({department})')
+            else:
+                positions.append(in_department[i])
+        zone_map[str(number)] = sorted(positions)
+    if missing:
+        raise ValueError('municipios de zona sin coincidencia en la API: ' + '; '.join(missing))
+
+    names, words = [], []
+    for target, key in [(-(j + 1), k) for j, k in enumerate(dept_keys)] + [(i, m[1]) for i, m in enumerate(munis)]:
+        if not key:
+            continue
+        names.append((key, target))
+        words.extend((key[pos + 1:], target) for pos, c in enumerate(key) if c == ' ')
+
+    bundle = {
+        'format': FORMAT,
+        'source': snapshot.get('source', ''),
+        'departments': dept_columns,
+        'municipalities': muni_columns,
+        'zones': zone_map,
+        'index': {'names': _index(names), 'words': _index(words)},
+    }
+    digest = hashlib.sha256(json.dumps(bundle, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+    return {'format': FORMAT, 'version': digest[:12], **bundle}
+
+
+def render_module(bundle):
+    """``colombiaGeo.ts`` with ``bundle`` (``None``: the module without data)."""
+    if bundle is None:
+        value = 'null'
+    else:
+        text = json.dumps(bundle, ensure_ascii=False, separators=(',', ':'))
+        # JSON.parse de un literal se analiza más rápido que el mismo objeto como código
+        value = f'JSON.parse({json.dumps(text, ensure_ascii=False)})'
+    return load_template(TEMPLATE).render({'bundle': value})
+
+
+def _prefix_range(index, prefix):
+    keys = index['keys']
+    start = bisect.bisect_left(keys, prefix)
+    end = start
+    while end < len(keys) and keys[end].startswith(prefix):
+        end += 1
+    return index['ids'][start:end]
+
+
+def search(bundle, query, zone=None, limit=20):
+    """Departments and municipalities whose name, or a word of it, starts with ``query``.
+
+    Whole-name matches come first, each group in alphabetical order; with
+    ``zone`` (a zone number) only its municipalities and their departments.
+    The same lookup as ``geoBundleService.search`` in the app.
+    """
+    prefix = search_key(query)
+    if not prefix:
+        return []
+    departments, municipalities = bundle['departments'], bundle['municipalities']
+    allowed = None
+    if zone is not None:
+        allowed = set(bundle['zones'].get(str(zone), ()))
+        allowed |= {-(municipalities['department'][i] + 1) for i in allowed}
+    results, seen = [], set()
+    for index in (bundle['index']['names'], bundle['index']['words']):
+        for target in _prefix_range(index, prefix):
+            if target in seen or (allowed is not None and target not in allowed):
+                continue
+            seen.add(target)
+            if target < 0:
+                j = -target - 1
+                results.append({'type': 'department', '_id': departments['_id'][j], 'name': departments['name'][j]})
+            else:
+                j = municipalities['department'][target]
+                results.append({
+                    'type': 'municipality',
+                    '_id': municipalities['_id'][target],
+                    'name': municipalities['name'][target],
+                    'department': departments['name'][j],
+                })
+            if len(results) == limit:
+                return results
+    return results
+
+
+def zone_departments(bundle, zone):
+    """What ``/zones/:n/departments`` returns for ``zone``, from the bundle; ``None`` if it lacks it."""
+    positions = bundle['zones'].get(str(zone))
+    if positions is None:
+        return None
+    departments, municipalities = bundle['departments'], bundle['municipalities']
+    entries = {}
+    for i in positions:
+        j = municipalities['department'][i]
+        entry = entries.setdefault(j, {
+            'department': {field: departments[field][j] for field in DEPARTMENT_FIELDS},
+            'municipalities': [],
+        })
+        entry['municipalities'].append({field: municipalities[field][i] for field in MUNICIPALITY_FIELDS})
+    return {'zone': {'name': f'Zona {zone}', 'zoneNumber': zone}, 'departments': [entries[j] for j in sorted(entries)]}
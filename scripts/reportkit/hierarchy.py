@@ -0,0 +1,314 @@
+"""Constant-time index over the Admin > ... > Socializer hierarchy.
+
+``HierarchyIndex`` numbers the people of the tree in preorder (an Euler tour),
+so the subtree of a node is the interval ``[tin, tin + size)``:
+
+- "is ``a`` above ``b``" is two comparisons;
+- "everyone under this coordinator" is a slice of ``order``;
+- ``ancestor_of[node, level]`` gives the zone coordinator, field coordinator,
+  ... of any node without walking up the tree;
+- ``contains`` tests a whole array of nodes (one per record, for instance)
+  against one or several subtrees with a couple of vectorized comparisons.
+
+It is built from ``/users/hierarchy`` items, from a ``hierarchy-dry-run.json``
+spec or from a synthetic ``Dataset``, and saved as one ``.npy`` per array plus
+``meta.json`` (memory-mapped on load, like ``Dataset``), so report jobs open
+it without rebuilding anything.
+"""
+
+import asyncio
+import json
+import os
+
+import numpy as np
+
+from .synthetic import ROLES, staff_id
+
+# Nivel de cada rol en el árbol; 'admin' es la raíz
+LEVELS = ('admin',) + ROLES
+LEVEL_OF = {role: level for level, role in enumerate(LEVELS)}
+ROLE_ALIASES = {
+    'root': 'admin',
+    'zonecoordinator': 'zonecoordinator', 'zone_coordinator': 'zonecoordinator',
+    'fieldcoordinator': 'fieldcoordinator', 'field_coordinator': 'fieldcoordinator',
+    'socializador': 'socializer',
+}
+# Campos con el superior en los items de /users/hierarchy, del más cercano al más lejano
+PARENT_FIELDS = ('supervisor', 'fieldCoordinator', 'zoneCoordinator', 'admin', 'coordinator')
+USERS_HIERARCHY = '/users/hierarchy'
+
+_ARRAYS = ('parent', 'level', 'tin', 'size', 'order', 'ancestor_of', 'ids', 'names', 'id_order')
+
+
+def _ref(value):
+    """Id in a reference that may be a plain id or a populated document."""
+    if isinstance(value, dict):
+        return value.get('_id')
+    return value or None
+
+
+def _role_name(value):
+    """Canonical role of a ``role`` field (name or ``{_id, role}`` document)."""
+    role = str((value.get('role') if isinstance(value, dict) else value) or '').lower()
+    return ROLE_ALIASES.get(role, role)
+
+
+class HierarchyIndex:
+    """Preorder intervals and per-level ancestors of a forest of people."""
+
+    def __init__(self, arrays, meta=None):
+        self.arrays = arrays
+        self.meta = meta or {}
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['arrays'][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __len__(self):
+        return len(self.parent)
+
+    # ---- Construcción ----
+
+    @classmethod
+    def build(cls, ids, parents, levels=None, names=None, meta=None):
+        """Index of the nodes ``ids``; ``parents[i]`` is the position of the parent or -1.
+
+        ``levels`` (index into ``LEVELS``, -1 if unknown) default to the depth
+        in the tree. Siblings keep their input order.
+        """
+        parent = np.asarray(parents, dtype=np.int32)
+        n = len(parent)
+        if n and (parent.max() >= n or parent.min() < -1):
+            raise ValueError('parents fuera de rango')
+
+        # Profundidad, nivel por nivel desde las raíces
+        depth = np.full(n, -1, dtype=np.int32)
+        depth[parent == -1] = 0
+        frontier = np.flatnonzero(parent == -1)
+        levels_nodes = [frontier]
+        while True:
+            children = np.flatnonzero(np.isin(parent, frontier) & (depth == -1))
+            if not len(children):
+                break
+            depth[children] = depth[parent[children]] + 1
+            levels_nodes.append(children)
+            frontier = children
+        if (depth == -1).any():
+            raise ValueError(f'la jerarquía tiene ciclos ({int((depth == -1).sum())} nodos sin raíz)')
+
+        # Tamaño de cada subárbol, de las hojas hacia arriba
+        size = np.ones(n, dtype=np.int64)
+        for nodes in reversed(levels_nodes[1:]):
+            size += np.bincount(parent[nodes], weights=size[nodes], minlength=n).astype(np.int64)
+
+        # Preorden: tin(hijo) = tin(padre) + 1 + tamaños de los hermanos anteriores
+        tin = np.empty(n, dtype=np.int64)
+        for nodes in levels_nodes:
+            nodes = nodes[np.lexsort((nodes, parent[nodes]))]
+            sizes = size[nodes]
+            before = np.cumsum(sizes) - sizes
+            group = parent[nodes]
+            first = np.r_[True, group[1:] != group[:-1]]
+            before -= np.maximum.accumulate(np.where(first, before, 0))
+            tin[nodes] = before if group[0] == -1 else tin[group] + 1 + before
+        order = np.empty(n, dtype=np.int32)
+        order[tin] = np.arange(n, dtype=np.int32)
+
+        level = np.full(n, -1, dtype=np.int8) if levels is None else np.asarray(levels, dtype=np.int8).copy()
+        unknown = level < 0
+        level[unknown] = np.minimum(depth[unknown], len(LEVELS) - 1)
+
+        # Ancestro de cada nivel (el propio nodo en su nivel; -1 si no hay)
+        ancestor_of = np.full((n, len(LEVELS)), -1, dtype=np.int32)
+        for nodes in levels_nodes:
+            above = parent[nodes]
+            has_parent = above >= 0
+            ancestor_of[nodes[has_parent]] = ancestor_of[above[has_parent]]
+            ancestor_of[nodes, level[nodes]] = nodes
+
+        ids = np.asarray(ids, dtype=str)
+        if len(np.unique(ids)) != n:
+            raise ValueError('hay ids repetidos')
+        arrays = {
+            'parent': parent,
+            'level': level,
+            'tin': tin.astype(np.int32),
+            'size': size.astype(np.int32),
+            'order': order,
+            'ancestor_of': ancestor_of,
+            'ids': ids,
+            'names': np.asarray(names if names is not None else [''] * n, dtype=str),
+            'id_order': np.argsort(ids, kind='stable').astype(np.int32),
+        }
+        return cls(arrays, {'nodes': n, **(meta or {})})
+
+    @classmethod
+    def from_users(cls, items, meta=None):
+        """Index of ``/users/hierarchy`` items (profile ``_id``; user ids resolve too)."""
+        items = [item for item in items if item and item.get('_id')]
+        position = {}
+        for i, item in enumerate(items):
+            position[item['_id']] = i
+            user = _ref(item.get('user'))
+            if user:
+                position.setdefault(user, i)
+        parents, levels, names = [], [], []
+        for item in items:
+            candidates = [_ref(item.get(name)) for name in PARENT_FIELDS]
+            candidates.append(_ref(item.get('profile')))  # coordinador padre
+            own = position[item['_id']]
+            parents.append(next((position[c] for c in candidates if position.get(c, own) != own), -1))
+            user = item.get('user') if isinstance(item.get('user'), dict) else {}
+            levels.append(LEVEL_OF.get(_role_name(user.get('role') or item.get('role')), -1))
+            names.append(item.get('fullName') or '')
+        return cls.build([item['_id'] for item in items], parents, levels, names,
+                         {'source': 'users', **(meta or {})})
+
+    @classmethod
+    def from_spec(cls, path):
+        """Index of a ``hierarchy-dry-run.json`` (keys are the spec ``id``s)."""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        users = data['users'] if isinstance(data, dict) else data
+        by_name = {u['name']: i for i, u in enumerate(users)}
+        parents = [by_name.get(u.get('parentName'), -1) for u in users]
+        return cls.build([u['id'] for u in users], parents, [int(u['level']) for u in users],
+                         [u['name'] for u in users], {'source': os.path.basename(path)})
+
+    @classmethod
+    def from_dataset(cls, ds):
+        """Index of a synthetic ``Dataset``, with its ``staff_id`` ids.
+
+        Nodes are numbered admin, zone coordinators, field coordinators,
+        supervisors, socializers, so ``offset(role) + index`` is the node of
+        the ``index``-th person of ``role`` (``ds.socializer`` maps records).
+        """
+        counts = [1] + [ds.count(role) for role in ROLES]
+        offsets = np.cumsum([0] + counts)
+        parents = [
+            np.array([-1]),
+            np.zeros(counts[1], dtype=np.int64),
+            offsets[1] + np.asarray(ds.field_zone),
+            offsets[2] + np.asarray(ds.supervisor_field),
+            offsets[3] + np.asarray(ds.socializer_supervisor),
+        ]
+        ids = ['admin'] + [staff_id(role, i) for role, count in zip(ROLES, counts[1:]) for i in range(count)]
+        levels = np.repeat(np.arange(len(LEVELS)), counts)
+        return cls.build(ids, np.concatenate(parents), levels,
+                         meta={'source': 'synthetic', 'offsets': offsets[:-1].tolist()})
+
+    # ---- Consultas ----
+
+    def offset(self, role):
+        """First node of ``role`` in an index built by ``from_dataset``."""
+        return self.meta['offsets'][LEVEL_OF[role]]
+
+    def node(self, id_):
+        """Node of ``id_``; ``KeyError`` if it is not in the hierarchy."""
+        ids, by_id = self.ids, self.id_order
+        pos = int(np.searchsorted(ids[by_id], id_)) if len(ids) else 0
+        if pos < len(ids) and ids[by_id[pos]] == id_:
+            return int(by_id[pos])
+        raise KeyError(id_)
+
+    def is_ancestor(self, a, b):
+        """Whether ``a`` is ``b`` or above it."""
+        return self.tin[a] <= self.tin[b] < self.tin[a] + self.size[a]
+
+    def ancestor(self, node, role):
+        """Node of ``role`` above ``node`` (itself if it has that role), or -1."""
+        return int(self.ancestor_of[node, LEVEL_OF[role]])
+
+    def path(self, node):
+        """Nodes from the root down to ``node``."""
+        chain = self.ancestor_of[node]
+        return [int(a) for a in chain if a >= 0]
+
+    def descendants(self, node, role=None, include_self=False):
+        """Nodes under ``node`` in preorder, optionally only those of ``role``."""
+        start = self.tin[node] + (0 if include_self else 1)
+        nodes = self.order[start:self.tin[node] + self.size[node]]
+        if role is not None:
+            nodes = nodes[self.level[nodes] == LEVEL_OF[role]]
+        return nodes
+
+    def _intervals(self, roots):
+        roots = np.unique(np.atleast_1d(np.asarray(roots, dtype=np.int64)))
+        starts, ends = self.tin[roots].astype(np.int64), (self.tin[roots] + self.size[roots]).astype(np.int64)
+        keep = np.argsort(starts)
+        starts, ends = starts[keep], ends[keep]
+        # Quitar los subárboles contenidos en otro
+        outer = ends > np.maximum.accumulate(np.r_[-1, ends[:-1]])
+        return starts[outer], ends[outer]
+
+    def contains(self, roots, nodes):
+        """Vectorized: which ``nodes`` lie in the subtree of any of ``roots``."""
+        nodes = np.asarray(nodes)
+        starts, ends = self._intervals(roots)
+        position = self.tin[nodes]
+        if len(starts) == 1:
+            return (position >= starts[0]) & (position < ends[0])
+        k = np.searchsorted(starts, position, 'right') - 1
+        return (k >= 0) & (position < ends[np.maximum(k, 0)])
+
+    def member_table(self, roots, role='socializer'):
+        """Boolean table over the people of ``role`` (``from_dataset`` order) inside ``roots``."""
+        level = LEVEL_OF[role]
+        nodes = np.flatnonzero(self.level == level)
+        return self.contains(roots, nodes)
+
+    def resolve(self, values):
+        """Nodes of the ids in ``values``; unknown ids are skipped."""
+        nodes = []
+        for value in values:
+            try:
+                nodes.append(self.node(value))
+            except KeyError:
+                pass
+        return np.array(nodes, dtype=np.int64)
+
+    def describe(self, node):
+        return {
+            'id': str(self.ids[node]),
+            'name': str(self.names[node]),
+            'role': LEVELS[self.level[node]],
+            'descendants': int(self.size[node]) - 1,
+        }
+
+    # ---- Persistencia ----
+
+    def save(self, path):
+        """Write one ``.npy`` per array plus ``meta.json`` under ``path``."""
+        os.makedirs(path, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(os.path.join(path, f'{name}.npy'), self.arrays[name])
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Open an index written by ``save``; arrays are memory-mapped by default."""
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        mode = 'r' if mmap else None
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mode) for name in _ARRAYS}
+        return cls(arrays, meta)
+
+
+async def fetch_users(api, per_page=1000, concurrency=4):
+    """Every item of ``/users/hierarchy``, fetching pages concurrently."""
+    first = await api.get(USERS_HIERARCHY, {'page': 1, 'perPage': per_page})
+    items = list(first.get('data') or [])
+    total_pages = (first.get('pagination') or {}).get('totalPages') or 1
+    gate = asyncio.Semaphore(concurrency)
+
+    async def page(number):
+        async with gate:
+            response = await api.get(USERS_HIERARCHY, {'page': number, 'perPage': per_page})
+            return response.get('data') or []
+
+    for data in await asyncio.gather(*(page(n) for n in range(2, total_pages + 1))):
+        items.extend(data)
+    return items
@@ -0,0 +1,448 @@
+"""Local stand-in for the report endpoints, backed by a synthetic ``Dataset``.
+
+``ReportStore`` answers ``/dashboard002``, ``/dashboard003``,
+``/respondents/reports/complete`` and ``/respondents/reports/by-socializer-date``
+with the response shapes of ``api.service.ts``; ``serve`` exposes it over
+HTTP under a path prefix (``/api/v1`` by default).
+
+Filters are evaluated with numpy over the records of the requested date
+range (a contiguous slice, records being sorted by ``createdAt``). Socializer
+level filters (location and hierarchy) are resolved once per query into a
+lookup table over socializers. The ordered matches of the last few queries
+are cached, so paging through a result only slices an array.
+
+Query semantics:
+- ``startDate``/``endDate`` (``YYYY-MM-DD``) are whole days in Bogotá time, both inclusive.
+- ``q`` is split into terms; every term must appear in a name token
+  (accent/case-insensitive) or, if it is numeric, in the identification.
+  Only successful records match: the others carry neither.
+- ``department``, ``city`` and ``neighborhood`` match by substring,
+  accent/case-insensitive; the other filters are exact.
+- The default order is ``createdAt`` descending. Other ``sortBy`` fields order
+  by the value shown (text accent/case-insensitive), ties in ``createdAt`` order.
+"""
+
+import gzip
+import json
+import socket
+import sys
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from .aggregate import Aggregator
+from .params import date_bound, fold, parse_bool
+from .synthetic import (
+    AGE_RANGES, DEPARTMENT_GEO, FIRST_NAMES, GENDERS, ID_TYPES, LAST_NAMES, LINKED_HOMES,
+    LINKED_HOUSE, MUNICIPALITY_DEPARTMENTS, MUNICIPALITY_GEO, NEIGHBORHOODS, OFFLINE,
+    PATRIA_DEFENDER, ROLES, SUCCESSFUL, VERIFIED, WILLING, identification_numbers, parse_staff_id,
+)
+from .trace import count, span
+
+DEFAULT_PER_PAGE = 10
+COMPLETE_PER_PAGE = 10000
+
+_FLAG_FILTERS = {
+    'willingToRespond': WILLING,
+    'isPatriaDefender': PATRIA_DEFENDER,
+    'isVerified': VERIFIED,
+    'isLinkedHouse': LINKED_HOUSE,
+}
+
+# metric de /respondents/reports/by-socializer-date: (bit, valor esperado)
+_METRICS = {
+    'successful': (SUCCESSFUL, True),
+    'unsuccessful': (SUCCESSFUL, False),
+    'defensores': (PATRIA_DEFENDER, True),
+    'isVerified': (VERIFIED, True),
+    'isLinkedHouse': (LINKED_HOUSE, True),
+    'isOffline': (OFFLINE, True),
+    'linkedHomes': (LINKED_HOMES, True),
+}
+
+_HIERARCHY_FILTERS = (
+    ('zoneCoordinator', 'zonecoordinator'),
+    ('fieldCoordinator', 'fieldcoordinator'),
+    ('supervisor', 'supervisor'),
+    ('socializerId', 'socializer'),
+)
+
+# Parámetros que no filtran registros
+_NON_FILTERS = ('page', 'perPage', 'sortBy', 'sortOrder', 'rol')
+
+_SORT_FIELDS = (
+    'createdAt', 'updatedAt', 'fullName', 'identification', 'surveyStatus',
+    'department', 'city', 'stratum', 'ageRange', 'gender',
+)
+
+
+class QueryError(ValueError):
+    """Invalid query parameter (HTTP 400)."""
+
+
+def _epoch(value, name, end=False):
+    try:
+        return date_bound(value, end)
+    except ValueError:
+        raise QueryError(f'Fecha inválida en {name}: {value}') from None
+
+
+def _int(params, name, default):
+    value = params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise QueryError(f'{name} debe ser un número entero') from None
+    if number < 1:
+        raise QueryError(f'{name} debe ser mayor que cero')
+    return number
+
+
+def _vocab_table(vocab, value, substring=False):
+    """Boolean table over ``vocab`` codes matching ``value``."""
+    needle = fold(value)
+    if substring:
+        return np.array([bool(v) and needle in fold(v) for v in vocab])
+    return np.array([fold(v) == needle for v in vocab])
+
+
+class ReportStore:
+    """Report endpoints over a ``Dataset``."""
+
+    def __init__(self, dataset, cache_size=16):
+        self.ds = dataset
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.aggregator = Aggregator(dataset)
+        self._first_folded = [fold(n) for n in FIRST_NAMES]
+        self._last_folded = [fold(n) for n in LAST_NAMES]
+        self._muni_names = [name for name, _ in dataset.municipalities]
+        self._muni_departments = [MUNICIPALITY_DEPARTMENTS[name] for name in self._muni_names]
+        # Orden alfabético de municipios, departamentos y géneros, para sortBy=city/department/gender;
+        # nombres iguales comparten rango y quedan en orden de createdAt
+        self._city_rank = np.unique([fold(n) for n in self._muni_names], return_inverse=True)[1]
+        self._department_rank = np.unique([fold(d) for d in self._muni_departments], return_inverse=True)[1]
+        self._gender_rank = np.unique([fold(g) for g in GENDERS], return_inverse=True)[1]
+
+    # ---- Filtros ----
+
+    def _date_slice(self, params, start_key, end_key):
+        created = self.ds.created
+        lo, hi = 0, len(created)
+        if params.get(start_key):
+            lo = int(np.searchsorted(created, _epoch(params[start_key], start_key), 'left'))
+        if params.get(end_key):
+            hi = int(np.searchsorted(created, _epoch(params[end_key], end_key, end=True), 'left'))
+        return lo, max(lo, hi)
+
+    def _socializer_table(self, params):
+        """Socializers allowed by the location and hierarchy filters (``None``: all)."""
+        ds = self.ds
+        table = None
+
+        def restrict(allowed):
+            nonlocal table
+            table = allowed if table is None else table & allowed
+
+        for param, role in _HIERARCHY_FILTERS:
+            value = params.get(param)
+            if not value:
+                continue
+            index = parse_staff_id(role, value)
+            restrict(ds.staff_of(role) == (-1 if index is None else index))
+
+        munis = None
+        if params.get('department'):
+            needle = fold(params['department'])
+            munis = np.array([needle in fold(d) for d in self._muni_departments])
+        if params.get('city'):
+            needle = fold(params['city'])
+            cities = np.array([needle in fold(n) for n in self._muni_names])
+            munis = cities if munis is None else munis & cities
+        for param in ('departamento_id', 'municipio_id', 'municipio'):
+            value = params.get(param)
+            if value:
+                matches = np.array([self._location_matches(param, value, m) for m in range(len(self._muni_names))])
+                munis = matches if munis is None else munis & matches
+        if munis is not None:
+            restrict(munis[ds.socializer_municipality])
+        return table
+
+    def _location_matches(self, param, value, muni):
+        name = self._muni_names[muni]
+        department = self._muni_departments[muni]
+        if param == 'departamento_id':
+            return value == DEPARTMENT_GEO[department][0] or fold(value) == fold(department)
+        if param == 'municipio_id':
+            return value == MUNICIPALITY_GEO[name][0] or fold(value) == fold(name)
+        return fold(value.strip()) in fold(name)
+
+    def _q_mask(self, q, lo, hi, mask):
+        ds = self.ds
+        # Solo los exitosos tienen nombre e identificación en la respuesta
+        mask &= (ds.flags[lo:hi] & SUCCESSFUL) != 0
+        for term in fold(q).split():
+            if term.isdigit():
+                rows = lo + np.flatnonzero(mask)
+                idents = identification_numbers(rows)
+                found = np.zeros(len(rows), dtype=bool)
+                width = 10 ** len(term)
+                for shift in range(0, 11 - len(term)):
+                    found |= (idents // 10 ** shift) % width == int(term)
+                mask[rows[~found] - lo] = False
+            else:
+                first = np.array([term in n for n in self._first_folded])
+                last = np.array([term in n for n in self._last_folded])
+                mask &= first[ds.first[lo:hi]] | last[ds.last1[lo:hi]] | last[ds.last2[lo:hi]]
+        return mask
+
+    def _filter(self, params, start_key='startDate', end_key='endDate'):
+        """Record indices matching ``params``, in ``createdAt`` order."""
+        ds = self.ds
+        lo, hi = self._date_slice(params, start_key, end_key)
+        mask = np.ones(hi - lo, dtype=bool)
+        if hi == lo:
+            return np.empty(0, dtype=np.int64)
+
+        table = self._socializer_table(params)
+        if table is not None:
+            mask &= table[ds.socializer[lo:hi]]
+
+        flags = ds.flags[lo:hi]
+        status = params.get('surveyStatus')
+        if status:
+            if status not in ('successful', 'unsuccessful'):
+                raise QueryError('surveyStatus debe ser successful o unsuccessful')
+            mask &= ((flags & SUCCESSFUL) != 0) == (status == 'successful')
+        for name, bit in _FLAG_FILTERS.items():
+            try:
+                wanted = parse_bool(params.get(name))
+            except ValueError as exc:
+                raise QueryError(f'{name}: {exc}') from None
+            if wanted is not None:
+                mask &= ((flags & bit) != 0) == wanted
+        metric = params.get('metric')
+        if metric and metric != 'all':
+            if metric not in _METRICS:
+                raise QueryError(f'metric desconocida: {metric}')
+            bit, wanted = _METRICS[metric]
+            mask &= ((flags & bit) != 0) == wanted
+
+        for name, column, vocab in (
+            ('gender', 'gender', GENDERS),
+            ('ageRange', 'age', AGE_RANGES),
+            ('idType', 'id_type', ID_TYPES),
+        ):
+            if params.get(name):
+                mask &= _vocab_table(vocab, params[name])[ds.columns[column][lo:hi]]
+        if params.get('neighborhood'):
+            mask &= _vocab_table(NEIGHBORHOODS, params['neighborhood'], substring=True)[ds.neighborhood[lo:hi]]
+        if params.get('stratum'):
+            try:
+                mask &= ds.stratum[lo:hi] == int(params['stratum'])
+            except ValueError:
+                raise QueryError('stratum debe ser un número entre 1 y 6') from None
+        if params.get('q'):
+            mask = self._q_mask(params['q'], lo, hi, mask)
+        return lo + np.flatnonzero(mask)
+
+    # ---- Orden ----
+
+    def _sort_key(self, field, rows):
+        ds = self.ds
+        if field == 'updatedAt':
+            return ds.created[rows] + ds.updated_delta[rows]
+        if field == 'fullName':
+            return (ds.first[rows].astype(np.int32) << 16) | (ds.last1[rows].astype(np.int32) << 8) | ds.last2[rows]
+        if field == 'identification':
+            ok = (ds.flags[rows] & SUCCESSFUL) != 0
+            return np.where(ok, identification_numbers(rows), -1)
+        if field == 'surveyStatus':
+            # 'successful' < 'unsuccessful'
+            return 1 - (ds.flags[rows] & SUCCESSFUL)
+        muni = ds.socializer_municipality[ds.socializer[rows]]
+        if field == 'city':
+            return self._city_rank[muni]
+        if field == 'department':
+            return self._department_rank[muni]
+        if field == 'gender':
+            return self._gender_rank[ds.columns['gender'][rows]]
+        return ds.columns[{'stratum': 'stratum', 'ageRange': 'age'}[field]][rows]
+
+    def _order(self, rows, sort_by, sort_order):
+        sort_by = sort_by or 'createdAt'
+        if sort_by not in _SORT_FIELDS:
+            raise QueryError(f'sortBy no soportado: {sort_by}')
+        if sort_order not in (None, '', 'asc', 'desc'):
+            raise QueryError('sortOrder debe ser asc o desc')
+        descending = sort_order != 'asc'
+        if sort_by == 'createdAt':
+            return rows[::-1] if descending else rows
+        key = self._sort_key(sort_by, rows)
+        # Estable: a igual clave, en orden de createdAt en la misma dirección
+        if descending:
+            rows, key = rows[::-1], key[::-1]
+            return rows[np.argsort(-key.astype(np.int64), kind='stable')]
+        return rows[np.argsort(key, kind='stable')]
+
+    def select(self, params, start_key='startDate', end_key='endDate'):
+        """Ordered record indices for ``params`` (cached per filter set)."""
+        key = (start_key,) + tuple(sorted((k, v) for k, v in params.items() if k not in ('page', 'perPage') and v))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        rows = self._filter(params, start_key, end_key)
+        rows = self._order(rows, params.get('sortBy'), params.get('sortOrder'))
+        with self._lock:
+            self._cache[key] = rows
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return rows
+
+    def rows(self, params, start_key='startDate', end_key='endDate'):
+        """Records matching ``params`` in any order: a slice if only the dates filter."""
+        if all(not v or k in _NON_FILTERS + (start_key, end_key) for k, v in params.items()):
+            return slice(*self._date_slice(params, start_key, end_key))
+        return self._filter(params, start_key, end_key)
+
+    def _page(self, rows, params, default_per_page):
+        page = _int(params, 'page', 1)
+        per_page = _int(params, 'perPage', default_per_page)
+        total = len(rows)
+        chunk = rows[(page - 1) * per_page:page * per_page]
+        return {
+            'currentPage': page,
+            'itemsPerPage': per_page,
+            'totalItems': total,
+            'totalPages': -(-total // per_page),
+            'surveys': self.ds.items(chunk),
+        }
+
+    # ---- Endpoints ----
+
+    def dashboard002(self, params):
+        rows = self.select(params)
+        data = self._page(rows, params, DEFAULT_PER_PAGE)
+        filters = {k: v for k, v in params.items() if k not in ('page', 'perPage') and v}
+        data = {**{k: v for k, v in data.items() if k != 'surveys'}, 'filters': filters, 'surveys': data['surveys']}
+        return {'message': 'Reporte generado correctamente', 'data': data}
+
+    def complete_report(self, params):
+        rows = self.select(params)
+        return {'message': 'Reporte completo generado correctamente', 'data': self._page(rows, params, COMPLETE_PER_PAGE)}
+
+    def by_socializer(self, params):
+        if not params.get('startDate') or not params.get('endDate'):
+            raise QueryError('startDate y endDate son requeridos')
+        rows = self.select(params)
+        data = self._page(rows, params, COMPLETE_PER_PAGE)
+        summary_params = {k: v for k, v in params.items() if k != 'metric'}
+        data['resumen'] = self.aggregator.resumen(self.rows(summary_params))
+        return {'message': 'Reporte generado correctamente', 'data': data}
+
+    def dashboard003(self, params):
+        if not params.get('fecha_inicio') or not params.get('fecha_fin'):
+            raise QueryError('fecha_inicio y fecha_fin son requeridos')
+        role = params.get('rol') or 'socializer'
+        if role not in ROLES:
+            raise QueryError(f'rol desconocido: {role}')
+        rows = self.rows(params, 'fecha_inicio', 'fecha_fin')
+        periodo = {'inicio': params['fecha_inicio'], 'fin': params['fecha_fin']}
+        return self.aggregator.dashboard003(rows, periodo, params.get('municipio'), role)
+
+    def routes(self):
+        return {
+            '/dashboard002': self.dashboard002,
+            '/dashboard003': self.dashboard003,
+            '/respondents/reports/complete': self.complete_report,
+            '/respondents/reports/by-socializer-date': self.by_socializer,
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'soci-mock/1'
+
+    def setup(self):
+        super().setup()
+        # Cabeceras y cuerpo salen en escrituras separadas: sin esto Nagle + ACK retardado suman ~40 ms
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        gzipped = len(body) > 1024 and 'gzip' in self.headers.get('Accept-Encoding', '')
+        if gzipped:
+            body = gzip.compress(body, compresslevel=1)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_OPTIONS(self):
+        self.send_response(HTTPStatus.NO_CONTENT)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, x-access-token')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        prefix = self.server.prefix
+        path = url.path[len(prefix):] if url.path.startswith(prefix) else None
+        handler = self.server.routes.get(path.rstrip('/') if path else path)
+        if handler is None:
+            self._send(HTTPStatus.NOT_FOUND, {'message': f'Ruta no encontrada: {url.path}'})
+            return
+        token = self.server.token
+        if token and self.headers.get('x-access-token') != token:
+            self._send(HTTPStatus.UNAUTHORIZED, {'message': 'Token inválido o ausente'})
+            return
+        params = dict(parse_qsl(url.query))
+        count('requests')
+        try:
+            with span('query', path=path):
+                payload = handler(params)
+        except QueryError as exc:
+            self._send(HTTPStatus.BAD_REQUEST, {'message': str(exc)})
+            return
+        with span('send', path=path):
+            self._send(HTTPStatus.OK, payload)
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, store, prefix='/api/v1', token=None, verbose=False):
+        super().__init__(address, _Handler)
+        self.store = store
+        self.routes = store.routes()
+        self.prefix = prefix.rstrip('/')
+        self.token = token
+        self.verbose = verbose
+
+    def handle_error(self, request, client_address):
+        # Un cliente que cancela una petición en curso cierra el socket: no es un error del servidor
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+
+def serve(store, host='127.0.0.1', port=3000, prefix='/api/v1', token=None, verbose=False):
+    """Create a ``MockServer`` for ``store``; call ``serve_forever()`` on it."""
+    return MockServer((host, port), store, prefix, token, verbose)
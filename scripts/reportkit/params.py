@@ -0,0 +1,115 @@
+"""Query parameters of the report endpoints, mirroring ``api.service.ts``.
+
+``dashboard002_query`` builds the same query string as
+``ApiService.getDashboard002Report``: empty strings are dropped, booleans are
+sent as ``true``/``false`` and the parameter order is preserved.
+
+``fold`` and ``date_bound`` give the matching rules used when filters are
+evaluated locally (mock backend, report cache).
+"""
+
+import unicodedata
+from datetime import datetime, timedelta, timezone
+
+# America/Bogota no tiene horario de verano
+BOGOTA = timezone(timedelta(hours=-5), 'America/Bogota')
+
+# (name, type) in the order getDashboard002Report appends them
+DASHBOARD_002_PARAMS = (
+    ('page', int),
+    ('perPage', int),
+    ('startDate', str),
+    ('endDate', str),
+    ('q', str),
+    ('surveyStatus', str),
+    ('willingToRespond', bool),
+    ('isPatriaDefender', bool),
+    ('isVerified', bool),
+    ('isLinkedHouse', bool),
+    ('department', str),
+    ('city', str),
+    ('neighborhood', str),
+    ('gender', str),
+    ('ageRange', str),
+    ('stratum', str),
+    ('idType', str),
+    ('sortBy', str),
+    ('sortOrder', str),
+)
+
+BOOLEAN_PARAMS = tuple(name for name, kind in DASHBOARD_002_PARAMS if kind is bool)
+
+
+def parse_bool(value):
+    """``ReportFilters`` booleans are ``''``/``'true'``/``'false'`` strings."""
+    if value is None or isinstance(value, bool):
+        return value
+    value = str(value).strip().lower()
+    if value in ('', 'all', 'todos'):
+        return None
+    if value in ('true', '1', 'yes', 'si', 'sí'):
+        return True
+    if value in ('false', '0', 'no'):
+        return False
+    raise ValueError(f'Not a boolean filter value: {value!r}')
+
+
+def fold(text):
+    """Lowercase ``text`` without accents, for accent-insensitive matching."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def date_bound(value, end=False):
+    """Epoch seconds of a ``startDate``/``endDate`` value.
+
+    A bare ``YYYY-MM-DD`` is a whole day in Bogotá time; with ``end`` the
+    bound is exclusive (the next midnight), so both ends are inclusive days.
+    Raises ``ValueError`` on malformed dates.
+    """
+    if len(value) == 10:
+        day = datetime.fromisoformat(value).replace(tzinfo=BOGOTA)
+        return int(day.timestamp()) + (86400 if end else 0)
+    moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=BOGOTA)
+    return int(moment.timestamp()) + (1 if end else 0)
+
+
+def dashboard002_query(params):
+    """List of ``(name, value)`` pairs for ``/dashboard002`` from a params dict."""
+    query = []
+    for name, kind in DASHBOARD_002_PARAMS:
+        value = params.get(name)
+        if kind is bool:
+            value = parse_bool(value)
+            if value is not None:
+                query.append((name, 'true' if value else 'false'))
+        elif value:
+            query.append((name, str(value)))
+    return query
+
+
+def add_filter_arguments(parser):
+    """Add one ``--<param>`` option per ``Dashboard002Params`` filter."""
+    group = parser.add_argument_group('report filters (Dashboard002Params)')
+    for name, kind in DASHBOARD_002_PARAMS:
+        if name in ('page', 'perPage'):
+            continue
+        if name == 'surveyStatus':
+            group.add_argument(f'--{name}', choices=('successful', 'unsuccessful'))
+        elif name == 'sortOrder':
+            group.add_argument(f'--{name}', choices=('asc', 'desc'))
+        elif kind is bool:
+            group.add_argument(f'--{name}', type=parse_bool, metavar='true|false')
+        else:
+            group.add_argument(f'--{name}')
+    return group
+
+
+def filters_from_args(args):
+    return {
+        name: getattr(args, name)
+        for name, _ in DASHBOARD_002_PARAMS
+        if name not in ('page', 'perPage') and getattr(args, name, None) not in (None, '')
+    }
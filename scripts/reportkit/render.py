@@ -0,0 +1,665 @@
+"""Render TS/TSX fragments for the template slots of a page spec.
+
+Every public function takes specs and returns a block of code without
+leading indentation; the template engine indents it to the slot position.
+"""
+
+import posixpath
+
+from .specs import QueryCacheSpec
+
+
+def ts_string(value):
+    """Single-quoted TS string literal."""
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+def indent(text, prefix):
+    return '\n'.join(prefix + line if line else line for line in text.split('\n'))
+
+
+def _items(values, suffix=','):
+    """One entry per line; multi-line entries get the suffix on their last line."""
+    return '\n'.join(value + suffix for value in values)
+
+
+def _block(opener, body, closer):
+    return f'{opener}\n{indent(body, "  ")}\n{closer}' if body else f'{opener}\n{closer}'
+
+
+# ---- Interfaces y constantes ----
+
+def item_interface(fields):
+    body = '\n'.join(f"{f.name}{'?' if f.optional else ''}: {f.ts_type}" for f in fields)
+    return _block('interface ReportItem {', body, '}')
+
+
+def _column(c):
+    lines = [f'key: {ts_string(c.key)},', f'label: {ts_string(c.label)},', f'minWidth: {ts_string(c.min_width)},']
+    if c.align != 'left':
+        lines.append(f'align: {ts_string(c.align)},')
+    lines.append(_block(f'render: ({c.args}) => (', c.render, '),'))
+    return _block('{', '\n'.join(lines), '}')
+
+
+def table_columns(columns):
+    return _block('const TABLE_COLUMNS: ReportTableColumn<ReportItem>[] = [', _items(_column(c) for c in columns), ']')
+
+
+def _boolean(source):
+    return f"{source} ? {source} === 'true' : undefined"
+
+
+def report_params(filters):
+    """Mapping from ``filters`` state to ``Dashboard002Params`` (sin paginación)."""
+    entries = []
+    for f in filters:
+        source = f'filters.{f.name}'
+        if f.param == 'raw':
+            entries.append(f'{f.name}: {source}')
+        elif f.param == 'boolean':
+            entries.append(f"{f.name}: {source}\n  ? {source} === 'true'\n  : undefined")
+        else:
+            entries.append(f'{f.name}: {source} || undefined')
+    return _items(entries)
+
+
+def export_params(filters):
+    """Params of the Excel export: only set filters, with the unions narrowed to the API types."""
+    entries = []
+    for f in filters:
+        source = f'filters.{f.name}'
+        if f.param == 'raw' and f.required:
+            entries.append(f'{f.name}: {source}')
+        elif f.param == 'boolean':
+            entries.append(f'{f.name}: {_boolean(source)}')
+        elif f.ts_type != 'string':
+            narrowed = ' | '.join(t for t in f.ts_type.split(' | ') if t != "''")
+            entries.append(f'{f.name}: ({source} as {narrowed}) || undefined')
+        else:
+            entries.append(f'{f.name}: {source} || undefined')
+    return _items(entries)
+
+
+def api_import(zone):
+    return 'ApiService' if zone else 'apiService'
+
+
+def api_name(zone):
+    return 'reportsApi' if zone else 'apiService'
+
+
+def api_client(zone):
+    """Zone pages read through a client bound to the zone API (followed by a blank line)."""
+    if not zone:
+        return ''
+    lines = [
+        f'// {zone.app_name} (VITE_ACTIVE_ZONE={zone.active_zone}), generado desde {zone.env_file}',
+        f'const ZONE_API_BASE_URL = {ts_string(zone.api_base_url)}',
+        'const reportsApi = ApiService.createWithBaseUrl(ZONE_API_BASE_URL)',
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def zone_locations(zone):
+    """Departments and municipalities of the zone, for the filter panel (followed by a blank line)."""
+    if not zone or not zone.municipalities:
+        return ''
+    departments = {}
+    for municipality, department in zone.municipalities:
+        departments.setdefault(department, []).append(municipality)
+    entries = (
+        _block('{', f'department: {ts_string(department)},\n'
+               f'municipalities: [{", ".join(ts_string(m) for m in municipalities)}],', '}')
+        for department, municipalities in departments.items()
+    )
+    return _block(f'// Municipios de {zone.active_zone} (BUILD_ZONES.md)\nconst ZONE_LOCATIONS: ZoneLocation[] = [',
+                  _items(entries), ']') + '\n'
+
+
+# ---- Exportación CSV ----
+
+def csv_headers(csv_columns):
+    return _items(ts_string(c.header) for c in csv_columns)
+
+
+def csv_row(csv_columns):
+    return _items(c.value for c in csv_columns)
+
+
+def export_worker_path(spec):
+    """Import path of the spec's export worker from its page."""
+    return _module_path(spec, spec.export_worker)
+
+
+def _module_path(spec, target):
+    path = posixpath.relpath(posixpath.splitext(target)[0], posixpath.dirname(spec.target))
+    return path if path.startswith('.') else './' + path
+
+
+def page_imports(spec):
+    """Imports of the page's query cache and export worker types."""
+    lines = []
+    if spec.query_cache:
+        lines.append(f"import {{ reportQueries, reportQueryStats }} from {ts_string(_module_path(spec, spec.query_cache))}")
+    if spec.export_worker:
+        lines.append(f"import type {{ ExportRequest, ExportWorkerMessage }} from {ts_string(export_worker_path(spec))}")
+    return '\n'.join(lines)
+
+
+CACHE_BADGE = """{import.meta.env.DEV && (
+  <span className="rg-badge" title={JSON.stringify(cacheStats)}>
+    Caché: {cacheStats.hits} aciertos / {cacheStats.misses} fallos
+  </span>
+)}"""
+
+# Los contadores cambian fuera del render (revalidaciones, prefetch): se copian al estado
+CACHE_STATE = """const [cacheStats, setCacheStats] = useState(reportQueryStats)"""
+
+_CACHE_STATS = 'setCacheStats(reportQueryStats())'
+
+
+def worker_csv_export(spec):
+    """``exportToCSV`` paging through the whole report in the export worker; a second click cancels."""
+    worker_url = ts_string(export_worker_path(spec) + '.ts')
+    on_message = (
+        "const message = event.data\n"
+        "if (message.type === 'progress') {\n"
+        "  setExportProgress(Math.floor((100 * message.rows) / Math.max(message.totalItems, 1)))\n"
+        "  return\n"
+        "}\n"
+        "stopExport()\n"
+        "if (message.type === 'error') {\n"
+        "  notificationService.handleApiError(message, 'Error al exportar el reporte')\n"
+        "  return\n"
+        "}\n"
+        "const link = document.createElement('a')\n"
+        "link.href = URL.createObjectURL(message.blob)\n"
+        "link.download = `reporte_encuestas_${filters.startDate}_${filters.endDate}.csv`\n"
+        "link.style.visibility = 'hidden'\n"
+        "document.body.appendChild(link)\n"
+        "link.click()\n"
+        "document.body.removeChild(link)\n"
+        "// El Blob puede pesar decenas de MB: se libera cuando la descarga ya empezó\n"
+        "setTimeout(() => URL.revokeObjectURL(link.href), 10000)\n"
+        "notificationService.success(`Archivo CSV descargado: ${message.rows} registros`)"
+    )
+    request = _block(
+        'const request: ExportRequest = {',
+        _block(f'...{api_name(spec.zone)}.getDashboard002Request({{', report_params(spec.filters), '}),')
+        + f'\nperPage: {spec.export_page_size},',
+        '}',
+    )
+    body = (
+        "if (exportWorkerRef.current) {\n"
+        "  stopExport()\n"
+        "  notificationService.info('Exportación cancelada')\n"
+        "  return\n"
+        "}\n"
+        "if (!filters.startDate || !filters.endDate) {\n"
+        "  notificationService.warning('Por favor seleccione un rango de fechas')\n"
+        "  return\n"
+        "}\n"
+        f"const worker = new Worker(new URL({worker_url}, import.meta.url), {{ type: 'module' }})\n"
+        "exportWorkerRef.current = worker\n"
+        "setExportProgress(0)\n"
+        + _block('worker.onmessage = (event: MessageEvent<ExportWorkerMessage>) => {', on_message, '}') + '\n'
+        "worker.onerror = () => {\n"
+        "  stopExport()\n"
+        "  notificationService.error('Error al exportar el reporte')\n"
+        "}\n"
+        f"{request}\n"
+        "worker.postMessage(request)"
+    )
+    return (
+        _block(
+            'const stopExport = useCallback(() => {',
+            'exportWorkerRef.current?.terminate()\nexportWorkerRef.current = null\nsetExportProgress(null)',
+            '}, [])',
+        )
+        + '\n\nuseEffect(() => () => exportWorkerRef.current?.terminate(), [])\n\n'
+        '// Exporta todas las páginas del reporte en un Web Worker (CSV por bloques, sin bloquear la pestaña)\n'
+        + _block('const exportToCSV = useCallback(() => {', body, '}, [filters, stopExport])')
+        + '\n'
+    )
+
+
+EXPORT_STATE = """const [exportProgress, setExportProgress] = useState<number | null>(null)
+const exportWorkerRef = useRef<Worker | null>(null)"""
+
+CSV_BUTTON = """{hasData && (
+  <button
+    className="btn btn--secondary"
+    onClick={exportToCSV}
+    disabled={isGenerating}
+    title="Exportar todas las páginas a CSV"
+  >
+    {exportProgress === null ? 'Exportar CSV' : `Cancelar (${exportProgress}%)`}
+  </button>
+)}"""
+
+
+# ---- Consulta del reporte ----
+
+def _report_call(spec, on_revalidate):
+    """``getDashboard002Report`` call, through the query cache when the page has one."""
+    api = api_name(spec.zone)
+    if not spec.query_cache:
+        return f'{api}.getDashboard002Report(params)'
+    options = 'api: reportsApi,\n' if spec.zone else ''
+    options += (
+        'refresh,\n'
+        '// Respuesta vencida servida desde la caché: la revalidación la reemplaza\n'
+        + _block('onRevalidate: (fresh) => {', f'{_CACHE_STATS}\n{on_revalidate}', '},')
+    )
+    return f'reportQueries.getDashboard002Report(params, {_block("{", options, "}")})'
+
+
+_PAGED_REVALIDATE = """setReportData(sanitizeSurveys(fresh.data.surveys))
+setTotalItems(fresh.data.totalItems)
+setTotalPages(fresh.data.totalPages)"""
+
+_VIRTUAL_REVALIDATE = """if (request !== requestRef.current) return
+// Reemplaza las filas de esta página sin perder las siguientes
+const start = (page - 1) * itemsPerPage
+const rows = sanitizeSurveys(fresh.data.surveys)
+setReportData((prev) => [...prev.slice(0, start), ...rows, ...prev.slice(start + rows.length)])
+setTotalItems(fresh.data.totalItems)
+setTotalPages(fresh.data.totalPages)"""
+
+_CHECK_DATES = """if (!filters.startDate || !filters.endDate) {
+  notificationService.warning('Por favor seleccione un rango de fechas')
+  return
+}"""
+
+_REPORT_DONE = """notificationService.success(
+  `Reporte generado: ${response.data.totalItems} registros`
+)
+if (window.matchMedia('(max-width: 1024px)').matches) {
+  setFilterPanelOpen(false)
+}"""
+
+
+def _params(spec):
+    return _block('const params = {', 'page,\nperPage: itemsPerPage,\n' + report_params(spec.filters), '}')
+
+
+def _signature(spec):
+    # Con caché, "Generar Reporte" pide datos nuevos; la paginación usa la caché
+    args = 'page: number = 1, refresh: boolean = false' if spec.query_cache else 'page: number = 1'
+    return f'const generateReport = useCallback(async ({args}) => {{'
+
+
+def report_fetch(spec):
+    """``generateReport(page)``: replaces the table with page ``page``."""
+    body = (
+        f"{_CHECK_DATES}\n"
+        "try {\n"
+        "  setIsGenerating(true)\n"
+        + indent(_params(spec), '  ') + '\n'
+        + indent(f'const response = await {_report_call(spec, _PAGED_REVALIDATE)}', '  ') + '\n'
+        "  setReportData(sanitizeSurveys(response.data.surveys))\n"
+        "  setCurrentPage(response.data.currentPage)\n"
+        "  setTotalItems(response.data.totalItems)\n"
+        "  setTotalPages(response.data.totalPages)\n"
+        + indent(_REPORT_DONE, '  ') + '\n'
+        "} catch (err) {\n"
+        "  notificationService.handleApiError(err, 'Error al generar el reporte')\n"
+        "} finally {\n"
+        "  setIsGenerating(false)\n"
+        + (f'  {_CACHE_STATS}\n' if spec.query_cache else '')
+        + "}"
+    )
+    return (
+        _block(_signature(spec), body, '}, [filters, itemsPerPage])')
+        + '\n\nconst handlePageChange = useCallback((page: number) => generateReport(page), [generateReport])'
+    )
+
+
+PAGED_COLUMNS = """// Render columns with adjusted index for pagination - Memoizado (rerender-memo)
+const paginatedColumns: ReportTableColumn<ReportItem>[] = useMemo(() => {
+  return TABLE_COLUMNS.map((col) => {
+    if (col.key === '#') {
+      return {
+        ...col,
+        render: (_item: ReportItem, idx: number) => (
+          <span style={{ fontWeight: 'bold', color: '#666' }}>
+            {(currentPage - 1) * itemsPerPage + idx + 1}
+          </span>
+        ),
+      }
+    }
+    return col
+  })
+}, [currentPage, itemsPerPage])
+"""
+
+
+def report_table(columns):
+    """``ReportTable`` with the page's loading and empty states."""
+    return f"""<ReportTable<ReportItem>
+  columns={{{columns}}}
+  data={{displayData}}
+  getRowKey={{(item) => item._id}}
+  isLoading={{isGenerating}}
+  emptyTitle="Configure sus filtros"
+  emptyDescription='Seleccione un rango de fechas y haga clic en "Generar Reporte" para visualizar los resultados.'
+  emptyAction={{
+    !filterPanelOpen
+      ? {{
+        label: 'Abrir Filtros',
+        onClick: () => setFilterPanelOpen(true),
+        icon: (
+          <FilterIcon size={{16}} />
+        ),
+      }}
+      : undefined
+  }}
+/>"""
+
+
+def table_footer():
+    """Previous/next pagination under the paged table."""
+    return """{/* Paginación */}
+{hasData ? (
+  <div className="rg-pagination">
+    <button
+      className="rg-pagination__btn"
+      onClick={() => handlePageChange(currentPage - 1)}
+      disabled={currentPage === 1 || isGenerating}
+    >
+      ← Anterior
+    </button>
+    <span className="rg-pagination__info">
+      Página {currentPage} de {totalPages}
+    </span>
+    <button
+      className="rg-pagination__btn"
+      onClick={() => handlePageChange(currentPage + 1)}
+      disabled={currentPage === totalPages || isGenerating}
+    >
+      Siguiente →
+    </button>
+    <span className="rg-pagination__detail">
+      Mostrando {(currentPage - 1) * itemsPerPage + 1}-
+      {Math.min(currentPage * itemsPerPage, totalItems)} de{' '}
+      {totalItems}
+    </span>
+  </div>
+) : null}"""
+
+
+# ---- Tabla virtualizada ----
+
+def virtual_constants(spec):
+    return (
+        '// Tabla virtualizada: alto fijo de fila y filas extra renderizadas fuera de la vista\n'
+        f'const ROW_HEIGHT = {spec.row_height}\n'
+        f'const OVERSCAN = {spec.overscan}'
+    )
+
+
+VIRTUAL_STATE = """const [isPrefetching, setIsPrefetching] = useState(false)
+const [scrollTop, setScrollTop] = useState(0)
+const [viewportHeight, setViewportHeight] = useState(600)
+const tableRef = useRef<HTMLDivElement>(null)
+const scrollFrameRef = useRef(0)
+// Cada reporte nuevo invalida las respuestas en vuelo del anterior
+const requestRef = useRef(0)
+const loadedPageRef = useRef(0)
+// Filas visibles y ventana cuando se pidió la última precarga
+const prefetchRef = useRef<{ visible: number; windowEnd: number } | null>(null)"""
+
+VIRTUAL_WINDOW = """const handleTableScroll = useCallback(() => {
+  // Como máximo un render por frame mientras se desplaza
+  if (scrollFrameRef.current) return
+  scrollFrameRef.current = requestAnimationFrame(() => {
+    scrollFrameRef.current = 0
+    setScrollTop(tableRef.current?.scrollTop ?? 0)
+  })
+}, [])
+
+useEffect(() => () => cancelAnimationFrame(scrollFrameRef.current), [])
+
+useEffect(() => {
+  const container = tableRef.current
+  if (!container) return
+  setViewportHeight(container.clientHeight)
+  const observer = new ResizeObserver(() => setViewportHeight(container.clientHeight))
+  observer.observe(container)
+  return () => observer.disconnect()
+}, [])
+
+const windowStart = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN)
+const windowEnd = Math.min(displayData.length, Math.ceil((scrollTop + viewportHeight) / ROW_HEIGHT) + OVERSCAN)
+
+// Precarga la página siguiente cuando queda menos de media página por debajo de la vista.
+// Si la anterior no agregó filas visibles (solo trajo no exitosas y están ocultas), no se
+// encadena otra hasta que cambie la ventana: si no, se descargaría el reporte completo
+useEffect(() => {
+  if (isGenerating || currentPage >= totalPages) return
+  if (displayData.length - windowEnd >= itemsPerPage / 2) return
+  const last = prefetchRef.current
+  if (last && last.visible === displayData.length && last.windowEnd === windowEnd) return
+  prefetchRef.current = { visible: displayData.length, windowEnd }
+  generateReport(currentPage + 1)
+}, [windowEnd, displayData.length, currentPage, totalPages, isGenerating, itemsPerPage, generateReport])
+"""
+
+
+def virtual_report_fetch(spec):
+    """``generateReport(page)``: page 1 replaces the table, later pages are appended in the background."""
+    body = (
+        f"{_CHECK_DATES}\n"
+        "const first = page === 1\n"
+        "if (!first && loadedPageRef.current >= page) return\n"
+        "const request = first ? ++requestRef.current : requestRef.current\n"
+        "loadedPageRef.current = page\n"
+        "try {\n"
+        "  if (first) {\n"
+        "    prefetchRef.current = null\n"
+        "    setIsGenerating(true)\n"
+        "    setIsPrefetching(false)\n"
+        "  } else {\n"
+        "    setIsPrefetching(true)\n"
+        "  }\n"
+        + indent(_params(spec), '  ') + '\n'
+        + indent(f'const response = await {_report_call(spec, _VIRTUAL_REVALIDATE)}', '  ') + '\n'
+        "  if (request !== requestRef.current) return\n"
+        "  const surveys = sanitizeSurveys(response.data.surveys)\n"
+        "  setReportData((prev) => (first ? surveys : [...prev, ...surveys]))\n"
+        "  setCurrentPage(response.data.currentPage)\n"
+        "  setTotalItems(response.data.totalItems)\n"
+        "  setTotalPages(response.data.totalPages)\n"
+        "  if (first) {\n"
+        "    tableRef.current?.scrollTo({ top: 0 })\n"
+        "    setScrollTop(0)\n"
+        + indent(_REPORT_DONE, '    ') + '\n'
+        "  }\n"
+        "} catch (err) {\n"
+        "  if (request !== requestRef.current) return\n"
+        "  if (first) {\n"
+        "    notificationService.handleApiError(err, 'Error al generar el reporte')\n"
+        "  } else {\n"
+        "    // Se reintenta en el siguiente desplazamiento\n"
+        "    loadedPageRef.current = page - 1\n"
+        "    notificationService.handleApiError(err, 'Error al cargar más registros')\n"
+        "  }\n"
+        "} finally {\n"
+        "  if (request === requestRef.current) {\n"
+        "    if (first) setIsGenerating(false)\n"
+        "    else setIsPrefetching(false)\n"
+        "  }\n"
+        + (f'  {_CACHE_STATS}\n' if spec.query_cache else '')
+        + "}"
+    )
+    return _block(_signature(spec), body, '}, [filters, itemsPerPage])')
+
+
+def _spacer(height):
+    return _block(
+        f'<tr className="rg-table__spacer" style={{{{ height: {height} }}}}>',
+        '<td colSpan={TABLE_COLUMNS.length} />',
+        '</tr>',
+    )
+
+
+VIRTUAL_HEAD = """<thead>
+  <tr>
+    {TABLE_COLUMNS.map((col) => (
+      <th
+        key={col.key}
+        className="rg-table__th"
+        style={{
+          textAlign: col.align || 'left',
+          minWidth: col.minWidth,
+        }}
+      >
+        {col.label}
+      </th>
+    ))}
+  </tr>
+</thead>"""
+
+VIRTUAL_ROW = """<tr key={item._id} className="rg-table__row rg-table__row--fixed" style={{ height: ROW_HEIGHT }}>
+  {TABLE_COLUMNS.map((col) => (
+    <td
+      key={col.key}
+      className="rg-table__td"
+      style={{ textAlign: col.align || 'left' }}
+    >
+      {col.render(item, windowStart + offset)}
+    </td>
+  ))}
+</tr>"""
+
+
+def virtual_table():
+    """Rows inside the scroll window between two spacers; ``ReportTable`` for the loading/empty states."""
+    rows = _block('{displayData.slice(windowStart, windowEnd).map((item, offset) => (', VIRTUAL_ROW, '))}')
+    body = _block(
+        '<tbody>',
+        _spacer('windowStart * ROW_HEIGHT') + '\n' + rows + '\n'
+        + _spacer('(displayData.length - windowEnd) * ROW_HEIGHT'),
+        '</tbody>',
+    )
+    table = _block('<table className="rg-table">', f'{VIRTUAL_HEAD}\n{body}', '</table>')
+    return _block(
+        '{displayData.length > 0 && !isGenerating ? (',
+        table,
+        ') : (',
+    ) + '\n' + indent(report_table('TABLE_COLUMNS'), '  ') + '\n)}'
+
+
+def virtual_table_footer():
+    """Loaded-rows counter; the next page loads while scrolling."""
+    return """{/* Registros cargados: la página siguiente se carga al desplazarse */}
+{hasData ? (
+  <div className="rg-pagination">
+    <span className="rg-pagination__info">
+      {reportData.length} de {totalItems} registros cargados
+    </span>
+    {isPrefetching && (
+      <span className="rg-pagination__detail">Cargando más registros...</span>
+    )}
+  </div>
+) : null}"""
+
+
+def page_slots(spec):
+    """All slot values for a ``PageSpec``, keyed by the spec part that produced them."""
+    if spec.table not in ('paged', 'virtual'):
+        raise ValueError(f'{spec.name}: unknown table variant {spec.table!r}')
+    virtual = spec.table == 'virtual'
+    worker = bool(spec.export_worker)
+    columns = table_columns(spec.columns)
+    locations = zone_locations(spec.zone)
+    return {
+        'react_imports': ', useEffect, useRef' if virtual or worker else '',
+        'api_import': api_import(spec.zone),
+        'page_imports': page_imports(spec),
+        'item_interface': item_interface(spec.item_fields),
+        'table_columns': f'{columns}\n\n{virtual_constants(spec)}' if virtual else columns,
+        'api_client': api_client(spec.zone),
+        'zone_locations': locations,
+        'items_per_page': str(spec.items_per_page),
+        'table_state': '\n'.join(
+            block for block in (
+                VIRTUAL_STATE if virtual else '',
+                EXPORT_STATE if worker else '',
+                CACHE_STATE if spec.query_cache else '',
+            ) if block
+        ),
+        'report_fetch': virtual_report_fetch(spec) if virtual else report_fetch(spec),
+        'api': api_name(spec.zone),
+        'export_params': export_params(spec.filters),
+        'csv_export': worker_csv_export(spec) if worker else '',
+        'paged_columns': '' if virtual else PAGED_COLUMNS,
+        'table_window': VIRTUAL_WINDOW if virtual else '',
+        'page_title': spec.title,
+        'header_info': CACHE_BADGE if spec.query_cache else '',
+        'generate_args': ', true' if spec.query_cache else '',
+        'header_actions': CSV_BUTTON if worker else '',
+        'table_container': " ref={tableRef} onScroll={handleTableScroll} style={{ maxHeight: '70vh' }}" if virtual else '',
+        'table': virtual_table() if virtual else report_table('paginatedColumns'),
+        'table_footer': virtual_table_footer() if virtual else table_footer(),
+        'filter_panel_types': ', ZoneLocation' if locations else '',
+        'filter_panel_props': 'zoneLocations={ZONE_LOCATIONS}' if locations else '',
+        'csv_headers': csv_headers(spec.csv_columns),
+        'csv_row': csv_row(spec.csv_columns),
+    }
+
+
+# ---- Caché de consultas ----
+
+def query_types(queries):
+    lines = []
+    for q in queries:
+        method = f"ApiService[{ts_string(q.method)}]"
+        lines.append(f'type {q.type_prefix}Params = Parameters<{method}>[0]')
+        lines.append(f'type {q.type_prefix}Response = Awaited<ReturnType<{method}>>')
+    return '\n'.join(lines)
+
+
+def _query_method(q):
+    params, response = f'{q.type_prefix}Params', f'{q.type_prefix}Response'
+    method, ttl, max_age = ts_string(q.method), q.ttl * 1000, q.max_age * 1000
+    signature = _block(f'async {q.method}(', f'params: {params},\noptions: QueryOptions<{response}> = {{}},', f'): Promise<{response}> {{')
+    if not q.total_pages:
+        body = f'return query({method}, {ttl}, {max_age}, params, options, api => api.{q.method}(params))'
+    else:
+        body = (
+            f'const fetcher = (request: {params}) => (api: ApiService) => api.{q.method}(request)\n'
+            f'const response = await query({method}, {ttl}, {max_age}, params, options, fetcher(params))\n'
+            'const page = params.page ?? 1\n'
+            + _block(
+                f'if (page < {q.total_pages}) {{',
+                'const next = { ...params, page: page + 1 }\n'
+                f'prefetch({method}, {ttl}, next, options, fetcher(next))',
+                '}',
+            )
+            + '\nreturn response'
+        )
+    comment = f'// {q.method}: fresca {q.ttl} s, vencida servible hasta {q.max_age} s'
+    if q.total_pages:
+        comment += ', prefetch de la página siguiente'
+    return f'{comment}\n{signature}\n{indent(body, "  ")}\n}},'
+
+
+def query_methods(queries):
+    return '\n\n'.join(_query_method(q) for q in queries)
+
+
+def query_cache_slots(spec):
+    return {
+        'query_types': query_types(spec.queries),
+        'max_entries': str(spec.max_entries),
+        'query_methods': query_methods(spec.queries),
+    }
+
+
+def slots_for(spec):
+    """Slot values of any generated spec (page or query-cache module)."""
+    if isinstance(spec, QueryCacheSpec):
+        return query_cache_slots(spec)
+    return page_slots(spec)
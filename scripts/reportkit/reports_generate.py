@@ -0,0 +1,211 @@
+"""Spec for ``src/pages/ReportsGenerate.tsx`` and its query cache module.
+
+The filter-to-params mapping, ``ReportItem`` shape, table columns and CSV
+export columns below are everything that varies in the page; the rest of
+the markup lives in ``templates/ReportsGenerate.tsx.tpl``. The filter
+controls themselves are ``ReportFilterPanel``'s.
+``REPORT_QUERY_CACHE`` lists the report API calls served through
+``src/services/reportQueryCache.ts``.
+"""
+
+from .specs import (
+    CachedQuery,
+    Column,
+    CsvColumn,
+    FilterField,
+    ItemField,
+    PageSpec,
+    QueryCacheSpec,
+)
+
+YES_NO = "'' | 'true' | 'false'"
+
+# Fecha en formato es-CO usada en la tabla y en el CSV
+ES_CO_DATE = (
+    "new Date(item.createdAt).toLocaleString('es-CO', {\n"
+    "  year: 'numeric',\n"
+    "  month: '2-digit',\n"
+    "  day: '2-digit',\n"
+    "  hour: '2-digit',\n"
+    "  minute: '2-digit',\n"
+    "})"
+)
+
+# Mismo orden que ReportFilters en src/components/ReportFilterPanel.tsx
+REPORT_FILTERS = (
+    FilterField('startDate', param='raw', required=True),
+    FilterField('endDate', param='raw', required=True),
+    FilterField('q'),
+    FilterField('surveyStatus', ts_type="'' | 'successful' | 'unsuccessful'"),
+    FilterField('willingToRespond', ts_type=YES_NO, param='boolean'),
+    FilterField('isPatriaDefender', ts_type=YES_NO, param='boolean'),
+    FilterField('isVerified', ts_type=YES_NO, param='boolean'),
+    FilterField('isLinkedHouse', ts_type=YES_NO, param='boolean'),
+    FilterField('department'),
+    FilterField('city'),
+    FilterField('neighborhood'),
+    FilterField('gender'),
+    FilterField('ageRange'),
+    FilterField('stratum'),
+    FilterField('idType'),
+    FilterField('sortBy'),
+    FilterField('sortOrder', ts_type="'asc' | 'desc'", param='raw'),
+)
+
+REPORT_ITEM_FIELDS = (
+    ItemField('_id', 'string'),
+    ItemField('willingToRespond', 'boolean'),
+    ItemField('surveyStatus', "'successful' | 'unsuccessful'"),
+    ItemField('fullName', 'string'),
+    ItemField('idType', 'string', optional=True),
+    ItemField('identification', 'string', optional=True),
+    ItemField('email', 'string', optional=True),
+    ItemField('phone', 'string', optional=True),
+    ItemField('address', 'string', optional=True),
+    ItemField('ageRange', 'string', optional=True),
+    ItemField('region', 'string', optional=True),
+    ItemField('department', 'string'),
+    ItemField('city', 'string', optional=True),
+    ItemField('gender', 'string', optional=True),
+    ItemField('stratum', 'number', optional=True),
+    ItemField('neighborhood', 'string', optional=True),
+    ItemField('isPatriaDefender', 'boolean'),
+    ItemField('isVerified', 'boolean'),
+    ItemField('linkedHomes', 'boolean'),
+    ItemField('isLinkedHouse', 'boolean'),
+    ItemField('location', "{ type: 'Point'; coordinates: [number, number] }"),
+    ItemField('autor', '{ _id: string; email: string; role: string }'),
+    ItemField('createdAt', 'string'),
+    ItemField('updatedAt', 'string'),
+    ItemField('audioFileKey', 'string', optional=True),
+    ItemField('socializer', '{ _id: string; fullName: string; idNumber: string; phone: string }'),
+    ItemField('rejectionReason', '{ value: string; label: string }', optional=True),
+    ItemField('noResponseReason', '{ value: string; label: string }', optional=True),
+    ItemField('visitAddress', 'string', optional=True),
+)
+
+
+def _small(value):
+    return f'<span className="rg-table__td--small">{{{value}}}</span>'
+
+
+def _check(field):
+    return (
+        f"<span style={{{{ color: item.{field} ? '#0066cc' : '#999' }}}}>\n"
+        f"  {{item.{field} ? <CheckIcon size={{16}} /> : '—'}}\n"
+        '</span>'
+    )
+
+
+TABLE_COLUMNS = (
+    Column(
+        '#', '#', '50px',
+        "<span style={{ fontWeight: 'bold', color: '#666' }}>{idx + 1}</span>",
+        args='_item, idx',
+    ),
+    Column('name', 'Nombre', '150px', '<span style={{ fontWeight: 500 }}>{item.fullName}</span>'),
+    Column('id', 'Identificación', '120px', _small("item.identification || '—'")),
+    Column('gender', 'Género', '100px', _small("item.gender || '—'")),
+    Column('age', 'Edad', '100px', _small("item.ageRange || '—'")),
+    Column('stratum', 'Estrato', '80px', _small("item.stratum?.toString() || '—'")),
+    Column(
+        'location', 'Municipio', '150px',
+        "<span className=\"rg-table__td--small\" style={{ color: '#555' }}>\n"
+        "  {item.city || item.department || 'N/A'}\n"
+        '</span>',
+    ),
+    Column(
+        'status', 'Estado', '100px',
+        '<span\n'
+        "  className={`rg-status-badge ${item.surveyStatus === 'successful'\n"
+        "    ? 'rg-status-badge--success'\n"
+        "    : 'rg-status-badge--error'\n"
+        '    }`}\n'
+        '>\n'
+        "  {item.surveyStatus === 'successful' ? (\n"
+        '    <>\n'
+        '      <CheckIcon size={14} /> Exitosa\n'
+        '    </>\n'
+        '  ) : (\n'
+        '    <>\n'
+        '      <XIcon size={14} /> No Exitosa\n'
+        '    </>\n'
+        '  )}\n'
+        '</span>',
+        align='center',
+    ),
+    Column('verified', 'Verificado', '100px', _check('isVerified'), align='center'),
+    Column('linkedHomes', 'Hogares vinculados', '120px', _check('linkedHomes'), align='center'),
+    Column('visited', 'Vinculaciones extra', '120px', _check('isLinkedHouse'), align='center'),
+    Column(
+        'defender', 'Defensor', '80px',
+        "<span style={{ color: item.isPatriaDefender ? '#0066cc' : '#999' }}>\n"
+        "  {item.isPatriaDefender ? <StarIcon size={16} color=\"#f1c40f\" /> : '—'}\n"
+        '</span>',
+        align='center',
+    ),
+    Column(
+        'socializer', 'Socializador', '130px',
+        '<div>\n'
+        "  <div style={{ fontWeight: 500, fontSize: '0.8rem' }}>\n"
+        "    {item.socializer?.fullName || 'N/A'}\n"
+        '  </div>\n'
+        "  <div style={{ fontSize: '0.75rem', color: '#999' }}>\n"
+        '    {item.socializer?.idNumber}\n'
+        '  </div>\n'
+        '</div>',
+    ),
+    Column(
+        'date', 'Fecha', '150px',
+        "<span style={{ fontSize: '0.8rem', color: '#666' }}>\n"
+        + '\n'.join('  ' + line for line in ('{' + ES_CO_DATE + '}').split('\n')) + '\n'
+        '</span>',
+    ),
+)
+
+CSV_COLUMNS = (
+    CsvColumn('N°', '(idx + 1).toString()'),
+    CsvColumn('Nombre Completo', 'item.fullName'),
+    CsvColumn('Identificación', "item.identification || ''"),
+    CsvColumn('Email', "item.email || ''"),
+    CsvColumn('Teléfono', "item.phone || ''"),
+    CsvColumn('Género', "item.gender || ''"),
+    CsvColumn('Edad', "item.ageRange || ''"),
+    CsvColumn('Estrato', "item.stratum ? item.stratum.toString() : ''"),
+    CsvColumn('Departamento', "item.department || ''"),
+    CsvColumn('Ciudad', "item.city || ''"),
+    CsvColumn('Región', "item.region || ''"),
+    CsvColumn('Barrio', "item.neighborhood || ''"),
+    CsvColumn('Defensor Patria', "item.isPatriaDefender ? 'Sí' : 'No'"),
+    CsvColumn('Estado Encuesta', "item.surveyStatus === 'successful' ? 'Exitosa' : 'No Exitosa'"),
+    CsvColumn('Dispuesto Responder', "item.willingToRespond ? 'Sí' : 'No'"),
+    CsvColumn('Socializer', "item.socializer?.fullName || ''"),
+    CsvColumn('Fecha Creación', ES_CO_DATE),
+)
+
+REPORTS_GENERATE = PageSpec(
+    name='reports-generate',
+    template='ReportsGenerate.tsx.tpl',
+    target='src/pages/ReportsGenerate.tsx',
+    filters=REPORT_FILTERS,
+    item_fields=REPORT_ITEM_FIELDS,
+    columns=TABLE_COLUMNS,
+    csv_columns=CSV_COLUMNS,
+    export_worker='src/workers/ReportsGenerate.export.worker.ts',
+    query_cache='src/services/reportQueryCache.ts',
+)
+
+REPORT_QUERY_CACHE = QueryCacheSpec(
+    name='report-query-cache',
+    template='reportQueryCache.ts.tpl',
+    target='src/services/reportQueryCache.ts',
+    queries=(
+        CachedQuery('getDashboard002Report', 'Dashboard002', total_pages='response.data.totalPages'),
+        CachedQuery('getDashboard003Report', 'Dashboard003'),
+    ),
+)
+
+PAGES = (REPORTS_GENERATE,)
+
+# Generated modules other than pages: not expanded per zone or --virtual
+MODULES = (REPORT_QUERY_CACHE,)
@@ -0,0 +1,364 @@
+"""Hourly and daily rollup cubes of surveys per socializer and status, one per zone.
+
+The cubes are fed by the change files of ``delta-export.py``: an update only
+applies the runs it has not seen, so its cost follows what changed, not the
+campaign length. Layout::
+
+    <root>/<zone>/
+        meta.json       origins, socializers, last applied change file, generation
+        gen-000007/     daily.npy   (days, socializers, statuses) counts
+                        hourly.npy  (hours, socializers, statuses), last ``HOURLY_DAYS`` days
+                        daily_cum.npy, hourly_cum.npy: prefix sums along the first axis
+                        record_*.npy: cell of every counted record
+
+Buckets are Bogotá local hours and days of ``createdAt``. Every record keeps
+its cell (hour, socializer, status), so a record that comes back modified
+moves between cells and a deleted one is subtracted. ``meta.json`` is the
+commit point: a new generation is written in full before it is referenced.
+
+A range is answered from the prefix sums: the whole days from the daily
+cube and the partial hours at both ends from the hourly one, two
+subtractions each, whatever the length of the range. Supervisors and
+coordinators are not stored: socializers are rolled up through the
+``HierarchyIndex`` at query time, so a reassigned socializer counts with
+their current team, as the API's hierarchy filters do.
+"""
+
+import json
+import math
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .columns import parse_date
+from .delta import read_changes
+from .params import BOGOTA, date_bound
+from .trace import span
+
+STATUSES = ('successful', 'unsuccessful')
+HOURLY_DAYS = 35
+LEVELS = ('socializer', 'supervisor', 'fieldcoordinator', 'zonecoordinator', 'zone')
+SERIES = ('day', 'hour')
+DEFAULT_ROOT = os.path.join(os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share'), 'soci-rollups')
+
+_OFFSET = int(BOGOTA.utcoffset(None).total_seconds())
+_RECORD_ARRAYS = ('record_ids', 'record_hour', 'record_socializer', 'record_status')
+
+
+def local_hour(value):
+    """Bogotá local hours since the epoch of an ISO date."""
+    return (int(parse_date(value).timestamp()) + _OFFSET) // 3600
+
+
+def hour_bound(value, end=False):
+    """First hour of a ``startDate``, or the hour after an ``endDate`` (both inclusive)."""
+    hours = (date_bound(value, end) + _OFFSET) / 3600
+    return math.ceil(hours) if end else math.floor(hours)
+
+
+def hour_label(hour):
+    return datetime.fromtimestamp(hour * 3600, timezone.utc).strftime('%Y-%m-%dT%H:00')
+
+
+def day_label(day):
+    return datetime.fromtimestamp(day * 86400, timezone.utc).strftime('%Y-%m-%d')
+
+
+def _write_json(path, data):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _empty(width):
+    return np.zeros((0, width, len(STATUSES)), dtype=np.int32)
+
+
+def _cover(array, origin, lo, hi, width):
+    """``(array, origin)`` widened to buckets ``[lo, hi)`` and ``width`` socializers."""
+    new_lo, new_hi = min(origin, lo), max(origin + len(array), hi)
+    pad = ((origin - new_lo, new_hi - origin - len(array)), (0, width - array.shape[1]), (0, 0))
+    if any(p for axis in pad for p in axis):
+        array = np.pad(array, pad)
+    return array, new_lo
+
+
+def _prefix(array):
+    cum = np.zeros((len(array) + 1,) + array.shape[1:], dtype=np.int64)
+    np.cumsum(array, axis=0, out=cum[1:])
+    return cum
+
+
+def _range_sum(cum, origin, lo, hi):
+    """Sum of buckets ``[lo, hi)`` from a prefix-sum array starting at ``origin``."""
+    lo, hi = max(lo, origin), min(hi, origin + len(cum) - 1)
+    if hi <= lo:
+        return 0
+    return cum[hi - origin] - cum[lo - origin]
+
+
+@dataclass
+class UpdateStats:
+    zone: str
+    runs: int = 0
+    changes: int = 0
+    moved: int = 0
+    records: int = 0
+    elapsed: float = 0.0
+
+    def as_dict(self):
+        return {
+            'zone': self.zone,
+            'runs': self.runs,
+            'changes': self.changes,
+            'cellsMoved': self.moved,
+            'records': self.records,
+            'elapsedSeconds': round(self.elapsed, 3),
+        }
+
+
+class RollupCube:
+    """Daily and hourly cubes of one zone."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        try:
+            with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+                self.meta = json.load(f)
+        except FileNotFoundError:
+            self.meta = self._empty_meta()
+        self.arrays = {}
+        if self.meta['generation']:
+            gen = os.path.join(path, self.meta['generation'])
+            for name in ('daily', 'hourly', 'daily_cum', 'hourly_cum') + _RECORD_ARRAYS:
+                self.arrays[name] = np.load(os.path.join(gen, f'{name}.npy'), mmap_mode='r')
+
+    @staticmethod
+    def _empty_meta():
+        return {
+            'deltaStart': None, 'applied': 0, 'generation': None, 'next': 1,
+            'dayOrigin': 0, 'hourOrigin': 0, 'socializers': [''], 'names': ['Sin socializador'],
+        }
+
+    @classmethod
+    def open(cls, zone, root=DEFAULT_ROOT):
+        return cls(os.path.join(root, zone))
+
+    def __len__(self):
+        return len(self.arrays.get('record_ids', ()))
+
+    # ---- Actualización ----
+
+    def _contributions(self):
+        """``{_id: (hour, socializer, status)}`` of the counted records."""
+        if not len(self):
+            return {}
+        a = self.arrays
+        return dict(zip(
+            np.char.decode(a['record_ids']).tolist(),
+            zip(a['record_hour'].tolist(), a['record_socializer'].tolist(), a['record_status'].tolist()),
+        ))
+
+    def _socializer(self, doc, codes):
+        socializer = doc.get('socializer') or {}
+        if not isinstance(socializer, dict):
+            socializer = {'_id': socializer}
+        id_ = socializer.get('_id')
+        if not id_:
+            return 0
+        if id_ not in codes:
+            codes[id_] = len(self.meta['socializers'])
+            self.meta['socializers'].append(id_)
+            self.meta['names'].append(socializer.get('fullName') or id_)
+        return codes[id_]
+
+    def update(self, store, zone, now=None):
+        """Apply the change files of ``store`` (a ``DeltaStore``) not applied yet."""
+        started = time.time()
+        stats = UpdateStats(zone=zone)
+        if self.meta['deltaStart'] not in (None, store.state['startDate']) or \
+                self.meta['applied'] >= store.state['next']:
+            # El almacén de cambios se rehízo: se reconstruye el cubo desde cero
+            self.meta = dict(self._empty_meta(), generation=self.meta['generation'], next=self.meta['next'])
+            self.arrays = {}
+        runs = [run for run in store.state['runs'] if run['seq'] > self.meta['applied']]
+        contributions = self._contributions()
+        codes = {id_: code for code, id_ in enumerate(self.meta['socializers'])}
+        cells = []
+        for run in runs:
+            for change in read_changes(os.path.join(store.path, 'changes', run['file'])):
+                stats.changes += 1
+                if change['op'] == 'delete':
+                    old = contributions.pop(change['id'], None)
+                    if old:
+                        cells.append((*old, -1))
+                    continue
+                doc = change['doc']
+                if not doc.get('createdAt'):
+                    continue
+                status = 0 if doc.get('surveyStatus') == 'successful' else 1
+                new = (local_hour(doc['createdAt']), self._socializer(doc, codes), status)
+                old = contributions.get(doc['_id'])
+                if old == new:
+                    continue
+                if old:
+                    cells.append((*old, -1))
+                contributions[doc['_id']] = new
+                cells.append((*new, 1))
+        stats.runs, stats.moved = len(runs), len(cells)
+        if runs:
+            with span('apply', zone=zone, cells=len(cells)):
+                self._apply(cells, now)
+            self.meta['applied'] = runs[-1]['seq']
+            self.meta['deltaStart'] = store.state['startDate']
+            with span('save', zone=zone):
+                self._save(contributions)
+        stats.records = len(self)
+        stats.elapsed = time.time() - started
+        return stats
+
+    def _apply(self, cells, now=None):
+        meta, width = self.meta, len(self.meta['socializers'])
+        cells = np.array(cells, dtype=np.int64).reshape(-1, 4)
+        hours, socializers, statuses, deltas = cells.T
+        days = hours // 24
+        if 'daily' in self.arrays:
+            daily = np.array(self.arrays['daily'])
+        else:
+            daily, meta['dayOrigin'] = _empty(width), int(days.min()) if len(days) else 0
+        lo, hi = (int(days.min()), int(days.max()) + 1) if len(days) else (meta['dayOrigin'],) * 2
+        daily, meta['dayOrigin'] = _cover(daily, meta['dayOrigin'], lo, hi, width)
+        np.add.at(daily, (days - meta['dayOrigin'], socializers, statuses), deltas)
+
+        # Ventana horaria: desde la medianoche de hace HOURLY_DAYS días; lo anterior solo queda en el cubo diario
+        now = time.time() if now is None else now
+        window = ((int(now) + _OFFSET) // 86400 - HOURLY_DAYS) * 24
+        if 'hourly' in self.arrays:
+            hourly = np.array(self.arrays['hourly'])
+        else:
+            hourly, meta['hourOrigin'] = _empty(width), window
+        if meta['hourOrigin'] < window:
+            hourly = hourly[window - meta['hourOrigin']:]
+            meta['hourOrigin'] = window
+        recent = hours >= meta['hourOrigin']
+        lo, hi = (int(hours[recent].min()), int(hours[recent].max()) + 1) if recent.any() else (meta['hourOrigin'],) * 2
+        hourly, meta['hourOrigin'] = _cover(hourly, meta['hourOrigin'], lo, hi, width)
+        np.add.at(hourly, (hours[recent] - meta['hourOrigin'], socializers[recent], statuses[recent]), deltas[recent])
+        self.arrays.update(daily=daily, hourly=hourly)
+
+    def _save(self, contributions):
+        name = f'gen-{self.meta["next"]:06d}'
+        gen = os.path.join(self.path, name)
+        # Restos de una escritura interrumpida antes de actualizar meta.json
+        shutil.rmtree(gen, ignore_errors=True)
+        os.makedirs(gen)
+        cells = np.array(list(contributions.values()), dtype=np.int64).reshape(-1, 3)
+        arrays = {
+            'daily': self.arrays['daily'],
+            'hourly': self.arrays['hourly'],
+            'daily_cum': _prefix(self.arrays['daily']),
+            'hourly_cum': _prefix(self.arrays['hourly']),
+            'record_ids': np.array(list(contributions), dtype='S24'),
+            'record_hour': cells[:, 0],
+            'record_socializer': cells[:, 1].astype(np.int32),
+            'record_status': cells[:, 2].astype(np.int8),
+        }
+        for array_name, array in arrays.items():
+            np.save(os.path.join(gen, f'{array_name}.npy'), array)
+        old = self.meta['generation']
+        self.meta.update(generation=name, next=self.meta['next'] + 1)
+        _write_json(os.path.join(self.path, 'meta.json'), self.meta)
+        if old:
+            shutil.rmtree(os.path.join(self.path, old), ignore_errors=True)
+        self.arrays = arrays
+
+    # ---- Consultas ----
+
+    def counts(self, h0, h1):
+        """(socializers, statuses) totals of the local hours ``[h0, h1)``."""
+        meta, a = self.meta, self.arrays
+        total = np.zeros((len(meta['socializers']), len(STATUSES)), dtype=np.int64)
+        if not a or h1 <= h0:
+            return total
+        d0, d1 = -(-h0 // 24), h1 // 24
+        edges = [(h0, h1)] if d0 >= d1 else [(h0, d0 * 24), (d1 * 24, h1)]
+        if d0 < d1:
+            total += _range_sum(a['daily_cum'], meta['dayOrigin'], d0, d1)
+        for lo, hi in edges:
+            if hi <= lo:
+                continue
+            if lo < meta['hourOrigin'] and self._has_hours_before(lo, min(hi, meta['hourOrigin'])):
+                raise ValueError(
+                    f'{hour_label(lo)}: anterior a la ventana horaria ({hour_label(meta["hourOrigin"])}); '
+                    'use días completos'
+                )
+            total += _range_sum(a['hourly_cum'], meta['hourOrigin'], lo, hi)
+        return total
+
+    def _has_hours_before(self, lo, hi):
+        """Whether any daily bucket touching ``[lo, hi)`` has counts (the hourly cube does not cover them)."""
+        return bool(np.any(_range_sum(self.arrays['daily_cum'], self.meta['dayOrigin'], lo // 24, -(-hi // 24))))
+
+    def group_keys(self, by, zone, hierarchy=None):
+        """``(ids, names)`` of the group of each socializer code at level ``by``."""
+        socializers, names = self.meta['socializers'], self.meta['names']
+        if by == 'socializer':
+            return list(socializers), list(names)
+        if by == 'zone':
+            return [zone] * len(socializers), [zone] * len(socializers)
+        if hierarchy is None:
+            raise ValueError(f'--by {by} requiere el índice de jerarquía (hierarchy-index.py build)')
+        ids, labels = [], []
+        for id_ in socializers:
+            try:
+                node = hierarchy.ancestor(hierarchy.node(id_), by)
+            except KeyError:
+                node = -1
+            ids.append(str(hierarchy.ids[node]) if node >= 0 else '')
+            labels.append(str(hierarchy.names[node]) if node >= 0 else 'Sin asignar')
+        return ids, labels
+
+
+def query(cubes, start, end, by='socializer', series=None, hierarchy=None):
+    """Survey counts of ``[start, end]`` grouped at level ``by``, merged across ``cubes``.
+
+    ``cubes`` maps zone names to ``RollupCube``. ``start``/``end`` are
+    ``startDate``/``endDate`` values (days, or datetimes rounded to the hour).
+    With ``series`` (``day`` or ``hour``) there is one row per group and bucket.
+    """
+    if by not in LEVELS:
+        raise ValueError(f'--by debe ser uno de {", ".join(LEVELS)}')
+    h0, h1 = hour_bound(start), hour_bound(end, end=True)
+    if series == 'day':
+        buckets = [(max(h0, d * 24), min(h1, d * 24 + 24), day_label(d)) for d in range(h0 // 24, -(-h1 // 24))]
+    elif series == 'hour':
+        buckets = [(h, h + 1, hour_label(h)) for h in range(h0, h1)]
+    else:
+        buckets = [(h0, h1, None)]
+
+    rows = {}
+    for zone, cube in cubes.items():
+        ids, names = cube.group_keys(by, zone, hierarchy)
+        for lo, hi, label in buckets:
+            counts = cube.counts(lo, hi)
+            for code in np.flatnonzero(counts.sum(axis=1)).tolist():
+                key = (label, ids[code])
+                row = rows.get(key)
+                if row is None:
+                    row = rows[key] = {'id': ids[code], 'name': names[code], **{s: 0 for s in STATUSES}}
+                    if label is not None:
+                        row[series] = label
+                for status, value in zip(STATUSES, counts[code].tolist()):
+                    row[status] += value
+    result = []
+    for row in rows.values():
+        row['total'] = sum(row[s] for s in STATUSES)
+        result.append(row)
+    result.sort(key=lambda r: (r.get(series) or '', -r['total'], r['name']))
+    return result
@@ -0,0 +1,350 @@
+"""Concurrent, resumable creation of the Admin > ... > Socializer user tree.
+
+The hierarchy spec is the ``hierarchy-dry-run.json`` format written by
+``seed-hierarchy-dry-run.ts`` (``users`` with ``type``, ``name``, ``email``,
+``password``, ``id``, ``level`` and ``parentName``); ``build_hierarchy``
+produces the same format for any fan-out.
+
+Users are created level by level (a child needs its parents' ids) through
+``/users/create-with-profile``, with up to ``concurrency`` requests in
+flight on a pooled ``ApiClient``. Once the socializers exist, each
+supervisor gets its team in ``/coordinator-assignments/batch`` calls of up to
+``batch_size`` socializers.
+
+Every completed step is appended to a JSON-lines journal and flushed, so an
+interrupted run continues from there: created users are not created again
+and their ids are reused for the children. A create that succeeded on the
+server but was not journaled shows up as a conflict on the next run.
+"""
+
+import asyncio
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from .client import ApiError
+from .trace import span
+
+USERS_CREATE_WITH_PROFILE = '/users/create-with-profile'
+COORDINATOR_ASSIGNMENTS_BATCH = '/coordinator-assignments/batch'
+ROLES = '/roles'
+AUTH_LOGIN = '/auth/login'
+
+# (nivel, tipo en el dry run, nombres posibles del rol en /roles)
+LEVELS = (
+    (0, 'Admin', ('admin', 'root')),
+    (1, 'Coordinador de Zona', ('zonecoordinator', 'coordinador', 'coordinator')),
+    (2, 'Coordinador de Campo', ('fieldcoordinator', 'coordinador', 'coordinator')),
+    (3, 'Supervisor', ('supervisor',)),
+    (4, 'Socializador', ('socializer', 'socializador')),
+)
+# Campo de create-with-profile con el id de cada ancestro, por nivel del ancestro
+PARENT_FIELDS = {0: 'adminId', 1: 'zoneCoordinatorId', 2: 'fieldCoordinatorId', 3: 'supervisorId'}
+SUPERVISOR_LEVEL = 3
+SOCIALIZER_LEVEL = 4
+
+
+@dataclass
+class SeedUser:
+    key: str                  # ``id`` del dry run, p. ej. ``socializer-1-2``
+    type: str
+    name: str
+    email: str
+    password: str
+    level: int
+    parent: str = None        # key del superior inmediato
+    id_number: str = ''
+    phone: str = ''
+
+    def as_dry_run(self, parent_name=None):
+        data = {
+            'type': self.type, 'name': self.name, 'email': self.email,
+            'password': self.password, 'id': self.key, 'level': self.level,
+        }
+        if parent_name:
+            data['parentName'] = parent_name
+        return data
+
+
+def _contact(level, serial):
+    """Deterministic, unique ``(idNumber, phone)`` for the ``serial``-th user of ``level``."""
+    return f'{level + 10}{serial:08d}', f'30{level}{serial:07d}'
+
+
+def build_hierarchy(zones=2, fields=1, supervisors=1, socializers=2, domain='soci.app'):
+    """Users of a tree with the given fan-out per level, admin first.
+
+    With the defaults it is the tree of ``seed-hierarchy-dry-run.ts``
+    (same names, emails and passwords).
+    """
+    users = [SeedUser('admin-1', 'Admin', 'Admin Test', f'admin.test@{domain}', 'AdminTest123!', 0,
+                      id_number='1234567890', phone='3012345678')]
+    small = fields == supervisors == 1
+    counters = [0] * 5
+
+    def add(user):
+        counters[user.level] += 1
+        user.id_number, user.phone = _contact(user.level, counters[user.level])
+        users.append(user)
+        return user
+
+    for z in range(1, zones + 1):
+        zone = add(SeedUser(f'zone-coord-{z}', 'Coordinador de Zona', f'Coordinador Zona {z}',
+                            f'zone.coordinator.{z}@{domain}', f'ZoneCoord{z}Test123!', 1, 'admin-1'))
+        for f in range(1, fields + 1):
+            # Un solo coordinador/supervisor por zona conserva los nombres del dry run
+            tag = f'{z}' if small else f'{z}_{f}'
+            fc = add(SeedUser(f'field-coord-{tag.replace("_", "-")}', 'Coordinador de Campo',
+                              f'Coordinador Campo - Zona {tag.replace("_", " #")}',
+                              f'field.coordinator.zone{tag}@{domain}', f'FieldCoord{tag}Test123!', 2, zone.key))
+            for s in range(1, supervisors + 1):
+                stag = tag if small else f'{tag}_{s}'
+                sup = add(SeedUser(f'supervisor-{stag.replace("_", "-")}', 'Supervisor',
+                                   f'Supervisor - Zona {stag.replace("_", " #", 1).replace("_", ".")}',
+                                   f'supervisor.zone{stag}@{domain}', f'Supervisor{stag}Test123!', 3, fc.key))
+                for n in range(1, socializers + 1):
+                    ntag = f'{stag}_{n}'
+                    add(SeedUser(f'socializer-{ntag.replace("_", "-")}', 'Socializador',
+                                 f'Socializador - Zona {stag.replace("_", ".")} #{n}',
+                                 f'socializer.zone{ntag}@{domain}', f'Socializer{ntag}Test123!', 4, sup.key))
+    return users
+
+
+def load_hierarchy(path):
+    """``SeedUser`` list from a ``hierarchy-dry-run.json`` file."""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    entries = data['users'] if isinstance(data, dict) else data
+    by_name = {e['name']: e['id'] for e in entries}
+    counters = [0] * 5
+    users = []
+    for e in entries:
+        level = int(e['level'])
+        counters[level] += 1
+        id_number, phone = _contact(level, counters[level])
+        parent = e.get('parentName')
+        if parent and parent not in by_name:
+            raise ValueError(f'{e["id"]}: superior desconocido {parent!r}')
+        users.append(SeedUser(
+            e['id'], e['type'], e['name'], e['email'], e['password'], level,
+            by_name.get(parent), e.get('idNumber') or id_number, e.get('phone') or phone,
+        ))
+    if len({u.key for u in users}) != len(users):
+        raise ValueError(f'{path}: hay ids repetidos')
+    return users
+
+
+def write_hierarchy(users, json_path, csv_path, api_url, ids=None):
+    """Write the dry-run JSON and credentials CSV (``ids``: key -> real id, if seeded)."""
+    names = {u.key: u.name for u in users}
+    ids = ids or {}
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'api_url': api_url,
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+            'total_users': len(users),
+            'users': [{**u.as_dry_run(names.get(u.parent)), **({'_id': ids[u.key]} if u.key in ids else {})}
+                      for u in users],
+        }, f, ensure_ascii=False, indent=2)
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['Tipo', 'Nombre', 'Email', 'Contraseña', 'ID', 'Nivel'])
+        for u in users:
+            writer.writerow([u.type, u.name, u.email, u.password, ids.get(u.key, u.key), u.level])
+
+
+class Journal:
+    """Append-only JSON lines: ``{"user": key, ...ids}`` and ``{"assigned": [keys]}`` entries."""
+
+    def __init__(self, path):
+        self.path = path
+        self.users = {}
+        self.assigned = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # última línea a medio escribir
+                    if 'user' in entry:
+                        self.users[entry['user']] = entry
+                    elif 'assigned' in entry:
+                        self.assigned.update(entry['assigned'])
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _append(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def user_created(self, key, user_id, profile_id):
+        entry = {'user': key, 'userId': user_id, 'profileId': profile_id}
+        self.users[key] = entry
+        self._append(entry)
+
+    def assigned_to(self, keys):
+        self.assigned.update(keys)
+        self._append({'assigned': keys})
+
+    def sync(self):
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+@dataclass
+class SeedStats:
+    created: int = 0
+    skipped: int = 0
+    batches: int = 0
+    assigned: int = 0
+    failed: list = field(default_factory=list)   # (key, mensaje)
+    elapsed: float = 0.0
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'alreadyCreated': self.skipped,
+            'assignmentBatches': self.batches,
+            'socializersAssigned': self.assigned,
+            'failed': len(self.failed),
+            'usersPerSecond': round(self.created / self.elapsed, 1) if self.elapsed else 0.0,
+            'elapsedSeconds': round(self.elapsed, 3),
+        }
+
+
+def _created_ids(response):
+    """``(userId, profileId)`` from a create-with-profile response (both shapes seen)."""
+    data = (response or {}).get('data') or {}
+    profile = data.get('profile') or data
+    user = profile.get('user')
+    user_id = data.get('userId') or (user.get('_id') if isinstance(user, dict) else user) or profile.get('_id')
+    return user_id, profile.get('_id') or user_id
+
+
+async def role_ids(api):
+    """``{level: roleId}`` from ``/roles``."""
+    response = await api.get(ROLES)
+    available = {str(r.get('role', '')).lower(): r['_id'] for r in response.get('data') or []}
+    ids = {}
+    for level, type_, names in LEVELS:
+        found = next((available[n] for n in names if n in available), None)
+        if found is None:
+            raise ApiError(f'No existe un rol para {type_} (se buscó: {", ".join(names)})')
+        ids[level] = found
+    return ids
+
+
+async def login(api, email, password):
+    response = await api.post(AUTH_LOGIN, {'email': email, 'password': password})
+    token = (response.get('user') or {}).get('token') or response.get('token')
+    if not token:
+        raise ApiError(f'Login sin token para {email}')
+    return token
+
+
+async def _run_pool(items, worker, concurrency):
+    """Run ``worker(item)`` with at most ``concurrency`` in flight."""
+    queue = iter(items)
+
+    async def run():
+        for item in queue:
+            await worker(item)
+
+    await asyncio.gather(*(run() for _ in range(concurrency)))
+
+
+async def seed(api, users, journal, concurrency=16, batch_size=500, admin_login=True, progress=None):
+    """Create ``users`` and the supervisor assignments; returns ``SeedStats``.
+
+    With ``admin_login`` the client logs in as the spec's admin once it
+    exists and sends that token on every later request.
+    """
+    started = time.time()
+    stats = SeedStats()
+    roles = await role_ids(api)
+    by_key = {u.key: u for u in users}
+
+    def ancestors(user):
+        parent = by_key.get(user.parent)
+        while parent is not None:
+            yield parent
+            parent = by_key.get(parent.parent)
+
+    for level in sorted({u.level for u in users}):
+        members = [u for u in users if u.level == level]
+        pending = []
+        for user in members:
+            if user.key in journal.users:
+                stats.skipped += 1
+            elif any(a.key not in journal.users for a in ancestors(user)):
+                stats.failed.append((user.key, 'superior no creado'))
+            else:
+                pending.append(user)
+
+        async def create(user):
+            payload = {
+                'email': user.email,
+                'password': user.password,
+                'roleId': roles[user.level],
+                'profileData': {'fullName': user.name, 'idNumber': user.id_number, 'phone': user.phone},
+            }
+            for ancestor in ancestors(user):
+                payload[PARENT_FIELDS[ancestor.level]] = journal.users[ancestor.key]['userId']
+            try:
+                response = await api.post(USERS_CREATE_WITH_PROFILE, payload)
+            except ApiError as err:
+                stats.failed.append((user.key, err.message))
+                return
+            journal.user_created(user.key, *_created_ids(response))
+            stats.created += 1
+            if progress:
+                progress(level, stats)
+
+        with span('level', level=level, users=len(pending)):
+            await _run_pool(pending, create, concurrency)
+        journal.sync()
+
+        if level == 0 and admin_login and members and members[0].key in journal.users and not api.token:
+            api.token = await login(api, members[0].email, members[0].password)
+
+    with span('assign'):
+        await _assign(api, users, journal, batch_size, concurrency, stats)
+    journal.sync()
+    stats.elapsed = time.time() - started
+    return stats
+
+
+async def _assign(api, users, journal, batch_size, concurrency, stats):
+    # Solo se envían los socializadores aún sin asignar: al reanudar, los
+    # creados en esta ejecución se suman al equipo ya asignado del supervisor
+    teams = {}
+    for user in users:
+        if (user.level == SOCIALIZER_LEVEL and user.key in journal.users
+                and user.key not in journal.assigned and user.parent in journal.users):
+            teams.setdefault(user.parent, []).append(user.key)
+    batches = [
+        (supervisor, keys[start:start + batch_size])
+        for supervisor, keys in teams.items()
+        for start in range(0, len(keys), batch_size)
+    ]
+
+    async def assign(batch):
+        supervisor, keys = batch
+        try:
+            await api.post(COORDINATOR_ASSIGNMENTS_BATCH, {
+                'coordinatorId': journal.users[supervisor]['profileId'],
+                'socializerIds': [journal.users[key]['profileId'] for key in keys],
+            })
+        except ApiError as err:
+            stats.failed.append((f'{supervisor} ({len(keys)} socializadores)', err.message))
+            return
+        journal.assigned_to(keys)
+        stats.batches += 1
+        stats.assigned += len(keys)
+
+    await _run_pool(batches, assign, concurrency)
@@ -0,0 +1,135 @@
+"""Declarative building blocks for generated report pages.
+
+Each spec is a frozen dataclass so a page definition can be hashed and
+compared between runs: if neither the spec nor its template changed, the
+generator does not need to render anything.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class FilterField:
+    """One field of the ``ReportFilters`` state and how it reaches the API.
+
+    The fields and their controls live in ``ReportFilterPanel``; the page
+    only maps them into ``Dashboard002Params``. ``param`` is ``raw`` (sent
+    as is), ``optional`` (``value || undefined``) or ``boolean``
+    (``'true'``/``'false'`` strings become booleans). ``required`` fields
+    are always set (the date range), so the Excel export sends them as is.
+    """
+
+    name: str
+    ts_type: str = 'string'
+    param: str = 'optional'
+    required: bool = False
+
+
+@dataclass(frozen=True)
+class ItemField:
+    """One property of the ``ReportItem`` interface."""
+
+    name: str
+    ts_type: str
+    optional: bool = False
+
+
+@dataclass(frozen=True)
+class Column:
+    """One ``ReportTableColumn`` of the results table.
+
+    ``render`` is the JSX returned for a row, with ``args`` as the
+    parameters of the render function (``item`` and optionally ``idx``).
+    """
+
+    key: str
+    label: str
+    min_width: str
+    render: str
+    align: str = 'left'
+    args: str = 'item'
+
+
+@dataclass(frozen=True)
+class CsvColumn:
+    """One column of the CSV export: header label and TS value expression."""
+
+    header: str
+    value: str
+
+
+@dataclass(frozen=True)
+class ZoneSpec:
+    """A production zone build, as described by its ``.env.production.*`` file.
+
+    ``municipalities`` holds ``(name, department)`` pairs; it is empty for
+    builds without a fixed municipality list (e.g. ``zonaf``).
+    """
+
+    name: str
+    env_file: str
+    active_zone: str
+    app_name: str
+    api_base_url: str
+    municipalities: tuple = ()
+
+
+@dataclass(frozen=True)
+class PageSpec:
+    """A generated page: template, target path and the specs that fill it.
+
+    Pages with a ``zone`` talk to that zone's API instead of the build's
+    default ``VITE_API_BASE_URL``. ``table`` is ``paged`` (previous/next
+    buttons) or ``virtual`` (rows of ``row_height`` px rendered only around
+    the visible window, next page prefetched while scrolling).
+    ``export_worker`` is the target of the page's CSV export Web Worker
+    (which pages through the whole report ``export_page_size`` rows at a
+    time); without it the page only has the server-side Excel export.
+    ``query_cache`` is the target of a ``QueryCacheSpec`` module the page
+    reads reports through.
+    """
+
+    name: str
+    template: str
+    target: str
+    filters: tuple
+    item_fields: tuple
+    columns: tuple
+    csv_columns: tuple
+    title: str = 'Reportes - Generar Reporte Tabular'
+    items_per_page: int = 50
+    zone: ZoneSpec = None
+    table: str = 'paged'
+    row_height: int = 56
+    overscan: int = 10
+    export_worker: str = ''
+    export_page_size: int = 5000
+    query_cache: str = ''
+
+
+@dataclass(frozen=True)
+class CachedQuery:
+    """One ``ApiService`` report method served through the query cache.
+
+    Responses younger than ``ttl`` seconds are fresh; until ``max_age`` they
+    are served immediately while a background request revalidates them.
+    With ``total_pages`` (a TS expression over ``response``) the next value
+    of the ``page`` param is prefetched after every call.
+    """
+
+    method: str
+    type_prefix: str
+    ttl: int = 60
+    max_age: int = 600
+    total_pages: str = ''
+
+
+@dataclass(frozen=True)
+class QueryCacheSpec:
+    """A generated query-cache module for report API calls (LRU of ``max_entries``)."""
+
+    name: str
+    template: str
+    target: str
+    queries: tuple
+    max_entries: int = 24
@@ -0,0 +1,451 @@
+"""Fleet simulator for the offline ``pendingRespondents`` sync.
+
+Replays what the app does when devices come back online, against a local
+stand-in backend with bounded capacity, in compressed time (``speed``
+simulated seconds per real second):
+
+- ``Fleet``: N devices with a pending queue (surveys saved offline), an MP3
+  recording per survey (128 kbps, as ``audioConverter.ts`` encodes them),
+  an uplink bandwidth, the moment they reconnect and, for some, a dropped
+  connection in the middle of the sync;
+- ``IngestBackend``: ``POST /respondents``, ``/respondents/batch`` and
+  ``/respondents/upload-audio`` served by ``workers`` threads with a per
+  request cost; past ``max_queue`` waiting requests it answers 503;
+- ``Strategy``: how a device drains its queue. ``current`` is
+  ``SyncService.syncPendingRespondents`` plus ``useSyncStatus``: 2 s after
+  reconnecting, then again 2 s after any pass that changed the pending count,
+  otherwise on the 5-minute ``startAutoSync`` tick; one create and one upload
+  at a time; a failed upload loses the audio.
+
+Audio bytes are not sent: the upload carries its size and the uplink time is
+spent on the device, so a large fleet fits on one machine. Every time and
+rate reported is in simulated seconds.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import random
+import socket
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from .client import ApiClient, ApiError
+
+RESPONDENTS = '/respondents'
+RESPONDENTS_BATCH = '/respondents/batch'
+UPLOAD_AUDIO = '/respondents/upload-audio'
+SIM_STATS = '/__sim/stats'
+MP3_BITRATE = 128_000
+RECONNECT_DELAY = 2.0          # setTimeout de useSyncStatus
+AUTO_SYNC_INTERVAL = 300.0     # startAutoSync(5)
+
+
+@dataclass
+class Device:
+    pending: list                 # bytes de audio por encuesta (0: sin grabación)
+    online_at: float
+    uplink: float                 # bytes/s
+    phase: float                  # desfase del setInterval de startAutoSync
+    drop_at: float = None         # la conexión se cae en este instante...
+    back_at: float = None         # ... y vuelve en este
+
+
+def make_fleet(devices, pending_mean=25, audio_seconds=150, window=600, burst=0.6, flap=0.1, seed=1):
+    """Devices with skewed queues; ``burst`` of them reconnect together at t=0."""
+    rng = np.random.default_rng(seed)
+    counts = rng.poisson(rng.gamma(2.0, pending_mean / 2.0, devices))
+    durations = rng.lognormal(np.log(audio_seconds), 0.5, counts.sum())
+    with_audio = rng.random(counts.sum()) < 0.9
+    sizes = np.where(with_audio, durations * MP3_BITRATE / 8, 0).astype(np.int64)
+    together = rng.random(devices) < burst
+    online = np.where(together, np.abs(rng.normal(0, 30, devices)), rng.uniform(0, window, devices))
+    uplink = rng.lognormal(np.log(1.5e6), 0.7, devices) / 8
+    fleet = []
+    start = 0
+    for i in range(devices):
+        device = Device(sizes[start:start + counts[i]].tolist(), float(online[i]), float(uplink[i]),
+                        float(rng.uniform(0, AUTO_SYNC_INTERVAL)))
+        start += counts[i]
+        if rng.random() < flap:
+            device.drop_at = device.online_at + float(rng.uniform(10, 120))
+            device.back_at = device.drop_at + float(rng.uniform(30, 300))
+        fleet.append(device)
+    return fleet
+
+
+# ---- Backend ----
+
+@dataclass
+class BackendCosts:
+    workers: int = 8
+    max_queue: int = 64
+    create: float = 0.040          # s por POST /respondents
+    batch_base: float = 0.020      # s por POST /respondents/batch...
+    batch_item: float = 0.004      # ... más esto por encuesta
+    audio_base: float = 0.050      # s por subida...
+    audio_mb: float = 0.030        # ... más esto por MB guardado
+
+
+class IngestBackend:
+    """Bounded-capacity stand-in for the write endpoints."""
+
+    def __init__(self, costs, speed):
+        self.costs = costs
+        self.speed = speed
+        self.started = time.perf_counter()
+        self._slots = threading.Semaphore(costs.workers)
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.max_waiting = 0
+        self.rejected = 0
+        self.served = {'create': 0, 'batch': 0, 'audio': 0}
+        self.busy = 0.0
+        self.next_id = 0
+
+    def _work(self, kind, cost):
+        with self._lock:
+            if self.waiting >= self.costs.max_queue:
+                self.rejected += 1
+                return False
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+        with self._slots:
+            with self._lock:
+                self.waiting -= 1
+            time.sleep(cost / self.speed)
+        with self._lock:
+            self.served[kind] += 1
+            self.busy += cost
+        return True
+
+    def _ids(self, n):
+        with self._lock:
+            first = self.next_id
+            self.next_id += n
+        return [f'{0x6a000000 + i:024x}' for i in range(first, first + n)]
+
+    def handle(self, path, query, body):
+        """``(status, payload)`` for a POST."""
+        c = self.costs
+        if path == RESPONDENTS:
+            if not self._work('create', c.create):
+                return HTTPStatus.SERVICE_UNAVAILABLE, {'message': 'Servidor ocupado'}
+            return HTTPStatus.CREATED, {'message': 'Encuestado creado', 'data': {'_id': self._ids(1)[0]}}
+        if path == RESPONDENTS_BATCH:
+            items = json.loads(body or b'{}').get('respondents') or []
+            if not self._work('batch', c.batch_base + c.batch_item * len(items)):
+                return HTTPStatus.SERVICE_UNAVAILABLE, {'message': 'Servidor ocupado'}
+            ids = self._ids(len(items))
+            return HTTPStatus.CREATED, {'message': 'Encuestados creados', 'data': [{'_id': i} for i in ids]}
+        if path == UPLOAD_AUDIO:
+            size = int(query.get('simulatedBytes') or 0)
+            if not self._work('audio', c.audio_base + c.audio_mb * size / 1e6):
+                return HTTPStatus.SERVICE_UNAVAILABLE, {'message': 'Servidor ocupado'}
+            return HTTPStatus.OK, {'message': 'Audio subido', 'audioUrl': f'/audio/{query.get("respondentId")}.mp3'}
+        return HTTPStatus.NOT_FOUND, {'message': f'Ruta no encontrada: {path}'}
+
+    def stats(self):
+        with self._lock:
+            elapsed = (time.perf_counter() - self.started) * self.speed
+            return {
+                'served': dict(self.served),
+                'rejected': self.rejected,
+                'maxQueue': self.max_waiting,
+                'utilizationPct': round(100 * self.busy / (elapsed * self.costs.workers), 1) if elapsed else 0.0,
+            }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Igual que en mock_backend: sin TCP_NODELAY cada respuesta espera ~40 ms el ACK retardado
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        url = urlsplit(self.path)
+        prefix = self.server.prefix
+        return (url.path[len(prefix):] if url.path.startswith(prefix) else url.path), dict(parse_qsl(url.query))
+
+    def do_GET(self):
+        path, _ = self._route()
+        if path == SIM_STATS:
+            self._send(HTTPStatus.OK, self.server.backend.stats())
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {'message': f'Ruta no encontrada: {path}'})
+
+    def do_POST(self):
+        path, query = self._route()
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self._send(*self.server.backend.handle(path, query, body))
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def _serve(port, costs, speed, prefix, ready):
+    server = _Server(('127.0.0.1', port), _Handler)
+    server.backend = IngestBackend(costs, speed)
+    server.prefix = prefix
+    ready.set()
+    server.serve_forever()
+
+
+def start_backend(port, costs, speed, prefix='/api/v1'):
+    """Run an ``IngestBackend`` in its own process (so it does not share the GIL with the fleet)."""
+    ready = multiprocessing.Event()
+    process = multiprocessing.Process(target=_serve, args=(port, costs, speed, prefix, ready), daemon=True)
+    process.start()
+    if not ready.wait(10):
+        process.terminate()
+        raise RuntimeError('el backend simulado no arrancó')
+    return process
+
+
+# ---- Dispositivos ----
+
+@dataclass
+class Strategy:
+    name: str
+    batch_size: int = 1            # >1: POST /respondents/batch
+    reconnect_jitter: float = 0.0  # s aleatorios sumados al retardo de reconexión
+    backoff: bool = False          # reintento con backoff exponencial con jitter en vez del tick fijo
+    upload_parallelism: int = 1
+    retry_audio: bool = False      # una subida fallida queda pendiente en vez de perderse
+
+
+STRATEGIES = {
+    'current': Strategy('current'),
+    'jittered': Strategy('jittered', reconnect_jitter=60.0, backoff=True),
+    'batched': Strategy('batched', batch_size=25),
+    'parallel-uploads': Strategy('parallel-uploads', upload_parallelism=3, retry_audio=True),
+    'combined': Strategy('combined', batch_size=25, reconnect_jitter=60.0, backoff=True,
+                         upload_parallelism=3, retry_audio=True),
+}
+
+_SURVEY = {
+    'fullName': 'MARIA FERNANDA GOMEZ RESTREPO', 'idType': 'cc', 'identification': '1032456789',
+    'phone': '3104567890', 'address': 'CALLE 45 # 12-34', 'gender': 'femenino', 'ageRange': '26-35',
+    'region': 'andina', 'department': 'Cundinamarca', 'city': 'Bogotá', 'stratum': '3',
+    'neighborhood': 'Chapinero', 'isPatriaDefender': False, 'willingToRespond': True,
+    'location': {'lat': 4.6486, 'long': -74.0628}, 'visitAnswers': [{'question': 'q1', 'answer': 'si'}] * 6,
+}
+
+
+class Clock:
+    def __init__(self, speed):
+        self.speed = speed
+        self.started = time.perf_counter()
+
+    def now(self):
+        return (time.perf_counter() - self.started) * self.speed
+
+    async def sleep_until(self, t):
+        delay = (t - self.now()) / self.speed
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@dataclass
+class FleetMetrics:
+    latencies: dict = field(default_factory=lambda: {'create': [], 'batch': [], 'audio': []})
+    sent: list = field(default_factory=list)        # instante de cada petición al backend
+    failures: dict = field(default_factory=lambda: {'busy': 0, 'network': 0, 'offline': 0})
+    audio_lost: int = 0
+    passes: int = 0
+    drained: list = field(default_factory=list)     # segundos desde la reconexión hasta vaciar la cola
+    finished: list = field(default_factory=list)    # instante en que se vació cada cola
+    undrained: int = 0
+
+
+class _Offline(Exception):
+    pass
+
+
+async def _call(api, clock, device, metrics, kind, endpoint, payload=None, params=None):
+    if device.drop_at is not None and device.drop_at <= clock.now() < device.back_at:
+        metrics.failures['offline'] += 1
+        raise _Offline()
+    sent = clock.now()
+    metrics.sent.append(sent)
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    try:
+        response = await api.request('POST', endpoint, params, body)
+    except ApiError as err:
+        metrics.failures['busy' if err.code == '503' else 'network'] += 1
+        raise
+    metrics.latencies[kind].append(clock.now() - sent)
+    return response
+
+
+async def _drain_pass(api, clock, device, queue, strategy, metrics, uplink):
+    """One ``syncPendingRespondents`` run; returns the records still pending."""
+    metrics.passes += 1
+    remaining = []
+    uploads = asyncio.Semaphore(strategy.upload_parallelism)
+    tasks = []
+
+    async def upload(record):
+        respondent_id, size = record['id'], record['audio']
+        async with uploads:
+            try:
+                async with uplink:    # el enlace del dispositivo es uno solo
+                    await clock.sleep_until(clock.now() + size / device.uplink)
+                await _call(api, clock, device, metrics, 'audio', UPLOAD_AUDIO,
+                            {'respondentId': respondent_id},
+                            {'respondentId': respondent_id, 'simulatedBytes': size})
+            except (ApiError, _Offline):
+                if strategy.retry_audio:
+                    remaining.append(record)
+                else:
+                    metrics.audio_lost += 1
+
+    async def create(records):
+        if strategy.batch_size > 1:
+            response = await _call(api, clock, device, metrics, 'batch', RESPONDENTS_BATCH,
+                                   {'respondents': [_SURVEY] * len(records)})
+            return [item['_id'] for item in response['data']]
+        response = await _call(api, clock, device, metrics, 'create', RESPONDENTS, _SURVEY)
+        return [response['data']['_id']]
+
+    step = max(1, strategy.batch_size)
+    for start in range(0, len(queue), step):
+        group = queue[start:start + step]
+        pending_create = [r for r in group if r.get('id') is None]
+        if pending_create:
+            try:
+                ids = await create(pending_create)
+            except (ApiError, _Offline):
+                remaining.extend(pending_create)
+                group = [r for r in group if r.get('id') is not None]
+            else:
+                for record, respondent_id in zip(pending_create, ids):
+                    record['id'] = respondent_id
+        for record in group:
+            if record['id'] is not None and record['audio']:
+                task = asyncio.ensure_future(upload(record))
+                tasks.append(task)
+                if strategy.upload_parallelism == 1:
+                    await task
+    await asyncio.gather(*tasks)
+    return remaining
+
+
+async def run_device(api, clock, device, strategy, metrics, horizon, seed):
+    queue = [{'id': None, 'audio': size} for size in device.pending]
+    if not queue:
+        return
+    uplink = asyncio.Lock()
+    rng = random.Random(seed)
+    next_at = device.online_at + RECONNECT_DELAY + rng.uniform(0, strategy.reconnect_jitter)
+    failures = 0
+    while queue:
+        if next_at > horizon:
+            metrics.undrained += 1
+            return
+        await clock.sleep_until(next_at)
+        if device.drop_at is not None and device.drop_at <= clock.now() < device.back_at:
+            # Sin red: useSyncStatus vuelve a intentar al reconectar
+            next_at = device.back_at + RECONNECT_DELAY + rng.uniform(0, strategy.reconnect_jitter)
+            continue
+        before, started = len(queue), clock.now()
+        queue = await _drain_pass(api, clock, device, queue, strategy, metrics, uplink)
+        now = clock.now()
+        if not queue:
+            break
+        if strategy.backoff:
+            failures = 0 if len(queue) < before else failures + 1
+            next_at = now + rng.uniform(0, min(AUTO_SYNC_INTERVAL, 5 * 2 ** failures))
+        elif len(queue) != before:
+            next_at = now + RECONNECT_DELAY     # cambió pendingCount: el efecto vuelve a sincronizar
+        else:
+            ticks = (now - device.phase) // AUTO_SYNC_INTERVAL + 1
+            next_at = device.phase + ticks * AUTO_SYNC_INTERVAL
+        if device.drop_at is not None and started <= device.back_at and device.drop_at <= now:
+            # Se cayó la red durante la pasada: el evento 'online' vuelve a sincronizar
+            next_at = min(next_at, device.back_at + RECONNECT_DELAY + rng.uniform(0, strategy.reconnect_jitter))
+    metrics.drained.append(clock.now() - device.online_at)
+    metrics.finished.append(clock.now())
+
+
+def _percentiles(values):
+    if not values:
+        return {'count': 0}
+    a = np.asarray(values)
+    return {
+        'count': len(a),
+        'p50': round(float(np.percentile(a, 50)), 3),
+        'p95': round(float(np.percentile(a, 95)), 3),
+        'p99': round(float(np.percentile(a, 99)), 3),
+        'max': round(float(a.max()), 3),
+    }
+
+
+async def _fleet(base_url, fleet, strategy, speed, horizon):
+    clock = Clock(speed)
+    metrics = FleetMetrics()
+    apis = [ApiClient(base_url, max_connections=strategy.upload_parallelism + 1, retries=0, timeout=600)
+            for _ in fleet]
+    try:
+        await asyncio.gather(*(run_device(api, clock, device, strategy, metrics, horizon, seed)
+                               for seed, (api, device) in enumerate(zip(apis, fleet))))
+    finally:
+        await asyncio.gather(*(api.close() for api in apis))
+    elapsed = clock.now()
+    async with ApiClient(base_url) as api:
+        backend = await api.get(SIM_STATS)
+    return metrics, elapsed, backend
+
+
+def simulate(fleet, strategy, costs=None, speed=30.0, port=3900, horizon=6 * 3600):
+    """Run ``strategy`` over ``fleet`` against a fresh backend; returns a result dict."""
+    costs = costs or BackendCosts()
+    process = start_backend(port, costs, speed)
+    try:
+        metrics, elapsed, backend = asyncio.run(
+            _fleet(f'http://127.0.0.1:{port}/api/v1', fleet, strategy, speed, horizon))
+    finally:
+        process.terminate()
+        process.join()
+    per_second = np.bincount(np.asarray(metrics.sent, dtype=np.int64)) if metrics.sent else np.zeros(1)
+    surveys = sum(len(d.pending) for d in fleet)
+    return {
+        'strategy': asdict(strategy),
+        'devices': len(fleet),
+        'surveys': surveys,
+        'audioMb': round(sum(sum(d.pending) for d in fleet) / 1e6, 1),
+        'fleetDrainSeconds': None if metrics.undrained else round(
+            max(metrics.finished, default=0.0) - min(d.online_at for d in fleet), 1),
+        'deviceDrainSeconds': _percentiles(metrics.drained),
+        'undrainedDevices': metrics.undrained,
+        'syncPasses': metrics.passes,
+        'requests': len(metrics.sent),
+        'requestsPerSecond': {'mean': round(len(metrics.sent) / elapsed, 2) if elapsed else 0.0,
+                              'peak': int(per_second.max())},
+        'latencySeconds': {kind: _percentiles(values) for kind, values in metrics.latencies.items() if values},
+        'failures': metrics.failures,
+        'audioLost': metrics.audio_lost,
+        'backend': backend,
+        'simulatedSeconds': round(elapsed, 1),
+    }
@@ -0,0 +1,537 @@
+"""Seeded synthetic respondents, stored column by column in numpy arrays.
+
+A ``Dataset`` holds one compact array per field (about 35 bytes per
+record, so 50M records fit in under 2 GB) plus the field hierarchy
+(zone coordinator > field coordinator > supervisor > socializer). Categorical
+fields are codes into the vocabularies below, where code ``0`` always means
+"empty", as on unsuccessful surveys. Records are sorted by ``createdAt``, so
+a date range is a contiguous slice.
+
+Geography follows BUILD_ZONES.md: every socializer works in one municipality,
+picked with probability proportional to its population, which gives the
+zones their real relative weight (Bogotá and Medellín/Cali dominate).
+
+Identifiers, emails, phones and addresses are not stored: they are derived
+from the record index, so they stay stable across runs with the same seed.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from .codegen import ROOT_DIR
+from .params import BOGOTA, fold
+from .zones import MUNICIPALITY_DEPARTMENTS, zone_municipalities
+
+# name: (código DANE, latitud, longitud, población en miles)
+MUNICIPALITY_GEO = {
+    'Bogotá': ('11001', 4.711, -74.072, 7900),
+    'Soacha': ('25754', 4.579, -74.217, 700),
+    'Fusagasugá': ('25290', 4.337, -74.364, 150),
+    'Girardot': ('25307', 4.303, -74.803, 110),
+    'Chía': ('25175', 4.862, -74.058, 150),
+    'Zipaquirá': ('25899', 5.022, -74.004, 130),
+    'Cajicá': ('25126', 4.918, -74.028, 90),
+    'Tenjo': ('25799', 4.872, -74.144, 20),
+    'Sopó': ('25758', 4.908, -73.938, 30),
+    'Nemocón': ('25486', 5.067, -73.878, 14),
+    'Cota': ('25214', 4.809, -74.103, 30),
+    'Mosquera': ('25473', 4.706, -74.230, 140),
+    'Facatativá': ('25269', 4.814, -74.354, 160),
+    'Madrid': ('25430', 4.732, -74.264, 90),
+    'Funza': ('25286', 4.716, -74.212, 100),
+    'Tunja': ('15001', 5.535, -73.367, 200),
+    'Sogamoso': ('15759', 5.714, -72.934, 120),
+    'Duitama': ('15238', 5.827, -73.033, 120),
+    'Medellín': ('05001', 6.244, -75.581, 2600),
+    'Bello': ('05088', 6.337, -75.558, 550),
+    'Itagüí': ('05360', 6.172, -75.611, 290),
+    'Envigado': ('05266', 6.171, -75.591, 240),
+    'Turbo': ('05837', 8.093, -76.728, 170),
+    'Sabaneta': ('05631', 6.151, -75.616, 90),
+    'La Ceja': ('05376', 6.031, -75.431, 60),
+    'Cali': ('76001', 3.451, -76.532, 2300),
+    'Palmira': ('76520', 3.539, -76.303, 350),
+    'Buenaventura': ('76109', 3.883, -77.031, 320),
+    'Jamundí': ('76364', 3.261, -76.540, 150),
+    'Yumbo': ('76892', 3.585, -76.495, 110),
+    'Candelaria': ('76130', 3.410, -76.348, 90),
+    'Bucaramanga': ('68001', 7.119, -73.123, 610),
+    'Floridablanca': ('68276', 7.062, -73.086, 270),
+    'Barrancabermeja': ('68081', 7.065, -73.854, 210),
+    'Girón': ('68307', 7.068, -73.169, 200),
+    'Piedecuesta': ('68547', 6.988, -73.050, 180),
+    'Cúcuta': ('54001', 7.894, -72.508, 780),
+    'Villa del Rosario': ('54874', 7.834, -72.474, 100),
+    'Los Patios': ('54405', 7.837, -72.504, 80),
+    'Barranquilla': ('08001', 10.964, -74.796, 1300),
+    'Soledad': ('08758', 10.918, -74.765, 680),
+}
+
+# departamento: (código DANE, región natural)
+DEPARTMENT_GEO = {
+    'Bogotá D.C.': ('11', 'Andina'),
+    'Cundinamarca': ('25', 'Andina'),
+    'Boyacá': ('15', 'Andina'),
+    'Antioquia': ('05', 'Andina'),
+    'Valle del Cauca': ('76', 'Pacífica'),
+    'Santander': ('68', 'Andina'),
+    'Norte de Santander': ('54', 'Andina'),
+    'Atlántico': ('08', 'Caribe'),
+}
+
+# Vocabularios: el código 0 es "sin valor"
+GENDERS = ('', 'Masculino', 'Femenino', 'Otro', 'Prefiero no decir')
+AGE_RANGES = ('', '18-24', '25-34', '35-44', '45-54', '55-64', '65+')
+ID_TYPES = ('', 'CC', 'CE', 'PA', 'TI')
+# (value, label, clave en noExitosaDetalle) como NO_RESPONSE_REASONS
+REJECTION_REASONS = (
+    ('', '', ''),
+    ('no_interest', 'No está interesado', 'noEstaInteresado'),
+    ('no_time', 'No tiene tiempo', 'noTieneTiempo'),
+    ('not_home', 'No se encuentra en casa', 'noSeEncuentraEnCasa'),
+    ('privacy_concerns', 'Preocupaciones de privacidad', 'preocupacionesDePrivacidad'),
+    ('other', 'Otra razón', 'otraRazon'),
+)
+
+MALE_NAMES = (
+    'Alejandro', 'Andrés', 'Camilo', 'Carlos', 'Cristian', 'Daniel', 'David', 'Diego', 'Eduardo',
+    'Felipe', 'Fernando', 'Gustavo', 'Hernán', 'Jaime', 'Javier', 'Jhon', 'Jorge', 'José', 'Juan',
+    'Julián', 'Kevin', 'Luis', 'Manuel', 'Mario', 'Mauricio', 'Miguel', 'Nicolás', 'Óscar',
+    'Pablo', 'Pedro', 'Rafael', 'Ricardo', 'Santiago', 'Sebastián', 'Sergio', 'Víctor', 'William',
+)
+FEMALE_NAMES = (
+    'Adriana', 'Alejandra', 'Ana', 'Ángela', 'Beatriz', 'Carolina', 'Catalina', 'Claudia', 'Daniela',
+    'Diana', 'Esperanza', 'Gloria', 'Isabel', 'Juliana', 'Laura', 'Leidy', 'Lina', 'Luz', 'Marcela',
+    'María', 'Marta', 'Mónica', 'Natalia', 'Paola', 'Patricia', 'Sandra', 'Sara', 'Sofía',
+    'Tatiana', 'Valentina', 'Valeria', 'Viviana', 'Yamile', 'Yolanda',
+)
+SURNAMES = (
+    'Acosta', 'Aguilar', 'Álvarez', 'Arias', 'Benítez', 'Cardona', 'Castillo', 'Castro', 'Contreras',
+    'Díaz', 'Duarte', 'Escobar', 'Flórez', 'Gaitán', 'García', 'Gómez', 'González', 'Gutiérrez',
+    'Guzmán', 'Hernández', 'Herrera', 'Jiménez', 'López', 'Martínez', 'Medina', 'Mejía', 'Moreno',
+    'Muñoz', 'Ortiz', 'Ospina', 'Parra', 'Peña', 'Pérez', 'Pineda', 'Quintero', 'Ramírez',
+    'Restrepo', 'Reyes', 'Rincón', 'Rodríguez', 'Rojas', 'Ruiz', 'Salazar', 'Sánchez', 'Suárez',
+    'Torres', 'Valencia', 'Vargas', 'Vásquez', 'Zapata',
+)
+NEIGHBORHOODS = (
+    '', 'Centro', 'Centro Histórico', 'San José', 'La Esperanza', 'El Prado', 'Las Américas',
+    'Villa del Sol', 'El Bosque', 'La Floresta', 'San Antonio', 'Santa Fe', 'El Carmen',
+    'La Victoria', 'Los Alpes', 'Bellavista', 'El Recreo', 'La Paz', 'Primero de Mayo',
+    'San Martín', 'Los Pinos', 'El Jardín', 'Nueva Granada', 'La Libertad', 'Simón Bolívar',
+    'Las Palmas', 'Villa Nueva', 'El Porvenir', 'San Fernando', 'La Candelaria', 'Los Rosales',
+)
+
+
+def _sorted_vocab(names):
+    # '' primero; el orden de los códigos es el orden alfabético (sin tildes)
+    return ('',) + tuple(sorted(set(names), key=fold))
+
+
+FIRST_NAMES = _sorted_vocab(MALE_NAMES + FEMALE_NAMES)
+LAST_NAMES = _sorted_vocab(SURNAMES)
+
+# Bits de la columna ``flags``
+SUCCESSFUL = 1
+WILLING = 2
+PATRIA_DEFENDER = 4
+VERIFIED = 8
+LINKED_HOUSE = 16
+LINKED_HOMES = 32
+RECORDING_AUTHORIZATION = 64
+OFFLINE = 128
+
+# (columna, dtype) de cada registro
+RECORD_COLUMNS = (
+    ('created', '<i8'),        # epoch, segundos
+    ('updated_delta', '<u4'),  # updatedAt - createdAt, segundos
+    ('socializer', '<i4'),
+    ('flags', 'u1'),
+    ('reason', 'u1'),
+    ('gender', 'u1'),
+    ('age', 'u1'),
+    ('stratum', 'u1'),
+    ('id_type', 'u1'),
+    ('first', 'u1'),
+    ('last1', 'u1'),
+    ('last2', 'u1'),
+    ('neighborhood', 'u1'),
+    ('lat', '<f4'),
+    ('lon', '<f4'),
+)
+
+# Jerarquía: columnas por nivel (índice del superior inmediato)
+HIERARCHY_COLUMNS = (
+    ('socializer_municipality', '<i2'),
+    ('socializer_supervisor', '<i4'),
+    ('supervisor_field', '<i4'),
+    ('field_zone', '<i4'),
+    ('zone_coordinator_zone', '<i2'),
+)
+
+ROLES = ('zonecoordinator', 'fieldcoordinator', 'supervisor', 'socializer')
+_ROLE_CODES = {role: code for code, role in enumerate(ROLES, start=1)}
+# Marca de tiempo fija para los ObjectId del personal (2026-01-01)
+_STAFF_EPOCH = 0x6955B900
+
+# Cédulas únicas: biyección afín módulo un primo, sin guardar nada por registro
+_ID_MODULUS = 2147483647
+_ID_MULTIPLIER = 48271
+IDENTIFICATION_BASE = 1_000_000_000
+
+_SECONDS_PER_DAY = 86400
+_CHUNK = 5_000_000
+# Actividad por hora del día (hora local) y por día de la semana (lunes=0)
+_HOUR_WEIGHTS = np.array(
+    [0, 0, 0, 0, 0, 0, 1, 4, 8, 10, 10, 9, 6, 7, 9, 10, 9, 7, 5, 3, 1, 0, 0, 0], dtype=float
+)
+_WEEKDAY_WEIGHTS = np.array([1.0, 1.0, 1.0, 1.0, 0.95, 0.7, 0.3])
+
+
+def object_id(timestamp, counter):
+    """Mongo-style 24-hex id: 4-byte timestamp + 8-byte counter."""
+    return f'{timestamp & 0xFFFFFFFF:08x}{counter:016x}'
+
+
+def staff_id(role, index):
+    return f'{_STAFF_EPOCH:08x}{_ROLE_CODES[role]:02x}{index:014x}'
+
+
+def parse_staff_id(role, value):
+    """Index of a ``staff_id`` of ``role``, or ``None`` if it is not one."""
+    if not isinstance(value, str) or len(value) != 24:
+        return None
+    try:
+        if int(value[:8], 16) != _STAFF_EPOCH or int(value[8:10], 16) != _ROLE_CODES[role]:
+            return None
+        return int(value[10:], 16)
+    except ValueError:
+        return None
+
+
+def identification_numbers(indices):
+    """Identification number of each record index (unique for any dataset size)."""
+    indices = np.asarray(indices, dtype=np.int64)
+    return IDENTIFICATION_BASE + (indices * _ID_MULTIPLIER) % _ID_MODULUS
+
+
+def local_midnight(date):
+    """Epoch seconds of 00:00 Bogotá time on ``date`` (``'YYYY-MM-DD'``)."""
+    return int(datetime.fromisoformat(date).replace(tzinfo=BOGOTA).timestamp())
+
+
+def iso(epoch):
+    """``'2026-03-05T19:07:00.000Z'`` from epoch seconds."""
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def iso_array(epochs):
+    """``iso`` over an array of epoch seconds, as a list of strings."""
+    seconds = np.asarray(epochs, dtype=np.int64).astype('datetime64[s]')
+    return np.char.add(np.datetime_as_string(seconds, unit='s'), '.000Z').tolist()
+
+
+class Dataset:
+    """Synthetic respondents plus the hierarchy and geography they refer to."""
+
+    # Dimensiones con vocabulario fijo: (columna, valores)
+    vocabularies = {
+        'gender': ('gender', GENDERS),
+        'ageRange': ('age', AGE_RANGES),
+        'idType': ('id_type', ID_TYPES),
+        'neighborhood': ('neighborhood', NEIGHBORHOODS),
+    }
+
+    def __init__(self, columns, hierarchy, meta):
+        self.columns = columns
+        self.hierarchy = hierarchy
+        self.meta = meta
+        self.zones = tuple(meta['zones'])
+        self.municipalities = tuple(tuple(m) for m in meta['municipalities'])  # (name, zone)
+
+    def __len__(self):
+        return len(self.columns['created'])
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['columns'][name]
+        except KeyError:
+            try:
+                return self.__dict__['hierarchy'][name]
+            except KeyError:
+                raise AttributeError(name) from None
+
+    def count(self, role):
+        """Number of people with ``role``."""
+        return {
+            'socializer': len(self.socializer_municipality),
+            'supervisor': len(self.supervisor_field),
+            'fieldcoordinator': len(self.field_zone),
+            'zonecoordinator': len(self.zone_coordinator_zone),
+        }[role]
+
+    def staff_of(self, role):
+        """Index of the ``role`` person above each socializer."""
+        supervisor = self.socializer_supervisor
+        if role == 'socializer':
+            return np.arange(len(supervisor), dtype=np.int32)
+        if role == 'supervisor':
+            return supervisor
+        field = self.supervisor_field[supervisor]
+        if role == 'fieldcoordinator':
+            return field
+        return self.field_zone[field]
+
+    def staff_label(self, role, index):
+        """``_id`` of a staff member, as the API returns it."""
+        return staff_id(role, index)
+
+    def staff_name(self, role, index):
+        """Deterministic full name of a staff member."""
+        h = (index * 2654435761 + _ROLE_CODES[role] * 40503) & 0xFFFFFFFF
+        first = FIRST_NAMES[1 + h % (len(FIRST_NAMES) - 1)]
+        last = LAST_NAMES[1 + (h >> 8) % (len(LAST_NAMES) - 1)]
+        last2 = LAST_NAMES[1 + (h >> 16) % (len(LAST_NAMES) - 1)]
+        return f'{first} {last} {last2}'
+
+    def department_of(self, municipality):
+        """Department of the municipality at index ``municipality``."""
+        return MUNICIPALITY_DEPARTMENTS[self.municipalities[municipality][0]]
+
+    def municipality_of(self, socializers):
+        return self.socializer_municipality[socializers]
+
+    def items(self, indices):
+        """``Dashboard002Survey`` dicts for the records at ``indices``."""
+        indices = np.asarray(indices, dtype=np.int64)
+        cols = {name: np.asarray(self.columns[name][indices]).tolist() for name, _ in RECORD_COLUMNS}
+        idents = identification_numbers(indices).tolist()
+        munis = self.socializer_municipality[np.asarray(self.columns['socializer'][indices])].tolist()
+        created_iso = iso_array(self.columns['created'][indices])
+        updated_iso = iso_array(self.columns['created'][indices] + self.columns['updated_delta'][indices])
+        staff = {}
+        out = []
+        for k, i in enumerate(indices.tolist()):
+            created = cols['created'][k]
+            flags = cols['flags'][k]
+            soc = cols['socializer'][k]
+            if soc not in staff:
+                staff[soc] = self.socializer_ref(soc)
+            city = self.municipalities[munis[k]][0]
+            department = MUNICIPALITY_DEPARTMENTS[city]
+            item = {
+                '_id': object_id(created, i),
+                'willingToRespond': bool(flags & WILLING),
+                'surveyStatus': 'successful' if flags & SUCCESSFUL else 'unsuccessful',
+                'recordingAuthorization': bool(flags & RECORDING_AUTHORIZATION),
+                'fullName': '',
+                'region': DEPARTMENT_GEO[department][1],
+                'department': department,
+                'city': city,
+                'isPatriaDefender': bool(flags & PATRIA_DEFENDER),
+                'isVerified': bool(flags & VERIFIED),
+                'isLinkedHouse': bool(flags & LINKED_HOUSE),
+                'linkedHomes': bool(flags & LINKED_HOMES),
+                'isOffline': bool(flags & OFFLINE),
+                'location': {'type': 'Point', 'coordinates': [round(cols['lon'][k], 6), round(cols['lat'][k], 6)]},
+                'autor': staff[soc]['autor'],
+                'socializer': staff[soc]['socializer'],
+                'createdAt': created_iso[k],
+                'updatedAt': updated_iso[k],
+                'visitAddress': f'Calle {1 + i % 180} # {1 + (i >> 3) % 99}-{1 + (i >> 5) % 90}',
+            }
+            if flags & SUCCESSFUL:
+                first, last1 = FIRST_NAMES[cols['first'][k]], LAST_NAMES[cols['last1'][k]]
+                item.update({
+                    'fullName': f'{first} {last1} {LAST_NAMES[cols["last2"][k]]}',
+                    'idType': ID_TYPES[cols['id_type'][k]],
+                    'identification': str(idents[k]),
+                    'email': f'{fold(first)}.{fold(last1)}{i % 1000}@example.com'.replace(' ', ''),
+                    'phone': f'3{(idents[k] * 7919) % 1_000_000_000:09d}',
+                    'address': item['visitAddress'],
+                    'ageRange': AGE_RANGES[cols['age'][k]],
+                    'gender': GENDERS[cols['gender'][k]],
+                    'stratum': cols['stratum'][k],
+                    'neighborhood': NEIGHBORHOODS[cols['neighborhood'][k]],
+                })
+                if flags & RECORDING_AUTHORIZATION:
+                    item['audioFileKey'] = f'audios/{item["_id"]}.webm'
+            else:
+                value, label, _ = REJECTION_REASONS[cols['reason'][k]]
+                item['rejectionReason'] = {'value': value, 'label': label}
+            out.append(item)
+        return out
+
+    def socializer_ref(self, index):
+        """``autor`` and ``socializer`` sub-documents of a socializer."""
+        _id = staff_id('socializer', index)
+        name = self.staff_name('socializer', index)
+        email = f'socializer.{index}@soci.app'
+        return {
+            'autor': {'_id': _id, 'email': email, 'role': 'socializer'},
+            'socializer': {
+                '_id': _id,
+                'fullName': name,
+                'idNumber': str(900_000_000 + index),
+                'phone': f'31{index:08d}'[-10:],
+            },
+        }
+
+    # ---- Persistencia ----
+
+    def save(self, path):
+        """Write one ``.npy`` per column plus ``meta.json`` under ``path``."""
+        os.makedirs(path, exist_ok=True)
+        for name, array in {**self.columns, **self.hierarchy}.items():
+            np.save(os.path.join(path, f'{name}.npy'), array)
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Open a dataset written by ``save``; columns are memory-mapped by default."""
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        mode = 'r' if mmap else None
+
+        def read(name):
+            return np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mode)
+
+        columns = {name: read(name) for name, _ in RECORD_COLUMNS}
+        hierarchy = {name: read(name) for name, _ in HIERARCHY_COLUMNS}
+        return cls(columns, hierarchy, meta)
+
+
+def _hierarchy(rng, socializers, root):
+    zones = zone_municipalities(root)
+    zone_names = sorted(zones)
+    municipalities = [(name, z) for z, zone in enumerate(zone_names) for name, _ in zones[zone]]
+    population = np.array([MUNICIPALITY_GEO[name][3] for name, _ in municipalities], dtype=float)
+    muni = rng.choice(len(municipalities), size=socializers, p=population / population.sum())
+    muni_zone = np.array([z for _, z in municipalities], dtype=np.int16)
+
+    # Por zona: equipos de ~10 socializadores por supervisor y ~5 supervisores por coordinador de campo
+    order = np.lexsort((muni, muni_zone[muni]))
+    muni = muni[order].astype(np.int16)
+    supervisor = np.empty(socializers, dtype=np.int32)
+    supervisor_field, field_zone, zone_coordinator_zone = [], [], []
+    start = 0
+    for z in range(len(zone_names)):
+        members = np.count_nonzero(muni_zone[muni] == z)
+        if not members:
+            continue
+        coordinator = len(zone_coordinator_zone)
+        zone_coordinator_zone.append(z)
+        sups = -(-members // 10)
+        fields = -(-sups // 5)
+        first_sup, first_field = len(supervisor_field), len(field_zone)
+        supervisor[start:start + members] = first_sup + np.arange(members) // 10
+        supervisor_field.extend(first_field + np.arange(sups) // 5)
+        field_zone.extend([coordinator] * fields)
+        start += members
+
+    hierarchy = {
+        'socializer_municipality': muni,
+        'socializer_supervisor': supervisor,
+        'supervisor_field': np.array(supervisor_field, dtype=np.int32),
+        'field_zone': np.array(field_zone, dtype=np.int32),
+        'zone_coordinator_zone': np.array(zone_coordinator_zone, dtype=np.int16),
+    }
+    return hierarchy, zone_names, municipalities
+
+
+def _pick(rng, size, weights):
+    weights = np.asarray(weights, dtype=float)
+    return rng.choice(len(weights), size=size, p=weights / weights.sum()).astype(np.uint8)
+
+
+def _fill(rng, columns, lo, hi, hierarchy, municipalities, activity):
+    m = hi - lo
+    socializer = rng.choice(len(activity), size=m, p=activity).astype(np.int32)
+    columns['socializer'][lo:hi] = socializer
+
+    successful = rng.random(m) < 0.72
+    flags = successful.astype(np.uint8) * SUCCESSFUL
+    flags |= (successful | (rng.random(m) < 0.15)).astype(np.uint8) * WILLING
+    flags |= (successful & (rng.random(m) < 0.35)).astype(np.uint8) * PATRIA_DEFENDER
+    flags |= (successful & (rng.random(m) < 0.60)).astype(np.uint8) * VERIFIED
+    flags |= (successful & (rng.random(m) < 0.25)).astype(np.uint8) * LINKED_HOUSE
+    flags |= (successful & (rng.random(m) < 0.15)).astype(np.uint8) * LINKED_HOMES
+    flags |= (successful & (rng.random(m) < 0.90)).astype(np.uint8) * RECORDING_AUTHORIZATION
+    flags |= (rng.random(m) < 0.10).astype(np.uint8) * OFFLINE
+    columns['flags'][lo:hi] = flags
+
+    def when_successful(values):
+        return np.where(successful, values, 0).astype(np.uint8)
+
+    columns['reason'][lo:hi] = np.where(successful, 0, 1 + _pick(rng, m, [30, 20, 35, 8, 7]))
+    gender = when_successful(1 + _pick(rng, m, [48, 49, 2, 1]))
+    columns['gender'][lo:hi] = gender
+    columns['age'][lo:hi] = when_successful(1 + _pick(rng, m, [14, 22, 21, 18, 14, 11]))
+    columns['stratum'][lo:hi] = when_successful(1 + _pick(rng, m, [22, 33, 27, 10, 5, 3]))
+    columns['id_type'][lo:hi] = when_successful(1 + _pick(rng, m, [92, 5, 1, 2]))
+
+    male = np.array([FIRST_NAMES.index(n) for n in MALE_NAMES], dtype=np.uint8)
+    female = np.array([FIRST_NAMES.index(n) for n in FEMALE_NAMES], dtype=np.uint8)
+    first = np.where(
+        gender == 1, male[rng.integers(0, len(male), m)], female[rng.integers(0, len(female), m)]
+    )
+    either = gender > 2
+    first[either] = rng.integers(1, len(FIRST_NAMES), np.count_nonzero(either))
+    columns['first'][lo:hi] = when_successful(first)
+    columns['last1'][lo:hi] = when_successful(rng.integers(1, len(LAST_NAMES), m))
+    columns['last2'][lo:hi] = when_successful(rng.integers(1, len(LAST_NAMES), m))
+    columns['neighborhood'][lo:hi] = when_successful(rng.integers(1, len(NEIGHBORHOODS), m))
+
+    # Ubicación: alrededor del centro del municipio del socializador, más dispersa en ciudades grandes
+    geo = np.array([MUNICIPALITY_GEO[name][1:] for name, _ in municipalities], dtype=float)
+    muni = hierarchy['socializer_municipality'][socializer]
+    spread = 0.01 + 0.0015 * np.sqrt(geo[muni, 2])
+    columns['lat'][lo:hi] = geo[muni, 0] + rng.normal(0, 1, m) * spread
+    columns['lon'][lo:hi] = geo[muni, 1] + rng.normal(0, 1, m) * spread
+
+    edited = rng.random(m) < 0.2
+    columns['updated_delta'][lo:hi] = np.where(edited, rng.integers(60, 7 * _SECONDS_PER_DAY, m), 0)
+
+
+def generate(records, seed=1, start='2026-01-01', days=90, socializers=None, root=ROOT_DIR):
+    """Generate ``records`` synthetic respondents between ``start`` and ``start + days``.
+
+    The same arguments always produce the same dataset.
+    """
+    rng = np.random.default_rng(seed)
+    socializers = socializers or max(20, records // 2000)
+    hierarchy, zone_names, municipalities = _hierarchy(rng, socializers, root)
+
+    columns = {name: np.empty(records, dtype=dtype) for name, dtype in RECORD_COLUMNS}
+    origin = local_midnight(start)
+    weekday = (datetime.fromisoformat(start).weekday() + np.arange(days)) % 7
+    day_weights = _WEEKDAY_WEIGHTS[weekday] / _WEEKDAY_WEIGHTS[weekday].sum()
+    hour_weights = _HOUR_WEIGHTS / _HOUR_WEIGHTS.sum()
+    # Productividad por socializador: unos pocos hacen mucho más que el promedio
+    activity = rng.gamma(2.0, 1.0, socializers)
+    activity /= activity.sum()
+
+    created = columns['created']
+    for lo in range(0, records, _CHUNK):
+        hi = min(lo + _CHUNK, records)
+        m = hi - lo
+        day = rng.choice(days, size=m, p=day_weights)
+        hour = rng.choice(24, size=m, p=hour_weights)
+        created[lo:hi] = origin + day * _SECONDS_PER_DAY + hour * 3600 + rng.integers(0, 3600, m)
+        _fill(rng, columns, lo, hi, hierarchy, municipalities, activity)
+    created.sort()
+
+    end = (datetime.fromisoformat(start) + timedelta(days=days)).date().isoformat()
+    meta = {
+        'records': records,
+        'seed': seed,
+        'start': start,
+        'end': end,
+        'days': days,
+        'zones': zone_names,
+        'municipalities': municipalities,
+    }
+    return Dataset(columns, hierarchy, meta)
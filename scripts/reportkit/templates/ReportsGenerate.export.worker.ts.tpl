@@ -0,0 +1,124 @@
+/**
+ * Exportación CSV de ReportsGenerate en un Web Worker
+ * Recorre todas las páginas de dashboard002 y arma el CSV por bloques, sin
+ * bloquear la pestaña; el resultado vuelve al hilo principal como Blob
+ */
+
+/*@ item_interface @*/
+
+export interface ExportRequest {
+  // URL de dashboard002 con los filtros aplicados (page, perPage y el orden se reemplazan)
+  url: string
+  token: string | null
+  perPage: number
+}
+
+export type ExportWorkerMessage =
+  | { type: 'progress'; rows: number; totalItems: number }
+  | { type: 'done'; blob: Blob; rows: number }
+  | { type: 'error'; message: string; code?: string }
+
+interface Dashboard002Page {
+  data: {
+    totalItems: number
+    totalPages: number
+    surveys: ReportItem[]
+  }
+}
+
+const MAX_ATTEMPTS = 3
+
+const HEADERS = [
+  /*@ csv_headers @*/
+]
+
+// city/department pueden llegar como objetos poblados desde la API
+const placeName = (value: unknown): string | undefined =>
+  value && typeof value === 'object' && 'name' in value
+    ? (value as { name: string }).name
+    : (value as string | undefined)
+
+const sanitize = (item: ReportItem): ReportItem => ({
+  ...item,
+  city: placeName(item.city),
+  department: placeName(item.department) ?? '',
+})
+
+// Comillas alrededor de cada celda y comillas internas duplicadas (RFC 4180)
+const csvCell = (value: string) => `"${value.replace(/"/g, '""')}"`
+
+const csvRow = (item: ReportItem, idx: number) => [
+  /*@ csv_row @*/
+].map(csvCell).join(',')
+
+const post = (message: ExportWorkerMessage) => self.postMessage(message)
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms))
+
+async function apiError(response: Response) {
+  let message = `HTTP ${response.status}: ${response.statusText}`
+  try {
+    const body = await response.json()
+    if (typeof body?.error === 'string') message = body.error
+    else if (typeof body?.message === 'string') message = body.message
+  } catch {
+    // Respuesta sin JSON: se usa el mensaje por defecto
+  }
+  return { message, code: response.status.toString() }
+}
+
+async function fetchPage(request: ExportRequest, page: number): Promise<Dashboard002Page> {
+  const url = new URL(request.url, self.location.href)
+  url.searchParams.set('page', page.toString())
+  url.searchParams.set('perPage', request.perPage.toString())
+  // Orden fijo por createdAt ascendente, como export-report.py: los registros nuevos quedan
+  // al final y no desplazan las páginas que faltan (con el orden de la tabla se duplicarían u omitirían filas)
+  url.searchParams.set('sortBy', 'createdAt')
+  url.searchParams.set('sortOrder', 'asc')
+  const headers: Record<string, string> = { 'Content-Type': 'application/json' }
+  if (request.token) headers['x-access-token'] = request.token
+
+  // Reintenta errores de red y 5xx con espera exponencial
+  for (let attempt = 1; ; attempt++) {
+    let response: Response
+    try {
+      response = await fetch(url, { headers })
+    } catch (err) {
+      if (attempt >= MAX_ATTEMPTS) throw err
+      await sleep(500 * 2 ** attempt)
+      continue
+    }
+    if (response.ok) return response.json()
+    if (response.status < 500 || attempt >= MAX_ATTEMPTS) throw await apiError(response)
+    await sleep(500 * 2 ** attempt)
+  }
+}
+
+async function exportCsv(request: ExportRequest) {
+  // BOM para que Excel abra el UTF-8 con tildes
+  const parts: Blob[] = [new Blob(['\uFEFF' + HEADERS.map(csvCell).join(',') + '\n'])]
+  let rows = 0
+  let next = fetchPage(request, 1)
+  for (let page = 1; ; page++) {
+    const { data } = await next
+    const surveys = (data.surveys || []).map(sanitize)
+    const last = page >= data.totalPages || surveys.length === 0
+    // La página siguiente se descarga mientras se formatea esta
+    if (!last) next = fetchPage(request, page + 1)
+    if (surveys.length > 0) {
+      parts.push(new Blob([surveys.map((item, i) => csvRow(item, rows + i)).join('\n') + '\n']))
+    }
+    rows += surveys.length
+    post({ type: 'progress', rows, totalItems: data.totalItems })
+    if (last) break
+  }
+  post({ type: 'done', blob: new Blob(parts, { type: 'text/csv;charset=utf-8;' }), rows })
+}
+
+self.onmessage = (event: MessageEvent<ExportRequest>) => {
+  exportCsv(event.data).catch(err => post({
+    type: 'error',
+    message: err?.message || 'Error al exportar el reporte',
+    code: err?.code,
+  }))
+}
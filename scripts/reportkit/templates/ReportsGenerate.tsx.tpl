@@ -0,0 +1,186 @@
+/**
+ * ReportsGenerate - Generar reportes tabulares
+ * Layout: Tabla principal a la izquierda, panel de filtros colapsable a la derecha
+ */
+
+import { useState, useMemo, useCallback/*@ react_imports @*/ } from 'react'
+import { useNavigate } from 'react-router-dom'
+import { DashboardLayout, ToggleUnsuccessful, ReportFilterPanel, INITIAL_FILTERS, ReportTable, FilterIcon, CheckIcon, XIcon, StarIcon, ExcelIcon } from '../components'
+import type { ReportFilters/*@ filter_panel_types @*/ } from '../components/ReportFilterPanel'
+import type { ReportTableColumn } from '../components/ReportTable'
+import { useUnsuccessfulToggle } from '../hooks/useUnsuccessfulToggle'
+import { /*@ api_import @*/ } from '../services/api.service'
+import { notificationService } from '../services/notification.service'
+import { ROUTES } from '../constants'
+/*@ page_imports @*/
+import '../styles/Dashboard.scss'
+
+// Tipo local para items del reporte (mapeado de Dashboard002Survey)
+/*@ item_interface @*/
+
+// Configuración de columnas
+/*@ table_columns @*/
+
+/*@ api_client @*/
+/*@ zone_locations @*/
+// city/department pueden llegar como objetos poblados desde la API
+const extractStr = (val: unknown): string | undefined => {
+  if (!val) return undefined
+  if (typeof val === 'string') return val
+  if (typeof val === 'object' && val !== null && 'name' in val) return (val as { name: string }).name
+  return undefined
+}
+
+type ReportSurvey = Omit<ReportItem, 'linkedHomes'> & { linkedHomes?: boolean }
+
+const sanitizeSurveys = (surveys: ReportSurvey[] | undefined): ReportItem[] =>
+  (surveys || []).map((s) => ({
+    ...s,
+    city: extractStr(s.city),
+    department: extractStr(s.department) ?? s.department,
+    linkedHomes: s.linkedHomes || false,
+  }))
+
+export default function ReportsGenerate() {
+  const navigate = useNavigate()
+  const [isGenerating, setIsGenerating] = useState(false)
+  const [filterPanelOpen, setFilterPanelOpen] = useState(true)
+  const [filters, setFilters] = useState<ReportFilters>(INITIAL_FILTERS)
+  const [reportData, setReportData] = useState<ReportItem[]>([])
+  const [currentPage, setCurrentPage] = useState(1)
+  const [itemsPerPage] = useState(/*@ items_per_page @*/)
+  const [totalItems, setTotalItems] = useState(0)
+  const [totalPages, setTotalPages] = useState(0)
+  /*@ table_state @*/
+
+  // ---- Handlers - Memoizados para estabilidad ----
+  const handleFilterChange = useCallback((field: keyof ReportFilters, value: string) => {
+    setFilters((prev) => {
+      const updated = { ...prev, [field]: value }
+
+      if (field === 'startDate' && value && prev.endDate && value > prev.endDate) {
+        updated.endDate = value
+      } else if (field === 'endDate' && value && prev.startDate && value < prev.startDate) {
+        updated.startDate = value
+      }
+
+      return updated
+    })
+  }, [])
+
+  const handleBackToReports = useCallback(() => navigate(ROUTES.ADMIN_REPORTS), [navigate])
+
+  /*@ report_fetch @*/
+
+  const exportToExcel = useCallback(async () => {
+    if (!filters.startDate || !filters.endDate) {
+      notificationService.warning('Por favor seleccione un rango de fechas')
+      return
+    }
+    try {
+      await /*@ api @*/.exportDashboard002({
+        /*@ export_params @*/
+      })
+      notificationService.success('Archivo Excel descargado exitosamente')
+    } catch (err) {
+      notificationService.handleApiError(err, 'Error al exportar el reporte')
+    }
+  }, [filters])
+
+  /*@ csv_export @*/
+  const activeFiltersCount = useMemo(() => {
+    return Object.entries(filters).filter(
+      ([key, value]) => value && key !== 'sortOrder'
+    ).length
+  }, [filters])
+
+  const hasData = reportData.length > 0
+
+  /*@ paged_columns @*/
+  const { showUnsuccessful } = useUnsuccessfulToggle()
+
+  // Memoizar data filtrada (js-batch-dom-css / rerender-memo)
+  const displayData = useMemo(() => {
+    return showUnsuccessful ? reportData : reportData.filter(item => item.surveyStatus === 'successful')
+  }, [reportData, showUnsuccessful])
+
+  /*@ table_window @*/
+  return (
+    <DashboardLayout
+      title="/*@ page_title @*/"
+      onBack={handleBackToReports}
+    >
+      <div className="rg-layout">
+        {/* ====== MAIN: Tabla / Empty State (izquierda) ====== */}
+        <div className="rg-layout__main">
+          {/* Header barra superior */}
+          <div className="rg-main-header">
+            <div className="rg-main-header__left">
+              <h3 className="rg-main-header__title">
+                {hasData ? 'Resultados del Reporte' : 'Reporte de Encuestas'}
+              </h3>
+              /*@ header_info @*/
+            </div>
+            <div className="rg-main-header__right">
+              {hasData && (
+                <button
+                  className="btn btn--excel"
+                  onClick={exportToExcel}
+                  disabled={isGenerating}
+                  title="Exportar a Excel"
+                >
+                  <ExcelIcon size={16} />
+                  Exportar Excel
+                </button>
+              )}
+              /*@ header_actions @*/
+              {hasData && <ToggleUnsuccessful />}
+              <button
+                className={`rg-filter-toggle ${filterPanelOpen ? 'rg-filter-toggle--active' : ''}`}
+                onClick={() => setFilterPanelOpen(!filterPanelOpen)}
+                title={
+                  filterPanelOpen ? 'Ocultar filtros' : 'Mostrar filtros'
+                }
+              >
+                <FilterIcon size={18} strokeWidth={2.5} />
+                <span className="rg-filter-toggle__label">
+                  {filterPanelOpen ? 'Ocultar' : 'Filtros'}
+                </span>
+                {activeFiltersCount > 0 && (
+                  <span className="rg-filter-toggle__badge">
+                    {activeFiltersCount}
+                  </span>
+                )}
+              </button>
+            </div>
+          </div>
+
+          {/* Tabla o empty state */}
+          <div className="rg-table-container"/*@ table_container @*/>
+            /*@ table @*/
+          </div>
+
+          /*@ table_footer @*/
+        </div>
+
+        {/* ====== FILTROS: Panel lateral derecho ====== */}
+        <div
+          className={`rg-layout__filters ${filterPanelOpen ? 'rg-layout__filters--open' : ''}`}
+        >
+          <ReportFilterPanel
+            isOpen={filterPanelOpen}
+            onClose={() => setFilterPanelOpen(false)}
+            filters={filters}
+            onFilterChange={handleFilterChange}
+            onGenerate={() => generateReport(1/*@ generate_args @*/)}
+            onExportCSV={exportToExcel}
+            isGenerating={isGenerating}
+            hasData={hasData}
+            /*@ filter_panel_props @*/
+          />
+        </div>
+      </div>
+    </DashboardLayout>
+  )
+}
+
@@ -0,0 +1,167 @@
+/**
+ * reportQueryCache - Caché de las consultas de reportes
+ * Claves por parámetros normalizados, expiración por TTL y LRU,
+ * stale-while-revalidate y prefetch de la página siguiente
+ */
+
+import { apiService, ApiService } from './api.service'
+
+export interface QueryOptions<T> {
+  // Cliente a usar (p. ej. el de otra zona); por defecto apiService
+  api?: ApiService
+  // Consulta pedida explícitamente (p. ej. "Generar Reporte"): no se sirve la
+  // copia en caché, se espera la respuesta de la API y reemplaza la entrada
+  refresh?: boolean
+  // Recibe la respuesta revalidada cuando se sirvió una copia vencida, si
+  // mientras tanto no se pidió otra consulta del mismo método
+  onRevalidate?: (value: T) => void
+}
+
+export interface QueryCacheStats {
+  hits: number
+  staleHits: number
+  misses: number
+  revalidations: number
+  prefetches: number
+  evictions: number
+  entries: number
+}
+
+interface Entry {
+  value?: unknown
+  fetchedAt: number
+  pending?: Promise<unknown>
+}
+
+/*@ query_types @*/
+
+const MAX_ENTRIES = /*@ max_entries @*/
+
+// Orden de inserción = orden de uso: la primera clave es la menos usada
+const entries = new Map<string, Entry>()
+// Última clave pedida por cada método (para descartar revalidaciones viejas)
+const latest = new Map<string, string>()
+const stats = { hits: 0, staleHits: 0, misses: 0, revalidations: 0, prefetches: 0, evictions: 0 }
+let sessionToken: string | null = null
+
+// Parámetros vacíos fuera y claves ordenadas: { q: undefined, page: 1 } === { page: 1 }
+const normalize = (params: object) => JSON.stringify(
+  Object.entries(params)
+    .filter(([, value]) => value !== undefined && value !== null && value !== '')
+    .sort(([a], [b]) => (a < b ? -1 : a > b ? 1 : 0))
+)
+
+// Otra sesión (logout/login) no reutiliza los datos de la anterior
+function checkSession() {
+  const token = localStorage.getItem('soci_token')
+  if (token !== sessionToken) {
+    entries.clear()
+    latest.clear()
+    sessionToken = token
+  }
+}
+
+function store(key: string, entry: Entry) {
+  entries.delete(key)
+  entries.set(key, entry)
+  while (entries.size > MAX_ENTRIES) {
+    entries.delete(entries.keys().next().value as string)
+    stats.evictions++
+  }
+}
+
+function load<T>(key: string, fetcher: () => Promise<T>): Promise<T> {
+  const previous = entries.get(key)
+  const pending: Promise<T> = fetcher().then(
+    value => {
+      if (entries.get(key)?.pending === pending) store(key, { value, fetchedAt: Date.now() })
+      return value
+    },
+    err => {
+      const current = entries.get(key)
+      if (current?.pending === pending) {
+        // Si había una copia se sigue sirviendo hasta que venza
+        if (current.value !== undefined) store(key, { value: current.value, fetchedAt: current.fetchedAt })
+        else entries.delete(key)
+      }
+      throw err
+    },
+  )
+  store(key, { value: previous?.value, fetchedAt: previous?.fetchedAt ?? 0, pending })
+  return pending
+}
+
+function query<T>(
+  method: string,
+  ttl: number,
+  maxAge: number,
+  params: object,
+  options: QueryOptions<T>,
+  fetcher: (api: ApiService) => Promise<T>,
+): Promise<T> {
+  checkSession()
+  const api = options.api ?? apiService
+  const scope = `${api.getBaseUrl()} ${method}`
+  const key = `${scope} ${normalize(params)}`
+  latest.set(scope, key)
+  const entry = entries.get(key)
+  const age = entry ? Date.now() - entry.fetchedAt : Infinity
+
+  if (!options.refresh && entry && entry.value !== undefined && age < maxAge) {
+    store(key, entry)
+    if (age < ttl) {
+      stats.hits++
+    } else {
+      stats.staleHits++
+      if (!entry.pending) {
+        stats.revalidations++
+        load(key, () => fetcher(api)).then(
+          fresh => {
+            if (latest.get(scope) === key) options.onRevalidate?.(fresh)
+          },
+          () => {
+            // La copia vencida sigue siendo la respuesta servida
+          },
+        )
+      }
+    }
+    return Promise.resolve(entry.value as T)
+  }
+  if (entry?.pending) {
+    // Misma consulta en vuelo (p. ej. el prefetch de esta página)
+    stats.hits++
+    return entry.pending as Promise<T>
+  }
+  stats.misses++
+  return load(key, () => fetcher(api))
+}
+
+function prefetch<T>(
+  method: string,
+  ttl: number,
+  params: object,
+  options: QueryOptions<T>,
+  fetcher: (api: ApiService) => Promise<T>,
+) {
+  const api = options.api ?? apiService
+  const key = `${api.getBaseUrl()} ${method} ${normalize(params)}`
+  const entry = entries.get(key)
+  if (entry?.pending || (entry && entry.value !== undefined && Date.now() - entry.fetchedAt < ttl)) return
+  stats.prefetches++
+  load(key, () => fetcher(api)).catch(() => {
+    // Un prefetch fallido no afecta a la página actual
+  })
+}
+
+export const reportQueries = {
+  /*@ query_methods @*/
+}
+
+export function reportQueryStats(): QueryCacheStats {
+  return { ...stats, entries: entries.size }
+}
+
+export function clearReportQueries() {
+  entries.clear()
+  latest.clear()
+}
@@ -0,0 +1,364 @@
+"""Inverted index for the free-text report search (``q``) over cached records.
+
+The index covers ``fullName``, ``identification``, ``phone``, ``email``,
+``neighborhood`` and the socializer's name. Values are folded (no accents,
+lowercase) and split into word tokens (``[a-z]+``) and number tokens
+(``[0-9]+``), so ``maria.gomez85@mail.com`` gives ``maria``, ``gomez``,
+``85``, ``mail`` and ``com``. A query is split the same way and a record
+matches when every term matches one of its tokens, in any field:
+
+- a number term is a prefix of a number token (cédula or phone typed from
+  the start);
+- a word term of ``NGRAM`` or more letters appears inside a word token
+  (``ndez`` finds Hernández), found through trigram postings over the word
+  vocabulary; a shorter word term is a prefix of a word token.
+
+With ``rules='server'`` the terms match as the API does (see
+``mock_backend``): every word term inside a word token and every number term
+anywhere inside a number token. The index then only gives candidates; the
+API searches ``fullName`` and ``identification`` alone, which
+``server_match`` checks on the candidate rows.
+
+Layout (one directory per ``ReportCache`` segment, every array a ``.npy``)::
+
+    text/
+        meta.json                   rows, terms, (term, row) pairs, posting bytes
+        words.npy                   sorted word vocabulary (S24)
+        numbers.npy                 sorted number keys: digits << 57 | value (uint64)
+        df.npy, first.npy           postings per term (words first, then numbers), first row
+        width.npy, offset.npy       bytes per delta (0: only ``first``), position in post<width>
+        post1.npy, post2.npy, post4.npy   row deltas of the longer lists, uint8/16/32
+        grams.npy                   sorted trigrams of the word vocabulary (S3)
+        gram_offsets.npy, gram_terms.npy  word ids containing each trigram
+
+Posting lists are sorted row numbers stored as their first row plus the
+gaps, each list in the narrowest integer that holds its largest gap; a
+number seen once (most cédulas and phones) costs no posting bytes at all.
+Segments are immutable, so each sync writes the index of its new segment,
+superseded rows are dropped by the segment's ``dead`` mask and ``merge``
+combines the indexes when the cache compacts, without re-reading records.
+"""
+
+import json
+import os
+import re
+import shutil
+from functools import lru_cache
+
+import numpy as np
+
+from .params import fold
+
+DIR = 'text'
+VERSION = 3  # 2: solo nombre e identificación
+NGRAM = 3
+WORD_WIDTH = 24
+NUMBER_DIGITS = 17
+_LENGTH_SHIFT = 57  # 10**17 < 2**57: dígitos en los bits altos, valor en los bajos
+_WIDTHS = {1: np.uint8, 2: np.uint16, 4: np.uint32}
+_FEW_LISTS = 64
+_TOKEN = re.compile(r'[a-z]+|[0-9]+')
+
+# Campos indexados de un ReportItem
+TEXT_FIELDS = {
+    'fullName': lambda item: item.get('fullName'),
+    'identification': lambda item: item.get('identification'),
+    'phone': lambda item: item.get('phone'),
+    'email': lambda item: item.get('email'),
+    'neighborhood': lambda item: item.get('neighborhood'),
+    'socializer': lambda item: (item.get('socializer') or {}).get('fullName'),
+}
+# Reglas de coincidencia de ``q``: las del índice (prefijos, todos los campos) o las de la API
+RULES = ('local', 'server')
+
+
+@lru_cache(maxsize=1 << 16)
+def _folded_tokens(text):
+    return tuple(_TOKEN.findall(fold(text)))
+
+
+def tokens(text):
+    """Word and number tokens of ``text``: ``'Hernández-Díaz 3001'`` -> ``['hernandez', 'diaz', '3001']``."""
+    if not text:
+        return []
+    text = str(text)
+    # Cédulas, teléfonos y correos casi nunca se repiten: no pasan por la caché
+    if text.isascii():
+        return _TOKEN.findall(text.lower())
+    return list(_folded_tokens(text))
+
+
+def item_tokens(item):
+    """Distinct tokens of the indexed fields of a ``ReportItem``."""
+    out = []
+    for value in TEXT_FIELDS.values():
+        out.extend(tokens(value(item)))
+    return list(dict.fromkeys(out))
+
+
+def server_match(query, names, idents):
+    """Mask of the records whose ``fullName`` (``names``) and ``identification``
+    (``idents``) match every term of ``query`` as the API does."""
+    terms = list(dict.fromkeys(tokens(query)))
+    out = np.ones(len(names), dtype=bool)
+    for i, (name, ident) in enumerate(zip(names, idents)):
+        words, numbers = tokens(name), tokens(ident)
+        out[i] = all(any(term in token for token in (numbers if term[0].isdigit() else words)) for term in terms)
+    return out
+
+
+def _number_key(token):
+    digits = token[:NUMBER_DIGITS]
+    return (len(digits) << _LENGTH_SHIFT) | int(digits)
+
+
+def _save(path, name, array):
+    np.save(os.path.join(path, f'{name}.npy'), array)
+
+
+def _write(path, rows, words, numbers, keys):
+    """Write the index of ``rows`` records from the ``term * rows + row`` pairs ``keys`` (sorted in place)."""
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    terms, scale = len(words) + len(numbers), max(rows, 1)
+    keys.sort()
+    if len(keys) > 1 and np.any(keys[1:] == keys[:-1]):
+        # Palabras o números truncados que coinciden dentro de un registro
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    term = (keys // scale).astype(np.uint32)
+    row = (keys % scale).astype(np.uint32)
+    del keys
+    df = np.bincount(term, minlength=terms).astype(np.uint32)
+    starts = np.cumsum(df, dtype=np.int64) - df
+    present = df > 0
+    first = np.zeros(terms, dtype=np.uint32)
+    first[present] = row[starts[present]]
+    gaps = np.zeros(len(row), dtype=np.uint32)
+    np.subtract(row[1:], row[:-1], out=gaps[1:])
+    gaps[starts[present]] = 0
+    largest = np.zeros(terms, dtype=np.uint32)
+    if len(row):
+        largest[present] = np.maximum.reduceat(gaps, starts[present])
+    del row
+    width = np.select([df <= 1, largest < 1 << 8, largest < 1 << 16], [0, 1, 2], 4).astype(np.uint8)
+    offset = np.zeros(terms, dtype=np.uint32)
+    # El primer registro de cada lista va en ``first``; el resto, como saltos
+    rest = np.ones(len(gaps), dtype=bool)
+    rest[starts[present]] = False
+    term_width = width[term]
+    del term
+    postings = 0
+    for w, dtype in _WIDTHS.items():
+        count_w = np.where(width == w, df.astype(np.int64) - 1, 0)
+        offset[width == w] = (np.cumsum(count_w) - count_w)[width == w]
+        blob = gaps[(term_width == w) & rest].astype(dtype)
+        postings += blob.nbytes
+        _save(path, f'post{w}', blob)
+
+    # Sin los términos que se quedaron sin registros
+    words, numbers = words[present[:len(words)]], numbers[present[len(words):]]
+    df, first, width, offset = df[present], first[present], width[present], offset[present]
+    grams, gram_terms = [], []
+    for i, word in enumerate(words.tolist()):
+        for gram in {word[j:j + NGRAM] for j in range(len(word) - NGRAM + 1)}:
+            grams.append(gram)
+            gram_terms.append(i)
+    grams = np.array(grams, dtype=f'S{NGRAM}')
+    order = np.lexsort((np.array(gram_terms, dtype=np.uint32), grams))
+    grams, gram_terms = grams[order], np.array(gram_terms, dtype=np.uint32)[order]
+    unique_grams, gram_starts = np.unique(grams, return_index=True)
+
+    for name, array in (
+        ('words', words), ('numbers', numbers), ('df', df), ('first', first), ('width', width),
+        ('offset', offset), ('grams', unique_grams), ('gram_terms', gram_terms),
+        ('gram_offsets', np.append(gram_starts, len(grams)).astype(np.uint32)),
+    ):
+        _save(path, name, array)
+    with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({'version': VERSION, 'rows': rows, 'terms': len(df), 'pairs': len(gaps), 'postingBytes': postings}, f)
+
+
+def build(path, token_lists):
+    """Write the index of records whose tokens (``item_tokens``) are ``token_lists``."""
+    vocab = {}
+    ids = np.fromiter((vocab.setdefault(t, len(vocab)) for row_tokens in token_lists for t in row_tokens),
+                      dtype=np.int64)
+    pair_rows = np.repeat(np.arange(len(token_lists), dtype=np.uint64), [len(t) for t in token_lists])
+    # Solo se ordena el vocabulario, no cada aparición
+    vocab = list(vocab)
+    word_pos = [i for i, t in enumerate(vocab) if not t[0].isdigit()]
+    number_pos = [i for i, t in enumerate(vocab) if t[0].isdigit()]
+    words, word_ids = np.unique(np.array([vocab[i] for i in word_pos], dtype=f'S{WORD_WIDTH}'), return_inverse=True)
+    numbers, number_ids = np.unique(np.array([_number_key(vocab[i]) for i in number_pos], dtype=np.uint64),
+                                    return_inverse=True)
+    term_of = np.empty(len(vocab), dtype=np.uint64)
+    term_of[word_pos] = word_ids
+    term_of[number_pos] = number_ids + len(words)
+    _write(path, len(token_lists), words, numbers, term_of[ids] * np.uint64(max(len(token_lists), 1)) + pair_rows)
+
+
+def merge(path, parts, rows):
+    """Write one index from ``(TextIndex, new_rows)`` parts; ``new_rows[r]`` is ``-1`` for dropped rows."""
+    words, word_map = np.unique(np.concatenate([p.words for p, _ in parts] or [np.zeros(0, f'S{WORD_WIDTH}')]),
+                                return_inverse=True)
+    numbers, number_map = np.unique(np.concatenate([p.numbers for p, _ in parts] or [np.zeros(0, np.uint64)]),
+                                    return_inverse=True)
+    scale = np.uint64(max(rows, 1))
+    keys = np.empty(sum(index.meta['pairs'] for index, _ in parts), dtype=np.uint64)
+    filled = word_base = number_base = 0
+    for index, new_rows in parts:
+        w = len(index.words)
+        n = index.terms - w
+        # Término de la parte -> término del índice combinado
+        remap = np.concatenate([word_map[word_base:word_base + w], number_map[number_base:number_base + n] + len(words)])
+        word_base, number_base = word_base + w, number_base + n
+        mapped = np.asarray(new_rows)[index.postings(np.arange(index.terms))]
+        keep = mapped >= 0
+        part = np.repeat(remap.astype(np.uint64), index.df)[keep] * scale + mapped[keep].astype(np.uint64)
+        keys[filled:filled + len(part)] = part
+        filled += len(part)
+    _write(path, rows, words, numbers, keys[:filled])
+
+
+class TextIndex:
+    """Memory-mapped index of one segment, as written by ``build`` or ``merge``."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.rows = self.meta['rows']
+        self.terms = self.meta['terms']
+        for name in ('words', 'numbers', 'df', 'first', 'width', 'offset', 'grams', 'gram_offsets', 'gram_terms'):
+            setattr(self, name, np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r'))
+        self.post = {w: np.load(os.path.join(path, f'post{w}.npy'), mmap_mode='r') for w in _WIDTHS}
+        self._number_text = None
+
+    @staticmethod
+    def exists(path):
+        """Whether ``path`` holds an index of the current ``VERSION``."""
+        try:
+            with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+                return json.load(f).get('version') == VERSION
+        except FileNotFoundError:
+            return False
+
+    def _list(self, term):
+        df, first = int(self.df[term]), int(self.first[term])
+        out = np.full(df, first, dtype=np.uint32)
+        if df > 1:
+            start = int(self.offset[term])
+            out[1:] += np.cumsum(self.post[int(self.width[term])][start:start + df - 1], dtype=np.uint32)
+        return out
+
+    def postings(self, ids):
+        """Rows of the posting lists of term ``ids`` (uint32), list after list, each sorted."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) <= _FEW_LISTS:
+            return np.concatenate([self._list(term) for term in ids.tolist()] or [np.zeros(0, dtype=np.uint32)])
+        # Muchas listas (un prefijo corto): todas a la vez; la aritmética uint32 da la vuelta y se compensa
+        df = np.asarray(self.df[ids], dtype=np.int64)
+        out = np.repeat(np.asarray(self.first[ids]), df)
+        starts = np.cumsum(df) - df
+        width = np.asarray(self.width[ids])
+        for w, blob in self.post.items():
+            sel = np.flatnonzero(width == w)
+            if not len(sel):
+                continue
+            n = df[sel] - 1
+            list_starts = np.cumsum(n) - n
+            local = np.arange(int(n.sum())) - np.repeat(list_starts, n)
+            gaps = blob[np.repeat(np.asarray(self.offset[ids[sel]], dtype=np.int64), n) + local]
+            sums = np.cumsum(gaps, dtype=np.uint32)
+            sums -= np.repeat(sums[list_starts] - gaps[list_starts], n)
+            out[np.repeat(starts[sel] + 1, n) + local] += sums
+        return out
+
+    def _prefix(self, term):
+        """Word ids whose word starts with ``term`` (bytes)."""
+        lo = np.searchsorted(self.words, term, 'left')
+        hi = np.searchsorted(self.words, term + b'\xff', 'left')
+        return np.arange(lo, hi)
+
+    def _infix(self, term):
+        """Word ids whose word contains ``term`` (bytes)."""
+        if len(term) < NGRAM:
+            return np.flatnonzero(np.char.find(np.asarray(self.words), term) >= 0)
+        lists = []
+        for gram in {term[j:j + NGRAM] for j in range(len(term) - NGRAM + 1)}:
+            k = np.searchsorted(self.grams, gram)
+            if k == len(self.grams) or self.grams[k] != gram:
+                return np.zeros(0, dtype=np.int64)
+            lists.append(self.gram_terms[self.gram_offsets[k]:self.gram_offsets[k + 1]])
+        lists.sort(key=len)
+        candidates = np.asarray(lists[0])
+        for other in lists[1:]:
+            candidates = candidates[np.isin(candidates, other, assume_unique=True)]
+        # Los trigramas en otro orden también pasan el filtro
+        return candidates[np.char.find(np.asarray(self.words[candidates]), term) >= 0].astype(np.int64)
+
+    def _numbers(self, term):
+        """Term ids of the number tokens that start with ``term`` (digits)."""
+        digits = term[:NUMBER_DIGITS]
+        value, k = int(digits), len(digits)
+        ranges = []
+        for length in range(k, NUMBER_DIGITS + 1):
+            scale = 10 ** (length - k)
+            lo, hi = (np.uint64((length << _LENGTH_SHIFT) | v) for v in (value * scale, (value + 1) * scale))
+            ranges.append(np.arange(np.searchsorted(self.numbers, lo), np.searchsorted(self.numbers, hi)))
+        return np.concatenate(ranges) + len(self.words)
+
+    def _number_infix(self, term):
+        """Term ids of the number tokens that contain ``term`` (digits)."""
+        if self._number_text is None:
+            # Las claves guardan valor y cantidad de dígitos: se vuelven texto una vez por índice
+            keys = np.asarray(self.numbers).tolist()
+            self._number_text = np.array(
+                [str(key & ((1 << _LENGTH_SHIFT) - 1)).zfill(key >> _LENGTH_SHIFT) for key in keys],
+                dtype=f'S{NUMBER_DIGITS}')
+        found = np.char.find(self._number_text, term[:NUMBER_DIGITS].encode('ascii')) >= 0
+        return np.flatnonzero(found) + len(self.words)
+
+    def term_ids(self, term, rules='local'):
+        """Ids of the terms a query term (one token) matches under ``rules``."""
+        if term[0].isdigit():
+            return self._number_infix(term) if rules == 'server' else self._numbers(term)
+        term = term.encode('ascii')[:WORD_WIDTH]
+        return self._infix(term) if len(term) >= NGRAM or rules == 'server' else self._prefix(term)
+
+    def search(self, query, rules='local'):
+        """Sorted rows whose tokens match every term of ``query``; ``None`` if it has no terms.
+
+        With ``rules='server'`` the rows are candidates for ``server_match``.
+        """
+        terms = tokens(query)
+        if not terms:
+            return None
+        matches = sorted((self.term_ids(t, rules) for t in dict.fromkeys(terms)),
+                         key=lambda ids: int(self.df[ids].sum()))
+        result = None
+        for ids in matches:
+            rows = self.postings(ids)
+            if result is None:
+                if len(ids) == 1:
+                    result = rows
+                elif len(rows) > self.rows // 1024:
+                    result = self._member(rows)
+                else:
+                    result = np.unique(rows)
+            elif len(ids) == 1 and len(result) * 8 < len(rows):
+                # Pocos candidatos frente a una lista ordenada: búsqueda binaria
+                pos = np.minimum(np.searchsorted(rows, result), max(len(rows) - 1, 0))
+                result = result[rows[pos] == result] if len(rows) else rows
+            else:
+                result = self._member(rows, result)
+            if not len(result):
+                break
+        return result
+
+    def _member(self, rows, candidates=None):
+        """``candidates`` found in ``rows``; without ``candidates``, ``rows`` sorted and deduplicated."""
+        # np.zeros no toca la memoria hasta escribirla; con índices intp la asignación es más rápida
+        hit = np.zeros(self.rows, dtype=bool)
+        hit[rows.astype(np.intp)] = True
+        return np.flatnonzero(hit).astype(np.uint32) if candidates is None else candidates[hit[candidates]]
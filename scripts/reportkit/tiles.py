@@ -0,0 +1,379 @@
+"""Pre-clustered map tiles of respondent locations, one JSON file per tile.
+
+Replaces client-side clustering in ``ReportsMap``: clusters are computed
+once per zoom level and written as ``<z>/<x>/<y>.json`` under the usual
+slippy-map tile scheme, so the map only fetches the tiles in view.
+
+Points are projected to Web Mercator pixels at ``max_zoom``. Below
+``max_zoom`` a cluster is every point inside one ``CELL``-pixel square
+(4 x 4 cells per 256 px tile); cells nest across zoom levels, so each level
+is built from the one below with ``reduceat`` over points sorted once by
+their Morton code. A cell holding a single point is written as a point. At
+``max_zoom`` every point is written individually, as Supercluster does past
+its ``maxZoom``. Levels are written in parallel with ``jobs > 1`` (forked
+processes; the points are shared copy-on-write).
+
+Tile layout (columnar, so a tile is a handful of arrays)::
+
+    {"z": 9, "x": 145, "y": 246,
+     "clusters": {"lon": [...], "lat": [...], "count": [...], "successful": [...],
+                  "expansionZoom": [...], "topReasons": [[["not_home", 12], ...], ...]},
+     "points": {"id": [...], "lon": [...], "lat": [...], "successful": [1, 0, ...],
+                "reason": ["", "no_interest", ...]}}
+
+``lon``/``lat`` of a cluster is the centroid of its points; ``expansionZoom``
+is the first zoom at which it splits (what ``getClusterExpansionZoom``
+returns). ``topReasons`` are ``REJECTION_REASONS`` values with their counts,
+most frequent first. ``index.json`` holds the zoom range, bounds and the
+totals for ``MapStats``/``RejectionBreakdown``.
+"""
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from .codegen import write_if_changed
+from .synthetic import REJECTION_REASONS, SUCCESSFUL, object_id
+
+TILE_SIZE = 256
+CELL = 64
+TOP_REASONS = 3
+MAX_LATITUDE = 85.05112878
+_CELL_SHIFT = 6    # log2(CELL)
+_TILE_SHIFT = 8    # log2(TILE_SIZE)
+_CELLS_PER_TILE_SHIFT = _TILE_SHIFT - _CELL_SHIFT
+
+_REASON_CODES = {value: code for code, (value, _, _) in enumerate(REJECTION_REASONS)}
+_OTHER_REASON = _REASON_CODES['other']
+
+
+@dataclass
+class Points:
+    """Respondent locations: coordinates, status and rejection reason code."""
+
+    lon: np.ndarray
+    lat: np.ndarray
+    successful: np.ndarray
+    reason: np.ndarray       # índice en REJECTION_REASONS (0: ninguna)
+    ident: Callable          # índice -> _id
+
+    def __len__(self):
+        return len(self.lon)
+
+
+def points_from_dataset(ds, rows):
+    """``Points`` of the records ``rows`` (slice or indices) of a synthetic ``Dataset``."""
+    indices = np.arange(rows.start, rows.stop) if isinstance(rows, slice) else np.asarray(rows)
+    created = ds.created
+    return Points(
+        lon=np.asarray(ds.lon[indices], dtype=np.float64),
+        lat=np.asarray(ds.lat[indices], dtype=np.float64),
+        successful=(np.asarray(ds.flags[indices]) & SUCCESSFUL) != 0,
+        reason=np.asarray(ds.reason[indices]),
+        ident=lambda i: object_id(int(created[indices[i]]), int(indices[i])),
+    )
+
+
+def points_from_items(items):
+    """``Points`` of ``ReportItem`` dicts that have a location (others are skipped)."""
+    lon, lat, successful, reason, ids = [], [], [], [], []
+    for item in items:
+        coordinates = (item.get('location') or {}).get('coordinates') or ()
+        if len(coordinates) < 2 or not (coordinates[0] or coordinates[1]):
+            continue
+        lon.append(coordinates[0])
+        lat.append(coordinates[1])
+        ok = item.get('surveyStatus') == 'successful'
+        successful.append(ok)
+        why = item.get('rejectionReason') or item.get('noResponseReason') or {}
+        value = why.get('value') if isinstance(why, dict) else why
+        reason.append(0 if ok else _REASON_CODES.get(value or '', _OTHER_REASON))
+        ids.append(item.get('_id') or '')
+    return Points(
+        lon=np.array(lon, dtype=np.float64),
+        lat=np.array(lat, dtype=np.float64),
+        successful=np.array(successful, dtype=bool),
+        reason=np.array(reason, dtype=np.uint8),
+        ident=ids.__getitem__,
+    )
+
+
+# ---- Proyección y orden de Morton ----
+
+def project(lon, lat, zoom):
+    """Integer Web Mercator pixel coordinates at ``zoom``."""
+    scale = TILE_SIZE * 2.0 ** zoom
+    x = (np.asarray(lon) + 180.0) / 360.0
+    sin = np.sin(np.radians(np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE)))
+    y = 0.5 - np.log((1 + sin) / (1 - sin)) / (4 * np.pi)
+    limit = scale - 1
+    return (
+        np.clip(np.floor(x * scale), 0, limit).astype(np.int64),
+        np.clip(np.floor(y * scale), 0, limit).astype(np.int64),
+    )
+
+
+def _spread(v):
+    v = v.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    for shift, mask in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F),
+                        (2, 0x3333333333333333), (1, 0x5555555555555555)):
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+    return v
+
+
+def _compact(v):
+    v = v & np.uint64(0x5555555555555555)
+    for shift, mask in ((1, 0x3333333333333333), (2, 0x0F0F0F0F0F0F0F0F), (4, 0x00FF00FF00FF00FF),
+                        (8, 0x0000FFFF0000FFFF), (16, 0x00000000FFFFFFFF)):
+        v = (v | (v >> np.uint64(shift))) & np.uint64(mask)
+    return v.astype(np.int64)
+
+
+def morton(x, y):
+    return _spread(x) | (_spread(y) << np.uint64(1))
+
+
+def unmorton(code):
+    return _compact(code), _compact(code >> np.uint64(1))
+
+
+# ---- Pirámide de clusters ----
+
+@dataclass
+class Level:
+    """Clusters of one zoom level, in Morton order of their cells."""
+
+    zoom: int
+    cell: np.ndarray          # código de Morton de la celda
+    count: np.ndarray
+    successful: np.ndarray
+    lon_sum: np.ndarray
+    lat_sum: np.ndarray
+    reasons: np.ndarray       # (clusters, len(REJECTION_REASONS))
+    expansion: np.ndarray
+    first: np.ndarray         # un punto del cluster (índice en Points)
+
+    def parent(self):
+        """The next zoom level out: every 2 x 2 cells merged."""
+        parent_cell = self.cell >> np.uint64(2)
+        starts = np.flatnonzero(np.r_[True, parent_cell[1:] != parent_cell[:-1]])
+        children = np.diff(np.r_[starts, len(parent_cell)])
+        return Level(
+            zoom=self.zoom - 1,
+            cell=parent_cell[starts],
+            count=np.add.reduceat(self.count, starts),
+            successful=np.add.reduceat(self.successful, starts),
+            lon_sum=np.add.reduceat(self.lon_sum, starts),
+            lat_sum=np.add.reduceat(self.lat_sum, starts),
+            reasons=np.add.reduceat(self.reasons, starts, axis=0),
+            # Con un solo hijo el cluster no se divide al acercarse: hereda su zoom de expansión
+            expansion=np.where(children == 1, self.expansion[starts], self.zoom),
+            first=self.first[starts],
+        )
+
+
+def _finest_level(points, order, cells, zoom, max_zoom):
+    cells = cells[order]
+    new_cell = np.r_[True, cells[1:] != cells[:-1]]
+    starts = np.flatnonzero(new_cell)
+    cluster = np.cumsum(new_cell) - 1
+    reasons = np.bincount(
+        cluster * len(REJECTION_REASONS) + points.reason[order], minlength=len(starts) * len(REJECTION_REASONS)
+    ).reshape(len(starts), len(REJECTION_REASONS))
+    return Level(
+        zoom=zoom,
+        cell=cells[starts],
+        count=np.diff(np.r_[starts, len(cells)]),
+        successful=np.add.reduceat(points.successful[order].astype(np.int64), starts),
+        lon_sum=np.add.reduceat(points.lon[order], starts),
+        lat_sum=np.add.reduceat(points.lat[order], starts),
+        reasons=reasons,
+        expansion=np.full(len(starts), max_zoom, dtype=np.int64),
+        first=order[starts],
+    )
+
+
+# ---- Escritura ----
+
+def _top_reasons(counts):
+    ranked = sorted(((int(n), code) for code, n in enumerate(counts) if code and n), key=lambda r: (-r[0], r[1]))
+    return [[REJECTION_REASONS[code][0], n] for n, code in ranked[:TOP_REASONS]]
+
+
+def _round(values, digits=6):
+    return np.round(values, digits).tolist()
+
+
+class TileWriter:
+    """Writes tile JSON under ``root`` and removes tiles no longer produced."""
+
+    def __init__(self, root):
+        self.root = root
+        self.written = set()
+        self.changed = 0
+
+    def write(self, z, x, y, payload):
+        path = os.path.join(self.root, str(z), str(x), f'{y}.json')
+        data = json.dumps({'z': z, 'x': x, 'y': y, **payload}, ensure_ascii=False, separators=(',', ':'))
+        self.changed += write_if_changed(path, data.encode('utf-8'))
+        self.written.add(path)
+
+    def prune(self):
+        """Delete tiles of a previous run that this run did not write."""
+        removed = 0
+        for entry in os.scandir(self.root):
+            if not (entry.is_dir() and entry.name.isdigit()):
+                continue
+            for dirpath, _, filenames in os.walk(entry.path, topdown=False):
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    if name.endswith('.json') and path not in self.written:
+                        os.remove(path)
+                        removed += 1
+                if not os.listdir(dirpath):
+                    os.rmdir(dirpath)
+        return removed
+
+
+def _tile_groups(tile_codes):
+    """``(start, end, x, y)`` of each run of equal Morton tile codes."""
+    starts = np.flatnonzero(np.r_[True, tile_codes[1:] != tile_codes[:-1]])
+    ends = np.r_[starts[1:], len(tile_codes)]
+    xs, ys = unmorton(tile_codes[starts])
+    return zip(starts.tolist(), ends.tolist(), xs.tolist(), ys.tolist())
+
+
+def _points_payload(points, indices):
+    return {
+        'id': [points.ident(i) for i in indices.tolist()],
+        'lon': _round(points.lon[indices]),
+        'lat': _round(points.lat[indices]),
+        'successful': points.successful[indices].astype(np.int8).tolist(),
+        'reason': [REJECTION_REASONS[code][0] for code in points.reason[indices].tolist()],
+    }
+
+
+def write_level(writer, points, level):
+    """Write every tile of a cluster ``level``; returns the number of tiles."""
+    tiles = 0
+    tile_codes = level.cell >> np.uint64(2 * _CELLS_PER_TILE_SHIFT)
+    for start, end, x, y in _tile_groups(tile_codes):
+        count = level.count[start:end]
+        many = start + np.flatnonzero(count > 1)
+        single = start + np.flatnonzero(count == 1)
+        payload = {}
+        if len(many):
+            payload['clusters'] = {
+                'lon': _round(level.lon_sum[many] / level.count[many]),
+                'lat': _round(level.lat_sum[many] / level.count[many]),
+                'count': level.count[many].tolist(),
+                'successful': level.successful[many].tolist(),
+                'expansionZoom': level.expansion[many].tolist(),
+                'topReasons': [_top_reasons(r) for r in level.reasons[many].tolist()],
+            }
+        if len(single):
+            payload['points'] = _points_payload(points, level.first[single])
+        writer.write(level.zoom, x, y, payload)
+        tiles += 1
+    return tiles
+
+
+def write_point_level(writer, points, zoom, px, py):
+    """Write every point individually in its tile at ``zoom``."""
+    tile_codes = morton(px >> _TILE_SHIFT, py >> _TILE_SHIFT)
+    order = np.argsort(tile_codes, kind='stable')
+    tiles = 0
+    for start, end, x, y in _tile_groups(tile_codes[order]):
+        writer.write(zoom, x, y, {'points': _points_payload(points, order[start:end])})
+        tiles += 1
+    return tiles
+
+
+# Pool de procesos: puntos y niveles quedan en el hijo al hacer fork, sin serializarlos
+_worker = None
+
+
+def _init_worker(out_dir, points, levels):
+    global _worker
+    _worker = (out_dir, points, levels)
+
+
+def _write_task(i):
+    out_dir, points, levels = _worker
+    writer = TileWriter(out_dir)
+    level = levels[i]
+    tiles = write_point_level(writer, points, *level) if isinstance(level, tuple) else write_level(writer, points, level)
+    return tiles, writer.changed, writer.written
+
+
+def _levels(points, min_zoom, max_zoom):
+    """Every level to write: ``(zoom, px, py)`` for points at ``max_zoom``, then clusters."""
+    px, py = project(points.lon, points.lat, max_zoom)
+    levels = [(max_zoom, px, py)]
+    if min_zoom < max_zoom:
+        # Celdas del nivel max_zoom - 1: píxeles a ese zoom, agrupados de CELL en CELL
+        cells = morton(px >> (1 + _CELL_SHIFT), py >> (1 + _CELL_SHIFT))
+        order = np.argsort(cells, kind='stable')
+        levels.append(_finest_level(points, order, cells, max_zoom - 1, max_zoom))
+        while levels[-1].zoom > min_zoom:
+            levels.append(levels[-1].parent())
+    return levels
+
+
+def build_tiles(points, out_dir, min_zoom=4, max_zoom=16, meta=None, jobs=1):
+    """Write the tile pyramid of ``points`` and ``index.json`` under ``out_dir``.
+
+    Returns the index dict (tile counts per zoom, totals, bounds) plus the
+    number of tiles that changed and of stale tiles removed.
+    """
+    if not 0 <= min_zoom <= max_zoom <= 24:
+        raise ValueError('se requiere 0 <= min_zoom <= max_zoom <= 24')
+    os.makedirs(out_dir, exist_ok=True)
+    levels = _levels(points, min_zoom, max_zoom) if len(points) else []
+    writer = TileWriter(out_dir)
+    tiles = {}
+    jobs = min(jobs, len(levels))
+    if jobs > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        with ProcessPoolExecutor(
+            max_workers=jobs, mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_worker, initargs=(out_dir, points, levels),
+        ) as pool:
+            for level, (count, changed, written) in zip(levels, pool.map(_write_task, range(len(levels)))):
+                tiles[level[0] if isinstance(level, tuple) else level.zoom] = count
+                writer.changed += changed
+                writer.written |= written
+    else:
+        for level in levels:
+            if isinstance(level, tuple):
+                tiles[level[0]] = write_point_level(writer, points, *level)
+            else:
+                tiles[level.zoom] = write_level(writer, points, level)
+    removed = writer.prune()
+
+    successful = int(np.count_nonzero(points.successful))
+    reasons = np.bincount(points.reason, minlength=len(REJECTION_REASONS))
+    index = {
+        'version': 1,
+        'tileUrl': '{z}/{x}/{y}.json',
+        'minZoom': min_zoom,
+        'maxZoom': max_zoom,
+        'cellSize': CELL,
+        'bounds': [
+            round(float(points.lon.min()), 6), round(float(points.lat.min()), 6),
+            round(float(points.lon.max()), 6), round(float(points.lat.max()), 6),
+        ] if len(points) else None,
+        'total': len(points),
+        'successful': successful,
+        'unsuccessful': len(points) - successful,
+        'noExitosaDetalle': {key: int(reasons[code]) for code, (_, _, key) in enumerate(REJECTION_REASONS) if code},
+        'rejectionReasons': [{'value': v, 'label': label, 'key': key} for v, label, key in REJECTION_REASONS[1:]],
+        'tiles': {str(z): n for z, n in sorted(tiles.items())},
+        **({'meta': meta} if meta else {}),
+    }
+    write_if_changed(os.path.join(out_dir, 'index.json'), json.dumps(index, ensure_ascii=False, indent=2).encode('utf-8'))
+    return {**index, 'changed': writer.changed, 'removed': removed}
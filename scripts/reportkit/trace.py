@@ -0,0 +1,311 @@
+"""Timing spans, counters and optional profiling for the report tooling.
+
+Library code marks its stages and the CLIs decide whether they are recorded::
+
+    from .trace import count, span
+
+    with span('render', page=spec.name):
+        data = template.render(slots)
+    count('rows', len(surveys))
+
+A CLI adds ``--trace FILE`` (plus ``--profile`` and ``--tracemalloc``) with
+``add_trace_arguments`` and wraps its work in ``tracing(args, name)``.
+Without ``--trace`` a span is one attribute check and a shared no-op context
+manager, so the marks stay in production code.
+
+The file is a Chrome trace (``chrome://tracing``, https://ui.perfetto.dev):
+one complete (``X``) event per span and a counter (``C``) event per
+``count``. Spans of concurrent asyncio tasks go to a lane per task, so
+overlapping page fetches do not nest into each other. Workers forked by a
+process pool inherit the tracer: each one writes its events to
+``<file>.<pid>.part`` when it exits and ``save`` merges them.
+
+``otherData`` carries the command line, the counter totals and, when asked
+for, the top functions of a cProfile run (the full profile is written to
+``<file>.prof`` for ``pstats``/snakeviz) and the largest allocation sites
+seen by tracemalloc, whose usage is also added to every span as
+``allocKiB``. ``summarize`` and ``compare`` turn one or two traces into
+per-span totals, self times and percentiles (``trace-report.py``).
+"""
+
+import asyncio
+import contextlib
+import glob
+import json
+import math
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 20
+
+_clock = time.perf_counter_ns  # CLOCK_MONOTONIC: común a todos los procesos de la máquina
+_null = contextlib.nullcontext()
+
+
+class Tracer:
+    """Collects span and counter events of this process."""
+
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.memory = False
+        self.events = []
+        self.counters = {}
+        self.pid = os.getpid()
+        self.origin = 0
+        self._lanes = {}
+        self._lock = threading.Lock()
+
+    def start(self, path, memory=False):
+        self.path, self.memory = path, memory
+        self.events, self.counters, self._lanes = [], {}, {}
+        self.pid, self.origin = os.getpid(), _clock()
+        self.enabled = True
+        for stale in glob.glob(glob.escape(path) + '.*.part'):
+            os.remove(stale)
+
+    def _now(self):
+        return (_clock() - self.origin) / 1000
+
+    def _check_fork(self):
+        """In a forked worker: start an empty buffer saved when the worker exits."""
+        pid = os.getpid()
+        if pid == self.pid:
+            return
+        import multiprocessing.util
+
+        self.pid, self.events, self.counters, self._lanes = pid, [], {}, {}
+        multiprocessing.util.Finalize(self, self._save_part, exitpriority=100)
+
+    def _lane(self):
+        """Trace ``tid``: one per thread and, inside an event loop, one per task."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = (threading.get_ident(), id(task) if task else 0)
+        lane = self._lanes.get(key)
+        if lane is None:
+            with self._lock:
+                lane = self._lanes.setdefault(key, len(self._lanes) + 1)
+            name = task.get_name() if task else threading.current_thread().name
+            self.events.append({'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': lane, 'args': {'name': name}})
+        return lane
+
+    @contextlib.contextmanager
+    def span(self, name, args):
+        self._check_fork()
+        lane = self._lane()
+        memory = self.memory and _traced_memory()
+        start = self._now()
+        try:
+            yield
+        finally:
+            event = {'name': name, 'ph': 'X', 'ts': start, 'dur': self._now() - start, 'pid': self.pid, 'tid': lane}
+            if memory is not False:
+                args = {**args, 'allocKiB': round((_traced_memory() - memory) / 1024, 1)}
+            if args:
+                event['args'] = args
+            self.events.append(event)
+
+    def count(self, name, value):
+        self._check_fork()
+        with self._lock:
+            total = self.counters[name] = self.counters.get(name, 0) + value
+        self.events.append({'name': name, 'ph': 'C', 'ts': self._now(), 'pid': self.pid, 'args': {name: total}})
+
+    def _save_part(self):
+        self.events.append({'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'args': {'name': f'worker {self.pid}'}})
+        with open(f'{self.path}.{self.pid}.part', 'w', encoding='utf-8') as f:
+            json.dump({'events': self.events, 'counters': self.counters}, f)
+
+    def save(self, other=None):
+        """Write the trace with the events of this process and of its workers."""
+        events, counters = list(self.events), dict(self.counters)
+        for part in sorted(glob.glob(glob.escape(self.path) + '.*.part')):
+            with open(part, encoding='utf-8') as f:
+                data = json.load(f)
+            events.extend(data['events'])
+            for name, value in data['counters'].items():
+                counters[name] = counters.get(name, 0) + value
+            os.remove(part)
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'args': {'name': 'main'}})
+        trace = {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {**(other or {}), 'counters': counters},
+        }
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(trace, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self.enabled = False
+
+
+def _traced_memory():
+    import tracemalloc
+
+    return tracemalloc.get_traced_memory()[0]
+
+
+TRACER = Tracer()
+
+
+def span(name, **args):
+    """Context manager timing one stage; free when tracing is off."""
+    if not TRACER.enabled:
+        return _null
+    return TRACER.span(name, args)
+
+
+def count(name, value=1):
+    """Add ``value`` to a per-stage counter."""
+    if TRACER.enabled:
+        TRACER.count(name, value)
+
+
+def add_trace_arguments(parser):
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--trace', metavar='FILE', help='write a Chrome trace (JSON) of the run to FILE')
+    group.add_argument('--profile', action='store_true', help='with --trace: also run cProfile (FILE.prof)')
+    group.add_argument('--tracemalloc', action='store_true', help='with --trace: record allocations per span')
+    return group
+
+
+def _profile_rows(profile):
+    import pstats
+
+    stats = pstats.Stats(profile)
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f'{os.path.relpath(filename) if filename.startswith(os.sep) else filename}:{line}({function})',
+            'calls': calls,
+            'ownSeconds': round(own, 6),
+            'cumulativeSeconds': round(cumulative, 6),
+        })
+    rows.sort(key=lambda r: r['cumulativeSeconds'], reverse=True)
+    return rows[:TOP_FUNCTIONS]
+
+
+@contextlib.contextmanager
+def tracing(args, name):
+    """Record the body as span ``name`` when ``args.trace`` is set."""
+    if not getattr(args, 'trace', None):
+        if getattr(args, 'profile', False) or getattr(args, 'tracemalloc', False):
+            print('Error: --profile y --tracemalloc requieren --trace FILE', file=sys.stderr)
+            raise SystemExit(2)
+        yield
+        return
+    profile = None
+    if args.tracemalloc:
+        import tracemalloc
+
+        tracemalloc.start()
+    TRACER.start(args.trace, memory=args.tracemalloc)
+    started = datetime.now(timezone.utc)
+    if args.profile:
+        import cProfile
+
+        profile = cProfile.Profile()
+        profile.enable()
+    try:
+        with span(name):
+            yield
+    finally:
+        other = {
+            'command': [os.path.basename(sys.argv[0])] + sys.argv[1:],
+            'started': started.isoformat(timespec='seconds'),
+            'elapsedSeconds': round((datetime.now(timezone.utc) - started).total_seconds(), 3),
+        }
+        if profile:
+            profile.disable()
+            profile.dump_stats(f'{args.trace}.prof')
+            other['profile'] = _profile_rows(profile)
+        if args.tracemalloc:
+            import tracemalloc
+
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics('lineno')[:TOP_ALLOCATIONS]
+            tracemalloc.stop()
+            other['memory'] = {
+                'currentKiB': round(current / 1024, 1),
+                'peakKiB': round(peak / 1024, 1),
+                'top': [{'site': str(s.traceback), 'KiB': round(s.size / 1024, 1), 'blocks': s.count} for s in top],
+            }
+        TRACER.save(other)
+        print(f'traza: {args.trace}', file=sys.stderr)
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def summarize(trace):
+    """Per span name: count, total/self/mean/p95/max milliseconds; plus the counters."""
+    lanes = {}
+    for event in trace['traceEvents']:
+        if event.get('ph') == 'X':
+            lanes.setdefault((event['pid'], event['tid']), []).append(event)
+    durations, own = {}, {}
+    for events in lanes.values():
+        events.sort(key=lambda e: (e['ts'], -e['dur']))
+        for event, children in _walk(events):
+            durations.setdefault(event['name'], []).append(event['dur'])
+            own[event['name']] = own.get(event['name'], 0.0) + event['dur'] - children
+    spans = {}
+    for name, values in durations.items():
+        total = sum(values)
+        spans[name] = {
+            'count': len(values),
+            'totalMs': round(total / 1000, 3),
+            'selfMs': round(own[name] / 1000, 3),
+            'meanMs': round(total / len(values) / 1000, 3),
+            'p95Ms': round(_percentile(values, 0.95) / 1000, 3),
+            'maxMs': round(max(values) / 1000, 3),
+        }
+    return {'spans': spans, 'counters': (trace.get('otherData') or {}).get('counters', {})}
+
+
+def _walk(events):
+    """``(event, time of its direct children)`` of sorted events on one lane.
+
+    Self time is the duration minus that of the direct children.
+    """
+    children = [0.0] * len(events)
+    stack = []
+    for i, event in enumerate(events):
+        while stack and event['ts'] >= events[stack[-1]]['ts'] + events[stack[-1]]['dur']:
+            stack.pop()
+        if stack:
+            children[stack[-1]] += event['dur']
+        stack.append(i)
+    return zip(events, children)
+
+
+def compare(base, new):
+    """Rows of ``summarize`` for two traces, biggest change in total time first."""
+    a, b = summarize(base), summarize(new)
+    rows = []
+    for name in a['spans'].keys() | b['spans'].keys():
+        before, after = a['spans'].get(name, {}), b['spans'].get(name, {})
+        total_a, total_b = before.get('totalMs', 0.0), after.get('totalMs', 0.0)
+        rows.append({
+            'span': name,
+            'countBase': before.get('count', 0), 'countNew': after.get('count', 0),
+            'totalMsBase': total_a, 'totalMsNew': total_b,
+            'deltaMs': round(total_b - total_a, 3),
+            'ratio': round(total_b / total_a, 3) if total_a else None,
+            'selfMsBase': before.get('selfMs', 0.0), 'selfMsNew': after.get('selfMs', 0.0),
+        })
+    rows.sort(key=lambda r: abs(r['deltaMs']), reverse=True)
+    counters = {
+        name: {'base': a['counters'].get(name, 0), 'new': b['counters'].get(name, 0)}
+        for name in sorted(a['counters'].keys() | b['counters'].keys())
+    }
+    return {'spans': rows, 'counters': counters}
@@ -0,0 +1,473 @@
+"""Compact storage and route analytics of socializer GPS tracks.
+
+The app posts a fix (``POST /locations``) every 30 s for every active
+socializer, but the API only hands back the latest one. This store keeps the
+whole tracks, one directory per Bogotá day::
+
+    <root>/
+        socializers.json        user id -> name, from the collector
+        2026-03-05/
+            chunk-000003.npz    fixes appended by one collector flush or import
+            track.npz           the day compacted: every chunk merged and deduplicated
+
+Every ``.npz`` holds the same delta-encoded arrays, one track per user sorted
+by time (CSR, like ``Dataset``'s socializer index)::
+
+    users   (tracks,)  user ids          offsets (tracks + 1,) first fix of each track
+    t0      (tracks,)  epoch seconds     dt      (fixes,) uint32 seconds since the previous fix
+    lat0    (tracks,)  microdegrees      dlat    (fixes,) int32 microdegrees since the previous fix
+    lon0    (tracks,)  microdegrees      dlon    (fixes,) int32
+    acc     (fixes,)   uint16 decimetres (clipped at 6553.5 m)
+
+Consecutive fixes are a few metres and 30 s apart, so the deltas are small
+integers that ``savez_compressed`` shrinks to a handful of bytes per fix;
+decoding is a ``cumsum`` per column.
+
+Route analytics work on a whole day at once, with no loop over socializers:
+
+- fixes less accurate than ``max_accuracy`` are dropped, then GPS spikes
+  (a fix reached and left faster than ``max_speed``) are removed;
+- a track is cut into segments wherever two fixes are more than ``gap``
+  seconds apart (app closed, no signal): time on the ground is the sum of the
+  segment durations and no distance is counted across a gap;
+- every segment is simplified with Douglas-Peucker, all segments of the day
+  in the same pass: each iteration measures every pending point against its
+  chord, takes the farthest per chord with ``maximum.reduceat`` and splits
+  the chords that exceed the tolerance;
+- the distance travelled is measured on the simplified route, which also
+  drops the jitter of a socializer standing still at a door.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from .columns import parse_date
+from .params import BOGOTA, date_bound
+
+DEFAULT_ROOT = os.path.join(os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share'), 'soci-tracks')
+SOCIALIZERS_WITH_LOCATIONS = '/socializers/with-locations'
+
+MAX_ACCURACY = 50.0   # metros
+MAX_SPEED = 50.0      # m/s; ningún socializador va a 180 km/h, es un salto del GPS
+TOLERANCE = 10.0      # metros, Douglas-Peucker
+GAP = 600             # segundos sin posiciones que cortan el recorrido
+MAX_SPIKE = 3         # posiciones seguidas que puede durar un salto
+EARTH_RADIUS = 6_371_008.8
+MICRO = 1_000_000
+
+_OFFSET = int(BOGOTA.utcoffset(None).total_seconds())
+_ARRAYS = ('users', 'offsets', 't0', 'dt', 'lat0', 'dlat', 'lon0', 'dlon', 'acc')
+_TRACK = 'track.npz'
+
+
+def local_day(epoch):
+    """Bogotá days since the epoch of epoch seconds (scalar or array)."""
+    return (epoch + _OFFSET) // 86400
+
+
+def day_label(day):
+    return datetime.fromtimestamp(int(day) * 86400, timezone.utc).strftime('%Y-%m-%d')
+
+
+def clock(epoch):
+    """``HH:MM`` in Bogotá time."""
+    return datetime.fromtimestamp(int(epoch), BOGOTA).strftime('%H:%M')
+
+
+def _write_json(path, data):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _track_starts(user):
+    """Index of the first fix of each run of equal ``user`` values."""
+    if not len(user):
+        return np.zeros(0, dtype=np.int64)
+    return np.flatnonzero(np.r_[True, user[1:] != user[:-1]])
+
+
+def _track_ends(user):
+    """Index after the last fix of each run of equal ``user`` values."""
+    return np.r_[_track_starts(user)[1:], len(user)].astype(np.int64)
+
+
+@dataclass
+class Fixes:
+    """GPS fixes sorted by user and time; ``user`` indexes ``users``."""
+
+    users: np.ndarray     # ids, sorted
+    user: np.ndarray      # int32
+    t: np.ndarray         # int64 epoch seconds
+    lat: np.ndarray       # float64 degrees
+    lon: np.ndarray
+    acc: np.ndarray       # float32 metres
+
+    def __len__(self):
+        return len(self.t)
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros(0, dtype='<U1'), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int64),
+                   np.zeros(0), np.zeros(0), np.zeros(0, dtype=np.float32))
+
+    @classmethod
+    def from_columns(cls, ids, t, lat, lon, acc):
+        """Fixes from unsorted columns; ``ids`` are user ids, one per fix."""
+        users, user = np.unique(np.asarray(ids, dtype=str), return_inverse=True)
+        fixes = cls(users, user.astype(np.int32), np.asarray(t, dtype=np.int64),
+                    np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64),
+                    np.asarray(acc, dtype=np.float32))
+        return fixes.normalized()
+
+    @classmethod
+    def concat(cls, parts):
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+        ids = np.concatenate([p.users[p.user] for p in parts])
+        return cls.from_columns(ids, *(np.concatenate([getattr(p, name) for p in parts])
+                                       for name in ('t', 'lat', 'lon', 'acc')))
+
+    def take(self, index):
+        return Fixes(self.users, self.user[index], self.t[index], self.lat[index], self.lon[index], self.acc[index])
+
+    def normalized(self):
+        """Sorted by (user, time), rounded to the stored precision, one fix per user and second."""
+        order = np.lexsort((self.t, self.user))
+        fixes = self.take(order)
+        fixes.lat, fixes.lon = np.round(fixes.lat * MICRO) / MICRO, np.round(fixes.lon * MICRO) / MICRO
+        if len(fixes) > 1:
+            repeated = (fixes.user[1:] == fixes.user[:-1]) & (fixes.t[1:] == fixes.t[:-1])
+            if repeated.any():
+                fixes = fixes.take(np.flatnonzero(~np.r_[False, repeated]))
+        return fixes
+
+    def select(self, ids):
+        """Only the tracks of these user ids."""
+        keep = np.isin(self.users, list(ids))
+        return self.take(np.flatnonzero(keep[self.user]))
+
+    def encode(self):
+        """The delta-encoded arrays of the module docstring."""
+        starts = _track_starts(self.user)
+        lat = np.round(self.lat * MICRO).astype(np.int64)
+        lon = np.round(self.lon * MICRO).astype(np.int64)
+        dt, dlat, dlon = np.diff(self.t, prepend=0), np.diff(lat, prepend=0), np.diff(lon, prepend=0)
+        dt[starts] = dlat[starts] = dlon[starts] = 0
+        return {
+            'users': self.users[self.user[starts]],
+            'offsets': np.r_[starts, len(self)].astype(np.int64),
+            't0': self.t[starts], 'dt': dt.astype(np.uint32),
+            'lat0': lat[starts], 'dlat': dlat.astype(np.int32),
+            'lon0': lon[starts], 'dlon': dlon.astype(np.int32),
+            'acc': np.clip(np.round(self.acc * 10), 0, 65535).astype(np.uint16),
+        }
+
+    @classmethod
+    def decode(cls, arrays):
+        offsets = arrays['offsets']
+        lengths = np.diff(offsets)
+        user = np.repeat(np.arange(len(lengths), dtype=np.int32), lengths)
+
+        def column(first, deltas):
+            values = np.cumsum(deltas.astype(np.int64))
+            # El primer delta de cada recorrido es 0: se suma su valor inicial
+            return values + np.repeat(first - values[offsets[:-1]], lengths) if len(values) else values
+
+        return cls(
+            np.asarray(arrays['users']), user, column(arrays['t0'], arrays['dt']),
+            column(arrays['lat0'], arrays['dlat']) / MICRO, column(arrays['lon0'], arrays['dlon']) / MICRO,
+            arrays['acc'].astype(np.float32) / 10,
+        )
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Great-circle distance in metres."""
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def accurate(fixes, max_accuracy=MAX_ACCURACY, max_speed=MAX_SPEED, gap=GAP):
+    """Indices of the fixes kept by the accuracy and spike filters."""
+    # Precisión 0 es desconocida (importaciones sin el campo): se conserva
+    keep = np.flatnonzero((fixes.acc <= max_accuracy) | (fixes.acc == 0))
+    while len(keep) > 2:
+        user, t = fixes.user[keep], fixes.t[keep]
+        # Un corte (``gap``) cuenta como fin de recorrido: la velocidad a través de él no dice nada
+        same = (user[1:] == user[:-1]) & (t[1:] - t[:-1] <= gap)
+        speed = haversine(fixes.lat[keep[:-1]], fixes.lon[keep[:-1]], fixes.lat[keep[1:]], fixes.lon[keep[1:]])
+        speed /= np.maximum(t[1:] - t[:-1], 1)
+        fast = same & (speed > max_speed)
+        # Las posiciones entre dos tramos rápidos forman una excursión; es un
+        # salto si es corta y más corta que alguna de sus vecinas (en los
+        # extremos de un tramo, que su única vecina)
+        start = np.r_[True, ~same | fast]
+        run = np.cumsum(start) - 1
+        length = np.bincount(run)
+        fast_in, fast_out = np.r_[False, fast][start], np.r_[fast[~same | fast], False]
+        edge_in, edge_out = ~np.r_[False, same][start], ~np.r_[same[~same | fast], False]
+        shorter_prev = length < np.r_[0, length[:-1]]
+        shorter_next = length < np.r_[length[1:], 0]
+        spike = (length <= MAX_SPIKE) & (
+            (fast_in & fast_out & (shorter_prev | shorter_next))
+            | (edge_in & fast_out & shorter_next)
+            | (fast_in & edge_out & shorter_prev)
+        )
+        if not spike.any():
+            break
+        keep = keep[~spike[run]]
+    return keep
+
+
+def segments(fixes, gap=GAP):
+    """``(starts, ends)`` of the stretches without gaps, ``ends`` inclusive."""
+    if not len(fixes):
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    cut = np.r_[True, (fixes.user[1:] != fixes.user[:-1]) | (np.diff(fixes.t) > gap)]
+    starts = np.flatnonzero(cut)
+    return starts, np.r_[starts[1:], len(fixes)] - 1
+
+
+def project(fixes, starts, ends):
+    """Local metres (equirectangular at the latitude of each segment)."""
+    lengths = ends - starts + 1
+    scale = np.repeat(np.cos(np.radians(fixes.lat[starts])), lengths)
+    return np.radians(fixes.lon) * scale * EARTH_RADIUS, np.radians(fixes.lat) * EARTH_RADIUS
+
+
+def simplify(x, y, starts, ends, tolerance=TOLERANCE):
+    """Douglas-Peucker over every segment at once; boolean mask of the points kept."""
+    keep = np.zeros(len(x), dtype=bool)
+    keep[starts] = keep[ends] = True
+    a, b = starts, ends
+    while True:
+        span = b - a - 1
+        pending = span > 0
+        a, b, span = a[pending], b[pending], span[pending]
+        if not len(a):
+            return keep
+        offsets = np.cumsum(span) - span
+        chord = np.repeat(np.arange(len(a)), span)
+        index = a[chord] + 1 + np.arange(len(chord)) - offsets[chord]
+        # Distancia de cada punto al segmento (no a la recta) entre los extremos
+        ax, ay = x[a][chord], y[a][chord]
+        dx, dy = x[b][chord] - ax, y[b][chord] - ay
+        px, py = x[index] - ax, y[index] - ay
+        length2 = dx * dx + dy * dy
+        along = np.clip((px * dx + py * dy) / np.where(length2 > 0, length2, 1), 0, 1)
+        distance = np.hypot(px - along * dx, py - along * dy)
+        farthest = np.maximum.reduceat(distance, offsets)
+        split = farthest > tolerance
+        if not split.any():
+            return keep
+        hit = np.flatnonzero(distance == farthest[chord])
+        chords, first = np.unique(chord[hit], return_index=True)
+        middle = index[hit[first]]
+        middle, a, b = middle[split[chords]], a[split], b[split]
+        keep[middle] = True
+        a, b = np.r_[a, middle], np.r_[middle, b]
+
+
+def routes(fixes, max_accuracy=MAX_ACCURACY, max_speed=MAX_SPEED, tolerance=TOLERANCE, gap=GAP):
+    """Filtered, segmented and simplified routes of one day.
+
+    Returns ``(stats, route, route_segment)``: a dict per user with the counts,
+    distance and time on the ground, the simplified fixes and the segment
+    number of each of them (consecutive fixes of the same segment form a line).
+    """
+    kept = fixes.take(accurate(fixes, max_accuracy, max_speed, gap))
+    starts, ends = segments(kept, gap)
+    x, y = project(kept, starts, ends)
+    mask = simplify(x, y, starts, ends, tolerance)
+    segment = np.repeat(np.arange(len(starts)), ends - starts + 1)
+    route, route_segment = kept.take(np.flatnonzero(mask)), segment[mask]
+
+    n = len(fixes.users)
+    legs = np.flatnonzero(route_segment[1:] == route_segment[:-1])
+    lengths = haversine(route.lat[legs], route.lon[legs], route.lat[legs + 1], route.lon[legs + 1])
+    distance = np.bincount(route.user[legs], lengths, minlength=n)
+    seg_user = kept.user[starts]
+    active = np.bincount(seg_user, (kept.t[ends] - kept.t[starts]).astype(np.float64), minlength=n)
+    counts = {
+        'fixes': np.bincount(fixes.user, minlength=n),
+        'accurate': np.bincount(kept.user, minlength=n),
+        'points': np.bincount(route.user, minlength=n),
+        'segments': np.bincount(seg_user, minlength=n),
+    }
+    starts, ends = _track_starts(fixes.user), _track_ends(fixes.user)
+    stats = {}
+    for start, end in zip(starts, ends):
+        u = fixes.user[start]
+        stats[str(fixes.users[u])] = {
+            **{key: int(values[u]) for key, values in counts.items()},
+            'distanceKm': round(float(distance[u]) / 1000, 3),
+            'activeMinutes': round(float(active[u]) / 60, 1),
+            'firstFix': clock(fixes.t[start]),
+            'lastFix': clock(fixes.t[end - 1]),
+        }
+    return stats, route, route_segment
+
+
+def geojson(route, route_segment, properties):
+    """One ``MultiLineString`` feature per user; ``properties`` maps user id to its dict."""
+    features = []
+    for start, end in zip(_track_starts(route.user), _track_ends(route.user)):
+        user = str(route.users[route.user[start]])
+        lines = []
+        seg = route_segment[start:end]
+        cuts = np.flatnonzero(np.r_[True, seg[1:] != seg[:-1], True])
+        for lo, hi in zip(cuts[:-1], cuts[1:]):
+            if hi - lo > 1:
+                lines.append([[float(lon), float(lat)] for lon, lat in
+                              zip(route.lon[start + lo:start + hi], route.lat[start + lo:start + hi])])
+        features.append({
+            'type': 'Feature',
+            'geometry': {'type': 'MultiLineString', 'coordinates': lines},
+            'properties': {'socializer': user, **properties.get(user, {})},
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+class TrackStore:
+    """Day directories of delta-encoded fixes."""
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def days(self):
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+
+    def files(self, day):
+        path = os.path.join(self.root, day)
+        try:
+            names = sorted(n for n in os.listdir(path) if n.endswith('.npz'))
+        except FileNotFoundError:
+            return []
+        return [os.path.join(path, n) for n in names]
+
+    def names(self):
+        try:
+            with open(os.path.join(self.root, 'socializers.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save_names(self, names):
+        known = self.names()
+        if any(known.get(k) != v for k, v in names.items()):
+            _write_json(os.path.join(self.root, 'socializers.json'), {**known, **names})
+
+    @staticmethod
+    def _write(path, fixes):
+        tmp = f'{path}.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(f, **fixes.encode())
+        os.replace(tmp, path)
+
+    def append(self, fixes):
+        """Write ``fixes`` as a new chunk of each day they touch; returns the days."""
+        if not len(fixes):
+            return []
+        days = local_day(fixes.t)
+        written = []
+        for day in np.unique(days):
+            label = day_label(day)
+            path = os.path.join(self.root, label)
+            os.makedirs(path, exist_ok=True)
+            chunks = [n for n in os.listdir(path) if n.startswith('chunk-') and n.endswith('.npz')]
+            seq = max((int(n[6:12]) for n in chunks), default=0) + 1
+            self._write(os.path.join(path, f'chunk-{seq:06d}.npz'), fixes.take(np.flatnonzero(days == day)))
+            written.append(label)
+        return written
+
+    def load(self, day):
+        """Every fix of a day (``YYYY-MM-DD``), chunks merged."""
+        parts = []
+        for path in self.files(day):
+            with np.load(path) as arrays:
+                parts.append(Fixes.decode({name: arrays[name] for name in _ARRAYS}))
+        return Fixes.concat(parts)
+
+    def compact(self, day):
+        """Merge the chunks of a day into ``track.npz``; returns ``(files merged, fixes)``."""
+        files = self.files(day)
+        if not any(os.path.basename(f).startswith('chunk-') for f in files):
+            return 0, None
+        fixes = self.load(day)
+        self._write(os.path.join(self.root, day, _TRACK), fixes)
+        # Si se interrumpe aquí, los fragmentos repetidos se descartan al leer
+        for path in files:
+            if not path.endswith(_TRACK):
+                os.remove(path)
+        return len(files), len(fixes)
+
+    def day_range(self, start, end):
+        first = datetime.fromtimestamp(date_bound(start), BOGOTA).date()
+        last = datetime.fromtimestamp(date_bound(end, True) - 1, BOGOTA).date()
+        if last < first:
+            raise ValueError(f'rango vacío: {start} a {end}')
+        available = set(self.days())
+        days = (first + timedelta(days=i) for i in range((last - first).days + 1))
+        return [d.isoformat() for d in days if d.isoformat() in available]
+
+
+def fix_from_location(item):
+    """``(user id, epoch seconds, lat, lon, accuracy)`` of a location document, or ``None``.
+
+    Accepts the ``/socializers/with-locations`` items (``latestLocation``) and
+    the documents of the backend ``locations`` collection (``userId``,
+    GeoJSON ``location`` or ``latitude``/``longitude``, ``timestamp`` or
+    ``createdAt``), as exported with ``mongoexport``.
+    """
+    if 'latestLocation' in item:
+        location = item['latestLocation'] or {}
+        user = (item.get('user') or {}).get('_id')
+    else:
+        location, user = item, item.get('userId') or item.get('user')
+    if isinstance(user, dict):
+        user = user.get('$oid') or user.get('_id')
+    coordinates = (location.get('location') or location).get('coordinates')
+    if coordinates:
+        lon, lat = coordinates[:2]
+    else:
+        lat, lon = location.get('latitude'), location.get('longitude')
+    when = location.get('timestamp') or location.get('createdAt')
+    if isinstance(when, dict):
+        when = when.get('$date')
+    if not user or lat is None or lon is None or not when or (lat == 0 and lon == 0):
+        return None
+    if isinstance(when, (int, float)):
+        epoch = int(when / 1000)
+    else:
+        epoch = int(parse_date(when).timestamp())
+    return str(user), epoch, float(lat), float(lon), float(location.get('accuracy') or 0)
+
+
+def fixes_from_items(items):
+    rows = [fix for fix in map(fix_from_location, items) if fix]
+    if not rows:
+        return Fixes.empty()
+    return Fixes.from_columns(*zip(*rows))
+
+
+async def poll(api):
+    """Latest fix of every socializer (``/socializers/with-locations``) and their names."""
+    response = await api.get(SOCIALIZERS_WITH_LOCATIONS)
+    items = response.get('data') or []
+    names = {}
+    for item in items:
+        user = (item.get('user') or {}).get('_id')
+        if user and item.get('fullName'):
+            names[user] = item['fullName']
+    return fixes_from_items(items), names
@@ -0,0 +1,23 @@
+"""Virtualized variant of a generated report table.
+
+The paged table renders ``items_per_page`` rows (50) and every page change
+is a new ``getDashboard002Report`` round-trip. The virtual variant requests
+pages of thousands of rows, renders only the rows around the scroll
+window and loads the next page in the background before the user reaches
+the end of what is loaded.
+"""
+
+import dataclasses
+
+DEFAULT_PAGE_SIZE = 2000
+
+
+def virtual_page(page, page_size=DEFAULT_PAGE_SIZE):
+    """``page`` with a windowed table fetching ``page_size`` rows per request."""
+    if page_size < 1:
+        raise ValueError(f'page size must be positive, got {page_size}')
+    return dataclasses.replace(
+        page,
+        table='virtual',
+        items_per_page=page_size,
+    )
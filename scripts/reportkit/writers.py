@@ -0,0 +1,364 @@
+"""Streaming CSV, XLSX and Parquet writers of the report export columns.
+
+Every writer takes the report in chunks of ``export_columns`` (one list per
+``HEADERS`` column, ``N°`` to ``Fecha Creación`` with their Spanish labels
+and ``es-CO`` dates) and appends each chunk to the output as soon as it is
+formatted, so memory depends on the chunk size and not on the report::
+
+    with open_writer('reporte.xlsx') as writer:
+        for items in pages:
+            writer.write(export_columns(items, writer.rows))
+
+or, for an iterable of ``ReportItem`` dicts, ``write_items(items, path)``.
+
+- ``csv``: RFC 4180, a cell is quoted only when it holds ``"``, ``,`` or a
+  line break (the same bytes as ``csv.writer``); ``bom=True`` prepends the
+  UTF-8 BOM Excel needs to detect the encoding, as the browser export does.
+- ``xlsx``: standard library only. The sheet XML is deflated into the zip
+  while it is written (inline strings, no shared-string table to keep),
+  with a bold, frozen and filterable header row; past Excel's 1,048,576
+  rows the report continues on a new sheet.
+- ``parquet``: one row group per chunk, ``N°`` and ``Estrato`` as integers
+  and the rest as strings. Requires ``pyarrow``.
+"""
+
+import itertools
+import os
+import re
+import time
+import zipfile
+from dataclasses import dataclass
+
+from .columns import HEADERS, export_columns
+from .trace import count, span
+
+CHUNK = 5000                    # items formateados y escritos por bloque
+INTEGER_COLUMNS = ('N°', 'Estrato')
+XLSX_MAX_ROWS = 1_048_576       # filas por hoja de Excel, encabezado incluido
+XLSX_SHEET = 'Reporte'
+
+
+@dataclass
+class WriteStats:
+    format: str
+    rows: int = 0
+    chunks: int = 0
+    bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'format': self.format,
+            'rows': self.rows,
+            'chunks': self.chunks,
+            'bytes': self.bytes,
+            'elapsedSeconds': round(self.elapsed, 3),
+            'rowsPerSecond': round(self.rows_per_second, 1),
+        }
+
+
+class ReportWriter:
+    """Appends chunks of export columns to ``path``; ``close`` finishes the file."""
+
+    format = None
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.chunks = 0
+
+    def write(self, columns):
+        """Append one chunk: a list of values per ``HEADERS`` column."""
+        rows = len(columns[0]) if columns else 0
+        if not rows:
+            return
+        with span(f'write.{self.format}', rows=rows):
+            self._write(columns, rows)
+        self.rows += rows
+        self.chunks += 1
+        count('rows', rows)
+
+    def _write(self, columns, rows):
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---- CSV ----
+
+def _csv_quote(value):
+    if '"' in value:
+        return '"' + value.replace('"', '""') + '"'
+    if ',' in value or '\n' in value or '\r' in value:
+        return '"' + value + '"'
+    return value
+
+
+def csv_text(columns):
+    """CSV lines (``\\n``-terminated) of a chunk of export columns."""
+    escaped = []
+    for values in columns:
+        # Una sola pasada por columna decide si alguna celda necesita comillas
+        joined = ''.join(values)
+        if '"' in joined or ',' in joined or '\n' in joined or '\r' in joined:
+            values = [_csv_quote(value) for value in values]
+        escaped.append(values)
+    return '\n'.join(map(','.join, zip(*escaped))) + '\n'
+
+
+class CsvWriter(ReportWriter):
+    format = 'csv'
+
+    def __init__(self, path, bom=False):
+        super().__init__(path)
+        self.out = open(path, 'wb')
+        if bom:
+            self.out.write('\ufeff'.encode('utf-8'))
+        self.out.write(csv_text([[h] for h in HEADERS]).encode('utf-8'))
+
+    def _write(self, columns, rows):
+        self.out.write(csv_text(columns).encode('utf-8'))
+        self.out.flush()
+
+    def close(self):
+        self.out.close()
+
+
+# ---- XLSX ----
+
+_XML_INVALID = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+def _xml_text(value):
+    value = value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('\r', '&#13;')
+    return _XML_INVALID.sub('', value)
+
+
+def _xlsx_cells(values, integer=False):
+    joined = ''.join(values)
+    if '&' in joined or '<' in joined or '>' in joined or '\r' in joined or _XML_INVALID.search(joined):
+        values = [_xml_text(value) for value in values]
+    if integer:
+        return [
+            f'<c><v>{value}</v></c>' if value.isdigit() else
+            f'<c t="inlineStr"><is><t>{value}</t></is></c>' if value else '<c/>'
+            for value in values
+        ]
+    return [f'<c t="inlineStr"><is><t xml:space="preserve">{value}</t></is></c>' if value else '<c/>'
+            for value in values]
+
+
+def _column_name(index):
+    name = ''
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        name = chr(65 + rest) + name
+    return name
+
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '</sheetView></sheetViews><sheetData>'
+)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"'
+    ' Target="xl/workbook.xml"/></Relationships>'
+)
+
+
+class XlsxWriter(ReportWriter):
+    format = 'xlsx'
+
+    def __init__(self, path, compresslevel=1):
+        super().__init__(path)
+        self.zip = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+        self.sheets = 0
+        self.sheet = None
+        self.sheet_rows = 0
+        self._integer = [header in INTEGER_COLUMNS for header in HEADERS]
+        self._last_column = _column_name(len(HEADERS) - 1)
+        self._new_sheet()
+
+    def _new_sheet(self):
+        self._end_sheet()
+        self.sheets += 1
+        self.sheet = self.zip.open(f'xl/worksheets/sheet{self.sheets}.xml', 'w', force_zip64=True)
+        header = ''.join(f'<c t="inlineStr" s="1"><is><t>{_xml_text(h)}</t></is></c>' for h in HEADERS)
+        self.sheet.write(f'{_SHEET_HEAD}<row r="1">{header}</row>'.encode('utf-8'))
+        self.sheet_rows = 1
+
+    def _end_sheet(self):
+        if self.sheet is None:
+            return
+        self.sheet.write(
+            f'</sheetData><autoFilter ref="A1:{self._last_column}{self.sheet_rows}"/></worksheet>'.encode('utf-8')
+        )
+        self.sheet.close()
+        self.sheet = None
+
+    def _write(self, columns, rows):
+        done = 0
+        while done < rows:
+            if self.sheet_rows == XLSX_MAX_ROWS:
+                self._new_sheet()
+            take = min(rows - done, XLSX_MAX_ROWS - self.sheet_rows)
+            part = columns if take == rows else [values[done:done + take] for values in columns]
+            cells = [_xlsx_cells(values, integer) for values, integer in zip(part, self._integer)]
+            first = self.sheet_rows + 1
+            xml = ''.join(
+                f'<row r="{r}">{"".join(row)}</row>' for r, row in zip(range(first, first + take), zip(*cells))
+            )
+            self.sheet.write(xml.encode('utf-8'))
+            self.sheet_rows += take
+            done += take
+
+    def close(self):
+        if self.zip is None:
+            return
+        self._end_sheet()
+        names = [XLSX_SHEET] + [f'{XLSX_SHEET} {n}' for n in range(2, self.sheets + 1)]
+        sheets = ''.join(f'<sheet name="{name}" sheetId="{n}" r:id="rId{n}"/>' for n, name in enumerate(names, 1))
+        self.zip.writestr('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+            ' xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets>{sheets}</sheets></workbook>'
+        ))
+        rels = ''.join(
+            f'<Relationship Id="rId{n}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"'
+            f' Target="worksheets/sheet{n}.xml"/>' for n in range(1, self.sheets + 1)
+        )
+        styles = self.sheets + 1
+        self.zip.writestr('xl/_rels/workbook.xml.rels', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'{rels}<Relationship Id="rId{styles}"'
+            ' Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+            '</Relationships>'
+        ))
+        self.zip.writestr('xl/styles.xml', _STYLES)
+        self.zip.writestr('_rels/.rels', _ROOT_RELS)
+        overrides = ''.join(
+            f'<Override PartName="/xl/worksheets/sheet{n}.xml"'
+            ' ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for n in range(1, self.sheets + 1)
+        )
+        self.zip.writestr('[Content_Types].xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml"'
+            ' ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml"'
+            ' ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f'{overrides}</Types>'
+        ))
+        self.zip.close()
+        self.zip = None
+
+
+# ---- Parquet ----
+
+class ParquetWriter(ReportWriter):
+    format = 'parquet'
+
+    def __init__(self, path, compression='snappy'):
+        super().__init__(path)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ValueError('la salida Parquet requiere pyarrow: pip install pyarrow') from None
+        self.pa = pyarrow
+        self.schema = pyarrow.schema([
+            (header, pyarrow.int64() if header in INTEGER_COLUMNS else pyarrow.string()) for header in HEADERS
+        ])
+        self.out = pyarrow.parquet.ParquetWriter(path, self.schema, compression=compression)
+
+    def _write(self, columns, rows):
+        arrays = []
+        for header, values in zip(HEADERS, columns):
+            if header in INTEGER_COLUMNS:
+                # Estrato vacío (o no numérico) queda nulo, no 0
+                values = [int(value) if value.isdigit() else None for value in values]
+            arrays.append(self.pa.array(values, self.schema.field(header).type))
+        self.out.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.out.close()
+
+
+WRITERS = {
+    'csv': CsvWriter,
+    'xlsx': XlsxWriter,
+    'parquet': ParquetWriter,
+}
+FORMATS = tuple(WRITERS)
+
+
+def format_for(path, fmt=None):
+    """``fmt``, or the format named by the extension of ``path``."""
+    if fmt is None:
+        fmt = os.path.splitext(path)[1].lstrip('.').lower()
+        fmt = {'pq': 'parquet'}.get(fmt, fmt)
+    if fmt not in WRITERS:
+        raise ValueError(f'formato no soportado: {fmt or path} (use {", ".join(FORMATS)})')
+    return fmt
+
+
+def open_writer(path, fmt=None, **options):
+    return WRITERS[format_for(path, fmt)](path, **options)
+
+
+def write_items(items, path, fmt=None, chunk_size=CHUNK, **options):
+    """Stream an iterable of ``ReportItem`` dicts to ``path``; returns ``WriteStats``."""
+    writer = open_writer(path, fmt, **options)
+    started = time.perf_counter()
+    items = iter(items)
+    with writer:
+        while True:
+            chunk = list(itertools.islice(items, chunk_size))
+            if not chunk:
+                break
+            with span('columns', rows=len(chunk)):
+                columns = export_columns(chunk, writer.rows)
+            writer.write(columns)
+    return WriteStats(
+        format=writer.format,
+        rows=writer.rows,
+        chunks=writer.chunks,
+        bytes=os.path.getsize(path),
+        elapsed=time.perf_counter() - started,
+    )
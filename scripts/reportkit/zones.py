@@ -0,0 +1,127 @@
+"""Zone builds: ``.env.production.*`` files and the municipalities of each zone.
+
+The municipality list per zone comes from BUILD_ZONES.md (the same list the
+``.env.production.zona[N]`` headers repeat); departments are resolved with
+``MUNICIPALITY_DEPARTMENTS``.
+"""
+
+import dataclasses
+import glob
+import os
+import re
+
+from .codegen import ROOT_DIR
+from .specs import ZoneSpec
+
+ENV_PATTERN = '.env.production.*'
+
+MUNICIPALITY_DEPARTMENTS = {
+    # Zona 1
+    'Bogotá': 'Bogotá D.C.',
+    'Soacha': 'Cundinamarca',
+    'Fusagasugá': 'Cundinamarca',
+    'Girardot': 'Cundinamarca',
+    # Zona 2
+    'Chía': 'Cundinamarca',
+    'Zipaquirá': 'Cundinamarca',
+    'Cajicá': 'Cundinamarca',
+    'Tenjo': 'Cundinamarca',
+    'Sopó': 'Cundinamarca',
+    'Nemocón': 'Cundinamarca',
+    'Cota': 'Cundinamarca',
+    'Mosquera': 'Cundinamarca',
+    'Facatativá': 'Cundinamarca',
+    'Madrid': 'Cundinamarca',
+    'Funza': 'Cundinamarca',
+    'Tunja': 'Boyacá',
+    'Sogamoso': 'Boyacá',
+    'Duitama': 'Boyacá',
+    # Zona 3
+    'Medellín': 'Antioquia',
+    'Bello': 'Antioquia',
+    'Itagüí': 'Antioquia',
+    'Envigado': 'Antioquia',
+    'Turbo': 'Antioquia',
+    'Sabaneta': 'Antioquia',
+    'La Ceja': 'Antioquia',
+    'Cali': 'Valle del Cauca',
+    'Palmira': 'Valle del Cauca',
+    'Buenaventura': 'Valle del Cauca',
+    'Jamundí': 'Valle del Cauca',
+    'Yumbo': 'Valle del Cauca',
+    'Candelaria': 'Valle del Cauca',
+    # Zona 4
+    'Bucaramanga': 'Santander',
+    'Floridablanca': 'Santander',
+    'Barrancabermeja': 'Santander',
+    'Girón': 'Santander',
+    'Piedecuesta': 'Santander',
+    'Cúcuta': 'Norte de Santander',
+    'Villa del Rosario': 'Norte de Santander',
+    'Los Patios': 'Norte de Santander',
+    # Zona 5
+    'Barranquilla': 'Atlántico',
+    'Soledad': 'Atlántico',
+}
+
+_ZONE_LINE = re.compile(r'^- \*\*Zona (\d+)\*\*: (.+)$', re.M)
+
+
+def read_env(path):
+    """Parse a dotenv file (``KEY=value`` lines, ``#`` comments)."""
+    values = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            values[key.strip()] = value.strip().strip('"\'')
+    return values
+
+
+def zone_municipalities(root=ROOT_DIR):
+    """``{'zona1': (('Bogotá', 'Bogotá D.C.'), ...), ...}`` from BUILD_ZONES.md."""
+    with open(os.path.join(root, 'BUILD_ZONES.md'), encoding='utf-8') as f:
+        text = f.read()
+    zones = {}
+    for number, names in _ZONE_LINE.findall(text):
+        zones[f'zona{number}'] = tuple(
+            (name, MUNICIPALITY_DEPARTMENTS[name]) for name in (n.strip() for n in names.split(','))
+        )
+    return zones
+
+
+def load_zones(root=ROOT_DIR):
+    """One ``ZoneSpec`` per ``.env.production.<name>`` file, sorted by name."""
+    municipalities = zone_municipalities(root)
+    zones = []
+    for path in sorted(glob.glob(os.path.join(root, ENV_PATTERN))):
+        env = read_env(path)
+        env_file = os.path.basename(path)
+        active_zone = env.get('VITE_ACTIVE_ZONE', '')
+        zones.append(ZoneSpec(
+            name=env_file[len('.env.production.'):],
+            env_file=env_file,
+            active_zone=active_zone,
+            app_name=env.get('VITE_APP_NAME', 'SociApp'),
+            api_base_url=env['VITE_API_BASE_URL'],
+            municipalities=municipalities.get(active_zone, ()),
+        ))
+    return zones
+
+
+def zone_page(page, zone):
+    """Specialize ``page`` for ``zone``: the page reads through the zone's API and
+    offers the zone's municipalities in its filter panel.
+
+    ``src/pages/ReportsGenerate.tsx`` becomes ``src/pages/ReportsGenerate.<zone>.tsx``.
+    """
+    stem, ext = os.path.splitext(page.target)
+    return dataclasses.replace(
+        page,
+        name=f'{page.name}.{zone.name}',
+        target=f'{stem}.{zone.name}{ext}',
+        title=f'{page.title} ({zone.app_name})',
+        zone=zone,
+    )
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Hourly/daily rollup cubes of surveys by socializer and hierarchy (requires numpy).
+
+``update`` applies the new ``delta-export.py`` change files of each zone to
+its cubes; ``query`` answers any date range by merging pre-aggregated
+buckets, grouped by socializer, supervisor, field/zone coordinator or zone,
+optionally as a daily or hourly series.
+
+Usage:
+    python3 scripts/delta-export.py --zones && python3 scripts/rollup-cubes.py update
+    python3 scripts/rollup-cubes.py query --startDate 2026-02-01 --endDate 2026-02-28 --by supervisor
+    python3 scripts/rollup-cubes.py query --startDate 2026-03-05 --endDate 2026-03-05 --by zone --series hour
+    python3 scripts/rollup-cubes.py query --startDate 2026-03-01T08:00 --endDate 2026-03-05T14:00 --zone zona1
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    sys.exit('rollup-cubes.py requiere numpy: pip install numpy')
+
+from reportkit.cache import DEFAULT_ROOT as CACHE_ROOT
+from reportkit.delta import DEFAULT_ROOT as DELTA_ROOT, DeltaStore
+from reportkit.hierarchy import HierarchyIndex
+from reportkit.rollup import DEFAULT_ROOT, LEVELS, SERIES, RollupCube, query
+from reportkit.trace import add_trace_arguments, tracing
+
+DEFAULT_INDEX = os.path.join(CACHE_ROOT, 'hierarchy')
+
+
+def selected_zones(args, available):
+    if not args.zone:
+        return available
+    unknown = sorted(set(args.zone) - set(available))
+    if unknown:
+        raise ValueError(f'zonas sin datos: {", ".join(unknown)}')
+    return [z for z in available if z in args.zone]
+
+
+def cmd_update(args):
+    results = []
+    for zone in selected_zones(args, DeltaStore.zones(args.store)):
+        stats = RollupCube.open(zone, args.cubes).update(DeltaStore.open(zone, args.store), zone)
+        results.append(stats.as_dict())
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+def cmd_query(args):
+    zones = selected_zones(args, sorted(
+        name for name in os.listdir(args.cubes) if os.path.exists(os.path.join(args.cubes, name, 'meta.json'))
+    ) if os.path.isdir(args.cubes) else [])
+    hierarchy = None
+    if args.by not in ('socializer', 'zone'):
+        if not os.path.exists(os.path.join(args.hierarchy, 'meta.json')):
+            raise ValueError(f'--by {args.by} requiere el índice de jerarquía en {args.hierarchy} (hierarchy-index.py build)')
+        hierarchy = HierarchyIndex.load(args.hierarchy)
+    started = time.perf_counter()
+    cubes = {zone: RollupCube.open(zone, args.cubes) for zone in zones}
+    rows = query(cubes, args.startDate, args.endDate, by=args.by, series=args.series, hierarchy=hierarchy)
+    payload = json.dumps(rows, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(payload + '\n')
+    else:
+        print(payload)
+    print(f'{len(rows)} filas de {len(zones)} zona(s) ({(time.perf_counter() - started) * 1000:.1f} ms)', file=sys.stderr)
+
+
+def cmd_info(args):
+    info = []
+    for zone in selected_zones(args, DeltaStore.zones(args.store)):
+        cube = RollupCube.open(zone, args.cubes)
+        meta = cube.meta
+        info.append({
+            'zone': zone,
+            'records': len(cube),
+            'socializers': len(meta['socializers']) - 1,
+            'appliedChangeFile': meta['applied'],
+            'days': len(cube.arrays.get('daily', ())),
+            'hours': len(cube.arrays.get('hourly', ())),
+        })
+    print(json.dumps(info, indent=2, ensure_ascii=False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--cubes', default=DEFAULT_ROOT, help=f'cube root (default: {DEFAULT_ROOT})')
+    common.add_argument('--store', default=DELTA_ROOT, help=f'delta-export.py store root (default: {DELTA_ROOT})')
+    common.add_argument('--zone', action='append', help='only this zone (repeatable)')
+    add_trace_arguments(common)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    update = sub.add_parser('update', parents=[common], help='apply new change files to the cubes')
+    update.set_defaults(func=cmd_update)
+
+    q = sub.add_parser('query', parents=[common], help='survey counts of a date range')
+    q.add_argument('--startDate', required=True, help='first day (or datetime, rounded down to the hour)')
+    q.add_argument('--endDate', required=True, help='last day (or datetime), inclusive')
+    q.add_argument('--by', choices=LEVELS, default='socializer', help='grouping level (default: socializer)')
+    q.add_argument('--series', choices=SERIES, help='one row per group and day/hour')
+    q.add_argument('--hierarchy', default=DEFAULT_INDEX, help=f'hierarchy index for supervisor/coordinator levels (default: {DEFAULT_INDEX})')
+    q.add_argument('-o', '--output', help='write the rows to this JSON file')
+    q.set_defaults(func=cmd_query)
+
+    info = sub.add_parser('info', parents=[common], help='show what each zone cube holds')
+    info.set_defaults(func=cmd_info)
+
+    args = parser.parse_args(argv)
+    try:
+        with tracing(args, f'rollup-cubes {args.command}'):
+            args.func(args)
+    except ValueError as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
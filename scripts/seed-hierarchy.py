@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Seed the Admin > Zone/Field Coordinator > Supervisor > Socializer tree.
+
+Reads the hierarchy from ``hierarchy-dry-run.json`` (``--spec``) or builds it
+from a fan-out per level, creates the users level by level with concurrent
+requests over a pooled connection and assigns each supervisor's socializers
+in ``/coordinator-assignments/batch`` calls. Progress goes to a journal, so
+re-running the same command resumes an interrupted seed.
+
+Usage:
+    python3 scripts/seed-hierarchy.py --spec hierarchy-dry-run.json
+    python3 scripts/seed-hierarchy.py --zones 8 --fields 4 --supervisors 5 --socializers 40 \\
+        --concurrency 32 --journal /tmp/seed-8z.jsonl
+    python3 scripts/seed-hierarchy.py --zones 8 --socializers 40 --dry-run
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from reportkit.client import ApiClient, ApiError
+from reportkit.seeding import Journal, build_hierarchy, load_hierarchy, seed, write_hierarchy
+from reportkit.trace import add_trace_arguments, span, tracing
+
+DEFAULT_API = 'http://localhost:3000/api/v1'
+DEFAULT_JOURNAL = 'seed-journal.jsonl'
+
+
+async def run(args, users):
+    async with ApiClient(args.api, args.token, max_connections=args.concurrency) as api:
+        journal = Journal(args.journal)
+        if journal.users:
+            print(f'Reanudando: {len(journal.users)} usuarios ya creados según {args.journal}', file=sys.stderr)
+
+        def progress(level, stats):
+            if stats.created % 100 == 0:
+                print(f'  nivel {level}: {stats.created} creados', file=sys.stderr)
+
+        try:
+            stats = await seed(api, users, journal, args.concurrency, args.batch_size,
+                               admin_login=not args.token, progress=progress)
+        finally:
+            journal.close()
+        ids = {key: entry['userId'] for key, entry in journal.users.items()}
+        return stats, ids, api.requests
+
+
+def seed_users(args):
+    try:
+        with span('hierarchy', source='spec' if args.spec else 'fan-out'):
+            users = (load_hierarchy(args.spec) if args.spec
+                     else build_hierarchy(args.zones, args.fields, args.supervisors, args.socializers, args.domain))
+    except (OSError, ValueError, KeyError) as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 2
+
+    if args.dry_run:
+        with span('write', users=len(users)):
+            write_hierarchy(users, args.json, args.csv, args.api)
+        print(f'{len(users)} usuarios → {args.json}, {args.csv}', file=sys.stderr)
+        return 0
+
+    try:
+        with span('seed', users=len(users)):
+            stats, ids, requests = asyncio.run(run(args, users))
+    except ApiError as err:
+        print(f'Error de API: {err}', file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print(f'Interrumpido; vuelva a ejecutar para continuar desde {args.journal}', file=sys.stderr)
+        return 130
+
+    # Las salidas reales no pisan el dry run
+    base_json, base_csv = args.json.replace('dry-run', 'seeded'), args.csv.replace('dry-run', 'seeded')
+    write_hierarchy([u for u in users if u.key in ids], base_json, base_csv, args.api, ids)
+    for key, message in stats.failed[:20]:
+        print(f'  ✗ {key}: {message}', file=sys.stderr)
+    if len(stats.failed) > 20:
+        print(f'  ... y {len(stats.failed) - 20} fallos más', file=sys.stderr)
+    print(json.dumps({**stats.as_dict(), 'requests': requests, 'json': base_json, 'csv': base_csv}, indent=2))
+    return 1 if stats.failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--api', default=os.environ.get('API_BASE_URL', DEFAULT_API), help='API base URL')
+    parser.add_argument('--token', default=os.environ.get('SOCI_TOKEN'),
+                        help='existing admin token (default: $SOCI_TOKEN; else log in as the spec admin)')
+    parser.add_argument('--spec', help='hierarchy-dry-run.json to seed (overrides the fan-out options)')
+    parser.add_argument('--zones', type=int, default=2, help='zone coordinators (default: 2)')
+    parser.add_argument('--fields', type=int, default=1, help='field coordinators per zone (default: 1)')
+    parser.add_argument('--supervisors', type=int, default=1, help='supervisors per field coordinator (default: 1)')
+    parser.add_argument('--socializers', type=int, default=2, help='socializers per supervisor (default: 2)')
+    parser.add_argument('--domain', default='soci.app', help='email domain of generated users')
+    parser.add_argument('--concurrency', type=int, default=16, help='requests in flight (default: 16)')
+    parser.add_argument('--batch-size', dest='batch_size', type=int, default=500,
+                        help='socializers per batch assignment (default: 500)')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL, help=f'resume journal (default: {DEFAULT_JOURNAL})')
+    parser.add_argument('--dry-run', action='store_true', help='only write the hierarchy JSON/CSV, no requests')
+    parser.add_argument('--json', default='hierarchy-dry-run.json', help='hierarchy JSON output')
+    parser.add_argument('--csv', default='credentials-dry-run.csv', help='credentials CSV output')
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+    with tracing(args, 'seed-hierarchy'):
+        return seed_users(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
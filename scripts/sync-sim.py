@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Simulate a fleet of devices syncing their offline surveys (requires numpy).
+
+Models N socializer devices with pending surveys and recordings that come
+back online together, replays the app's sync (``current``) or an
+alternative strategy against a local stand-in backend with bounded
+capacity, and reports drain time, request rate, tail latency, rejections
+and lost recordings. Times are simulated seconds; ``--speed`` compresses
+them (60: one simulated minute per real second).
+
+Usage:
+    python3 scripts/sync-sim.py --devices 300
+    python3 scripts/sync-sim.py --devices 800 --pending-mean 40 --workers 4 \\
+        --strategies current,jittered,batched,parallel-uploads,combined -o sync-sim.json
+"""
+
+import argparse
+import json
+import sys
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    sys.exit('sync-sim.py requiere numpy: pip install numpy')
+
+from reportkit.sync_sim import STRATEGIES, BackendCosts, make_fleet, simulate
+from reportkit.trace import add_trace_arguments, span, tracing
+
+
+def summary_line(result):
+    latency = result['latencySeconds']
+    create = latency.get('batch') or latency.get('create') or {}
+    audio = latency.get('audio') or {}
+    drain = result['fleetDrainSeconds']
+    return (f'{result["strategy"]["name"]:<17} drenado {drain if drain is not None else "—":>8}s · '
+            f'p95 dispositivo {result["deviceDrainSeconds"].get("p95", 0):>7}s · '
+            f'pico {result["requestsPerSecond"]["peak"]:>4} req/s · '
+            f'p99 alta {create.get("p99", 0):>6}s · p99 audio {audio.get("p99", 0):>6}s · '
+            f'503 {result["backend"]["rejected"]:>5} · audios perdidos {result["audioLost"]}')
+
+
+def run(args, names):
+    with span('fleet', devices=args.devices):
+        devices = make_fleet(args.devices, args.pending_mean, args.audio_seconds, args.window, args.burst, args.flap,
+                             args.seed)
+    costs = BackendCosts(workers=args.workers, max_queue=args.max_queue, create=args.create, audio_mb=args.audio_mb)
+    surveys = sum(len(d.pending) for d in devices)
+    print(f'{len(devices)} dispositivos, {surveys} encuestas pendientes, '
+          f'{sum(sum(d.pending) for d in devices) / 1e6:.0f} MB de audio', file=sys.stderr)
+
+    results = []
+    try:
+        for name in names:
+            with span('simulate', strategy=name):
+                result = simulate(devices, STRATEGIES[name], costs, args.speed, args.port, args.horizon)
+            results.append(result)
+            print(summary_line(result), file=sys.stderr)
+    except KeyboardInterrupt:
+        print('\nInterrumpido.', file=sys.stderr)
+        return 130
+    data = json.dumps(results, ensure_ascii=False, indent=2) + '\n'
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+    else:
+        sys.stdout.write(data)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    fleet = parser.add_argument_group('fleet')
+    fleet.add_argument('--devices', type=int, default=300, help='devices (default: 300)')
+    fleet.add_argument('--pending-mean', dest='pending_mean', type=float, default=25,
+                       help='mean pending surveys per device (default: 25)')
+    fleet.add_argument('--audio-seconds', dest='audio_seconds', type=float, default=150,
+                       help='median recording length, s (default: 150)')
+    fleet.add_argument('--window', type=float, default=600, help='reconnect window of the rest, s (default: 600)')
+    fleet.add_argument('--burst', type=float, default=0.6, help='share reconnecting together at t=0 (default: 0.6)')
+    fleet.add_argument('--flap', type=float, default=0.1, help='share losing the connection mid-sync (default: 0.1)')
+    fleet.add_argument('--seed', type=int, default=1, help='fleet seed (default: 1)')
+    backend = parser.add_argument_group('backend')
+    defaults = BackendCosts()
+    backend.add_argument('--workers', type=int, default=defaults.workers, help=f'requests served at once (default: {defaults.workers})')
+    backend.add_argument('--max-queue', dest='max_queue', type=int, default=defaults.max_queue,
+                         help=f'waiting requests before answering 503 (default: {defaults.max_queue})')
+    backend.add_argument('--create-cost', dest='create', type=float, default=defaults.create,
+                         help=f'seconds per POST /respondents (default: {defaults.create})')
+    backend.add_argument('--audio-mb-cost', dest='audio_mb', type=float, default=defaults.audio_mb,
+                         help=f'seconds per stored audio MB (default: {defaults.audio_mb})')
+    parser.add_argument('--strategies', default=','.join(STRATEGIES),
+                        help=f'comma-separated, from: {", ".join(STRATEGIES)}')
+    parser.add_argument('--speed', type=float, default=60, help='simulated seconds per real second (default: 60)')
+    parser.add_argument('--horizon', type=float, default=6 * 3600, help='give up after this many simulated seconds')
+    parser.add_argument('--port', type=int, default=3900, help='port of the stand-in backend (default: 3900)')
+    parser.add_argument('-o', '--output', help='write the full results as JSON here')
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.strategies.split(',') if name.strip()]
+    unknown = [name for name in names if name not in STRATEGIES]
+    if unknown:
+        parser.error(f'estrategia desconocida: {", ".join(unknown)}')
+    with tracing(args, 'sync-sim'):
+        return run(args, names)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
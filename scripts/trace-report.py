@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Summarize a --trace file of the report tooling, or compare two of them.
+
+With one trace: every span name with its count, total, self, mean, p95 and
+max time, plus the counters. With two: the change in total and self time of
+each span between the first (base) and the second trace, biggest change
+first, e.g. the same export before and after an optimization.
+
+Usage:
+    python3 scripts/export-report.py --startDate 2026-01-01 --endDate 2026-01-31 -o r.csv --trace antes.json
+    python3 scripts/trace-report.py antes.json
+    python3 scripts/trace-report.py antes.json despues.json --top 15
+    python3 scripts/trace-report.py antes.json despues.json --json > diff.json
+"""
+
+import argparse
+import json
+import sys
+
+from reportkit.trace import compare, summarize
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        trace = json.load(f)
+    if 'traceEvents' not in trace:
+        raise ValueError(f'{path}: no es una traza (falta traceEvents)')
+    return trace
+
+
+def print_summary(summary, top):
+    spans = sorted(summary['spans'].items(), key=lambda item: item[1]['totalMs'], reverse=True)[:top]
+    width = max([len(name) for name, _ in spans] + [4])
+    print(f'{"span":<{width}} {"n":>7} {"total ms":>11} {"self ms":>11} {"media":>9} {"p95":>9} {"máx":>9}')
+    for name, s in spans:
+        print(f'{name:<{width}} {s["count"]:>7} {s["totalMs"]:>11.1f} {s["selfMs"]:>11.1f} '
+              f'{s["meanMs"]:>9.2f} {s["p95Ms"]:>9.2f} {s["maxMs"]:>9.2f}')
+    for name, value in sorted(summary['counters'].items()):
+        print(f'{name}: {value:,}')
+
+
+def print_comparison(diff, top):
+    rows = diff['spans'][:top]
+    width = max([len(r['span']) for r in rows] + [4])
+    print(f'{"span":<{width}} {"n base":>7} {"n nuevo":>7} {"base ms":>11} {"nuevo ms":>11} {"Δ ms":>11} {"×":>7}')
+    for r in rows:
+        ratio = f'{r["ratio"]:.2f}' if r['ratio'] is not None else '-'
+        print(f'{r["span"]:<{width}} {r["countBase"]:>7} {r["countNew"]:>7} {r["totalMsBase"]:>11.1f} '
+              f'{r["totalMsNew"]:>11.1f} {r["deltaMs"]:>+11.1f} {ratio:>7}')
+    for name, values in diff['counters'].items():
+        print(f'{name}: {values["base"]:,} -> {values["new"]:,}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('traces', nargs='+', metavar='TRACE', help='one trace to summarize, or base and new to compare')
+    parser.add_argument('--top', type=int, default=30, help='spans to show (default: 30)')
+    parser.add_argument('--json', action='store_true', help='print the summary/comparison as JSON')
+    args = parser.parse_args(argv)
+    if len(args.traces) > 2:
+        parser.error('se compara como máximo una traza base con una nueva')
+
+    try:
+        traces = [load(path) for path in args.traces]
+    except (OSError, ValueError) as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 2
+    result = summarize(traces[0]) if len(traces) == 1 else compare(*traces)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    elif len(traces) == 1:
+        print_summary(result, args.top)
+    else:
+        print_comparison(result, args.top)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,9 +7,11 @@ import { DateInput } from './DateInput'
 import { Select } from './Select'
 import { Input } from './Input'
 import { getTodayISO } from '../utils/dateHelpers'
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useMemo } from 'react'
 import { useUnsuccessfulToggle } from '../hooks/useUnsuccessfulToggle'
-import { apiService, type ZoneDepartmentEntry, type ZoneMunicipalityItem } from '../services/api.service'
+import { type ZoneDepartmentEntry, type ZoneMunicipalityItem } from '../services/api.service'
+import { geoBundleService } from '../services/geoBundle.service'
+import { searchKey } from '../utils/helpers'
 import { FilterIcon, XIcon, CalendarIcon, SearchIcon, SlidersIcon, ChevronDownIcon, ChartIcon, ExcelIcon } from './Icons'
 
 export interface ReportFilters {
@@ -52,6 +54,12 @@ export const INITIAL_FILTERS: ReportFilters = {
   sortOrder: 'asc',
 }
 
+/** Departamento y municipios de una zona (páginas generadas con write-reports.py --zones) */
+export interface ZoneLocation {
+  department: string
+  municipalities: string[]
+}
+
 interface ReportFilterPanelProps {
   isOpen: boolean
   onClose: () => void
@@ -61,6 +69,7 @@ interface ReportFilterPanelProps {
   onExportCSV: () => void
   isGenerating: boolean
   hasData: boolean
+  zoneLocations?: ZoneLocation[]
 }
 
 export function ReportFilterPanel({
@@ -72,6 +81,7 @@ export function ReportFilterPanel({
   onExportCSV,
   isGenerating,
   hasData,
+  zoneLocations,
 }: ReportFilterPanelProps) {
   const ACTIVE_ZONE = import.meta.env.VITE_ACTIVE_ZONE || 'zona1'
   const ZONE_ALIASES: Record<string, number> = { zonaf: 6 }
@@ -79,7 +89,6 @@ export function ReportFilterPanel({
 
   const [showAdvanced, setShowAdvanced] = useState(false)
   const [zoneDepartments, setZoneDepartments] = useState<ZoneDepartmentEntry[]>([])
-  const [municipalities, setMunicipalities] = useState<ZoneMunicipalityItem[]>([])
   const [loadingDepts, setLoadingDepts] = useState(false)
   const { showUnsuccessful } = useUnsuccessfulToggle()
 
@@ -90,7 +99,7 @@ export function ReportFilterPanel({
     const loadDepartments = async () => {
       setLoadingDepts(true)
       try {
-        const response = await apiService.getZoneDepartments(ZONE_NUMBER)
+        const response = await geoBundleService.getZoneDepartments(ZONE_NUMBER)
         setZoneDepartments(response.departments)
       } catch {
         setZoneDepartments([])
@@ -101,21 +110,35 @@ export function ReportFilterPanel({
     loadDepartments()
   }, [])
 
-  // Actualizar municipios cuando cambia el departamento seleccionado
-  useEffect(() => {
-    if (!filters.department) {
-      setMunicipalities([])
-      return
+  // Opciones de ubicación: las de la página de la zona si las trae, si no las cargadas
+  const locationOptions = useMemo(() => {
+    if (!zoneLocations) {
+      return zoneDepartments
+        .filter((entry) => entry?.department?._id)
+        .map((entry) => ({
+          value: entry.department._id,
+          label: entry.department.name,
+          municipalities: (entry.municipalities || [])
+            .filter((muni) => muni?._id)
+            .map((muni) => ({ value: muni._id, label: muni.name })),
+        }))
     }
+    // Los _id salen de los datos cargados; sin ellos se filtra por nombre
+    return zoneLocations.map(({ department, municipalities }) => {
+      const entry = zoneDepartments.find((e) => searchKey(e?.department?.name || '') === searchKey(department))
+      const byKey = new Map<string, ZoneMunicipalityItem>(
+        (entry?.municipalities || []).map((muni) => [searchKey(muni?.name || ''), muni])
+      )
+      return {
+        value: entry?.department?._id || department,
+        label: department,
+        municipalities: municipalities.map((name) => ({ value: byKey.get(searchKey(name))?._id || name, label: name })),
+      }
+    })
+  }, [zoneDepartments, zoneLocations])
 
-    // Buscar el departamento seleccionado en la data ya cargada
-    const selectedDept = zoneDepartments.find(d => d?.department?._id === filters.department)
-    if (selectedDept?.municipalities) {
-      setMunicipalities(selectedDept.municipalities)
-    } else {
-      setMunicipalities([])
-    }
-  }, [filters.department, zoneDepartments])
+  // Municipios del departamento seleccionado
+  const municipalityOptions = locationOptions.find((option) => option.value === filters.department)?.municipalities || []
 
   const handleDepartmentChange = (value: string) => {
     onFilterChange('department', value)
@@ -359,15 +382,10 @@ export function ReportFilterPanel({
                       label="Departamento"
                       value={filters.department}
                       onChange={(e) => handleDepartmentChange(e.target.value)}
-                      disabled={isGenerating || loadingDepts || zoneDepartments.length === 0}
+                      disabled={isGenerating || loadingDepts || locationOptions.length === 0}
                       options={[
                         { value: '', label: 'Todos' },
-                        ...zoneDepartments
-                          .filter((entry) => entry?.department?._id)
-                          .map((entry) => ({
-                            value: entry.department._id,
-                            label: entry.department.name,
-                          })),
+                        ...locationOptions.map(({ value, label }) => ({ value, label })),
                       ]}
                     />
                   </div>
@@ -376,16 +394,8 @@ export function ReportFilterPanel({
                       label="Municipio"
                       value={filters.city}
                       onChange={(e) => onFilterChange('city', e.target.value)}
-                      disabled={isGenerating || !filters.department || municipalities.length === 0}
-                      options={[
-                        { value: '', label: 'Todos' },
-                        ...municipalities
-                          .filter((muni) => muni?._id)
-                          .map((muni) => ({
-                            value: muni._id,
-                            label: muni.name,
-                          })),
-                      ]}
+                      disabled={isGenerating || !filters.department || municipalityOptions.length === 0}
+                      options={[{ value: '', label: 'Todos' }, ...municipalityOptions]}
                     />
                   </div>
                   <div className="rg-panel__field">
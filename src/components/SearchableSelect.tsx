@@ -4,6 +4,7 @@
 
 import React, { useState, useRef, useEffect, useCallback } from 'react'
 import { ChevronDownIcon, SearchIcon, CheckIcon } from './Icons'
+import { searchKey } from '../utils'
 
 interface SelectOption {
   readonly value: string | number
@@ -50,8 +51,10 @@ export const SearchableSelect: React.FC<SearchableSelectProps> = ({
 
   const selectedOption = options.find(o => String(o.value) === String(value))
 
-  const filtered = search.trim()
-    ? options.filter(o => o.label.toLowerCase().includes(search.toLowerCase()))
+  // Sin distinguir tildes ni mayúsculas: 'bogota' encuentra 'BOGOTÁ, D.C.'
+  const needle = searchKey(search)
+  const filtered = needle
+    ? options.filter(o => searchKey(o.label).includes(needle))
     : options
 
   // Cerrar al hacer click fuera
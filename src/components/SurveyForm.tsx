@@ -17,7 +17,8 @@ import {
 } from '../constants'
 import { Respondent } from '../models/Respondent'
 import type { SurveyFormData, SurveyFormProps } from './types'
-import { apiService, type ZoneDepartmentEntry, type ZoneMunicipalityItem } from '../services/api.service'
+import { type ZoneDepartmentEntry, type ZoneMunicipalityItem } from '../services/api.service'
+import { geoBundleService } from '../services/geoBundle.service'
 import { Input } from './Input'
 import { Select } from './Select'
 import { useSafeRegister } from '../hooks/useSafeRegister'
@@ -104,12 +105,12 @@ export function SurveyForm({
     }
   }, [initialData, reset, setValue])
 
-  // Cargar departamentos y municipios de la zona activa desde el backend
+  // Cargar departamentos y municipios de la zona activa (bundle precompilado o backend)
   useEffect(() => {
     const loadDepartments = async () => {
       setLoadingDepartments(true)
       try {
-        const response = await apiService.getZoneDepartments(ZONE_NUMBER)
+        const response = await geoBundleService.getZoneDepartments(ZONE_NUMBER)
         setZoneDepartments(response.departments)
 
         // Auto-seleccionar si solo hay un departamento
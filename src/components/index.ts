@@ -51,6 +51,6 @@ export type { StatCardProps } from './StatCard'
 export type { EmptyStateProps } from './EmptyState'
 export type { LoadingStateProps } from './LoadingState'
 export type { MapPopupProps, MapPopupField } from './MapPopup'
-export type { ReportFilters } from './ReportFilterPanel'
+export type { ReportFilters, ZoneLocation } from './ReportFilterPanel'
 export type { ReportTableColumn } from './ReportTable'
 export type { MetricsData, DailyStat, RejectionStat } from './MetricsCard'
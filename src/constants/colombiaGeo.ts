@@ -0,0 +1,9 @@
+/**
+ * colombiaGeo - Departamentos, municipios y zonas precompilados
+ * Generado por scripts/geo-bundle.py build a partir de la API y BUILD_ZONES.md; no editar a mano.
+ * null: sin compilar, los formularios consultan /zones/:n/departments
+ */
+
+import type { GeoBundle } from '../services/geoBundle.service'
+
+export const COLOMBIA_GEO: GeoBundle | null = null
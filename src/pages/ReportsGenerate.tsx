@@ -3,7 +3,7 @@
  * Layout: Tabla principal a la izquierda, panel de filtros colapsable a la derecha
  */
 
-import { useState, useMemo, useCallback } from 'react'
+import { useState, useMemo, useCallback, useEffect, useRef } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { DashboardLayout, ToggleUnsuccessful, ReportFilterPanel, INITIAL_FILTERS, ReportTable, FilterIcon, CheckIcon, XIcon, StarIcon, ExcelIcon } from '../components'
 import type { ReportFilters } from '../components/ReportFilterPanel'
@@ -12,6 +12,8 @@ import { useUnsuccessfulToggle } from '../hooks/useUnsuccessfulToggle'
 import { apiService } from '../services/api.service'
 import { notificationService } from '../services/notification.service'
 import { ROUTES } from '../constants'
+import { reportQueries, reportQueryStats } from '../services/reportQueryCache'
+import type { ExportRequest, ExportWorkerMessage } from '../workers/ReportsGenerate.export.worker'
 import '../styles/Dashboard.scss'
 
 // Tipo local para items del reporte (mapeado de Dashboard002Survey)
@@ -26,6 +28,7 @@ interface ReportItem {
   phone?: string
   address?: string
   ageRange?: string
+  region?: string
   department: string
   city?: string
   gender?: string
@@ -207,6 +210,24 @@ const TABLE_COLUMNS: ReportTableColumn<ReportItem>[] = [
   },
 ]
 
+// city/department pueden llegar como objetos poblados desde la API
+const extractStr = (val: unknown): string | undefined => {
+  if (!val) return undefined
+  if (typeof val === 'string') return val
+  if (typeof val === 'object' && val !== null && 'name' in val) return (val as { name: string }).name
+  return undefined
+}
+
+type ReportSurvey = Omit<ReportItem, 'linkedHomes'> & { linkedHomes?: boolean }
+
+const sanitizeSurveys = (surveys: ReportSurvey[] | undefined): ReportItem[] =>
+  (surveys || []).map((s) => ({
+    ...s,
+    city: extractStr(s.city),
+    department: extractStr(s.department) ?? s.department,
+    linkedHomes: s.linkedHomes || false,
+  }))
+
 export default function ReportsGenerate() {
   const navigate = useNavigate()
   const [isGenerating, setIsGenerating] = useState(false)
@@ -217,6 +238,9 @@ export default function ReportsGenerate() {
   const [itemsPerPage] = useState(50)
   const [totalItems, setTotalItems] = useState(0)
   const [totalPages, setTotalPages] = useState(0)
+  const [exportProgress, setExportProgress] = useState<number | null>(null)
+  const exportWorkerRef = useRef<Worker | null>(null)
+  const [cacheStats, setCacheStats] = useState(reportQueryStats)
 
   // ---- Handlers - Memoizados para estabilidad ----
   const handleFilterChange = useCallback((field: keyof ReportFilters, value: string) => {
@@ -235,7 +259,7 @@ export default function ReportsGenerate() {
 
   const handleBackToReports = useCallback(() => navigate(ROUTES.ADMIN_REPORTS), [navigate])
 
-  const generateReport = useCallback(async (page: number = 1) => {
+  const generateReport = useCallback(async (page: number = 1, refresh: boolean = false) => {
     if (!filters.startDate || !filters.endDate) {
       notificationService.warning('Por favor seleccione un rango de fechas')
       return
@@ -271,21 +295,17 @@ export default function ReportsGenerate() {
         sortBy: filters.sortBy || undefined,
         sortOrder: filters.sortOrder,
       }
-      const response = await apiService.getDashboard002Report(params)
-      // Sanitize: city/department may arrive as populated objects from the API
-      const extractStr = (val: unknown): string | undefined => {
-        if (!val) return undefined
-        if (typeof val === 'string') return val
-        if (typeof val === 'object' && val !== null && 'name' in val) return (val as { name: string }).name
-        return undefined
-      }
-      const sanitized = (response.data.surveys || []).map((s) => ({
-        ...s,
-        city: extractStr(s.city),
-        department: extractStr(s.department) ?? s.department,
-        linkedHomes: s.linkedHomes || false,
-      }))
-      setReportData(sanitized)
+      const response = await reportQueries.getDashboard002Report(params, {
+        refresh,
+        // Respuesta vencida servida desde la caché: la revalidación la reemplaza
+        onRevalidate: (fresh) => {
+          setCacheStats(reportQueryStats())
+          setReportData(sanitizeSurveys(fresh.data.surveys))
+          setTotalItems(fresh.data.totalItems)
+          setTotalPages(fresh.data.totalPages)
+        },
+      })
+      setReportData(sanitizeSurveys(response.data.surveys))
       setCurrentPage(response.data.currentPage)
       setTotalItems(response.data.totalItems)
       setTotalPages(response.data.totalPages)
@@ -299,6 +319,7 @@ export default function ReportsGenerate() {
       notificationService.handleApiError(err, 'Error al generar el reporte')
     } finally {
       setIsGenerating(false)
+      setCacheStats(reportQueryStats())
     }
   }, [filters, itemsPerPage])
 
@@ -335,6 +356,87 @@ export default function ReportsGenerate() {
     }
   }, [filters])
 
+  const stopExport = useCallback(() => {
+    exportWorkerRef.current?.terminate()
+    exportWorkerRef.current = null
+    setExportProgress(null)
+  }, [])
+
+  useEffect(() => () => exportWorkerRef.current?.terminate(), [])
+
+  // Exporta todas las páginas del reporte en un Web Worker (CSV por bloques, sin bloquear la pestaña)
+  const exportToCSV = useCallback(() => {
+    if (exportWorkerRef.current) {
+      stopExport()
+      notificationService.info('Exportación cancelada')
+      return
+    }
+    if (!filters.startDate || !filters.endDate) {
+      notificationService.warning('Por favor seleccione un rango de fechas')
+      return
+    }
+    const worker = new Worker(new URL('../workers/ReportsGenerate.export.worker.ts', import.meta.url), { type: 'module' })
+    exportWorkerRef.current = worker
+    setExportProgress(0)
+    worker.onmessage = (event: MessageEvent<ExportWorkerMessage>) => {
+      const message = event.data
+      if (message.type === 'progress') {
+        setExportProgress(Math.floor((100 * message.rows) / Math.max(message.totalItems, 1)))
+        return
+      }
+      stopExport()
+      if (message.type === 'error') {
+        notificationService.handleApiError(message, 'Error al exportar el reporte')
+        return
+      }
+      const link = document.createElement('a')
+      link.href = URL.createObjectURL(message.blob)
+      link.download = `reporte_encuestas_${filters.startDate}_${filters.endDate}.csv`
+      link.style.visibility = 'hidden'
+      document.body.appendChild(link)
+      link.click()
+      document.body.removeChild(link)
+      // El Blob puede pesar decenas de MB: se libera cuando la descarga ya empezó
+      setTimeout(() => URL.revokeObjectURL(link.href), 10000)
+      notificationService.success(`Archivo CSV descargado: ${message.rows} registros`)
+    }
+    worker.onerror = () => {
+      stopExport()
+      notificationService.error('Error al exportar el reporte')
+    }
+    const request: ExportRequest = {
+      ...apiService.getDashboard002Request({
+        startDate: filters.startDate,
+        endDate: filters.endDate,
+        q: filters.q || undefined,
+        surveyStatus: filters.surveyStatus || undefined,
+        willingToRespond: filters.willingToRespond
+          ? filters.willingToRespond === 'true'
+          : undefined,
+        isPatriaDefender: filters.isPatriaDefender
+          ? filters.isPatriaDefender === 'true'
+          : undefined,
+        isVerified: filters.isVerified
+          ? filters.isVerified === 'true'
+          : undefined,
+        isLinkedHouse: filters.isLinkedHouse
+          ? filters.isLinkedHouse === 'true'
+          : undefined,
+        department: filters.department || undefined,
+        city: filters.city || undefined,
+        neighborhood: filters.neighborhood || undefined,
+        gender: filters.gender || undefined,
+        ageRange: filters.ageRange || undefined,
+        stratum: filters.stratum || undefined,
+        idType: filters.idType || undefined,
+        sortBy: filters.sortBy || undefined,
+        sortOrder: filters.sortOrder,
+      }),
+      perPage: 5000,
+    }
+    worker.postMessage(request)
+  }, [filters, stopExport])
+
   const activeFiltersCount = useMemo(() => {
     return Object.entries(filters).filter(
       ([key, value]) => value && key !== 'sortOrder'
@@ -381,6 +483,11 @@ export default function ReportsGenerate() {
               <h3 className="rg-main-header__title">
                 {hasData ? 'Resultados del Reporte' : 'Reporte de Encuestas'}
               </h3>
+              {import.meta.env.DEV && (
+                <span className="rg-badge" title={JSON.stringify(cacheStats)}>
+                  Caché: {cacheStats.hits} aciertos / {cacheStats.misses} fallos
+                </span>
+              )}
             </div>
             <div className="rg-main-header__right">
               {hasData && (
@@ -394,6 +501,16 @@ export default function ReportsGenerate() {
                   Exportar Excel
                 </button>
               )}
+              {hasData && (
+                <button
+                  className="btn btn--secondary"
+                  onClick={exportToCSV}
+                  disabled={isGenerating}
+                  title="Exportar todas las páginas a CSV"
+                >
+                  {exportProgress === null ? 'Exportar CSV' : `Cancelar (${exportProgress}%)`}
+                </button>
+              )}
               {hasData && <ToggleUnsuccessful />}
               <button
                 className={`rg-filter-toggle ${filterPanelOpen ? 'rg-filter-toggle--active' : ''}`}
@@ -476,7 +593,7 @@ export default function ReportsGenerate() {
             onClose={() => setFilterPanelOpen(false)}
             filters={filters}
             onFilterChange={handleFilterChange}
-            onGenerate={() => generateReport(1)}
+            onGenerate={() => generateReport(1, true)}
             onExportCSV={exportToExcel}
             isGenerating={isGenerating}
             hasData={hasData}
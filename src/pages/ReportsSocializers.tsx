@@ -3,7 +3,7 @@
  * Muestra intervenciones, exitosas, no exitosas y defensores agrupados por usuario del rol seleccionado
  */
 
-import { useState, useMemo, useEffect } from 'react'
+import { useState, useMemo, useEffect, useRef } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { DashboardLayout, Select, SearchableSelect, ToggleUnsuccessful, ChartIcon, CheckIcon, StarIcon, HomeIcon, PlusIcon, WifiIcon, XIcon, StatCard, DateRangeFilter, StatsGrid, VerifiedIcon, ExcelIcon } from '../components'
 import { ReportTable } from '../components/ReportTable'
@@ -12,7 +12,9 @@ import { useAuth } from '../contexts/AuthContext'
 import { useZoneApi } from '../contexts/ZoneApiContext'
 import type { ReportTableColumn } from '../components/ReportTable'
 import { apiService, type ZoneDepartmentEntry, type ZoneMunicipalityItem } from '../services/api.service'
+import { geoBundleService } from '../services/geoBundle.service'
 import { notificationService } from '../services/notification.service'
+import { reportQueries } from '../services/reportQueryCache'
 import { ROUTES } from '../constants'
 import '../styles/Dashboard.scss'
 
@@ -49,6 +51,29 @@ const getTodayString = (): string => {
   return `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}-${String(d.getDate()).padStart(2, '0')}`
 }
 
+// Filtros del último reporte generado: al volver a la página se muestra otra vez
+// desde la caché de consultas, sin pedirlo a la API mientras la copia sea válida
+const LAST_REPORT_KEY = 'reportsSocializers:lastReport'
+
+interface LastReport {
+  startDate: string
+  endDate: string
+  role: string
+  department: string
+  municipality: string
+  zone: string
+}
+
+const readLastReport = (): LastReport | null => {
+  try {
+    return JSON.parse(sessionStorage.getItem(LAST_REPORT_KEY) || 'null')
+  } catch {
+    return null
+  }
+}
+
+type Dashboard003Response = Awaited<ReturnType<typeof reportQueries.getDashboard003Report>>
+
 // Columnas de la tabla
 const TABLE_COLUMNS: ReportTableColumn<SocializerRow>[] = [
   {
@@ -147,12 +172,14 @@ export default function ReportsSocializers() {
   const navigate = useNavigate()
   const { user } = useAuth()
   const { zones, selectedZoneIds, setSelectedZoneIds, isLoadingZones, isSuperAdmin, querySelectedZones } = useZoneApi()
+  const [lastReport] = useState(readLastReport)
+  const restoredRef = useRef(false)
   const [isGenerating, setIsGenerating] = useState(false)
-  const [startDate, setStartDate] = useState(getTodayString())
-  const [endDate, setEndDate] = useState(getTodayString())
-  const [selectedRole, setSelectedRole] = useState('socializer')
-  const [selectedDepartment, setSelectedDepartment] = useState('')
-  const [selectedMunicipality, setSelectedMunicipality] = useState('')
+  const [startDate, setStartDate] = useState(lastReport?.startDate ?? getTodayString())
+  const [endDate, setEndDate] = useState(lastReport?.endDate ?? getTodayString())
+  const [selectedRole, setSelectedRole] = useState(lastReport?.role ?? 'socializer')
+  const [selectedDepartment, setSelectedDepartment] = useState(lastReport?.department ?? '')
+  const [selectedMunicipality, setSelectedMunicipality] = useState(lastReport?.municipality ?? '')
   const [zoneDepartments, setZoneDepartments] = useState<ZoneDepartmentEntry[]>([])
   const [municipalities, setMunicipalities] = useState<ZoneMunicipalityItem[]>([])
   const [loadingDepts, setLoadingDepts] = useState(false)
@@ -160,7 +187,7 @@ export default function ReportsSocializers() {
   const [summaryData, setSummaryData] = useState<any>(null)
   const [reportSummaryLabel, setReportSummaryLabel] = useState('')
   // Selector de zona local (UI): '' = zona actual, ALL_ZONES = todas, o un _id específico
-  const [selectedZone, setSelectedZone] = useState('')
+  const [selectedZone, setSelectedZone] = useState(lastReport?.zone ?? '')
   /** true cuando el reporte se generó consultando múltiples zonas */
   const [isMultiZone, setIsMultiZone] = useState(false)
   /** Errores parciales en consultas multi-zona */
@@ -201,7 +228,7 @@ export default function ReportsSocializers() {
     const loadDepartments = async () => {
       setLoadingDepts(true)
       try {
-        const response = await apiService.getZoneDepartments(activeZoneNumber)
+        const response = await geoBundleService.getZoneDepartments(activeZoneNumber)
         setZoneDepartments(response.departments)
       } catch {
         setZoneDepartments([])
@@ -336,7 +363,27 @@ export default function ReportsSocializers() {
     }, {} as any)
   }
 
-  const generateReport = async () => {
+  /** Muestra un reporte de la zona actual; devuelve el texto del resumen */
+  const showReport = (response: Dashboard003Response) => {
+    const socializadores = response.socializadores || []
+
+    const rows: SocializerRow[] = socializadores
+      .map((s) => mapSocializerRow(s))
+      .sort((a, b) => b.interventions - a.interventions)
+
+    setReportData(rows)
+    setIsMultiZone(false)
+    setSummaryData(response.resumen || null)
+
+    const rolLabel = availableRoles.find(r => r.value === selectedRole)?.label || 'usuarios'
+    const totalIntervenciones = response.resumen?.totalEncuestas ?? rows.reduce((s, r) => s + r.interventions, 0)
+    const summaryText = `Reporte generado: ${rows.length} ${rolLabel.toLowerCase()}, ${totalIntervenciones} intervenciones`
+    setReportSummaryLabel(summaryText)
+    return summaryText
+  }
+
+  // refresh: "Generar Reporte" siempre pide datos nuevos; al volver a la página se lee la caché
+  const generateReport = async (refresh: boolean = false) => {
     if (!startDate || !endDate) {
       notificationService.warning('Por favor seleccione un rango de fechas')
       return
@@ -350,7 +397,7 @@ export default function ReportsSocializers() {
       // ── Consulta multi-zona (superadmin con zonas seleccionadas) ──
       if (isAdminOrSuperadmin && selectedZoneIds.length > 0) {
         const results = await querySelectedZones(async (api) => {
-          return api.getDashboard003Report(params)
+          return reportQueries.getDashboard003Report(params, { refresh, api })
         })
 
         const allRows: SocializerRow[] = []
@@ -382,30 +429,31 @@ export default function ReportsSocializers() {
         const zonesQueried = results.filter(r => !r.error).length
         const summaryText = `Reporte generado: ${allRows.length} ${rolLabel.toLowerCase()}, ${totalIntervenciones} intervenciones (${zonesQueried} zona${zonesQueried !== 1 ? 's' : ''} consultada${zonesQueried !== 1 ? 's' : ''})`
         setReportSummaryLabel(summaryText)
-        notificationService.success(summaryText)
+        if (refresh) notificationService.success(summaryText)
 
         if (errors.length > 0) {
           notificationService.warning(`Errores en ${errors.length} zona(s): ${errors.join('; ')}`)
         }
       } else {
         // ── Consulta normal (zona actual) ──
-        const response = await apiService.getDashboard003Report(params)
-        const socializadores = response.socializadores || []
-
-        const rows: SocializerRow[] = socializadores
-          .map((s) => mapSocializerRow(s))
-          .sort((a, b) => b.interventions - a.interventions)
-
-        setReportData(rows)
-        setIsMultiZone(false)
-        setSummaryData(response.resumen || null)
+        const response = await reportQueries.getDashboard003Report(params, {
+          refresh,
+          // Copia vencida servida desde la caché: la revalidación la reemplaza
+          onRevalidate: showReport,
+        })
+        const summaryText = showReport(response)
+        if (refresh) notificationService.success(summaryText)
+      }
 
-        const rolLabel = availableRoles.find(r => r.value === selectedRole)?.label || 'usuarios'
-        const totalIntervenciones = response.resumen?.totalEncuestas ?? rows.reduce((s, r) => s + r.interventions, 0)
-        const summaryText = `Reporte generado: ${rows.length} ${rolLabel.toLowerCase()}, ${totalIntervenciones} intervenciones`
-        setReportSummaryLabel(summaryText)
-        notificationService.success(summaryText)
+      const report: LastReport = {
+        startDate,
+        endDate,
+        role: selectedRole,
+        department: selectedDepartment,
+        municipality: selectedMunicipality,
+        zone: selectedZone,
       }
+      sessionStorage.setItem(LAST_REPORT_KEY, JSON.stringify(report))
     } catch (err) {
       notificationService.handleApiError(err, 'Error al generar el reporte')
     } finally {
@@ -413,6 +461,15 @@ export default function ReportsSocializers() {
     }
   }
 
+  // Al volver a la página: el último reporte, leído de la caché de consultas
+  useEffect(() => {
+    if (!lastReport || restoredRef.current || isLoadingZones) return
+    // Espera a que la selección de zonas refleje la zona restaurada
+    if (isAdminOrSuperadmin && selectedZone && selectedZoneIds.length === 0) return
+    restoredRef.current = true
+    generateReport()
+  }, [lastReport, isLoadingZones, isAdminOrSuperadmin, selectedZone, selectedZoneIds, generateReport])
+
   const exportToExcel = async () => {
     if (!startDate || !endDate) {
       notificationService.warning('Por favor seleccione un rango de fechas')
@@ -474,7 +531,7 @@ export default function ReportsSocializers() {
           endDate={endDate}
           onStartDateChange={setStartDate}
           onEndDateChange={setEndDate}
-          onApply={generateReport}
+          onApply={() => generateReport(true)}
           isLoading={isGenerating}
           applyIcon={<ChartIcon size={20} />}
           applyLabel="Generar Reporte"
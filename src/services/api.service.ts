@@ -281,6 +281,11 @@ export class ApiService {
     return new ApiService(baseUrl)
   }
 
+  /** URL base de la instancia (distingue las cachés de cada zona) */
+  getBaseUrl(): string {
+    return this.baseUrl
+  }
+
   private async buildError(response: Response): Promise<ApiError> {
     let errorMessage = `HTTP ${response.status}: ${response.statusText}`
     let details: any = undefined
@@ -801,6 +806,21 @@ export class ApiService {
    * Nuevo endpoint para reportes con múltiples parámetros de filtrado
    */
   async getDashboard002Report(params: Dashboard002Params): Promise<Dashboard002Response> {
+    return this.get<Dashboard002Response>(this.dashboard002Endpoint(params))
+  }
+
+  /**
+   * URL absoluta de dashboard002 y token de sesión, para descargar el reporte
+   * desde un Web Worker (que no tiene acceso a localStorage)
+   */
+  getDashboard002Request(params: Dashboard002Params): { url: string; token: string | null } {
+    return {
+      url: `${this.baseUrl}${this.dashboard002Endpoint(params)}`,
+      token: localStorage.getItem('soci_token'),
+    }
+  }
+
+  private dashboard002Endpoint(params: Dashboard002Params): string {
     const queryParams = new URLSearchParams()
 
     // Parámetros de paginación
@@ -834,10 +854,7 @@ export class ApiService {
     if (params.sortBy) queryParams.append('sortBy', params.sortBy)
     if (params.sortOrder) queryParams.append('sortOrder', params.sortOrder)
 
-    const url = `${API_ENDPOINTS.DASHBOARD_002}?${queryParams.toString()}`
-    const response = await this.get<Dashboard002Response>(url)
-
-    return response
+    return `${API_ENDPOINTS.DASHBOARD_002}?${queryParams.toString()}`
   }
 
   /**
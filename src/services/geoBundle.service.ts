@@ -0,0 +1,158 @@
+/**
+ * GeoBundleService - Departamentos y municipios sin llamadas a la API
+ * Lee el bundle precompilado por scripts/geo-bundle.py (src/constants/colombiaGeo.ts).
+ * Si no hay bundle, si se compiló contra otra API (los _id no coincidirían)
+ * o si no incluye la zona, consulta /zones/:n/departments como antes
+ */
+
+import { COLOMBIA_GEO } from '../constants/colombiaGeo'
+import { EXTERNAL_URLS } from '../constants'
+import { searchKey } from '../utils/helpers'
+import {
+  apiService,
+  type ZoneDepartmentEntry,
+  type ZoneDepartmentItem,
+  type ZoneDepartmentsResponse,
+  type ZoneMunicipalityItem,
+} from './api.service'
+
+const BUNDLE_FORMAT = 1
+
+export interface GeoPrefixIndex {
+  keys: string[]
+  // i >= 0: municipio i; -(j + 1): departamento j
+  ids: number[]
+}
+
+export interface GeoBundle {
+  format: number
+  version: string
+  source: string
+  departments: Record<keyof ZoneDepartmentItem, string[]>
+  municipalities: Record<keyof ZoneMunicipalityItem, string[]> & { department: number[] }
+  zones: Record<string, number[]>
+  index: { names: GeoPrefixIndex; words: GeoPrefixIndex }
+}
+
+export interface GeoSearchResult {
+  type: 'department' | 'municipality'
+  department: ZoneDepartmentItem
+  municipality?: ZoneMunicipalityItem
+}
+
+const sameUrl = (a: string, b: string) => a.replace(/\/+$/, '') === b.replace(/\/+$/, '')
+
+/** Ids del índice cuyas claves empiezan por prefix (las claves están ordenadas) */
+const prefixRange = (index: GeoPrefixIndex, prefix: string): number[] => {
+  let lo = 0
+  let hi = index.keys.length
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1
+    if (index.keys[mid] < prefix) lo = mid + 1
+    else hi = mid
+  }
+  let end = lo
+  while (end < index.keys.length && index.keys[end].startsWith(prefix)) end++
+  return index.ids.slice(lo, end)
+}
+
+class GeoBundleService {
+  private bundle: GeoBundle | null
+  private departments: ZoneDepartmentItem[] = []
+  private municipalities: ZoneMunicipalityItem[] = []
+
+  constructor(bundle: GeoBundle | null, apiBaseUrl: string) {
+    this.bundle = bundle && bundle.format === BUNDLE_FORMAT && sameUrl(bundle.source, apiBaseUrl) ? bundle : null
+  }
+
+  /** Versión del bundle en uso, o null si se usa la API */
+  get version(): string | null {
+    return this.bundle?.version ?? null
+  }
+
+  private department(j: number): ZoneDepartmentItem {
+    const columns = this.bundle!.departments
+    return (this.departments[j] ??= {
+      _id: columns._id[j],
+      departmentId: columns.departmentId[j],
+      name: columns.name[j],
+      code: columns.code[j],
+      mpio: columns.mpio[j],
+    })
+  }
+
+  private municipality(i: number): ZoneMunicipalityItem {
+    const columns = this.bundle!.municipalities
+    return (this.municipalities[i] ??= {
+      _id: columns._id[i],
+      departmentId: columns.departmentId[i],
+      name: columns.name[i],
+      code: columns.code[i],
+      mpio: columns.mpio[i],
+    })
+  }
+
+  /** Departamentos y municipios de la zona desde el bundle, o null si no la incluye */
+  getLocalZoneDepartments(zoneNumber: number): ZoneDepartmentEntry[] | null {
+    const positions = this.bundle?.zones[String(zoneNumber)]
+    if (!this.bundle || !positions) return null
+    const entries = new Map<number, ZoneDepartmentEntry>()
+    for (const i of positions) {
+      const j = this.bundle.municipalities.department[i]
+      let entry = entries.get(j)
+      if (!entry) {
+        entry = { department: this.department(j), municipalities: [] }
+        entries.set(j, entry)
+      }
+      entry.municipalities.push(this.municipality(i))
+    }
+    return [...entries.keys()].sort((a, b) => a - b).map(j => entries.get(j)!)
+  }
+
+  /** Igual que apiService.getZoneDepartments, sin red cuando el bundle tiene la zona */
+  async getZoneDepartments(zoneNumber: number): Promise<ZoneDepartmentsResponse> {
+    const departments = this.getLocalZoneDepartments(zoneNumber)
+    if (departments) {
+      return { zone: { name: `Zona ${zoneNumber}`, zoneNumber }, departments }
+    }
+    return apiService.getZoneDepartments(zoneNumber)
+  }
+
+  /**
+   * Departamentos y municipios cuyo nombre, o una de sus palabras, empieza por query
+   * Primero las coincidencias con el nombre completo; con zoneNumber solo los de esa zona
+   */
+  search(query: string, options: { zoneNumber?: number; limit?: number } = {}): GeoSearchResult[] {
+    const { zoneNumber, limit = 20 } = options
+    const prefix = searchKey(query)
+    if (!this.bundle || !prefix) return []
+    const { municipalities, zones, index } = this.bundle
+    let allowed: Set<number> | null = null
+    if (zoneNumber !== undefined) {
+      const positions = zones[String(zoneNumber)] ?? []
+      allowed = new Set(positions)
+      for (const i of positions) allowed.add(-(municipalities.department[i] + 1))
+    }
+    const results: GeoSearchResult[] = []
+    const seen = new Set<number>()
+    for (const part of [index.names, index.words]) {
+      for (const id of prefixRange(part, prefix)) {
+        if (seen.has(id) || (allowed && !allowed.has(id))) continue
+        seen.add(id)
+        results.push(
+          id < 0
+            ? { type: 'department', department: this.department(-id - 1) }
+            : {
+                type: 'municipality',
+                department: this.department(municipalities.department[id]),
+                municipality: this.municipality(id),
+              }
+        )
+        if (results.length === limit) return results
+      }
+    }
+    return results
+  }
+}
+
+export const geoBundleService = new GeoBundleService(COLOMBIA_GEO, EXTERNAL_URLS.API_BASE_URL)
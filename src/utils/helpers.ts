@@ -74,3 +74,18 @@ export function getFirstName(fullName: string | undefined | null): string {
   }
   return fullName.split(' ')[0].toUpperCase()
 }
+
+/**
+ * Clave de búsqueda: minúsculas, sin tildes ni puntuación ('Bogotá, D.C.' -> 'bogota d c')
+ * Igual a search_key de scripts/reportkit/geo.py, con la que se ordena el índice del bundle geográfico
+ * @param text - Texto a normalizar
+ * @returns Texto normalizado
+ */
+export function searchKey(text: string): string {
+  return text
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .replace(/[^a-z0-9]+/g, ' ')
+    .trim()
+}
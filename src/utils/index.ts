@@ -2,7 +2,7 @@
  * Barrel export - Centraliza todas las exportaciones de utilidades
  */
 
-export { getAvatarColor, getInitials, simpleHash, selectFromArrayByHash, getFirstName } from './helpers'
+export { getAvatarColor, getInitials, simpleHash, selectFromArrayByHash, getFirstName, searchKey } from './helpers'
 export { convertToMp3 } from './audioConverter'
 export * from './mapHelpers'
 export * from './dateHelpers'
@@ -48,11 +48,34 @@ function serviceWorkerPlugin(): Plugin {
   }
 }
 
+// Plugin para los builds por zona (vite build --mode production.<zona>): si una página
+// tiene variante generada para la zona (scripts/write-reports.py --zones escribe
+// src/pages/<Página>.<zona>.tsx), los imports de la página se resuelven a la variante
+function zonePagesPlugin(mode: string): Plugin {
+  const prefix = 'production.'
+  const zone = mode.startsWith(prefix) ? mode.slice(prefix.length) : ''
+  const pagesDir = path.resolve(__dirname, 'src/pages')
+  return {
+    name: 'zone-pages',
+    enforce: 'pre',
+    async resolveId(source, importer, options) {
+      if (!zone || !importer || !source.includes('pages/')) return null
+      const resolved = await this.resolve(source, importer, { ...options, skipSelf: true })
+      if (!resolved || path.dirname(resolved.id) !== pagesDir) return null
+      const { name, ext } = path.parse(resolved.id)
+      const variant = path.join(pagesDir, `${name}.${zone}${ext}`)
+      // Sin variante generada se usa la página genérica
+      return fs.existsSync(variant) ? variant : null
+    },
+  }
+}
+
 // https://vite.dev/config/
-export default defineConfig({
+export default defineConfig(({ mode }) => ({
   plugins: [
     react(),
     serviceWorkerPlugin(),
+    zonePagesPlugin(mode),
   ],
   server: {
     middlewareMode: false,
@@ -60,6 +83,8 @@ export default defineConfig({
   publicDir: 'public',
   // Configuración para desarrollo offline
   build: {
+    // dist/.vite/manifest.json: lo usa scripts/bundle-report.py
+    manifest: true,
     rollupOptions: {
       input: {
         main: resolve(__dirname, 'index.html'),
@@ -77,4 +102,4 @@ export default defineConfig({
       },
     },
   },
-})
+}))